@@ -6,17 +6,35 @@ This server is intentionally small:
 
 Run:
   uvicorn backend.main:app --host 0.0.0.0 --port 8000 --reload
+
+Endpoints are `async def`. Ollama-only work (motif/ATU retrieval embeddings) uses
+the pooled asyncio client; the annotators, which call `llm_router.chat`
+synchronously for every provider, run in worker threads limited by
+`BACKEND_LLM_WORKERS` so long generations don't occupy FastAPI's default threadpool.
+
+The motif/ATU vector DB is loaded by a background thread at startup, followed by
+one warm-up detection that also loads the embedding model in Ollama
+(`VECTOR_DB_WARMUP=0` keeps the old load-on-first-request behavior). `/health`
+reports its state under `vector_db`; requests that arrive while it is loading wait
+for that load instead of starting another one.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypeVar
 
+import anyio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from llm_model.env import load_repo_dotenv
@@ -47,11 +65,18 @@ from llm_model.summaries_annotator import (
     annotate_single_paragraph_summary,
     annotate_whole_summary_from_per_paragraph,
 )
-from llm_model.text_segmentation import TextSegmenter, VisualizableTextSegmenter
+from llm_model.text_segmentation import TextSegmenter, VisualizableTextSegmenter, get_default_session_cache
+from llm_model.text_segmentation.matrix_payload import (
+    encode_similarity_matrix,
+    prepare_similarity_matrix,
+    similarity_matrix_bytes,
+)
+from llm_model.embedding_cache import get_default_embedding_cache
 from llm_model.ollama_client import embed as ollama_embed
-from llm_model.ollama_client import OllamaConfig, OllamaError, list_local_models
+from llm_model.ollama_client import OllamaConfig, OllamaError, aclose_async_client, list_local_models
 from llm_model.vector_database import FairyVectorDB, VectorDBPaths
 from llm_model.vector_database.db import QueryConfig, VectorDBNotBuiltError
+from llm_model.vector_database.result_cache import get_default_detect_result_cache
 
 # Import visualization processing functions
 import sys
@@ -77,6 +102,22 @@ load_repo_dotenv()
 
 
 _VECTOR_DB: Optional[FairyVectorDB] = None
+_VECTOR_DB_LOCK = threading.Lock()
+
+# Readiness of the vector DB, reported by /health.
+# status: not_loaded | loading | ready | unavailable
+_VECTOR_DB_STATE: Dict[str, Any] = {
+    "status": "not_loaded",
+    "error": None,
+    "load_s": None,
+    "warmup": None,
+    "warmup_s": None,
+}
+
+_WARMUP_TEXT = (
+    "Once upon a time a poor miller had a beautiful daughter. The king promised to marry her "
+    "if she could spin straw into gold, and a little man came to help her three times."
+)
 
 # Cached set of local Ollama model names (from GET /api/tags).
 _OLLAMA_MODELS: Optional[set[str]] = None
@@ -126,46 +167,69 @@ def _get_vector_db() -> FairyVectorDB:
     if _VECTOR_DB is not None:
         return _VECTOR_DB
 
-    # Allow overriding the store directory (defaults to llm_model/vector_database/store)
-    store_dir = _env("VECTOR_DB_DIR", "")
-    paths = VectorDBPaths(root_dir=Path(store_dir)) if store_dir else None
-
-    db = FairyVectorDB(paths=paths)
-    db.load()
-    _VECTOR_DB = db
-    return db
-
-
-def _format_atu_label(meta: Dict[str, Any]) -> str:
-    num = (meta.get("atu_number") or "").strip()
-    title = (meta.get("title") or "").strip()
-    l1 = (meta.get("level_1_category") or "").strip()
-    l2 = (meta.get("level_2_category") or "").strip()
-    l3 = (meta.get("level_3_category") or "").strip()
-    rng = (meta.get("category_range") or "").strip()
-
-    parts = [p for p in [l1, l2, l3] if p]
-    path = " > ".join(parts)
-    if rng:
-        path = f"{path} ({rng})" if path else f"({rng})"
-
-    core = f"ATU {num}: {title}" if title else f"ATU {num}"
-    return f"{core} ({path})" if path else core
-
+    # Serialize loads: a request arriving during the startup load waits for it.
+    with _VECTOR_DB_LOCK:
+        if _VECTOR_DB is not None:
+            return _VECTOR_DB
+
+        # Allow overriding the store directory (defaults to llm_model/vector_database/store)
+        store_dir = _env("VECTOR_DB_DIR", "")
+        paths = VectorDBPaths(root_dir=Path(store_dir)) if store_dir else None
+
+        # Collections whose HNSW index is not loaded (searched with quantized/exact vectors)
+        skip_hnsw = [c.strip() for c in _env("VECTOR_DB_SKIP_HNSW", "").split(",") if c.strip()]
+
+        _VECTOR_DB_STATE.update(status="loading", error=None)
+        start = time.perf_counter()
+        try:
+            db = FairyVectorDB(paths=paths, result_cache=get_default_detect_result_cache())
+            db.load(skip_hnsw=skip_hnsw)
+        except Exception as exc:
+            _VECTOR_DB_STATE.update(status="unavailable", error=str(exc))
+            raise
+        _VECTOR_DB_STATE.update(status="ready", load_s=round(time.perf_counter() - start, 3))
+        _VECTOR_DB = db
+        return db
+
+
+def _warm_up_vector_db() -> None:
+    """Load the vector DB, then run one detection to load the embedding model in Ollama.
+
+    Runs in a background thread at startup; failures are logged and reported by /health.
+    The warm-up bypasses the embedding cache, otherwise a cached warm-up text would
+    never reach Ollama.
+    """
 
-def _format_motif_label(meta: Dict[str, Any]) -> str:
-    code = (meta.get("code") or "").strip()
-    motif = (meta.get("motif") or "").strip()
-    chapter = (meta.get("chapter") or "").strip()
-    d1 = (meta.get("division1") or "").strip()
-    d2 = (meta.get("division2") or "").strip()
-    d3 = (meta.get("division3") or "").strip()
+    try:
+        db = _get_vector_db()
+    except Exception as exc:
+        logger.warning("Vector DB not loaded at startup: %s", exc)
+        return
+    logger.info("Vector DB loaded in %.2fs", _VECTOR_DB_STATE["load_s"])
 
-    path_parts = [p for p in [chapter, d1, d2, d3] if p]
-    path = " > ".join(path_parts)
+    embedding_model = _env("OLLAMA_EMBEDDING_MODEL", "qwen3-embedding:4b")
+    if _OLLAMA_MODELS is not None and embedding_model not in _OLLAMA_MODELS:
+        _VECTOR_DB_STATE.update(warmup="skipped")
+        return
 
-    core = f"Motif {code}: {motif}" if motif else f"Motif {code}"
-    return f"{core} ({path})" if path else core
+    _VECTOR_DB_STATE.update(warmup="running")
+    start = time.perf_counter()
+    try:
+        db.detect(
+            text=_WARMUP_TEXT,
+            config=QueryConfig(
+                ollama_base_url=_env("OLLAMA_BASE_URL", "http://localhost:11434"),
+                embedding_model=embedding_model,
+                search_mode=_env("VECTOR_DB_SEARCH_MODE", "auto"),
+                use_embedding_cache=False,
+            ),
+        )
+    except Exception as exc:
+        _VECTOR_DB_STATE.update(warmup="failed")
+        logger.warning("Vector DB warm-up query failed: %s", exc)
+        return
+    _VECTOR_DB_STATE.update(warmup="done", warmup_s=round(time.perf_counter() - start, 3))
+    logger.info("Vector DB warm-up query took %.2fs", _VECTOR_DB_STATE["warmup_s"])
 
 
 def _env(name: str, default: str) -> str:
@@ -194,6 +258,87 @@ def _env_float(name: str, default: float) -> float:
         return float(default)
 
 
+_T = TypeVar("_T")
+
+_LLM_LIMITER: Optional[anyio.CapacityLimiter] = None
+
+
+def _llm_limiter() -> anyio.CapacityLimiter:
+    global _LLM_LIMITER
+    if _LLM_LIMITER is None:
+        _LLM_LIMITER = anyio.CapacityLimiter(max(1, _env_int("BACKEND_LLM_WORKERS", 16)))
+    return _LLM_LIMITER
+
+
+async def _run_blocking(func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Run a blocking (LLM/embedding) call in a worker thread off the event loop."""
+
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_llm_limiter())
+
+
+_STREAM_TASKS: "set[asyncio.Task[None]]" = set()
+
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_annotation(
+    func: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    *,
+    to_response: Callable[[Any], BaseModel],
+    upstream_errors: tuple,
+) -> StreamingResponse:
+    """Run an annotator with `on_token` and relay its output as Server-Sent Events.
+
+    Events, in order:
+    - `start`: sent immediately (`{}`)
+    - `token`: `{"text": <raw model output delta>}`, zero or more
+    - `result`: the same JSON body the non-streaming endpoint returns, or
+      `error`: `{"status": 502|500, "detail": str}`
+    """
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[tuple[str, Any]]" = asyncio.Queue()
+
+    def on_token(text: str) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, ("token", text))
+
+    async def produce() -> None:
+        try:
+            result = await _run_blocking(func, on_token=on_token, **kwargs)
+            final = ("result", to_response(result).model_dump())
+        except upstream_errors as exc:
+            final = ("error", {"status": 502, "detail": str(exc)})
+        except Exception as exc:  # noqa: BLE001 - reported to the client as an SSE error event
+            logger.exception("Streaming annotation failed")
+            final = ("error", {"status": 500, "detail": str(exc)})
+        await queue.put(final)
+
+    async def events():
+        # Keep a strong reference: if the client disconnects, the worker thread
+        # cannot be interrupted and the task finishes in the background.
+        task = asyncio.create_task(produce())
+        _STREAM_TASKS.add(task)
+        task.add_done_callback(_STREAM_TASKS.discard)
+
+        yield _sse_event("start", {})
+        while True:
+            kind, data = await queue.get()
+            if kind == "token":
+                yield _sse_event("token", {"text": data})
+                continue
+            yield _sse_event(kind, data)
+            break
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _build_llm_config(*, provider: Optional[str], model: Optional[str], thinking: Optional[bool]) -> LLMConfig:
     provider_final = (provider or _env("LLM_PROVIDER", "ollama")).strip().lower()
     thinking_final = bool(thinking) if thinking is not None else _env_bool("LLM_THINKING", False)
@@ -389,6 +534,7 @@ class MotifAtuDetectResponse(BaseModel):
     atu: List[MotifAtuDetectItem]
     motifs: List[MotifAtuDetectItem]
     chunks: int
+    cached: bool = False
 
 
 class TextSegmentationRequest(BaseModel):
@@ -407,6 +553,17 @@ class TextSegmentationRequest(BaseModel):
     min_seg_size: int = Field(3, ge=1, le=20, description="Minimum segment size for GraphSegSM")
     # Optional reference boundaries for evaluation
     reference_boundaries: Optional[List[int]] = Field(None, description="Ground truth boundaries for evaluation")
+    # Similarity matrix payload (visualization)
+    matrix_format: Literal["json", "float16_base64", "float32_base64", "none"] = Field(
+        "json",
+        description="Similarity matrix encoding: nested JSON lists, base64 little-endian float16/float32, or omitted",
+    )
+    matrix_max_size: Optional[int] = Field(
+        None, ge=2, description="Downsample the matrix (block average) to at most this many rows"
+    )
+    matrix_band: Optional[int] = Field(
+        None, ge=0, description="Only send the diagonals 0..matrix_band as an (n, matrix_band + 1) array"
+    )
 
 
 class TextSegmentationResponse(BaseModel):
@@ -455,7 +612,7 @@ class GeminiModelsResponse(BaseModel):
 
 
 @app.get("/api/gemini/models", response_model=GeminiModelsResponse)
-def gemini_models() -> GeminiModelsResponse:
+async def gemini_models() -> GeminiModelsResponse:
     """List Gemini models available to the configured API key.
 
     This is proxied via backend to avoid exposing GEMINI_API_KEY in the browser.
@@ -468,7 +625,7 @@ def gemini_models() -> GeminiModelsResponse:
     from llm_model.gemini_client import GeminiError, list_models
 
     try:
-        raw_models = list_models(api_key=api_key, timeout_s=10.0)
+        raw_models = await _run_blocking(list_models, api_key=api_key, timeout_s=10.0)
     except GeminiError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -540,34 +697,43 @@ def _on_startup() -> None:
                 embedding_model,
             )
 
+    if _env_bool("VECTOR_DB_WARMUP", True):
+        threading.Thread(target=_warm_up_vector_db, name="vector-db-warmup", daemon=True).start()
+
 
 @app.on_event("shutdown")
-def _on_shutdown() -> None:
+async def _on_shutdown() -> None:
     logger.info("Backend shutting down")
+    await aclose_async_client()
 
 
 @app.get("/health")
-def health() -> Dict[str, str]:
-    return {"status": "ok"}
+async def health() -> Dict[str, Any]:
+    vector_db = dict(_VECTOR_DB_STATE)
+    vector_db["ready"] = vector_db["status"] == "ready"
+    return {"status": "ok", "vector_db": vector_db}
+
+
+def _annotate_v2_args(req: AnnotateRequest) -> Dict[str, Any]:
+    llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
+    return dict(
+        text=req.text,
+        reference_uri=req.reference_uri,
+        culture=req.culture,
+        language=req.language,
+        source_type=req.source_type,
+        existing_annotation=req.existing_annotation,
+        mode=req.mode,
+        config=AnnotatorConfig(llm=llm_cfg),
+    )
 
 
 @app.post("/api/annotate/v2", response_model=AnnotateResponse)
-def annotate_v2(req: AnnotateRequest) -> AnnotateResponse:
+async def annotate_v2(req: AnnotateRequest) -> AnnotateResponse:
     """Generate a v2 JSON annotation from raw text."""
 
-    llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
-
     try:
-        annotation = annotate_text_v2(
-            text=req.text,
-            reference_uri=req.reference_uri,
-            culture=req.culture,
-            language=req.language,
-            source_type=req.source_type,
-            existing_annotation=req.existing_annotation,
-            mode=req.mode,  # type: ignore
-            config=AnnotatorConfig(llm=llm_cfg),
-        )
+        annotation = await _run_blocking(annotate_text_v2, **_annotate_v2_args(req))
     except AnnotationError as exc:
         # Return a clean 502 for "model upstream" errors.
         raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -575,8 +741,32 @@ def annotate_v2(req: AnnotateRequest) -> AnnotateResponse:
     return AnnotateResponse(ok=True, annotation=annotation)
 
 
+@app.post("/api/annotate/v2/stream")
+async def annotate_v2_stream(req: AnnotateRequest) -> StreamingResponse:
+    """SSE variant of `/api/annotate/v2` (see `_stream_annotation` for the events)."""
+
+    return _stream_annotation(
+        annotate_text_v2,
+        _annotate_v2_args(req),
+        to_response=lambda annotation: AnnotateResponse(ok=True, annotation=annotation),
+        upstream_errors=(AnnotationError,),
+    )
+
+
+def _annotate_characters_args(req: CharacterAnnotateRequest) -> Dict[str, Any]:
+    llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
+    return dict(
+        text=req.text,
+        culture=req.culture,
+        existing_characters=req.existing_characters,
+        mode=req.mode,
+        additional_prompt=req.additional_prompt,
+        config=CharacterAnnotatorConfig(llm=llm_cfg),
+    )
+
+
 @app.post("/api/annotate/characters", response_model=CharacterAnnotateResponse)
-def annotate_characters_endpoint(req: CharacterAnnotateRequest) -> CharacterAnnotateResponse:
+async def annotate_characters_endpoint(req: CharacterAnnotateRequest) -> CharacterAnnotateResponse:
     """Extract character archetypes for the Characters tab.
 
     Returns a `motif` object with keys:
@@ -585,17 +775,8 @@ def annotate_characters_endpoint(req: CharacterAnnotateRequest) -> CharacterAnno
     - obstacle_thrower: [string]
     """
 
-    llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
-
     try:
-        result = annotate_characters(
-            text=req.text,
-            culture=req.culture,
-            existing_characters=req.existing_characters,
-            mode=req.mode,  # type: ignore
-            additional_prompt=req.additional_prompt,
-            config=CharacterAnnotatorConfig(llm=llm_cfg),
-        )
+        result = await _run_blocking(annotate_characters, **_annotate_characters_args(req))
     except CharacterAnnotationError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -603,33 +784,60 @@ def annotate_characters_endpoint(req: CharacterAnnotateRequest) -> CharacterAnno
     return CharacterAnnotateResponse(ok=True, motif=result)
 
 
-@app.post("/api/annotate/narrative", response_model=NarrativeAnnotateResponse)
-def annotate_narrative_endpoint(req: NarrativeAnnotateRequest) -> NarrativeAnnotateResponse:
-    """Extract or refine a single narrative event."""
+@app.post("/api/annotate/characters/stream")
+async def annotate_characters_stream(req: CharacterAnnotateRequest) -> StreamingResponse:
+    """SSE variant of `/api/annotate/characters`."""
+
+    return _stream_annotation(
+        annotate_characters,
+        _annotate_characters_args(req),
+        to_response=lambda result: CharacterAnnotateResponse(ok=True, motif=result),
+        upstream_errors=(CharacterAnnotationError,),
+    )
 
+
+def _annotate_narrative_args(req: NarrativeAnnotateRequest) -> Dict[str, Any]:
     llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
+    return dict(
+        narrative_id=req.narrative_id,
+        text_span=req.text_span,
+        narrative_text=req.narrative_text,
+        character_list=req.character_list,
+        culture=req.culture,
+        existing_event=req.existing_event,
+        history_events=req.history_events,
+        mode=req.mode,
+        additional_prompt=req.additional_prompt,
+        config=NarrativeAnnotatorConfig(llm=llm_cfg),
+    )
+
+
+@app.post("/api/annotate/narrative", response_model=NarrativeAnnotateResponse)
+async def annotate_narrative_endpoint(req: NarrativeAnnotateRequest) -> NarrativeAnnotateResponse:
+    """Extract or refine a single narrative event."""
 
     try:
-        result = annotate_narrative_event(
-            narrative_id=req.narrative_id,
-            text_span=req.text_span,
-            narrative_text=req.narrative_text,
-            character_list=req.character_list,
-            culture=req.culture,
-            existing_event=req.existing_event,
-            history_events=req.history_events,
-            mode=req.mode,  # type: ignore
-            additional_prompt=req.additional_prompt,
-            config=NarrativeAnnotatorConfig(llm=llm_cfg),
-        )
+        result = await _run_blocking(annotate_narrative_event, **_annotate_narrative_args(req))
     except NarrativeAnnotationError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
     return NarrativeAnnotateResponse(ok=True, event=result)
 
 
+@app.post("/api/annotate/narrative/stream")
+async def annotate_narrative_stream(req: NarrativeAnnotateRequest) -> StreamingResponse:
+    """SSE variant of `/api/annotate/narrative`."""
+
+    return _stream_annotation(
+        annotate_narrative_event,
+        _annotate_narrative_args(req),
+        to_response=lambda result: NarrativeAnnotateResponse(ok=True, event=result),
+        upstream_errors=(NarrativeAnnotationError,),
+    )
+
+
 @app.post("/api/narrative/auto_segment", response_model=NarrativeAutoSegmentResponse)
-def auto_segment_narrative_endpoint(req: NarrativeAutoSegmentRequest) -> NarrativeAutoSegmentResponse:
+async def auto_segment_narrative_endpoint(req: NarrativeAutoSegmentRequest) -> NarrativeAutoSegmentResponse:
     """Auto-segment a story into coherent narrative spans for later event annotation."""
 
     if not isinstance(req.text, str) or not req.text.strip():
@@ -639,7 +847,8 @@ def auto_segment_narrative_endpoint(req: NarrativeAutoSegmentRequest) -> Narrati
 
     # Fail fast when embeddings are required.
     if req.mode == "embedding_assisted":
-        _ensure_ollama_model_available(
+        await _run_blocking(
+            _ensure_ollama_model_available,
             model_name=req.embedding_model or default_embedding_model,
             purpose="embedding-assisted narrative segmentation",
         )
@@ -652,7 +861,8 @@ def auto_segment_narrative_endpoint(req: NarrativeAutoSegmentRequest) -> Narrati
     )
 
     try:
-        events = auto_segment_to_empty_narratives(
+        events = await _run_blocking(
+            auto_segment_to_empty_narratives,
             text=req.text,
             culture=req.culture,
             mode=req.mode,
@@ -665,13 +875,14 @@ def auto_segment_narrative_endpoint(req: NarrativeAutoSegmentRequest) -> Narrati
 
 
 @app.post("/api/annotate/summaries", response_model=SummariesAnnotateResponse)
-def annotate_summaries_endpoint(req: SummariesAnnotateRequest) -> SummariesAnnotateResponse:
+async def annotate_summaries_endpoint(req: SummariesAnnotateRequest) -> SummariesAnnotateResponse:
     """Generate per-paragraph summaries + whole-story summary for the Summaries tab."""
 
     llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
 
     try:
-        result = annotate_summaries(
+        result = await _run_blocking(
+            annotate_summaries,
             text=req.text,
             language=req.language,
             config=SummariesAnnotatorConfig(llm=llm_cfg),
@@ -687,13 +898,14 @@ def annotate_summaries_endpoint(req: SummariesAnnotateRequest) -> SummariesAnnot
 
 
 @app.post("/api/annotate/summaries/paragraph", response_model=SummaryParagraphResponse)
-def annotate_summary_paragraph_endpoint(req: SummaryParagraphRequest) -> SummaryParagraphResponse:
+async def annotate_summary_paragraph_endpoint(req: SummaryParagraphRequest) -> SummaryParagraphResponse:
     """Generate a summary for one paragraph (used for incremental UI updates)."""
 
     llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
 
     try:
-        text = annotate_single_paragraph_summary(
+        text = await _run_blocking(
+            annotate_single_paragraph_summary,
             index=req.index,
             paragraph=req.paragraph,
             language=req.language,
@@ -706,14 +918,15 @@ def annotate_summary_paragraph_endpoint(req: SummaryParagraphRequest) -> Summary
 
 
 @app.post("/api/annotate/summaries/whole", response_model=SummaryWholeResponse)
-def annotate_summary_whole_endpoint(req: SummaryWholeRequest) -> SummaryWholeResponse:
+async def annotate_summary_whole_endpoint(req: SummaryWholeRequest) -> SummaryWholeResponse:
     """Generate a whole-story summary from per-paragraph summaries."""
 
     llm_cfg = _build_llm_config(provider=req.provider, model=req.model, thinking=req.thinking)
 
     try:
         per = req.per_section or req.per_paragraph or {}
-        whole = annotate_whole_summary_from_per_paragraph(
+        whole = await _run_blocking(
+            annotate_whole_summary_from_per_paragraph,
             per_paragraph=per,
             language=req.language,
             config=SummariesAnnotatorConfig(llm=llm_cfg),
@@ -725,7 +938,7 @@ def annotate_summary_whole_endpoint(req: SummaryWholeRequest) -> SummaryWholeRes
 
 
 @app.post("/api/detect/motif_atu", response_model=MotifAtuDetectResponse)
-def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
+async def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
     """Detect likely ATU types and motifs using the local vector database."""
 
     if not isinstance(req.text, str) or not req.text.strip():
@@ -734,19 +947,21 @@ def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
     base_url = _env("OLLAMA_BASE_URL", "http://localhost:11434")
     embedding_model = req.embedding_model or _env("OLLAMA_EMBEDDING_MODEL", "qwen3-embedding:4b")
 
-    _ensure_ollama_model_available(
+    await _run_blocking(
+        _ensure_ollama_model_available,
         model_name=embedding_model,
         purpose="motif/ATU retrieval embeddings",
     )
 
     try:
-        db = _get_vector_db()
-        result = db.detect(
+        db = await _run_blocking(_get_vector_db)
+        result = await db.adetect(
             text=req.text,
             config=QueryConfig(
                 ollama_base_url=base_url,
                 embedding_model=embedding_model,
                 top_k=int(req.top_k),
+                search_mode=_env("VECTOR_DB_SEARCH_MODE", "auto"),
             ),
         )
     except VectorDBNotBuiltError as exc:
@@ -756,8 +971,7 @@ def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
 
     atu_items: List[MotifAtuDetectItem] = []
     for item in (result.get("atu") or [])[:10]:
-        meta = item.get("metadata") or {}
-        label = _format_atu_label(meta)
+        label = str(item.get("label") or "")
         atu_items.append(
             MotifAtuDetectItem(
                 label=label,
@@ -768,8 +982,7 @@ def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
 
     motif_items: List[MotifAtuDetectItem] = []
     for item in (result.get("motifs") or [])[:10]:
-        meta = item.get("metadata") or {}
-        label = _format_motif_label(meta)
+        label = str(item.get("label") or "")
         motif_items.append(
             MotifAtuDetectItem(
                 label=label,
@@ -783,12 +996,59 @@ def detect_motif_atu(req: MotifAtuDetectRequest) -> MotifAtuDetectResponse:
         atu=atu_items,
         motifs=motif_items,
         chunks=int(result.get("chunks") or 0),
+        cached=bool(result.get("cached")),
     )
 
 
 @app.post("/api/text/segment", response_model=TextSegmentationResponse)
-def segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
+async def segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
     """Segment text into semantic segments using LLM embeddings."""
+
+    # Embedding + segmentation are blocking (embedding calls and NumPy work).
+    return await _run_blocking(_segment_text, req)
+
+
+@app.post("/api/text/segment/matrix")
+async def segment_text_matrix(req: TextSegmentationRequest) -> Response:
+    """Similarity matrix of a segmentation request as raw little-endian bytes.
+
+    Uses `matrix_max_size` / `matrix_band` like `/api/text/segment` and float16
+    unless `matrix_format` is `float32_base64`. Shape and layout are returned in
+    `X-Matrix-*` headers. Embeddings come from the segmentation session cache,
+    so calling this after `/api/text/segment` does not embed the text again.
+    """
+
+    return await _run_blocking(_segment_text_matrix, req)
+
+
+def _segment_text_matrix(req: TextSegmentationRequest) -> Response:
+    _, viz_data = _run_text_segmentation(req)
+    sim_matrix = viz_data.get("similarity_matrix")
+    if sim_matrix is None:
+        raise HTTPException(status_code=400, detail="Text has too few sentences for a similarity matrix")
+
+    data, meta = similarity_matrix_bytes(
+        sim_matrix,
+        dtype="float32" if req.matrix_format == "float32_base64" else "float16",
+        max_size=req.matrix_max_size,
+        band=req.matrix_band,
+    )
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={
+            "X-Matrix-Dtype": meta["dtype"],
+            "X-Matrix-Layout": meta["layout"],
+            "X-Matrix-Shape": ",".join(str(d) for d in meta["shape"]),
+            "X-Matrix-N": str(meta["n"]),
+            "X-Matrix-Step": str(meta["step"]),
+            "Access-Control-Expose-Headers": "X-Matrix-Dtype, X-Matrix-Layout, X-Matrix-Shape, X-Matrix-N, X-Matrix-Step",
+        },
+    )
+
+
+def _run_text_segmentation(req: TextSegmentationRequest) -> Tuple[Any, Dict[str, Any]]:
+    """Segment the request's text; returns (SegmentationResult, visualization data)."""
     
     if not isinstance(req.text, str) or not req.text.strip():
         raise HTTPException(status_code=400, detail="`text` must be a non-empty string")
@@ -807,6 +1067,7 @@ def segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
             base_url=base_url,
             model=embedding_model,
             inputs=texts,
+            cache=get_default_embedding_cache(),
         )
     
     try:
@@ -820,6 +1081,8 @@ def segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
             filter_width=req.filter_width,
             threshold=req.threshold,
             min_seg_size=req.min_seg_size,
+            # Reuse embeddings + similarity matrix when only clustering parameters change
+            session_cache=get_default_session_cache(),
         )
         
         # Perform segmentation
@@ -831,18 +1094,40 @@ def segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
         )
         
         # Get visualization data
-        viz_data = segmenter.get_visualization_data()
-        
+        return result, segmenter.get_visualization_data()
+    except Exception as exc:
+        logger.exception("Text segmentation failed")
+        raise HTTPException(status_code=500, detail=f"Segmentation failed: {str(exc)}") from exc
+
+
+def _segment_text(req: TextSegmentationRequest) -> TextSegmentationResponse:
+    
+    result, viz_data = _run_text_segmentation(req)
+    
+    try:
         # Convert numpy arrays and networkx graphs to JSON-serializable format
         import numpy as np
         
         visualization = {}
-        if "similarity_matrix" in viz_data:
+        if "similarity_matrix" in viz_data and req.matrix_format != "none":
             sim_matrix = viz_data["similarity_matrix"]
-            if isinstance(sim_matrix, np.ndarray):
+            if req.matrix_format in ("float16_base64", "float32_base64"):
+                visualization["similarity_matrix_encoded"] = encode_similarity_matrix(
+                    sim_matrix,
+                    dtype="float32" if req.matrix_format == "float32_base64" else "float16",
+                    max_size=req.matrix_max_size,
+                    band=req.matrix_band,
+                )
+            elif req.matrix_max_size is not None or req.matrix_band is not None:
+                values, meta = prepare_similarity_matrix(
+                    sim_matrix, max_size=req.matrix_max_size, band=req.matrix_band
+                )
+                visualization["similarity_matrix"] = values.tolist()
+                visualization["similarity_matrix_layout"] = meta
+            elif isinstance(sim_matrix, np.ndarray):
                 visualization["similarity_matrix"] = sim_matrix.tolist()
             else:
-                visualization["similarity_matrix"] = sim_matrix
+                visualization["similarity_matrix"] = np.asarray(sim_matrix).tolist()
         
         if req.algorithm == "magnetic":
             if "raw_forces" in viz_data:
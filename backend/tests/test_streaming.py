@@ -0,0 +1,68 @@
+"""Tests for the SSE annotation endpoints (annotator replaced by a fake)."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from llm_model.annotator import AnnotationError
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client():
+    # No `with`: startup hooks (Ollama probe, vector DB warm-up) are not run.
+    return TestClient(main.app)
+
+
+def stream(client, monkeypatch, annotate):
+    monkeypatch.setattr(main, "annotate_text_v2", annotate)
+    resp = client.post("/api/annotate/v2/stream", json={"text": "狼来了", "provider": "ollama"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    return parse_events(resp.text)
+
+
+def test_events_are_start_tokens_result(client, monkeypatch):
+    def annotate(*, text, on_token, **kwargs):
+        for delta in ('{"title": ', '"狼来了"}'):
+            on_token(delta)
+        return {"metadata": {"title": text}}
+
+    events = stream(client, monkeypatch, annotate)
+
+    assert events == [
+        ("start", {}),
+        ("token", {"text": '{"title": '}),
+        ("token", {"text": '"狼来了"}'}),
+        ("result", {"ok": True, "annotation": {"metadata": {"title": "狼来了"}}}),
+    ]
+
+
+def test_upstream_error_is_502(client, monkeypatch):
+    def annotate(*, on_token, **kwargs):
+        on_token("{")
+        raise AnnotationError("model returned invalid JSON")
+
+    events = stream(client, monkeypatch, annotate)
+
+    assert [kind for kind, _ in events] == ["start", "token", "error"]
+    assert events[-1][1] == {"status": 502, "detail": "model returned invalid JSON"}
+
+
+def test_unexpected_error_is_500(client, monkeypatch):
+    def annotate(**kwargs):
+        raise KeyError("boom")
+
+    events = stream(client, monkeypatch, annotate)
+
+    assert [kind for kind, _ in events] == ["start", "error"]
+    assert events[-1][1]["status"] == 500
@@ -0,0 +1,150 @@
+"""Tests for the background vector DB load and its /health state (loader replaced by a fake)."""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+
+
+class FakeVectorDB:
+    """Stands in for FairyVectorDB; `load()` blocks until the test releases it."""
+
+    release = threading.Event()
+    loads = 0
+    error = None
+    detects = []
+
+    def __init__(self, *, paths=None, result_cache=None):
+        self.paths = paths
+
+    def load(self, *, skip_hnsw=()):
+        type(self).loads += 1
+        assert type(self).release.wait(5)
+        if type(self).error is not None:
+            raise type(self).error
+
+    def detect(self, *, text, config):
+        type(self).detects.append(config)
+        return {}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = type("Fake", (FakeVectorDB,), {"release": threading.Event(), "loads": 0, "error": None, "detects": []})
+    monkeypatch.setattr(main, "FairyVectorDB", fake)
+    monkeypatch.setattr(main, "get_default_detect_result_cache", lambda: None)
+    monkeypatch.setattr(main, "_OLLAMA_MODELS", None)
+    monkeypatch.setattr(main, "_VECTOR_DB", None)
+    monkeypatch.setattr(
+        main,
+        "_VECTOR_DB_STATE",
+        {"status": "not_loaded", "error": None, "load_s": None, "warmup": None, "warmup_s": None},
+    )
+    monkeypatch.delenv("VECTOR_DB_DIR", raising=False)
+    monkeypatch.delenv("VECTOR_DB_SKIP_HNSW", raising=False)
+    yield fake
+    fake.release.set()
+
+
+@pytest.fixture
+def client():
+    # No `with`: startup hooks are not run, the tests start the warm-up themselves.
+    return TestClient(main.app)
+
+
+def health(client):
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    return resp.json()["vector_db"]
+
+
+def wait_for_status(client, status):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        state = health(client)
+        if state["status"] == status:
+            return state
+        time.sleep(0.01)
+    raise AssertionError(f"vector DB never reached {status!r}: {state}")
+
+
+def start_warmup():
+    thread = threading.Thread(target=main._warm_up_vector_db, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_loading_then_ready(client, fake_db):
+    assert health(client)["status"] == "not_loaded"
+    warmup = start_warmup()
+
+    state = wait_for_status(client, "loading")
+    assert state["ready"] is False
+
+    fake_db.release.set()
+    warmup.join(5)
+
+    state = health(client)
+    assert state["status"] == "ready" and state["ready"] is True
+    assert state["error"] is None
+    assert isinstance(state["load_s"], float)
+    assert state["warmup"] == "done"
+    assert len(fake_db.detects) == 1
+    assert fake_db.detects[0].use_embedding_cache is False
+
+
+def test_loading_then_unavailable(client, fake_db):
+    fake_db.error = FileNotFoundError("no vector store")
+    warmup = start_warmup()
+    wait_for_status(client, "loading")
+
+    fake_db.release.set()
+    warmup.join(5)
+
+    state = health(client)
+    assert state["status"] == "unavailable" and state["ready"] is False
+    assert state["error"] == "no vector store"
+    assert state["warmup"] is None
+    assert main._VECTOR_DB is None
+
+    # A later request retries the load.
+    fake_db.error = None
+    assert isinstance(main._get_vector_db(), fake_db)
+    assert fake_db.loads == 2
+    assert health(client)["status"] == "ready"
+
+
+def test_warmup_query_skipped_without_embedding_model(client, fake_db, monkeypatch):
+    monkeypatch.setattr(main, "_OLLAMA_MODELS", {"qwen3:8b"})
+    fake_db.release.set()
+
+    start_warmup().join(5)
+
+    state = health(client)
+    assert state["status"] == "ready"
+    assert state["warmup"] == "skipped"
+    assert fake_db.detects == []
+
+
+def test_concurrent_requests_wait_for_the_single_load(client, fake_db):
+    warmup = start_warmup()
+    wait_for_status(client, "loading")
+
+    results = []
+    requests = [threading.Thread(target=lambda: results.append(main._get_vector_db())) for _ in range(4)]
+    for t in requests:
+        t.start()
+    time.sleep(0.05)
+    assert results == []  # blocked behind the startup load
+
+    fake_db.release.set()
+    warmup.join(5)
+    for t in requests:
+        t.join(5)
+
+    assert fake_db.loads == 1
+    assert len(results) == 4
+    assert all(db is main._VECTOR_DB for db in results)
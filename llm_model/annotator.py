@@ -7,7 +7,7 @@ CLI scripts, notebooks, etc.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Callable, Dict, Literal, Optional
 
 from .json_utils import loads_strict_json
 from .llm_router import LLMConfig, LLMRouterError, chat
@@ -35,6 +35,7 @@ def annotate_text_v2(
     existing_annotation: Optional[Dict[str, Any]] = None,
     mode: Literal["supplement", "modify", "recreate"] = "recreate",
     config: AnnotatorConfig = AnnotatorConfig(),
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     """Generate an auto-annotation compatible with the frontend v2 JSON shape.
 
@@ -53,6 +54,8 @@ def annotate_text_v2(
             - "modify": Update and improve existing fields, may add new ones
             - "recreate": Ignore existing annotation, generate from scratch
         config: Annotator configuration.
+        on_token: Optional callback receiving raw model output deltas as they stream
+                  (used by the SSE endpoints). The return value is unchanged.
 
     Note: We keep `source_info.text_content` equal to the provided text.
 
@@ -79,7 +82,7 @@ def annotate_text_v2(
     ]
 
     try:
-        raw = chat(config=config.llm, messages=messages, response_format_json=True)
+        raw = chat(config=config.llm, messages=messages, response_format_json=True, on_token=on_token)
     except LLMRouterError as exc:
         raise AnnotationError(str(exc)) from exc
 
@@ -0,0 +1,78 @@
+"""Benchmark: concurrent chats through the Hugging Face client, unbatched vs batched.
+
+Sends `--requests` chat requests from `--concurrency` threads to
+`huggingface_client.chat`, once with batching off and once with
+`LLM_BATCH_MAX_SIZE=--batch-size`, and prints throughput plus the batcher's
+queue/latency metrics. Runs on CPU with a tiny chat model, e.g.:
+
+  python -m llm_model.batching_benchmark --model HuggingFaceTB/SmolLM2-135M-Instruct \\
+    --requests 32 --concurrency 16 --batch-size 8 --max-new-tokens 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from .huggingface_client import HuggingFaceConfig, chat
+from .local_batching import batching_stats
+
+
+def _run(config: HuggingFaceConfig, *, requests: int, concurrency: int) -> Dict[str, float]:
+    def one(i: int) -> str:
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": f"Name one animal that appears in fairy tale number {i}."},
+        ]
+        return chat(config=config, messages=messages, response_format_json=False)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "requests_per_s": requests / elapsed if elapsed else 0.0}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.batching_benchmark",
+        description="Compare unbatched and dynamically batched local generation under concurrent load.",
+    )
+    parser.add_argument("--model", default="HuggingFaceTB/SmolLM2-135M-Instruct", help="Hugging Face model id")
+    parser.add_argument("--device", default="cpu", help="cpu, cuda, or auto")
+    parser.add_argument("--requests", type=int, default=32, help="Total chat requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads")
+    parser.add_argument("--batch-size", type=int, default=8, help="LLM_BATCH_MAX_SIZE for the batched run")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="LLM_BATCH_MAX_WAIT_MS for the batched run")
+    parser.add_argument("--max-new-tokens", type=int, default=16, help="Tokens generated per request")
+    args = parser.parse_args(argv)
+
+    # Greedy decoding, and no prefix reuse, so both runs do the same work.
+    config = HuggingFaceConfig(model=args.model, device=args.device, temperature=0.0, max_new_tokens=args.max_new_tokens)
+    os.environ["LLM_PREFIX_CACHE_ENTRIES"] = "0"
+
+    # Load the model and warm up before timing.
+    os.environ["LLM_BATCH_MAX_SIZE"] = "1"
+    _run(config, requests=2, concurrency=1)
+
+    rows = {"unbatched": _run(config, requests=args.requests, concurrency=args.concurrency)}
+
+    os.environ["LLM_BATCH_MAX_SIZE"] = str(max(2, args.batch_size))
+    os.environ["LLM_BATCH_MAX_WAIT_MS"] = str(args.max_wait_ms)
+    rows["batched"] = _run(config, requests=args.requests, concurrency=args.concurrency)
+
+    print(f"{'mode':<10} {'seconds':>9} {'req/s':>8}")
+    for name, r in rows.items():
+        print(f"{name:<10} {r['seconds']:>9.2f} {r['requests_per_s']:>8.2f}")
+    for key, stats in batching_stats().items():
+        print(f"\n{key}")
+        for name, value in stats.items():
+            print(f"  {name:<18} {value:.1f}" if isinstance(value, float) else f"  {name:<18} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
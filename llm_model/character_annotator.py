@@ -12,7 +12,7 @@ annotations (motifs, narrative events, etc.).
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 from .character_prompts import SYSTEM_PROMPT_CHARACTERS, build_character_user_prompt
 from .json_utils import loads_strict_json
@@ -38,6 +38,7 @@ def annotate_characters(
     mode: Literal["supplement", "modify", "recreate"] = "recreate",
     additional_prompt: Optional[str] = None,
     config: CharacterAnnotatorConfig = CharacterAnnotatorConfig(),
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     """Extract character archetypes (and simple helper/obstacle hints) from text.
 
@@ -51,6 +52,8 @@ def annotate_characters(
             - "recreate": Ignore existing annotation, generate from scratch
         additional_prompt: Optional additional instructions from the user.
         config: Character annotator configuration.
+        on_token: Optional callback receiving raw model output deltas as they stream
+                  (used by the SSE endpoints). The return value is unchanged.
 
     Returns a dict:
       {
@@ -82,7 +85,7 @@ def annotate_characters(
     ]
 
     try:
-        raw = chat(config=config.llm, messages=messages, response_format_json=True)
+        raw = chat(config=config.llm, messages=messages, response_format_json=True, on_token=on_token)
     except LLMRouterError as exc:
         raise CharacterAnnotationError(str(exc)) from exc
 
@@ -0,0 +1,284 @@
+"""Content-addressed embedding cache shared by all `embed()` callers.
+
+Embedding the same text twice with the same model always yields the same vector,
+yet the vector DB build, `/api/detect/motif_atu` and `/api/text/segment` used to
+re-embed identical inputs on every call. This module stores vectors keyed on
+(model, instruction, text hash) in two layers:
+
+- an in-memory LRU (fast path for repeated requests in one process)
+- an optional SQLite file (survives restarts, shared between CLI runs and the backend)
+
+Vectors are stored as packed float32 so the disk layer stays compact and the
+module does not depend on numpy. The memory layer holds tuples and every lookup
+returns fresh lists, so callers may modify the vectors they get.
+
+Configuration (environment):
+- `EMBEDDING_CACHE=0` disables the default cache entirely.
+- `EMBEDDING_CACHE_PATH` overrides the SQLite file location
+  (default: `~/.cache/fairytales_research/embeddings.sqlite`).
+- `EMBEDDING_CACHE_MEMORY_ITEMS` sets the LRU capacity (default: 4096).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# SQLite limits the number of bound parameters per statement (999 on older builds).
+_SQL_BATCH = 500
+
+
+def embedding_cache_key(*, model: str, text: str, instruction: Optional[str] = None) -> str:
+    """Return the content-addressed key for one embedding input."""
+
+    h = hashlib.sha256()
+    h.update((model or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update((instruction or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update((text or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    arr = array("f")
+    arr.frombytes(blob)
+    return arr.tolist()
+
+
+class EmbeddingCache:
+    """Two-level (LRU memory + optional SQLite) embedding cache.
+
+    The object is safe to share between threads (FastAPI serves requests in a
+    threadpool); all state is guarded by a single lock.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, max_memory_items: int = 4096):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file for the persistent layer. If None, the cache is memory-only.
+            max_memory_items: Capacity of the in-memory LRU layer (0 disables it).
+        """
+        self.path = Path(path) if path is not None else None
+        self.max_memory_items = max(0, int(max_memory_items))
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                  key TEXT PRIMARY KEY,
+                  model TEXT NOT NULL,
+                  dim INTEGER NOT NULL,
+                  vector BLOB NOT NULL
+                );
+                """
+            )
+            conn.commit()
+            self._conn = conn
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+
+    def get_many(
+        self,
+        *,
+        model: str,
+        texts: Sequence[str],
+        instruction: Optional[str] = None,
+    ) -> List[Optional[List[float]]]:
+        """Bulk lookup. Returns a list aligned with `texts` (None for misses)."""
+
+        keys = [embedding_cache_key(model=model, text=t, instruction=instruction) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(keys)
+
+        with self._lock:
+            pending: Dict[str, List[int]] = {}
+            for i, key in enumerate(keys):
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    out[i] = list(vec)
+                    self.memory_hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+
+            if pending and self._conn is not None:
+                found = self._disk_get(list(pending.keys()))
+                for key, vec in found.items():
+                    for i in pending.pop(key):
+                        out[i] = list(vec)
+                        self.disk_hits += 1
+                    self._remember(key, vec)
+
+            n_missing = sum(len(v) for v in pending.values())
+            self.misses += n_missing
+            self.hits += len(keys) - n_missing
+
+        return out
+
+    def get(self, *, model: str, text: str, instruction: Optional[str] = None) -> Optional[List[float]]:
+        return self.get_many(model=model, texts=[text], instruction=instruction)[0]
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, Tuple[float, ...]]:
+        assert self._conn is not None
+        found: Dict[str, Tuple[float, ...]] = {}
+        for start in range(0, len(keys), _SQL_BATCH):
+            part = keys[start : start + _SQL_BATCH]
+            placeholders = ",".join(["?"] * len(part))
+            cur = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                part,
+            )
+            for key, blob in cur.fetchall():
+                found[str(key)] = tuple(_unpack(blob))
+        return found
+
+    # -------------------------
+    # Store
+    # -------------------------
+
+    def put_many(
+        self,
+        *,
+        model: str,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        instruction: Optional[str] = None,
+    ) -> None:
+        """Store vectors aligned with `texts`."""
+
+        if len(texts) != len(vectors):
+            raise ValueError("texts and vectors length mismatch")
+        if not texts:
+            return
+
+        rows = []
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                key = embedding_cache_key(model=model, text=text, instruction=instruction)
+                values = tuple(float(x) for x in vec)
+                self._remember(key, values)
+                rows.append((key, model, len(values), _pack(values)))
+
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings(key, model, dim, vector) VALUES(?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+
+    def put(
+        self,
+        *,
+        model: str,
+        text: str,
+        vector: Sequence[float],
+        instruction: Optional[str] = None,
+    ) -> None:
+        self.put_many(model=model, texts=[text], vectors=[vector], instruction=instruction)
+
+    def _remember(self, key: str, vector: Tuple[float, ...]) -> None:
+        # Caller holds the lock.
+        if self.max_memory_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # -------------------------
+    # Housekeeping
+    # -------------------------
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and layer sizes."""
+
+        with self._lock:
+            disk_items = 0
+            if self._conn is not None:
+                row = self._conn.execute("SELECT COUNT(1) FROM embeddings").fetchone()
+                disk_items = int(row[0]) if row else 0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "memory_items": len(self._memory),
+                "disk_items": disk_items,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.memory_hits = 0
+            self.disk_hits = 0
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_DEFAULT_CACHE: Optional[EmbeddingCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def default_cache_path() -> Path:
+    raw = os.getenv("EMBEDDING_CACHE_PATH")
+    if raw:
+        return Path(raw).expanduser()
+    return Path.home() / ".cache" / "fairytales_research" / "embeddings.sqlite"
+
+
+def get_default_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or None when disabled via env."""
+
+    global _DEFAULT_CACHE
+
+    raw = (os.getenv("EMBEDDING_CACHE") or "1").strip().lower()
+    if raw in ("0", "false", "no", "n", "off"):
+        return None
+
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            try:
+                max_items = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS") or 4096)
+            except ValueError:
+                max_items = 4096
+            try:
+                _DEFAULT_CACHE = EmbeddingCache(default_cache_path(), max_memory_items=max_items)
+            except (OSError, sqlite3.Error):
+                # Read-only home or similar: still dedupe within this process.
+                _DEFAULT_CACHE = EmbeddingCache(None, max_memory_items=max_items)
+        return _DEFAULT_CACHE
@@ -8,6 +8,7 @@ from __future__ import annotations
 import os
 from typing import List, Sequence
 
+from llm_model.embedding_cache import get_default_embedding_cache
 from llm_model.env import load_repo_dotenv
 from llm_model.ollama_client import embed as ollama_embed
 
@@ -24,6 +25,7 @@ def generate_embeddings(
     base_url: str | None = None,
     instruction: str | None = None,
     timeout_s: float = 600.0,
+    use_cache: bool = True,
 ) -> List[List[float]]:
     """Generate embeddings for a list of texts.
 
@@ -40,6 +42,8 @@ def generate_embeddings(
                     embeddings. If provided, each input will be formatted as "{instruction} {text}".
                     Useful for models that support instruction-based embeddings.
         timeout_s: Timeout in seconds for API requests.
+        use_cache: Reuse vectors from the shared embedding cache
+                   (see `llm_model.embedding_cache`).
 
     Returns:
         List of embedding vectors, one per input text. Each vector is a list of floats.
@@ -68,6 +72,7 @@ def generate_embeddings(
             inputs=texts,
             instruction=instruction,
             timeout_s=timeout_s,
+            cache=get_default_embedding_cache() if use_cache else None,
         )
     else:
         raise ValueError(f"Unsupported embedding provider: {provider}. Supported: 'ollama'")
@@ -2,7 +2,11 @@
 
 from typing import Dict, Any, List, Optional, Tuple
 from llm_model.evaluation.base_evaluator import BaseEvaluator
-from llm_model.evaluation.utils import text_to_sentence_indices, char_position_to_sentence_index
+from llm_model.evaluation.utils import (
+    char_position_to_sentence_index,
+    extract_text_spans,
+    text_to_sentence_indices,
+)
 from llm_model.text_segmentation.boundary_metric import BoundarySegmentationMetric
 from llm_model.evaluation.metrics import calculate_overlap_ratio
 
@@ -133,23 +137,8 @@ class TextSpanEvaluator(BaseEvaluator):
         return summary
     
     def _extract_text_spans(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        从 JSON v3 数据中提取 text_span 列表
-        
-        注意：只提取有效的 text_span（start 和 end 都不为 None）
-        如果 text_span 为 null 或字段缺失，则跳过该事件
-        """
-        events = data.get("narrative_events", [])
-        spans = []
-        for event in events:
-            text_span = event.get("text_span")
-            # 检查 text_span 是否为有效值（不是 null，且 start 和 end 都存在）
-            if text_span is not None and isinstance(text_span, dict):
-                start = text_span.get("start")
-                end = text_span.get("end")
-                if start is not None and end is not None:
-                    spans.append(text_span)
-        return spans
+        """从 JSON v3 数据中提取有效的 text_span 列表（见 utils.extract_text_spans）"""
+        return extract_text_spans(data)
     
     def _spans_to_boundaries(
         self,
@@ -263,4 +263,24 @@ def char_position_to_sentence_index(
         return len(sentence_indices) - 1
     
     # 如果位置在所有句子之前，返回 0
-    return 0 if sentence_indices else -1
\ No newline at end of file
+    return 0 if sentence_indices else -1
+
+
+def extract_text_spans(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    从 JSON v3 数据中提取 text_span 列表
+    
+    注意：只提取有效的 text_span（start 和 end 都不为 None）
+    如果 text_span 为 null 或字段缺失，则跳过该事件
+    """
+    events = data.get("narrative_events", [])
+    spans = []
+    for event in events:
+        text_span = event.get("text_span")
+        # 检查 text_span 是否为有效值（不是 null，且 start 和 end 都存在）
+        if text_span is not None and isinstance(text_span, dict):
+            start = text_span.get("start")
+            end = text_span.get("end")
+            if start is not None and end is not None:
+                spans.append(text_span)
+    return spans
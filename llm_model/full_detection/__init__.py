@@ -6,7 +6,7 @@ story segments and generate structured narrative events following the v3 JSON sc
 
 from __future__ import annotations
 
-from .pipeline import PipelineError, build_pipeline, run_pipeline, run_pipeline_batch
+from .pipeline import PipelineError, build_pipeline, get_pipeline, run_pipeline, run_pipeline_batch
 from .pipeline_state import PipelineState
 from .story_processor import (
     StoryProcessingError,
@@ -19,6 +19,7 @@ __all__ = [
     "PipelineError",
     "PipelineState",
     "build_pipeline",
+    "get_pipeline",
     "run_pipeline",
     "run_pipeline_batch",
     "StoryProcessingError",
@@ -0,0 +1,128 @@
+"""Microbenchmark: per-span pipeline overhead, rebuilt vs compiled once.
+
+Runs the full detection pipeline on synthetic spans with the LLM call replaced by
+an instant canned response, so the timings contain only the orchestration cost
+(building LangChain runnables, state copies, prompt construction). Compares
+
+- `rebuild`: compile the pipeline for every span (what `run_pipeline` used to do)
+- `cached`: `get_pipeline` once, summary passed in the input state
+
+Usage:
+  python -m llm_model.full_detection.benchmark --spans 200 --include-instrument
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+from ..llm_router import LLMConfig
+from .pipeline import _compile_pipeline, clear_pipeline_cache, get_pipeline
+from .pipeline_state import PipelineState
+from .prompts import (
+    SYSTEM_PROMPT_ACTION,
+    SYSTEM_PROMPT_CHARACTER_RECOGNITION,
+    SYSTEM_PROMPT_EVENT_TYPE,
+    SYSTEM_PROMPT_INSTRUMENT,
+    SYSTEM_PROMPT_RELATIONSHIP,
+    SYSTEM_PROMPT_STAC,
+)
+
+_CANNED = {
+    SYSTEM_PROMPT_CHARACTER_RECOGNITION: {"doers": ["Hero"], "receivers": ["Villain"], "new_characters": []},
+    SYSTEM_PROMPT_INSTRUMENT: {"instrument": "sword"},
+    SYSTEM_PROMPT_RELATIONSHIP: {
+        "relationships": [{"agent": "Hero", "target": "Villain", "relationship_level1": "Adversarial"}]
+    },
+    SYSTEM_PROMPT_ACTION: {"category": "conflict", "type": "attack", "context": "", "status": "", "function": ""},
+    SYSTEM_PROMPT_STAC: {"situation": "s", "task": "t", "action": "a", "consequence": "c"},
+    SYSTEM_PROMPT_EVENT_TYPE: {"event_type": "STRUGGLE", "description_general": "g", "description_specific": ""},
+}
+
+
+def _fake_chat(*, config: LLMConfig, messages: List[Dict[str, str]], **kwargs: Any) -> str:
+    return json.dumps(_CANNED.get(messages[0]["content"], {}))
+
+
+def _states(n_spans: int) -> List[Dict[str, Any]]:
+    characters = [{"name": "Hero", "alias": "", "archetype": "Hero"}, {"name": "Villain", "alias": "", "archetype": "Villain"}]
+    return [
+        PipelineState(
+            story_text="The hero met the villain.",
+            text_span={"start": 0, "end": 25, "text": f"Span {i}: the hero fights the villain."},
+            characters=characters,
+            time_order=i,
+            event_id=f"event-{i}",
+            summary=f"Summary {i}",
+        ).to_dict()
+        for i in range(1, n_spans + 1)
+    ]
+
+
+def _run(get: Callable[[], Any], states: List[Dict[str, Any]]) -> Dict[str, float]:
+    build_ms: List[float] = []
+    total_ms: List[float] = []
+    for state in states:
+        t0 = time.perf_counter()
+        pipeline = get()
+        t1 = time.perf_counter()
+        pipeline.invoke(state)
+        t2 = time.perf_counter()
+        build_ms.append((t1 - t0) * 1000.0)
+        total_ms.append((t2 - t0) * 1000.0)
+    return {
+        "build_ms_per_span": statistics.mean(build_ms),
+        "total_ms_per_span": statistics.mean(total_ms),
+        "median_total_ms": statistics.median(total_ms),
+    }
+
+
+def run_benchmark(*, spans: int, include_instrument: bool, parallel_steps: bool) -> Dict[str, Dict[str, float]]:
+    """Time both strategies on `spans` synthetic spans; returns ms figures per strategy."""
+
+    config = LLMConfig()
+    states = _states(spans)
+    options = dict(include_instrument=include_instrument, parallel_steps=parallel_steps)
+
+    with patch("llm_model.full_detection.chains.chat", _fake_chat):
+        # Warm up imports and LangChain internals before timing
+        _run(lambda: _compile_pipeline(config, include_instrument, None, parallel_steps, False), states[:3])
+
+        rebuild = _run(lambda: _compile_pipeline(config, include_instrument, None, parallel_steps, False), states)
+        clear_pipeline_cache()
+        cached = _run(lambda: get_pipeline(config, **options), states)
+    return {"rebuild": rebuild, "cached": cached}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.full_detection.benchmark",
+        description="Measure per-span pipeline overhead with and without pipeline reuse (LLM calls stubbed).",
+    )
+    parser.add_argument("--spans", type=int, default=200, help="Number of synthetic spans")
+    parser.add_argument("--include-instrument", action="store_true", help="Include instrument recognition")
+    parser.add_argument("--parallel-steps", action="store_true", help="Use the concurrent step graph")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(
+        spans=max(1, int(args.spans)),
+        include_instrument=bool(args.include_instrument),
+        parallel_steps=bool(args.parallel_steps),
+    )
+
+    print(f"{'strategy':<8} {'build ms/span':>14} {'total ms/span':>14} {'median ms':>10}")
+    for name, r in rows.items():
+        print(
+            f"{name:<8} {r['build_ms_per_span']:>14.3f} {r['total_ms_per_span']:>14.3f} {r['median_total_ms']:>10.3f}"
+        )
+    saved = rows["rebuild"]["total_ms_per_span"] - rows["cached"]["total_ms_per_span"]
+    print(f"Overhead removed per span: {saved:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,7 +10,7 @@ from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.exceptions import OutputParserException
 
 from ..json_utils import loads_strict_json, JsonExtractionError
-from ..llm_router import LLMConfig, chat
+from ..llm_router import LLMConfig, LLMReplayMissError, chat
 from .pipeline_state import PipelineState
 from .prompts import (
     SYSTEM_PROMPT_ACTION,
@@ -71,6 +71,9 @@ class LLMRouterRunnable(Runnable):
         
         try:
             raw = chat(config=self.llm_config, messages=messages, response_format_json=self.response_format_json)
+        except LLMReplayMissError:
+            # A replay run must not silently continue with empty results.
+            raise
         except Exception as chat_error:
             print(f"\n{'='*60}", flush=True)
             print(f"ERROR: LLM chat call failed", flush=True)
@@ -191,6 +194,8 @@ class LLMRouterRunnable(Runnable):
 def create_summary_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for story segment summarization."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_SUMMARY, llm_config, response_format_json=False)
+    
     def summary_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract summary from state."""
         # Convert dict to PipelineState for access
@@ -204,7 +209,6 @@ def create_summary_chain(llm_config: LLMConfig) -> Runnable:
             story_context=None  # Always None to save memory (summary generation doesn't need full context)
         )
 
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_SUMMARY, llm_config, response_format_json=False)
         result = llm_runnable.invoke({"prompt": prompt})
 
         # Summary returns plain text (not JSON)
@@ -228,6 +232,8 @@ def create_summary_chain(llm_config: LLMConfig) -> Runnable:
 def create_character_recognition_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for character recognition and extraction."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_CHARACTER_RECOGNITION, llm_config)
+    
     def char_recognition_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract characters (doers/receivers) and update character list."""
         # Convert dict to PipelineState for access
@@ -243,9 +249,10 @@ def create_character_recognition_chain(llm_config: LLMConfig) -> Runnable:
             story_context=None  # Always None to save memory and speed up inference
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_CHARACTER_RECOGNITION, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: Character recognition failed: {e}", flush=True)
             result = {}  # Use empty dict as fallback
@@ -290,6 +297,8 @@ def create_character_recognition_chain(llm_config: LLMConfig) -> Runnable:
 def create_instrument_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for instrument recognition."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_INSTRUMENT, llm_config)
+    
     def instrument_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract instrument from state."""
         # Convert dict to PipelineState for access
@@ -304,9 +313,10 @@ def create_instrument_chain(llm_config: LLMConfig) -> Runnable:
             doers=s.doers or []
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_INSTRUMENT, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: Instrument recognition LLM call failed: {e}", flush=True)
             result = {}
@@ -327,6 +337,8 @@ def create_instrument_chain(llm_config: LLMConfig) -> Runnable:
 def create_relationship_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for relationship deduction."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_RELATIONSHIP, llm_config)
+    
     def relationship_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract relationships from state."""
         # Convert dict to PipelineState for access
@@ -349,9 +361,10 @@ def create_relationship_chain(llm_config: LLMConfig) -> Runnable:
             story_context=None  # Always None to save memory and speed up inference
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_RELATIONSHIP, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: Relationship deduction LLM call failed: {e}", flush=True)
             result = {}
@@ -372,6 +385,8 @@ def create_relationship_chain(llm_config: LLMConfig) -> Runnable:
 def create_action_category_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for action category deduction."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_ACTION, llm_config)
+    
     def action_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract action layer from state."""
         # Convert dict to PipelineState for access
@@ -388,9 +403,10 @@ def create_action_category_chain(llm_config: LLMConfig) -> Runnable:
             instrument=s.instrument or ""
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_ACTION, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: Action category LLM call failed: {e}", flush=True)
             result = {}
@@ -419,6 +435,8 @@ def create_stac_chain(llm_config: LLMConfig) -> Runnable:
     with the existing stac_analyzer module for consistency.
     """
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_STAC, llm_config)
+    
     def stac_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract STAC analysis from state."""
         # Convert dict to PipelineState for access
@@ -433,9 +451,10 @@ def create_stac_chain(llm_config: LLMConfig) -> Runnable:
             story_context=None  # Always None to save memory and speed up inference
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_STAC, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: STAC analysis LLM call failed: {e}", flush=True)
             result = {}
@@ -459,6 +478,8 @@ def create_stac_chain(llm_config: LLMConfig) -> Runnable:
 def create_event_type_chain(llm_config: LLMConfig) -> Runnable:
     """Create chain for event type classification (Propp functions)."""
     
+    llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_EVENT_TYPE, llm_config)
+    
     def event_type_func(state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract event type and description from state."""
         # Convert dict to PipelineState for access
@@ -473,9 +494,10 @@ def create_event_type_chain(llm_config: LLMConfig) -> Runnable:
             stac=s.stac or {}
         )
         
-        llm_runnable = LLMRouterRunnable(SYSTEM_PROMPT_EVENT_TYPE, llm_config)
         try:
             result = llm_runnable.invoke({"prompt": prompt})
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"Warning: Event type classification LLM call failed: {e}", flush=True)
             result = {}
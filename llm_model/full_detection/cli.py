@@ -41,6 +41,10 @@ Example:
     --story-file /path/to/story.txt \
     --text "Once upon a time..." \
     --debug
+
+  # Record LLM responses once, then re-run from the recording without any LLM calls
+  python -m llm_model.full_detection.cli --story-file story.txt --spans-json spans.json --llm-cache on
+  python -m llm_model.full_detection.cli --story-file story.txt --spans-json spans.json --llm-cache replay
 """
 
 from __future__ import annotations
@@ -59,6 +63,7 @@ from llm_model.env import load_repo_dotenv
 from llm_model.full_detection import PipelineError, run_pipeline, run_pipeline_batch
 from llm_model.gemini_client import GeminiConfig
 from llm_model.huggingface_client import HuggingFaceConfig
+from llm_model.llm_response_cache import configure_llm_response_cache
 from llm_model.llm_router import LLMConfig
 from llm_model.ollama_client import OllamaConfig
 from llm_model.unsloth_client import UnslothConfig
@@ -348,6 +353,29 @@ def main() -> int:
         action="store_true",
         help="Include instrument recognition (Step 2.5)",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Spans processed concurrently in batch mode (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--parallel-steps",
+        action="store_true",
+        help="Run independent steps of a span concurrently (e.g. STAC alongside character recognition)",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=["off", "on", "replay"],
+        default=os.getenv("LLM_RESPONSE_CACHE") or "off",
+        help="LLM response cache: on = reuse/store responses, replay = cached responses only (default: off)",
+    )
+    parser.add_argument(
+        "--llm-cache-path",
+        type=Path,
+        default=None,
+        help="SQLite file for the LLM response cache (default: LLM_RESPONSE_CACHE_PATH or ~/.cache/fairytales_research)",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -445,9 +473,12 @@ def main() -> int:
             top_p=float(os.getenv("UNSLOTH_TOP_P", "0.8")),
             top_k=int(os.getenv("UNSLOTH_TOP_K", "20")),
             max_new_tokens=int(os.getenv("UNSLOTH_MAX_NEW_TOKENS", "512")),
+            max_seq_length=int(os.getenv("UNSLOTH_MAX_SEQ_LENGTH", "4096")),
         ),
     )
     
+    response_cache = configure_llm_response_cache(args.llm_cache, args.llm_cache_path)
+
     # Run pipeline
     try:
         if mode == "single":
@@ -476,10 +507,12 @@ def main() -> int:
                     time_order=args.time_order,
                     llm_config=llm_config,
                     include_instrument=args.include_instrument,
+                    parallel_steps=args.parallel_steps,
                 )
                 output_data = {
                     "narrative_event": result["narrative_event"],
                     "updated_characters": result["updated_characters"],
+                    "step_timings": result["step_timings"],
                 }
         else:
             print(f"Running pipeline on {len(text_spans)} text spans...", file=sys.stderr)
@@ -489,6 +522,8 @@ def main() -> int:
                 characters=characters,
                 llm_config=llm_config,
                 include_instrument=args.include_instrument,
+                max_workers=args.max_workers,
+                parallel_steps=args.parallel_steps,
             )
             output_data = {
                 "narrative_events": result["narrative_events"],
@@ -496,6 +531,14 @@ def main() -> int:
                 "results": result["results"],
             }
         
+        if response_cache is not None:
+            stats = response_cache.stats()
+            print(
+                f"LLM response cache ({stats['mode']}): {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} stored",
+                file=sys.stderr,
+            )
+        
         # Output results
         output_json = json.dumps(output_data, ensure_ascii=False, indent=2)
         
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 from uuid import uuid4
 
-from ..llm_router import LLMConfig
+from ..llm_router import LLMConfig, LLMReplayMissError
 from .chains import (
     create_action_category_chain,
     create_character_recognition_chain,
@@ -17,6 +21,7 @@ from .chains import (
     create_summary_chain,
 )
 from .pipeline_state import PipelineState
+from .utils import reconcile_span_characters
 
 
 class PipelineError(RuntimeError):
@@ -24,78 +29,172 @@ class PipelineError(RuntimeError):
     pass
 
 
-def build_pipeline(
-    llm_config: LLMConfig,
-    include_instrument: bool = False,
-    summary: Optional[str] = None,
-    steps_only: Optional[List[str]] = None,
-) -> Any:
-    """Build the full detection pipeline.
+# State keys written by each step; used to merge the outputs of concurrent branches
+_STEP_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary",),
+    "character": ("doers", "receivers", "updated_characters", "characters", "target_type", "object_type"),
+    "instrument": ("instrument",),
+    "relationship": ("relationships",),
+    "action": ("action_layer",),
+    "stac": ("stac",),
+    "event_type": ("event_type", "description"),
+}
+
+
+def _timed_step(name: str, chain: Any) -> Any:
+    """Wrap a chain so that its wall time is recorded in state['step_timings'][name]."""
+    from langchain_core.runnables import RunnableLambda
+    
+    def run(state: Dict[str, Any]) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        state_dict = chain.invoke(state)
+        timings = dict(state_dict.get("step_timings") or {})
+        timings[name] = time.perf_counter() - start_time
+        state_dict["step_timings"] = timings
+        return state_dict
+    
+    return RunnableLambda(run)
+
+
+def _sequence(chains: List[Any]) -> Any:
+    """Compose chains with `|` (chains must be non-empty)."""
+    pipeline = chains[0]
+    for chain in chains[1:]:
+        pipeline = pipeline | chain
+    return pipeline
+
+
+def _parallel(branches: Dict[str, Tuple[List[str], Any]]) -> Any:
+    """Run branches concurrently on the same input state and merge their outputs.
     
     Args:
-        llm_config: LLM configuration for all chains
-        include_instrument: Whether to include instrument recognition (Step 2.5)
-        summary: Optional pre-generated summary. If provided, skips summary generation step.
-        steps_only: Optional list of steps to run. If provided, only these steps will be executed.
-                    Valid steps: 'character', 'relationship', 'action', 'instrument', 'stac', 'event_type'.
-                    Example: ['character', 'action', 'relationship'] to run only these three steps.
-        
-    Returns:
-        Composed LangChain pipeline
+        branches: Maps a branch name to (step names in the branch, runnable).
+                  Each branch returns a full state dict; only the keys written by
+                  its own steps (see _STEP_OUTPUTS) are taken from it.
+    """
+    from langchain_core.runnables import RunnableLambda, RunnableParallel
+    
+    def merge(outputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        names = list(branches)
+        merged = dict(outputs[names[0]])
+        timings = dict(merged.get("step_timings") or {})
+        for name in names[1:]:
+            branch_state = outputs[name]
+            for step in branches[name][0]:
+                for key in _STEP_OUTPUTS[step]:
+                    merged[key] = branch_state.get(key)
+            timings.update(branch_state.get("step_timings") or {})
+        merged["step_timings"] = timings
+        return merged
+    
+    return RunnableParallel({name: runnable for name, (_, runnable) in branches.items()}) | RunnableLambda(merge)
+
+
+def _build_step_graph(chains: Dict[str, Any]) -> Any:
+    """Compose the per-span steps as a dependency graph.
+    
+    Dependencies:
+        character -> instrument -> {relationship, action}
+        stac -> event_type
+    The two branches are independent of each other, as are relationship and action,
+    so each group runs concurrently. Steps missing from `chains` are skipped.
     """
+    character_steps = [n for n in ("character", "instrument") if n in chains]
+    fan_out = [n for n in ("relationship", "action") if n in chains]
+    character_branch = [chains[n] for n in character_steps]
+    if len(fan_out) > 1:
+        character_branch.append(_parallel({n: ([n], chains[n]) for n in fan_out}))
+    else:
+        character_branch.extend(chains[n] for n in fan_out)
+    character_steps += fan_out
+    
+    stac_steps = [n for n in ("stac", "event_type") if n in chains]
+    
+    branches: Dict[str, Tuple[List[str], Any]] = {}
+    if character_branch:
+        branches["character"] = (character_steps, _sequence(character_branch))
+    if stac_steps:
+        branches["stac"] = (stac_steps, _sequence([chains[n] for n in stac_steps]))
+    
+    if len(branches) > 1:
+        return _parallel(branches)
+    if branches:
+        return next(iter(branches.values()))[1]
+    return None
+
+
+def _ensure_summary(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the input state, using an empty summary if none was given."""
+    if isinstance(state, PipelineState):
+        state_dict = state.to_dict()
+    else:
+        state_dict = state.copy()
+    if state_dict.get("summary") is None:
+        state_dict["summary"] = ""
+    return state_dict
+
+
+def _compile_pipeline(
+    llm_config: LLMConfig,
+    include_instrument: bool,
+    steps_only: Optional[FrozenSet[str]],
+    parallel_steps: bool,
+    generate_summary: bool,
+) -> Any:
+    """Compose the chains; the summary is read from (or generated into) the input state."""
     from langchain_core.runnables import RunnableLambda
     
     # Build individual chains
-    char_chain = create_character_recognition_chain(llm_config)
-    instrument_chain = create_instrument_chain(llm_config) if include_instrument else None
-    relationship_chain = create_relationship_chain(llm_config)
-    action_chain = create_action_category_chain(llm_config)
-    stac_chain = create_stac_chain(llm_config)
-    event_type_chain = create_event_type_chain(llm_config)
+    char_chain = _timed_step("character", create_character_recognition_chain(llm_config))
+    instrument_chain = _timed_step("instrument", create_instrument_chain(llm_config)) if include_instrument else None
+    relationship_chain = _timed_step("relationship", create_relationship_chain(llm_config))
+    action_chain = _timed_step("action", create_action_category_chain(llm_config))
+    stac_chain = _timed_step("stac", create_stac_chain(llm_config))
+    event_type_chain = _timed_step("event_type", create_event_type_chain(llm_config))
     finalize_chain = create_finalize_chain()
+    step_chains = {
+        "character": char_chain,
+        "instrument": instrument_chain,
+        "relationship": relationship_chain,
+        "action": action_chain,
+        "stac": stac_chain,
+        "event_type": event_type_chain,
+    }
     
     # If steps_only is specified, only run those steps
     if steps_only is not None:
-        # Convert to set for easier checking
-        steps_set = set(steps_only)
-        
-        # Start with summary injection
         # In steps_only mode, summary should be provided by the caller (e.g., run_pipeline_batch)
         # If not provided, use empty string (summary should be generated at batch level)
-        def inject_summary(state: Dict[str, Any]) -> Dict[str, Any]:
-            """Inject summary into state."""
-            if isinstance(state, PipelineState):
-                state_dict = state.to_dict()
-            else:
-                state_dict = state.copy()
-            # Use provided summary or empty string (should be set at batch level)
-            state_dict["summary"] = summary if summary is not None else ""
-            return state_dict
+        pipeline = RunnableLambda(_ensure_summary)
         
-        pipeline = RunnableLambda(inject_summary)
+        if parallel_steps:
+            graph = _build_step_graph({n: c for n, c in step_chains.items() if n in steps_only and c is not None})
+            if graph is not None:
+                pipeline = pipeline | graph
+            return pipeline | finalize_chain
         
         # Add character recognition if requested
-        if 'character' in steps_set:
+        if 'character' in steps_only:
             pipeline = pipeline | char_chain
         
         # Add relationship deduction if requested (depends on character)
-        if 'relationship' in steps_set:
+        if 'relationship' in steps_only:
             pipeline = pipeline | relationship_chain
         
         # Add action category if requested (depends on character)
-        if 'action' in steps_set:
+        if 'action' in steps_only:
             pipeline = pipeline | action_chain
         
         # Add instrument if requested (depends on character)
-        if 'instrument' in steps_set and instrument_chain:
+        if 'instrument' in steps_only and instrument_chain:
             pipeline = pipeline | instrument_chain
         
         # Add STAC analysis if requested
-        if 'stac' in steps_set:
+        if 'stac' in steps_only:
             pipeline = pipeline | stac_chain
         
         # Add event type if requested
-        if 'event_type' in steps_set:
+        if 'event_type' in steps_only:
             pipeline = pipeline | event_type_chain
         
         # Always finalize to produce narrative_event structure
@@ -105,21 +204,15 @@ def build_pipeline(
     
     # Original full pipeline logic
     # Compose pipeline
-    # If summary is provided, inject it directly; otherwise generate it
-    if summary is not None:
-        def inject_summary(state: Dict[str, Any]) -> Dict[str, Any]:
-            """Inject pre-generated summary into state."""
-            if isinstance(state, PipelineState):
-                state_dict = state.to_dict()
-            else:
-                state_dict = state.copy()
-            state_dict["summary"] = summary
-            return state_dict
-        
-        pipeline = RunnableLambda(inject_summary)
+    # Use the summary from the input state, or generate it
+    if generate_summary:
+        pipeline = _timed_step("summary", create_summary_chain(llm_config))
     else:
-        summary_chain = create_summary_chain(llm_config)
-        pipeline = summary_chain
+        pipeline = RunnableLambda(_ensure_summary)
+    
+    if parallel_steps:
+        graph = _build_step_graph({n: c for n, c in step_chains.items() if c is not None})
+        return pipeline | graph | finalize_chain
     
     # Character recognition (depends on summary)
     pipeline = pipeline | char_chain
@@ -146,6 +239,115 @@ def build_pipeline(
     return pipeline
 
 
+# Compiled pipelines, most recently used last
+_PIPELINE_CACHE: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+_PIPELINE_CACHE_SIZE = 32
+_PIPELINE_CACHE_LOCK = threading.Lock()
+
+
+def get_pipeline(
+    llm_config: LLMConfig,
+    include_instrument: bool = False,
+    steps_only: Optional[List[str]] = None,
+    parallel_steps: bool = False,
+    generate_summary: bool = False,
+) -> Any:
+    """Return a compiled pipeline, building it only on first use.
+    
+    Pipelines are cached per (llm_config, include_instrument, steps_only,
+    parallel_steps, generate_summary). They hold no per-span data: the summary,
+    characters and text span all come from the input state, so one pipeline
+    serves every span and every story, also from several threads at once.
+    
+    Args:
+        llm_config: LLM configuration for all chains
+        include_instrument: Whether to include instrument recognition (Step 2.5)
+        steps_only: Optional list of steps to run (see build_pipeline)
+        parallel_steps: Run independent steps concurrently (see build_pipeline)
+        generate_summary: Generate the summary as the first step. Otherwise the
+                          input state's 'summary' is used (empty if missing).
+                          Ignored when steps_only is given.
+        
+    Returns:
+        Composed LangChain pipeline taking a PipelineState dict
+    """
+    steps = frozenset(steps_only) if steps_only is not None else None
+    key = (llm_config, bool(include_instrument), steps, bool(parallel_steps), bool(generate_summary and steps is None))
+    
+    with _PIPELINE_CACHE_LOCK:
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is not None:
+            _PIPELINE_CACHE.move_to_end(key)
+            return pipeline
+    
+    pipeline = _compile_pipeline(llm_config, *key[1:])
+    
+    with _PIPELINE_CACHE_LOCK:
+        pipeline = _PIPELINE_CACHE.setdefault(key, pipeline)
+        _PIPELINE_CACHE.move_to_end(key)
+        while len(_PIPELINE_CACHE) > _PIPELINE_CACHE_SIZE:
+            _PIPELINE_CACHE.popitem(last=False)
+    return pipeline
+
+
+def clear_pipeline_cache() -> None:
+    """Drop all compiled pipelines (e.g. after changing prompts at runtime)."""
+    with _PIPELINE_CACHE_LOCK:
+        _PIPELINE_CACHE.clear()
+
+
+def build_pipeline(
+    llm_config: LLMConfig,
+    include_instrument: bool = False,
+    summary: Optional[str] = None,
+    steps_only: Optional[List[str]] = None,
+    parallel_steps: bool = False,
+) -> Any:
+    """Build the full detection pipeline.
+    
+    Args:
+        llm_config: LLM configuration for all chains
+        include_instrument: Whether to include instrument recognition (Step 2.5)
+        summary: Optional pre-generated summary. If provided, skips summary generation step.
+        steps_only: Optional list of steps to run. If provided, only these steps will be executed.
+                    Valid steps: 'character', 'relationship', 'action', 'instrument', 'stac', 'event_type'.
+                    Example: ['character', 'action', 'relationship'] to run only these three steps.
+        parallel_steps: If True, run independent steps concurrently (STAC/event type alongside
+                        character recognition, relationship alongside action) instead of one
+                        after another. Needs a provider that serves concurrent requests.
+        
+    Returns:
+        Composed LangChain pipeline. The output state has a 'step_timings' dict with the
+        wall time of every step in seconds.
+        
+    Note:
+        This binds `summary` to the returned pipeline. To process many spans, prefer
+        get_pipeline() and pass the summary in the input state (as run_pipeline does).
+    """
+    from langchain_core.runnables import RunnableLambda
+    
+    pipeline = get_pipeline(
+        llm_config,
+        include_instrument=include_instrument,
+        steps_only=steps_only,
+        parallel_steps=parallel_steps,
+        generate_summary=summary is None,
+    )
+    if summary is None:
+        return pipeline
+    
+    def inject_summary(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Inject pre-generated summary into state."""
+        if isinstance(state, PipelineState):
+            state_dict = state.to_dict()
+        else:
+            state_dict = state.copy()
+        state_dict["summary"] = summary
+        return state_dict
+    
+    return RunnableLambda(inject_summary) | pipeline
+
+
 def run_pipeline(
     story_text: str,
     text_span: Dict[str, Any],
@@ -156,6 +358,7 @@ def run_pipeline(
     include_instrument: bool = False,
     summary: Optional[str] = None,
     steps_only: Optional[List[str]] = None,
+    parallel_steps: bool = False,
 ) -> Dict[str, Any]:
     """Run the full detection pipeline.
     
@@ -171,10 +374,12 @@ def run_pipeline(
         steps_only: Optional list of steps to run. If provided, only these steps will be executed.
                     Valid steps: 'character', 'relationship', 'action', 'instrument', 'stac', 'event_type'.
                     Example: ['character', 'action', 'relationship'] to run only these three steps.
+        parallel_steps: Run independent steps concurrently (see build_pipeline)
         
     Returns:
         Dictionary with 'narrative_event' key containing the final structured event,
-        and 'updated_characters' key with the updated character list
+        'updated_characters' key with the updated character list, and 'step_timings'
+        with the wall time of each step plus the whole span ('total'), in seconds
         
     Raises:
         PipelineError: If pipeline execution fails
@@ -211,13 +416,23 @@ def run_pipeline(
     
     # Build and run pipeline
     try:
-        pipeline = build_pipeline(llm_config, include_instrument=include_instrument, summary=summary, steps_only=steps_only)
+        # The summary travels in the state, so the compiled pipeline is shared across spans
+        pipeline = get_pipeline(
+            llm_config,
+            include_instrument=include_instrument,
+            steps_only=steps_only,
+            parallel_steps=parallel_steps,
+            generate_summary=summary is None,
+        )
         
         # Convert state to dict for pipeline
         state_dict = initial_state.to_dict()
         
         # Run pipeline
+        start_time = time.perf_counter()
         result_dict = pipeline.invoke(state_dict)
+        step_timings = dict(result_dict.get("step_timings") or {})
+        step_timings["total"] = time.perf_counter() - start_time
         
         # Extract results
         narrative_event = result_dict.get("narrative_event")
@@ -229,6 +444,7 @@ def run_pipeline(
         return {
             "narrative_event": narrative_event,
             "updated_characters": updated_characters,
+            "step_timings": step_timings,
             "pipeline_state": result_dict,  # Full state for debugging
         }
         
@@ -236,6 +452,32 @@ def run_pipeline(
         raise PipelineError(f"Pipeline execution failed: {e}") from e
 
 
+def map_spans(
+    func: Callable[[int, Dict[str, Any]], Dict[str, Any]],
+    text_spans: List[Dict[str, Any]],
+    max_workers: int,
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception], float]]:
+    """Run func(idx, text_span) for every span on a bounded thread pool.
+    
+    Spans are numbered from 1 like time_order. Exceptions are captured per span
+    so one failing span does not cancel the others.
+    
+    Returns:
+        List of (result, error, elapsed_seconds) tuples in span order, regardless
+        of the order in which the workers finish
+    """
+    def call(idx: int, text_span: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Exception], float]:
+        start_time = time.time()
+        try:
+            return func(idx, text_span), None, time.time() - start_time
+        except Exception as e:
+            return None, e, time.time() - start_time
+    
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="span") as pool:
+        futures = [pool.submit(call, idx, text_span) for idx, text_span in enumerate(text_spans, start=1)]
+        return [future.result() for future in futures]
+
+
 def run_pipeline_batch(
     story_text: str,
     text_spans: List[Dict[str, Any]],
@@ -244,10 +486,16 @@ def run_pipeline_batch(
     include_instrument: bool = False,
     summary: Optional[str] = None,
     steps_only: Optional[List[str]] = None,
+    max_workers: int = 1,
+    parallel_steps: bool = False,
 ) -> Dict[str, Any]:
-    """Run pipeline for multiple text spans sequentially.
+    """Run pipeline for multiple text spans.
     
-    Characters list is updated incrementally as new characters are discovered.
+    With max_workers=1 the spans run sequentially and the characters list is
+    updated incrementally as new characters are discovered. With max_workers > 1
+    the spans run concurrently on a bounded thread pool, each starting from the
+    initial character list; their character lists are then merged in span order
+    (see reconcile_span_characters).
     
     Args:
         story_text: Full story text for context
@@ -260,6 +508,10 @@ def run_pipeline_batch(
         steps_only: Optional list of steps to run. If provided, only these steps will be executed.
                     Valid steps: 'character', 'relationship', 'action', 'instrument', 'stac', 'event_type'.
                     Example: ['character', 'action', 'relationship'] to run only these three steps.
+        max_workers: Number of spans processed concurrently (default: 1, sequential).
+                     Use values > 1 only with providers that serve concurrent requests
+                     (e.g. Ollama with OLLAMA_NUM_PARALLEL, Gemini).
+        parallel_steps: Run independent steps of each span concurrently (see build_pipeline)
         
     Returns:
         Dictionary with:
@@ -282,6 +534,8 @@ def run_pipeline_batch(
                 llm_config=llm_config,
             )
             print(f"[INFO] Story summary generated successfully (length: {len(summary)} chars).", flush=True)
+        except LLMReplayMissError:
+            raise
         except Exception as e:
             print(f"[WARNING] Failed to generate story summary: {e}. Continuing without summary.", flush=True)
             import traceback
@@ -294,6 +548,50 @@ def run_pipeline_batch(
     narrative_events = []
     results = []
     
+    if max_workers > 1 and len(text_spans) > 1:
+        print(f"[INFO] Processing {len(text_spans)} text span(s) with {max_workers} workers...", flush=True)
+        snapshot = list(current_characters)
+        
+        def run_span(idx: int, text_span: Dict[str, Any]) -> Dict[str, Any]:
+            return run_pipeline(
+                story_text=story_text,
+                text_span=text_span,
+                characters=snapshot,
+                time_order=idx,
+                llm_config=llm_config,
+                include_instrument=include_instrument,
+                summary=summary,
+                steps_only=steps_only,
+                parallel_steps=parallel_steps,
+            )
+        
+        outcomes = map_spans(run_span, text_spans, max_workers=max_workers)
+        for idx, (result, error, _elapsed) in enumerate(outcomes, start=1):
+            if error is not None:
+                results.append({
+                    "index": idx,
+                    "success": False,
+                    "error": str(error),
+                })
+                continue
+            
+            event, current_characters = reconcile_span_characters(
+                result["narrative_event"], result["updated_characters"], current_characters
+            )
+            narrative_events.append(event)
+            results.append({
+                "index": idx,
+                "success": True,
+                "narrative_event": event,
+                "step_timings": result.get("step_timings", {}),
+            })
+        
+        return {
+            "narrative_events": narrative_events,
+            "updated_characters": current_characters,
+            "results": results,
+        }
+    
     print(f"[INFO] Processing {len(text_spans)} text span(s)...", flush=True)
     
     for idx, text_span in enumerate(text_spans, start=1):
@@ -308,6 +606,7 @@ def run_pipeline_batch(
                 include_instrument=include_instrument,
                 summary=summary,  # Pass shared summary
                 steps_only=steps_only,  # Pass steps_only parameter
+                parallel_steps=parallel_steps,
             )
             
             # Update character list for next iteration
@@ -319,6 +618,7 @@ def run_pipeline_batch(
                 "index": idx,
                 "success": True,
                 "narrative_event": result["narrative_event"],
+                "step_timings": result.get("step_timings", {}),
             })
             
         except Exception as e:
@@ -50,6 +50,9 @@ class PipelineState:
     # Final output
     narrative_event: Optional[Dict[str, Any]] = None
     
+    # Wall time per step in seconds, e.g. {"character": 1.2, "stac": 0.9}
+    step_timings: Dict[str, float] = field(default_factory=dict)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert state to dictionary for easy serialization."""
         return {
@@ -71,4 +74,5 @@ class PipelineState:
             "event_type": self.event_type,
             "description": self.description,
             "narrative_event": self.narrative_event,
+            "step_timings": self.step_timings,
         }
@@ -0,0 +1,218 @@
+"""Benchmark: prompt tokens saved per story by prompt-prefix reuse.
+
+1. Records the exact chat messages the pipeline sends for every span of a story
+   (LLM calls answered with canned JSON, so no model is needed for this step).
+2. Estimates reuse offline: replays the prompts through a simulated prefix cache
+   with `--slots` entries (Ollama with OLLAMA_NUM_PARALLEL=n keeps n slots and
+   picks the one sharing the longest prefix), counting tokens with a Hugging Face
+   tokenizer (`--tokenizer`) or a rough word/CJK-character approximation.
+3. Optionally measures it on Ollama (`--ollama-model`): sends the recorded prompts
+   twice, once with a unique first line in every system prompt (no prefix can be
+   reused) and once unchanged, and compares the `prompt_eval_count` totals.
+
+Usage:
+  python -m llm_model.full_detection.prompt_cache_benchmark \\
+    --story-file datasets/.../story.txt --spans 12 --summary-file summary.txt \\
+    [--ollama-model qwen3:8b --ollama-base-url http://localhost:11434]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+from ..llm_router import LLMConfig
+from ..ollama_client import OllamaConfig, chat as ollama_chat, reset_usage_stats, usage_stats
+from ..prefix_kv_cache import common_prefix_length
+from .pipeline import run_pipeline_batch
+from .prompts import (
+    SYSTEM_PROMPT_ACTION,
+    SYSTEM_PROMPT_CHARACTER_RECOGNITION,
+    SYSTEM_PROMPT_EVENT_TYPE,
+    SYSTEM_PROMPT_INSTRUMENT,
+    SYSTEM_PROMPT_RELATIONSHIP,
+    SYSTEM_PROMPT_STAC,
+)
+
+_CANNED = {
+    SYSTEM_PROMPT_CHARACTER_RECOGNITION: {"doers": ["Hero"], "receivers": ["Villain"], "new_characters": []},
+    SYSTEM_PROMPT_INSTRUMENT: {"instrument": ""},
+    SYSTEM_PROMPT_RELATIONSHIP: {"relationships": []},
+    SYSTEM_PROMPT_ACTION: {"category": "physical", "type": "travel", "context": "", "status": "", "function": ""},
+    SYSTEM_PROMPT_STAC: {"situation": "s", "task": "t", "action": "a", "consequence": "c"},
+    SYSTEM_PROMPT_EVENT_TYPE: {"event_type": "OTHER", "description_general": "", "description_specific": ""},
+}
+
+_APPROX_TOKEN = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]|\w+|[^\w\s]", re.UNICODE)
+
+
+def _split_spans(story_text: str, n_spans: int) -> List[Dict[str, object]]:
+    """Split the story into `n_spans` consecutive spans of roughly equal length."""
+
+    n = max(1, min(int(n_spans), len(story_text)))
+    size = -(-len(story_text) // n)
+    return [
+        {"start": start, "end": min(start + size, len(story_text)), "text": story_text[start : start + size]}
+        for start in range(0, len(story_text), size)
+    ]
+
+
+def record_prompts(
+    *,
+    story_text: str,
+    text_spans: List[Dict[str, object]],
+    summary: str,
+    include_instrument: bool = False,
+) -> List[List[Dict[str, str]]]:
+    """Return the message lists the pipeline sends for the spans, in call order."""
+
+    recorded: List[List[Dict[str, str]]] = []
+
+    def fake_chat(*, config: LLMConfig, messages: List[Dict[str, str]], **kwargs: object) -> str:
+        recorded.append([dict(m) for m in messages])
+        return json.dumps(_CANNED.get(messages[0]["content"], {}))
+
+    with patch("llm_model.full_detection.chains.chat", fake_chat):
+        run_pipeline_batch(
+            story_text=story_text,
+            text_spans=text_spans,
+            characters=[],
+            llm_config=LLMConfig(),
+            include_instrument=include_instrument,
+            summary=summary,
+        )
+    return recorded
+
+
+def _tokenizer(name: Optional[str]) -> Callable[[str], List[int]]:
+    if name:
+        from transformers import AutoTokenizer  # type: ignore
+
+        tok = AutoTokenizer.from_pretrained(name, trust_remote_code=True)
+        return lambda text: list(tok(text)["input_ids"])
+
+    vocab: Dict[str, int] = {}
+    return lambda text: [vocab.setdefault(t, len(vocab)) for t in _APPROX_TOKEN.findall(text)]
+
+
+def simulate_prefix_reuse(
+    prompts: Sequence[List[Dict[str, str]]],
+    *,
+    tokenize: Callable[[str], List[int]],
+    slots: int,
+) -> Dict[str, float]:
+    """Count prompt tokens and the tokens a `slots`-entry prefix cache would skip."""
+
+    cache: List[List[int]] = []
+    total = 0
+    reused = 0
+    for messages in prompts:
+        ids = tokenize("\n".join(m["content"] for m in messages))
+        total += len(ids)
+        best, best_len = -1, 0
+        for i, cached in enumerate(cache):
+            n = common_prefix_length(cached, ids)
+            if n > best_len:
+                best, best_len = i, n
+        reused += min(best_len, max(0, len(ids) - 1))
+        if best >= 0 and best_len == len(cache[best]):
+            # The prompt extends the cached one: the slot is continued.
+            cache.pop(best)
+        else:
+            # Otherwise the shared prefix is forked into the least recently used slot.
+            if best >= 0:
+                cache.append(cache.pop(best))
+            if len(cache) >= slots:
+                cache.pop(0)
+        cache.append(ids)
+    return {
+        "prompt_tokens": total,
+        "reused_tokens": reused,
+        "saved_fraction": reused / total if total else 0.0,
+    }
+
+
+def measure_ollama(
+    prompts: Sequence[List[Dict[str, str]]],
+    *,
+    config: OllamaConfig,
+) -> Dict[str, Dict[str, float]]:
+    """Send the prompts without and with reusable prefixes; sum Ollama's prompt_eval_count."""
+
+    results: Dict[str, Dict[str, float]] = {}
+    for mode in ("no_reuse", "prefix_reuse"):
+        reset_usage_stats()
+        start = time.perf_counter()
+        for messages in prompts:
+            if mode == "no_reuse":
+                nonce = f"[request {uuid.uuid4().hex}]\n"
+                messages = [{**messages[0], "content": nonce + messages[0]["content"]}, *messages[1:]]
+            ollama_chat(config=config, messages=messages, response_format_json=True)
+        stats = usage_stats()
+        results[mode] = {
+            "prompt_eval_count": stats["prompt_eval_count"],
+            "prompt_eval_s": stats["prompt_eval_duration_ns"] / 1e9,
+            "wall_s": time.perf_counter() - start,
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.full_detection.prompt_cache_benchmark",
+        description="Measure prompt tokens saved per story by prompt-prefix (KV cache) reuse.",
+    )
+    parser.add_argument("--story-file", type=Path, required=True, help="Story text file (UTF-8)")
+    parser.add_argument("--spans-json", type=Path, default=None, help="JSON list of spans (default: split evenly)")
+    parser.add_argument("--spans", type=int, default=10, help="Number of spans when --spans-json is not given")
+    parser.add_argument("--summary-file", type=Path, default=None, help="Story summary (default: first 600 chars)")
+    parser.add_argument("--include-instrument", action="store_true", help="Include instrument recognition")
+    parser.add_argument("--slots", type=int, default=6, help="Simulated cache slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--tokenizer", default=None, help="Hugging Face tokenizer for exact token counts")
+    parser.add_argument("--ollama-model", default=None, help="Also measure on this Ollama model")
+    parser.add_argument("--ollama-base-url", default="http://localhost:11434", help="Ollama base URL")
+    args = parser.parse_args(argv)
+
+    story_text = args.story_file.read_text(encoding="utf-8")
+    if args.spans_json:
+        text_spans = json.loads(args.spans_json.read_text(encoding="utf-8"))
+    else:
+        text_spans = _split_spans(story_text, args.spans)
+    summary = args.summary_file.read_text(encoding="utf-8") if args.summary_file else story_text[:600]
+
+    prompts = record_prompts(
+        story_text=story_text,
+        text_spans=text_spans,
+        summary=summary,
+        include_instrument=bool(args.include_instrument),
+    )
+    print(f"[INFO] Recorded {len(prompts)} LLM calls for {len(text_spans)} spans")
+
+    sim = simulate_prefix_reuse(prompts, tokenize=_tokenizer(args.tokenizer), slots=max(1, int(args.slots)))
+    unit = "tokens" if args.tokenizer else "approx. tokens"
+    print(
+        f"Simulated ({args.slots} slots): {sim['prompt_tokens']} prompt {unit}, "
+        f"{sim['reused_tokens']} reusable ({sim['saved_fraction']:.1%}) per story"
+    )
+
+    if args.ollama_model:
+        config = OllamaConfig(base_url=args.ollama_base_url, model=args.ollama_model, num_predict=1)
+        measured = measure_ollama(prompts, config=config)
+        for mode, r in measured.items():
+            print(
+                f"Ollama {mode:<13} prompt_eval_count={int(r['prompt_eval_count']):>8} "
+                f"prompt_eval={r['prompt_eval_s']:.1f}s wall={r['wall_s']:.1f}s"
+            )
+        saved = measured["no_reuse"]["prompt_eval_count"] - measured["prefix_reuse"]["prompt_eval_count"]
+        print(f"Prompt-eval tokens saved per story: {int(saved)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
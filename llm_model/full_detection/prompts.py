@@ -1,4 +1,16 @@
-"""Prompt templates for the full detection pipeline."""
+"""Prompt templates for the full detection pipeline.
+
+Every per-span prompt is laid out as a stable prefix followed by a per-span suffix:
+
+- prefix: task instructions, taxonomy guide, output format, then the story-level
+  summary (and, for character recognition, the known characters)
+- suffix: the story segment and the outputs of earlier steps for this span
+
+All spans of a story therefore send the same leading tokens for a given step, which
+lets the model server reuse the KV cache of that prefix (Ollama does this when the
+model stays loaded; the Hugging Face/Unsloth clients keep a prefix KV cache).
+Keep per-span values out of the prefix when editing these templates.
+"""
 
 from __future__ import annotations
 
@@ -69,17 +81,10 @@ def build_character_recognition_prompt(
             else:
                 chars_str += f"- {name}\n"
     
-    return f"""Identify all main characters and items in the following story segment.
+    return f"""Identify all main characters and items in the story segment given at the end.
 Classify each as either a DOER (performs actions) or RECEIVER (receives actions).
 Some entities can be both doers and receivers.
 
-Story Segment:
-{text_span}
-
-Summary:
-{summary}
-{chars_str}
-{context_part}
 Output JSON with the following structure:
 {{
   "doers": ["list", "of", "character/item", "names"],
@@ -96,6 +101,12 @@ Important:
 - Use existing character names when matching
 - Items can be objects, magical agents, or prices
 - Be careful to resolve aliases correctly (e.g., "孩子" might already be in list as "一儿一女")
+{context_part}
+Summary:
+{summary}
+{chars_str}
+Story Segment:
+{text_span}
 """
 
 
@@ -120,23 +131,23 @@ def build_instrument_prompt(
     """
     doers_str = ", ".join(doers) if doers else "unknown characters"
     
-    return f"""Identify if any key instruments or tools are used in this action.
+    return f"""Identify if any key instruments or tools are used in the action of the story segment given at the end.
 Only identify significant instruments (e.g., magical items, special weapons).
 Ignore common or everyday tools.
 
-Story Segment:
-{text_span}
+Output JSON:
+{{
+  "instrument": "name of instrument or empty string if none",
+  "explanation": "brief explanation"
+}}
 
 Summary:
 {summary}
 
-Doers: {doers_str}
+Story Segment:
+{text_span}
 
-Output JSON:
-{{
-  "instrument": "name of instrument or empty string if none",
-  "explanation": "brief explanation"
-}}"""
+Doers: {doers_str}"""
 
 
 # Step 3: Relationship Deduction
@@ -185,17 +196,7 @@ Sentiment (select one):
 - negative (dislike), fearful (submissive), hostile (high negative)
 """
     
-    return f"""Deduce the relationships between doers and receivers (if receivers are characters).
-
-Story Segment:
-{text_span}
-
-Summary:
-{summary}
-
-Doers: {', '.join(doers) if doers else 'None'}
-Receivers (characters): {', '.join(receivers) if receivers else 'None'}
-{context_part}
+    return f"""Deduce the relationships between the doers and receivers listed at the end (if receivers are characters).
 {relationship_guide}
 
 Output JSON:
@@ -216,6 +217,15 @@ CRITICAL:
 - relationship_level1 and relationship_level2 MUST use exact strings from the guide above
 - If receivers are not characters (are objects), return empty relationships array []
 - Multiple relationships possible if there are multiple doer-receiver pairs
+{context_part}
+Summary:
+{summary}
+
+Story Segment:
+{text_span}
+
+Doers: {', '.join(doers) if doers else 'None'}
+Receivers (characters): {', '.join(receivers) if receivers else 'None'}
 """
 
 
@@ -265,17 +275,7 @@ Function (narrative role, or empty string):
     
     instrument_part = f"\nInstrument used: {instrument}\n" if instrument else ""
     
-    return f"""Classify the action in this segment using the Universal Narrative Action Taxonomy.
-
-Story Segment:
-{text_span}
-
-Summary:
-{summary}
-
-Doers: {', '.join(doers) if doers else 'None'}
-Receivers: {', '.join(receivers) if receivers else 'None'}
-{instrument_part}
+    return f"""Classify the action in the story segment given at the end using the Universal Narrative Action Taxonomy.
 {action_guide}
 
 Output JSON:
@@ -290,7 +290,17 @@ Output JSON:
 CRITICAL:
 - category and type MUST use exact codes from the guide - do NOT invent new codes
 - type MUST match the selected category (e.g., if category="physical", type must be one of its options)
-- If unsure, check the category's allowed types in the guide above"""
+- If unsure, check the category's allowed types in the guide above
+
+Summary:
+{summary}
+
+Story Segment:
+{text_span}
+
+Doers: {', '.join(doers) if doers else 'None'}
+Receivers: {', '.join(receivers) if receivers else 'None'}
+{instrument_part}"""
 
 
 # Step 5: STAC Analysis (we'll reuse the existing STAC analyzer, but provide a prompt template here)
@@ -312,14 +322,7 @@ def build_stac_prompt(
     if story_context:
         context_part = f"\n\nFull Story Context:\n{story_context}\n"
     
-    return f"""Analyze this story segment using STAC classification (Situation, Task, Action, Consequence).
-
-Story Segment:
-{text_span}
-
-Summary:
-{summary}
-{context_part}
+    return f"""Analyze the story segment given at the end using STAC classification (Situation, Task, Action, Consequence).
 
 For each STAC component, provide a one-sentence summary:
 - Situation: Background context or setting
@@ -333,7 +336,13 @@ Output JSON:
   "task": "one sentence",
   "action": "one sentence",
   "consequence": "one sentence"
-}}"""
+}}
+{context_part}
+Summary:
+{summary}
+
+Story Segment:
+{text_span}"""
 
 
 # Step 6: Event Type Classification (Propp Functions)
@@ -403,15 +412,8 @@ STAC Analysis:
 - Consequence: {stac.get('consequence', '')}
 """
     
-    return f"""Classify this event using Vladimir Propp's Morphology of the Folktale.
+    return f"""Classify the event in the story segment given at the end using Vladimir Propp's Morphology of the Folktale.
 Focus on the structural role in the narrative, not literal interpretation.
-
-Story Segment:
-{text_span}
-
-Summary:
-{summary}
-{stac_str}
 {PROPP_FUNCTIONS_SUMMARY}
 
 Output JSON:
@@ -423,4 +425,10 @@ Output JSON:
 
 Note: If the event fits no specific Propp function, use "OTHER".
 Combine the two descriptions with semicolon: "general;specific"
-"""
+
+Summary:
+{summary}
+
+Story Segment:
+{text_span}
+{stac_str}"""
@@ -10,10 +10,11 @@ from __future__ import annotations
 import time
 from typing import Any, Callable, Dict, List, Optional
 
-from ..llm_router import LLMConfig, LLMRouterError, chat
+from ..llm_router import LLMConfig, LLMReplayMissError, LLMRouterError, chat
 from ..json_utils import loads_strict_json
-from .pipeline import run_pipeline
+from .pipeline import map_spans, run_pipeline
 from .pipeline_state import PipelineState
+from .utils import reconcile_span_characters
 from .prompts import SYSTEM_PROMPT_SUMMARY, build_summary_prompt
 
 
@@ -88,6 +89,8 @@ def generate_story_summary(
         
         return summary
         
+    except LLMReplayMissError:
+        raise
     except LLMRouterError as e:
         raise StoryProcessingError(f"Failed to generate summary: {e}") from e
     except Exception as e:
@@ -103,6 +106,8 @@ def process_story(
     generate_summary: bool = True,
     summary: Optional[str] = None,
     on_span_complete: Optional[Callable[[int, Dict[str, Any], float], None]] = None,
+    max_workers: int = 1,
+    parallel_steps: bool = False,
 ) -> Dict[str, Any]:
     """Process an entire story through the narrative detection pipeline.
     
@@ -110,6 +115,9 @@ def process_story(
     1. Generates a summary of the story (if not provided)
     2. Processes each text span using the pipeline with the shared summary
     
+    With max_workers > 1, spans are processed concurrently from the initial
+    character list and the resulting character lists are reconciled in span order.
+    
     Args:
         story_text: Full story text
         text_spans: List of text span dicts, each with 'start', 'end', 'text' keys
@@ -121,6 +129,9 @@ def process_story(
         on_span_complete: Optional callback function called after each span completes.
                         Called with (span_idx, result_dict, elapsed_time).
                         Result dict contains 'narrative_event' and 'updated_characters'.
+                        In parallel mode it is called in span order once all spans are done.
+        max_workers: Number of spans processed concurrently (default: 1, sequential)
+        parallel_steps: Run independent steps of each span concurrently (see build_pipeline)
         
     Returns:
         Dictionary with:
@@ -163,6 +174,19 @@ def process_story(
     results = []
     total_spans = len(text_spans)
     
+    if max_workers > 1 and total_spans > 1:
+        return _process_spans_parallel(
+            story_text=story_text,
+            text_spans=text_spans,
+            characters=current_characters,
+            llm_config=llm_config,
+            include_instrument=include_instrument,
+            summary=summary,
+            on_span_complete=on_span_complete,
+            max_workers=max_workers,
+            parallel_steps=parallel_steps,
+        )
+    
     print(f"\nProcessing {total_spans} text spans...", flush=True)
     
     for idx, text_span in enumerate(text_spans, start=1):
@@ -195,6 +219,7 @@ def process_story(
                 summary=summary,  # Pass summary as input
                 llm_config=llm_config,
                 include_instrument=include_instrument,
+                parallel_steps=parallel_steps,
             )
             
             # Update character list for next iteration
@@ -211,6 +236,7 @@ def process_story(
                 "success": True,
                 "narrative_event": result["narrative_event"],
                 "processing_time": elapsed,
+                "step_timings": result.get("step_timings", {}),
             })
             
             # Call callback if provided
@@ -247,6 +273,98 @@ def process_story(
     }
 
 
+def _process_spans_parallel(
+    story_text: str,
+    text_spans: List[Dict[str, Any]],
+    characters: List[Dict[str, Any]],
+    llm_config: LLMConfig,
+    include_instrument: bool,
+    summary: str,
+    on_span_complete: Optional[Callable[[int, Dict[str, Any], float], None]],
+    max_workers: int,
+    parallel_steps: bool,
+) -> Dict[str, Any]:
+    """Parallel variant of the span loop in process_story."""
+    total_spans = len(text_spans)
+    snapshot = list(characters)
+    
+    print(f"\nProcessing {total_spans} text spans with {max_workers} workers...", flush=True)
+    
+    def run_span(idx: int, text_span: Dict[str, Any]) -> Dict[str, Any]:
+        if "text" not in text_span:
+            if "start" in text_span and "end" in text_span:
+                text_span = {
+                    **text_span,
+                    "text": story_text[text_span["start"]:text_span["end"]],
+                }
+            else:
+                raise StoryProcessingError(f"Text span {idx} missing 'text' or 'start'/'end' fields")
+        
+        result = run_pipeline(
+            story_text=story_text,
+            text_span=text_span,
+            characters=snapshot,
+            time_order=idx,
+            summary=summary,
+            llm_config=llm_config,
+            include_instrument=include_instrument,
+            parallel_steps=parallel_steps,
+        )
+        print(f"  ✓ Span {idx}/{total_spans} done", flush=True)
+        return result
+    
+    start_time = time.time()
+    outcomes = map_spans(run_span, text_spans, max_workers=max_workers)
+    print(f"✓ {total_spans} spans processed in {time.time() - start_time:.1f}s, reconciling characters...", flush=True)
+    
+    # Merge in span order so the character list does not depend on completion order
+    current_characters = snapshot
+    narrative_events = []
+    results = []
+    for idx, (result, error, elapsed) in enumerate(outcomes, start=1):
+        if error is not None:
+            print(f"  ✗ Span {idx} failed after {elapsed:.1f}s: {error}", flush=True)
+            results.append({
+                "index": idx,
+                "success": False,
+                "error": str(error),
+                "processing_time": elapsed,
+            })
+            continue
+        
+        event, current_characters = reconcile_span_characters(
+            result["narrative_event"], result["updated_characters"], current_characters
+        )
+        narrative_events.append(event)
+        results.append({
+            "index": idx,
+            "success": True,
+            "narrative_event": event,
+            "processing_time": elapsed,
+            "step_timings": result.get("step_timings", {}),
+        })
+        
+        if on_span_complete:
+            try:
+                on_span_complete(
+                    span_idx=idx,
+                    result={
+                        "narrative_event": event,
+                        "updated_characters": current_characters,
+                    },
+                    elapsed_time=elapsed,
+                )
+            except Exception as callback_error:
+                print(f"  ⚠ Callback error for span {idx}: {callback_error}", flush=True)
+    
+    return {
+        "summary": summary,
+        "narrative_events": narrative_events,
+        "updated_characters": current_characters,
+        "results": results,
+    }
+
+
 def process_story_segment(
     story_text: str,
     text_span: Dict[str, Any],
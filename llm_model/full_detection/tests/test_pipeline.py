@@ -5,8 +5,8 @@ from uuid import uuid4
 
 import pytest
 
-from llm_model.full_detection.pipeline import PipelineError, build_pipeline, run_pipeline
-from llm_model.llm_router import LLMConfig
+from llm_model.full_detection.pipeline import PipelineError, build_pipeline, get_pipeline, run_pipeline
+from llm_model.llm_router import LLMConfig, LLMReplayMissError
 
 
 class TestBuildPipeline:
@@ -37,6 +37,16 @@ class TestBuildPipeline:
         assert pipeline is not None
 
 
+    def test_get_pipeline_is_reused(self):
+        """Test that compiled pipelines are cached per configuration."""
+        llm_config = LLMConfig()
+        pipeline = get_pipeline(llm_config, steps_only=["character", "stac"])
+        
+        assert get_pipeline(llm_config, steps_only=["stac", "character"]) is pipeline
+        assert get_pipeline(llm_config, steps_only=["character"]) is not pipeline
+        assert get_pipeline(llm_config, include_instrument=True) is not get_pipeline(llm_config)
+
+
 class TestRunPipeline:
     """Tests for run_pipeline function."""
     
@@ -149,3 +159,80 @@ class TestRunPipeline:
         # Verify the function ran successfully
         assert result is not None
         assert "narrative_event" in result
+    
+    def test_run_pipeline_parallel_steps(self):
+        """Test that parallel_steps produces the same event and reports step timings."""
+        from llm_model.full_detection.prompts import (
+            SYSTEM_PROMPT_ACTION,
+            SYSTEM_PROMPT_CHARACTER_RECOGNITION,
+            SYSTEM_PROMPT_EVENT_TYPE,
+            SYSTEM_PROMPT_RELATIONSHIP,
+            SYSTEM_PROMPT_STAC,
+        )
+        
+        # Steps may run in any order, so respond by system prompt
+        responses = {
+            SYSTEM_PROMPT_CHARACTER_RECOGNITION: '{"doers": ["Hero"], "receivers": ["Villain"], "new_characters": []}',
+            SYSTEM_PROMPT_RELATIONSHIP: '{"relationships": [{"agent": "Hero", "target": "Villain", "relationship_level1": "Adversarial"}]}',
+            SYSTEM_PROMPT_ACTION: '{"category": "physical", "type": "attack", "context": "", "status": "success", "function": ""}',
+            SYSTEM_PROMPT_STAC: '{"situation": "Hero faces villain", "task": "", "action": "", "consequence": ""}',
+            SYSTEM_PROMPT_EVENT_TYPE: '{"event_type": "A", "description_general": "Villainy", "description_specific": ""}',
+        }
+        
+        results = []
+        with patch('llm_model.full_detection.chains.chat') as mock_chat:
+            mock_chat.side_effect = lambda config, messages, **kwargs: responses[messages[0]["content"]]
+            for parallel_steps in (False, True):
+                results.append(run_pipeline(
+                    story_text="A hero faces a villain.",
+                    text_span={"start": 0, "end": 23, "text": "A hero faces a villain."},
+                    characters=[],
+                    time_order=1,
+                    event_id="event-1",
+                    summary="Hero faces villain",
+                    parallel_steps=parallel_steps,
+                ))
+        
+        sequential, parallel = results
+        assert parallel["narrative_event"] == sequential["narrative_event"]
+        assert parallel["narrative_event"]["relationships"][0]["agent"] == "Hero"
+        assert parallel["narrative_event"]["event_type"] == "A"
+        assert set(parallel["step_timings"]) == {
+            "character", "relationship", "action", "stac", "event_type", "total",
+        }
+    
+    @patch('llm_model.full_detection.chains.chat')
+    def test_run_pipeline_summary_per_span(self, mock_chat):
+        """Test that the shared compiled pipeline uses each call's summary."""
+        mock_chat.return_value = '{"situation": "", "task": "", "action": "", "consequence": ""}'
+        
+        for summary in ("First summary", "Second summary"):
+            run_pipeline(
+                story_text="Story",
+                text_span={"start": 0, "end": 5, "text": "Story"},
+                characters=[],
+                time_order=1,
+                summary=summary,
+                steps_only=["stac"],
+            )
+        
+        prompts = [call.kwargs["messages"][1]["content"] for call in mock_chat.call_args_list]
+        assert "First summary" in prompts[0]
+        assert "Second summary" in prompts[1]
+    
+    @patch('llm_model.full_detection.chains.chat')
+    def test_run_pipeline_replay_miss_fails_span(self, mock_chat):
+        """Test that a replay-mode cache miss fails the span instead of yielding empty results."""
+        mock_chat.side_effect = LLMReplayMissError("No recorded response")
+        
+        with pytest.raises(PipelineError, match="No recorded response") as exc_info:
+            run_pipeline(
+                story_text="Story",
+                text_span={"start": 0, "end": 5, "text": "Story"},
+                characters=[],
+                time_order=1,
+                summary="Summary",
+                steps_only=["stac"],
+            )
+        
+        assert isinstance(exc_info.value.__cause__, LLMReplayMissError)
@@ -1,5 +1,6 @@
 """Unit tests for story processor module."""
 
+import time
 from unittest.mock import patch
 
 import pytest
@@ -221,6 +222,51 @@ class TestProcessStory:
         assert any(r.get("success") is False for r in result["results"])
 
 
+    @patch('llm_model.full_detection.story_processor.run_pipeline')
+    def test_process_story_parallel(self, mock_run_pipeline):
+        """Test parallel mode keeps span order and merges characters."""
+        def fake_pipeline(**kwargs):
+            # Every span starts from the initial character list
+            assert kwargs["characters"] == [{"name": "Hero", "alias": "the boy"}]
+            if kwargs["text_span"]["text"] == "First...":
+                time.sleep(0.05)  # Finish after the second span
+                return {
+                    "narrative_event": {"id": "event-1", "agents": ["the boy"], "targets": ["Villain"]},
+                    "updated_characters": kwargs["characters"] + [{"name": "Villain", "alias": ""}],
+                }
+            if kwargs["text_span"]["text"] == "Third...":
+                raise Exception("Pipeline failed")
+            return {
+                "narrative_event": {"id": "event-2", "agents": ["villain"], "targets": ["Hero"]},
+                "updated_characters": kwargs["characters"] + [{"name": "villain", "alias": ""}],
+            }
+        mock_run_pipeline.side_effect = fake_pipeline
+        
+        text_spans = [
+            {"start": 0, "end": 50, "text": "First..."},
+            {"start": 50, "end": 100, "text": "Second..."},
+            {"start": 100, "end": 150, "text": "Third..."},
+        ]
+        completed = []
+        
+        result = process_story(
+            story_text="Story",
+            text_spans=text_spans,
+            characters=[{"name": "Hero", "alias": "the boy"}],
+            summary="Summary",
+            llm_config=LLMConfig(),
+            on_span_complete=lambda span_idx, result, elapsed_time: completed.append(span_idx),
+            max_workers=3,
+        )
+        
+        assert [e["id"] for e in result["narrative_events"]] == ["event-1", "event-2"]
+        assert result["narrative_events"][0]["agents"] == ["Hero"]
+        assert result["narrative_events"][1]["agents"] == ["Villain"]
+        assert [c["name"] for c in result["updated_characters"]] == ["Hero", "Villain"]
+        assert [r["success"] for r in result["results"]] == [True, True, False]
+        assert completed == [1, 2]
+
+
 class TestProcessStorySegment:
     """Tests for process_story_segment function."""
     
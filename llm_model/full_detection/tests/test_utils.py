@@ -7,6 +7,7 @@ from llm_model.full_detection.utils import (
     extract_aliases,
     find_character_match,
     normalize_name,
+    reconcile_span_characters,
     resolve_character_aliases,
 )
 
@@ -189,3 +190,37 @@ class TestClassifyTargetType:
         target_type, object_type = classify_target_type(receivers, characters)
         assert target_type == "object"
         assert object_type == "normal_object"
+
+
+class TestReconcileSpanCharacters:
+    """Tests for reconcile_span_characters function."""
+    
+    def test_new_character_keeps_details(self):
+        """Test that characters discovered by a span are added with their details."""
+        event = {"agents": ["织女"], "targets": [], "relationships": []}
+        span_characters = [{"name": "织女", "alias": "仙女", "archetype": "Hero"}]
+        
+        merged_event, updated = reconcile_span_characters(event, span_characters, [])
+        assert merged_event["agents"] == ["织女"]
+        assert updated == [{"name": "织女", "alias": "仙女", "archetype": "Hero"}]
+    
+    def test_alias_resolved_to_global_name(self):
+        """Test that a name found in parallel resolves to the earlier global character."""
+        characters = [{"name": "织女", "alias": "仙女", "archetype": "Hero"}]
+        event = {
+            "agents": ["仙女"],
+            "targets": ["牛郎"],
+            "relationships": [{"agent": "仙女", "target": "牛郎", "relationship_level1": "Romance"}],
+        }
+        span_characters = [
+            {"name": "仙女", "alias": "", "archetype": "Other"},
+            {"name": "牛郎", "alias": "", "archetype": "Hero"},
+        ]
+        
+        merged_event, updated = reconcile_span_characters(event, span_characters, characters)
+        assert merged_event["agents"] == ["织女"]
+        assert merged_event["targets"] == ["牛郎"]
+        assert merged_event["relationships"][0]["agent"] == "织女"
+        assert [c["name"] for c in updated] == ["织女", "牛郎"]
+        # Input event is not modified
+        assert event["agents"] == ["仙女"]
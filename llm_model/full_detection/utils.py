@@ -134,3 +134,63 @@ def classify_target_type(receivers: List[str], characters: List[Dict[str, Any]])
     # All receivers are objects
     # This is a simplified classification - could be enhanced with LLM
     return "object", "normal_object"
+
+
+def reconcile_span_characters(
+    narrative_event: Dict[str, Any],
+    span_characters: List[Dict[str, Any]],
+    characters: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Merge one independently processed span into the global character list.
+
+    In parallel batch mode every span starts from the same character snapshot, so
+    two spans may introduce the same character under different names. Spans are
+    merged one at a time in story order, which keeps the result deterministic.
+    
+    Args:
+        narrative_event: Narrative event produced for the span
+        span_characters: The span's 'updated_characters'
+        characters: Global character list built from the earlier spans
+        
+    Returns:
+        Tuple of (narrative_event, updated_characters)
+        - narrative_event: Copy of the event with agents, targets and relationship
+          endpoints resolved to the global character names
+        - updated_characters: Global list with the span's new characters added
+    """
+    updated = list(characters)
+    
+    # Keep the LLM-provided details (alias, archetype) of characters that are new
+    for char in span_characters or []:
+        if isinstance(char, dict):
+            name = char.get("name", "")
+            if name and not find_character_match(name, updated):
+                updated.append(char)
+    
+    agents = [a for a in narrative_event.get("agents") or [] if isinstance(a, str)]
+    targets = [t for t in narrative_event.get("targets") or [] if isinstance(t, str)]
+    resolved_agents, updated = resolve_character_aliases(agents, updated)
+    resolved_targets, updated = resolve_character_aliases(targets, updated)
+    
+    def canonical(name: Any) -> Any:
+        if not isinstance(name, str) or not name.strip():
+            return name
+        match = find_character_match(name, updated)
+        return match[1].get("name", name) if match else name
+    
+    relationships = []
+    for rel in narrative_event.get("relationships") or []:
+        if isinstance(rel, dict):
+            rel = {**rel}
+            for key in ("agent", "target"):
+                if key in rel:
+                    rel[key] = canonical(rel[key])
+        relationships.append(rel)
+    
+    event = {
+        **narrative_event,
+        "agents": resolved_agents,
+        "targets": resolved_targets,
+        "relationships": relationships,
+    }
+    return event, updated
@@ -8,12 +8,14 @@ Gemini API shape (v1beta, may evolve):
 - POST https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key=...
 
 This module converts messages and returns the first candidate text.
+`chat_stream` uses `:streamGenerateContent?alt=sse` to yield text as it arrives.
 """
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 
@@ -80,15 +82,14 @@ def _extract_text(data: Dict[str, Any]) -> str:
     return text
 
 
-def chat(
+def _build_request(
     *,
     config: GeminiConfig,
     messages: List[Dict[str, str]],
-    response_format_json: bool = True,
-    timeout_s: float = 300.0,
-    thinking: bool = False,
-) -> str:
-    """Send a chat request and return assistant content as a string."""
+    response_format_json: bool,
+    thinking: bool,
+) -> Tuple[str, Dict[str, Any]]:
+    """Return (model id, generateContent payload)."""
 
     if not config.api_key:
         raise GeminiError("Missing Gemini API key (set GEMINI_API_KEY in .env)")
@@ -122,9 +123,6 @@ def chat(
     if not contents:
         raise GeminiError("No user/assistant messages provided")
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-    params = {"key": config.api_key}
-
     payload: Dict[str, Any] = {
         "contents": contents,
         "generationConfig": {
@@ -142,6 +140,25 @@ def chat(
     if system_text:
         payload["systemInstruction"] = {"parts": [{"text": system_text}]}
 
+    return model, payload
+
+
+def chat(
+    *,
+    config: GeminiConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+    thinking: bool = False,
+) -> str:
+    """Send a chat request and return assistant content as a string."""
+
+    model, payload = _build_request(
+        config=config, messages=messages, response_format_json=response_format_json, thinking=thinking
+    )
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    params = {"key": config.api_key}
+
     try:
         resp = requests.post(url, params=params, json=payload, timeout=timeout_s)
     except requests.RequestException as exc:
@@ -160,6 +177,63 @@ def chat(
     return _extract_text(data)
 
 
+def _chunk_text(data: Dict[str, Any]) -> str:
+    """Text of one streamed chunk (chunks without parts, e.g. the final one, give "")."""
+
+    candidates = data.get("candidates")
+    if not isinstance(candidates, list) or not candidates or not isinstance(candidates[0], dict):
+        return ""
+    content = candidates[0].get("content")
+    parts = content.get("parts") if isinstance(content, dict) else None
+    if not isinstance(parts, list):
+        return ""
+    return "".join(p["text"] for p in parts if isinstance(p, dict) and isinstance(p.get("text"), str))
+
+
+def chat_stream(
+    *,
+    config: GeminiConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+    thinking: bool = False,
+) -> Iterator[str]:
+    """Stream a chat response, yielding text deltas (Server-Sent Events upstream)."""
+
+    model, payload = _build_request(
+        config=config, messages=messages, response_format_json=response_format_json, thinking=thinking
+    )
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+    params = {"key": config.api_key, "alt": "sse"}
+
+    try:
+        resp = requests.post(url, params=params, json=payload, timeout=timeout_s, stream=True)
+    except requests.RequestException as exc:
+        raise GeminiError(f"Failed to reach Gemini at {url}: {exc}") from exc
+
+    with resp:
+        if resp.status_code != 200:
+            raise GeminiError(f"Gemini streamGenerateContent failed: HTTP {resp.status_code}: {resp.text[:2000]}")
+        # requests decodes `text/event-stream` without a charset as ISO-8859-1;
+        # the Gemini API always sends UTF-8.
+        resp.encoding = "utf-8"
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                try:
+                    data = json.loads(line[len("data:") :].strip())
+                except ValueError as exc:
+                    raise GeminiError(f"Gemini returned non-JSON stream event: {line[:2000]}") from exc
+                if isinstance(data, dict) and data.get("error"):
+                    raise GeminiError(f"Gemini stream failed: {data['error']}")
+                text = _chunk_text(data) if isinstance(data, dict) else ""
+                if text:
+                    yield text
+        except requests.RequestException as exc:
+            raise GeminiError(f"Gemini stream from {url} was interrupted: {exc}") from exc
+
+
 def list_models(*, api_key: str, timeout_s: float = 10.0) -> List[Dict[str, Any]]:
     """List available Gemini models.
 
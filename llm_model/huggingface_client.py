@@ -24,7 +24,10 @@ Example:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+from .local_batching import FutureTimeoutError, batching_enabled, get_batcher, wait_for
+from .prefix_kv_cache import generate_with_prefix_cache, get_prefix_cache
 
 try:
     from transformers import AutoModelForCausalLM, AutoTokenizer
@@ -161,10 +164,13 @@ def chat(
         config: HuggingFaceConfig with model name and options.
         messages: List of {role: "system"|"user"|"assistant", content: str}.
         response_format_json: If True, instructs model to return JSON (via system prompt).
-        timeout_s: Timeout (not strictly enforced, but used for generation limits).
+        timeout_s: Timeout (only enforced while waiting for a batched generation).
     
     Returns:
         Assistant message content.
+
+    With `LLM_BATCH_MAX_SIZE` > 1, concurrent calls for the same model and
+    generation settings are generated together (see `local_batching`).
     """
     
     # Try using vLLM if requested (much faster on A100)
@@ -197,7 +203,80 @@ def chat(
         device=config.device,
         torch_dtype=config.torch_dtype,
     )
-    
+
+    prompt = _build_prompt(tokenizer, messages, response_format_json)
+
+    if batching_enabled():
+        # Concurrent callers share padded generate() calls (see local_batching)
+        batcher = get_batcher(
+            f"huggingface::{_model_key(config)}::{config.temperature}::{config.top_p}::{config.max_new_tokens}",
+            lambda prompts: _generate_batch(config, prompts),
+        )
+        try:
+            return wait_for(batcher.submit(prompt), timeout_s)
+        except FutureTimeoutError:
+            raise HuggingFaceError(f"Generation did not finish within {timeout_s}s (batch queue)")
+        except HuggingFaceError:
+            raise
+        except Exception as e:
+            raise HuggingFaceError(f"Generation failed: {e}") from e
+
+    return _generate_one(config, model, tokenizer, prompt)
+
+
+def chat_batch(
+    *,
+    config: HuggingFaceConfig,
+    messages_list: Sequence[List[Dict[str, str]]],
+    response_format_json: bool = True,
+) -> List[str]:
+    """Generate responses for several conversations in one batched generation.
+
+    Prompts are left-padded into a single `generate()` call (or one vLLM call
+    with `use_vllm`). Callers choose the batch size (see `llm_router.chat_many`).
+
+    Returns:
+        Assistant message contents, in the order of `messages_list`.
+    """
+
+    if not messages_list:
+        return []
+
+    if config.use_vllm:
+        try:
+            return _chat_batch_with_vllm(
+                config=config,
+                messages_list=messages_list,
+                response_format_json=response_format_json,
+            )
+        except ImportError:
+            raise HuggingFaceError(
+                "vLLM not installed. Install with: pip install vllm\n"
+                "Or set use_vllm=False to use transformers backend."
+            )
+
+    if not HF_AVAILABLE:
+        raise HuggingFaceError(
+            "transformers and torch not installed. "
+            "Install with: pip install transformers torch accelerate"
+        )
+
+    _, tokenizer = _load_model_and_tokenizer(
+        model_id=config.model,
+        device=config.device,
+        torch_dtype=config.torch_dtype,
+    )
+    prompts = [_build_prompt(tokenizer, messages, response_format_json) for messages in messages_list]
+    return _generate_batch(config, prompts)
+
+
+def _model_key(config: HuggingFaceConfig) -> str:
+    return f"{config.model}::{config.device}::{config.torch_dtype or 'auto'}"
+
+
+def _build_prompt(tokenizer: Any, messages: List[Dict[str, str]], response_format_json: bool) -> str:
+    """Render the chat messages as a single prompt string for `tokenizer`'s model."""
+
     # Convert messages to prompt format
     # Most chat models use a specific template (Qwen uses chatml format)
     system_prompt = ""
@@ -237,16 +316,10 @@ def chat(
             prompt = _format_messages_manual(chat_messages, system_prompt)
     else:
         prompt = _format_messages_manual(chat_messages, system_prompt)
-    
-    # Tokenize
-    inputs = tokenizer(prompt, return_tensors="pt")
-    
-    # Generate
-    actual_device = _get_device(config.device)
-    
-    # Move inputs to the correct device (keep as BatchEncoding object)
-    if inputs.input_ids.device.type != actual_device:
-        inputs = inputs.to(actual_device)
+    return prompt
+
+
+def _generation_kwargs(config: HuggingFaceConfig, tokenizer: Any, actual_device: str) -> Dict[str, Any]:
     generation_kwargs = {
         "temperature": config.temperature,
         "top_p": config.top_p,
@@ -260,14 +333,36 @@ def chat(
         # Disable pad_token_id warning if pad_token is None
         if hasattr(tokenizer, "pad_token") and tokenizer.pad_token is None:
             generation_kwargs["pad_token_id"] = tokenizer.eos_token_id
+    return generation_kwargs
+
+
+def _generate_one(config: HuggingFaceConfig, model: Any, tokenizer: Any, prompt: str) -> str:
+    """Generate the response for a single prompt."""
+
+    # Tokenize
+    inputs = tokenizer(prompt, return_tensors="pt")
+    
+    # Generate
+    actual_device = _get_device(config.device)
+    
+    # Move inputs to the correct device (keep as BatchEncoding object)
+    if inputs.input_ids.device.type != actual_device:
+        inputs = inputs.to(actual_device)
+    generation_kwargs = _generation_kwargs(config, tokenizer, actual_device)
+
+    # Reuse the KV state of a previously seen prompt prefix (see prefix_kv_cache)
+    prefix_cache = get_prefix_cache(_model_key(config))
 
     try:
         with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                **generation_kwargs,
-                return_dict_in_generate=False,  # Ensure we get tensor, not dict
-            )
+            if prefix_cache is not None:
+                outputs = generate_with_prefix_cache(model, inputs, prefix_cache, **generation_kwargs)
+            else:
+                outputs = model.generate(
+                    **inputs,
+                    **generation_kwargs,
+                    return_dict_in_generate=False,  # Ensure we get tensor, not dict
+                )
     except Exception as e:
         raise HuggingFaceError(f"Generation failed: {e}") from e
     
@@ -300,6 +395,50 @@ def chat(
     return response.strip()
 
 
+def _tokenize_left_padded(tokenizer: Any, prompts: List[str]) -> Any:
+    """Tokenize `prompts` as one left-padded batch.
+
+    Llama / Mistral / Gemma tokenizers have no pad token; they pad with EOS.
+    The tokenizer is cached and shared, so its padding side is restored afterwards.
+    """
+
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    padding_side = tokenizer.padding_side
+    # Decoder-only models continue from the last position, so pad on the left.
+    tokenizer.padding_side = "left"
+    try:
+        return tokenizer(prompts, return_tensors="pt", padding=True)
+    finally:
+        tokenizer.padding_side = padding_side
+
+
+def _generate_batch(config: HuggingFaceConfig, prompts: List[str]) -> List[str]:
+    """Generate responses for several prompts in one left-padded `generate()` call."""
+
+    model, tokenizer = _load_model_and_tokenizer(
+        model_id=config.model,
+        device=config.device,
+        torch_dtype=config.torch_dtype,
+    )
+    if len(prompts) == 1:
+        return [_generate_one(config, model, tokenizer, prompts[0])]
+
+    actual_device = _get_device(config.device)
+    inputs = _tokenize_left_padded(tokenizer, prompts).to(actual_device)
+    generation_kwargs = _generation_kwargs(config, tokenizer, actual_device)
+    generation_kwargs["pad_token_id"] = tokenizer.pad_token_id
+
+    try:
+        with torch.no_grad():
+            outputs = model.generate(**inputs, **generation_kwargs)
+    except Exception as e:
+        raise HuggingFaceError(f"Batched generation failed: {e}") from e
+
+    prompt_width = inputs.input_ids.shape[1]
+    return [tokenizer.decode(row[prompt_width:], skip_special_tokens=True).strip() for row in outputs]
+
+
 def _chat_with_vllm(
     *,
     config: HuggingFaceConfig,
@@ -308,6 +447,20 @@ def _chat_with_vllm(
     timeout_s: float = 300.0,
 ) -> str:
     """Chat using vLLM for faster inference (especially on A100)."""
+    return _chat_batch_with_vllm(
+        config=config,
+        messages_list=[messages],
+        response_format_json=response_format_json,
+    )[0]
+
+
+def _chat_batch_with_vllm(
+    *,
+    config: HuggingFaceConfig,
+    messages_list: Sequence[List[Dict[str, str]]],
+    response_format_json: bool = True,
+) -> List[str]:
+    """Generate responses for several conversations in one vLLM `generate()` call."""
     try:
         from vllm import LLM, SamplingParams
     except ImportError:
@@ -349,38 +502,16 @@ def _chat_with_vllm(
         from transformers import AutoTokenizer
         tokenizer = AutoTokenizer.from_pretrained(
             config.model, trust_remote_code=True)
-
-        system_prompt = ""
-        chat_messages = []
-        for msg in messages:
-            role = (msg.get("role") or "").strip().lower()
-            content = msg.get("content") or ""
-            if role == "system":
-                system_prompt = content
-                if response_format_json and "JSON" not in system_prompt.upper():
-                    if system_prompt:
-                        system_prompt += "\n\nYou must respond with valid JSON only (no markdown, no commentary)."
-                    else:
-                        system_prompt = "You must respond with valid JSON only (no markdown, no commentary)."
-            elif role in ("user", "assistant"):
-                chat_messages.append({"role": role, "content": content})
-
-        if hasattr(tokenizer, "apply_chat_template"):
-            prompt = tokenizer.apply_chat_template(
-                chat_messages,
-                tokenize=False,
-                add_generation_prompt=True,
-            )
-            if system_prompt:
-                prompt = f"<|im_start|>system\n{system_prompt}<|im_end|>\n{prompt}"
-        else:
-            prompt = _format_messages_manual(chat_messages, system_prompt)
+        prompts = [_build_prompt(tokenizer, messages, response_format_json) for messages in messages_list]
     except Exception:
-        prompt = _format_messages_manual(
-            [m for m in messages if m.get("role") != "system"],
-            next((m.get("content")
-                 for m in messages if m.get("role") == "system"), ""),
-        )
+        prompts = [
+            _format_messages_manual(
+                [m for m in messages if m.get("role") != "system"],
+                next((m.get("content")
+                     for m in messages if m.get("role") == "system"), ""),
+            )
+            for messages in messages_list
+        ]
 
     # Generate with vLLM
     sampling_params = SamplingParams(
@@ -390,9 +521,8 @@ def _chat_with_vllm(
     )
 
     try:
-        outputs = llm.generate([prompt], sampling_params)
-        response = outputs[0].outputs[0].text
-        return response.strip()
+        outputs = llm.generate(prompts, sampling_params)
+        return [output.outputs[0].text.strip() for output in outputs]
     except Exception as e:
         raise HuggingFaceError(f"vLLM generation failed: {e}") from e
 
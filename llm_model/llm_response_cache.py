@@ -0,0 +1,233 @@
+"""On-disk cache of LLM responses for re-running pipelines and evaluations.
+
+Re-running the full detection pipeline on the same stories (e.g. while iterating
+on evaluators or post-processing) sends exactly the same chat requests again.
+When enabled, `llm_router.chat` / `chat_stream` store every response in a SQLite
+file keyed on (provider, model, generation options, messages) and answer repeated
+requests from it.
+
+Modes:
+- `off`: no caching (default)
+- `on`: read from the cache, call the LLM on a miss and store the response
+- `replay`: read-only; a miss raises `llm_router.LLMReplayMissError` instead of
+  calling the LLM, so an evaluation run is guaranteed to use recorded responses only
+
+Note that with temperature > 0 a cached response is one sample; `on` mode makes
+repeated runs deterministic rather than re-sampling.
+
+Configuration (environment, or `configure_llm_response_cache()` from CLIs):
+- `LLM_RESPONSE_CACHE`: `off` / `on` / `replay`.
+- `LLM_RESPONSE_CACHE_PATH` overrides the SQLite file location
+  (default: `~/.cache/fairytales_research/llm_responses.sqlite`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Mapping, Optional
+
+LLMResponseCacheMode = Literal["off", "on", "replay"]
+
+
+def normalize_cache_mode(mode: Optional[str]) -> LLMResponseCacheMode:
+    m = (mode or "").strip().lower()
+    if m in ("", "0", "off", "false", "no", "none"):
+        return "off"
+    if m in ("1", "on", "true", "yes", "readwrite", "record"):
+        return "on"
+    if m in ("replay", "readonly", "read-only"):
+        return "replay"
+    raise ValueError(f"Unknown LLM response cache mode: {mode!r} (use 'off', 'on', or 'replay')")
+
+
+def response_cache_key(
+    *,
+    provider: str,
+    model: str,
+    options: Mapping[str, Any],
+    messages: List[Dict[str, str]],
+) -> str:
+    """Return the content-addressed key for one chat request."""
+
+    payload = {
+        "provider": provider,
+        "model": model,
+        "options": dict(options),
+        "messages": [{"role": m.get("role", ""), "content": m.get("content", "")} for m in messages],
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache.
+
+    The object is safe to share between threads (spans and steps may run
+    concurrently); all state is guarded by a single lock.
+    """
+
+    def __init__(self, path: Path, *, mode: LLMResponseCacheMode = "on"):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file holding the responses (created if missing).
+            mode: `on` (read + write) or `replay` (read-only).
+        """
+        self.path = Path(path)
+        self.mode: LLMResponseCacheMode = normalize_cache_mode(mode)
+        if self.mode == "off":
+            raise ValueError("LLMResponseCache needs mode 'on' or 'replay'")
+
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+              key TEXT PRIMARY KEY,
+              provider TEXT NOT NULL,
+              model TEXT NOT NULL,
+              response TEXT NOT NULL,
+              created_at REAL NOT NULL
+            );
+            """
+        )
+        conn.commit()
+        self._conn: Optional[sqlite3.Connection] = conn
+
+    @property
+    def replay_only(self) -> bool:
+        return self.mode == "replay"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response for `key`, or None on a miss."""
+
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("LLM response cache is closed")
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return str(row[0])
+
+    def put(self, key: str, *, provider: str, model: str, response: str) -> None:
+        """Store a response (no-op in replay mode)."""
+
+        if self.replay_only:
+            return
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("LLM response cache is closed")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses(key, provider, model, response, created_at) VALUES(?, ?, ?, ?, ?)",
+                (key, provider, model, response, time.time()),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the mode, hit/miss/write counters, hit rate and stored entries."""
+
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                row = self._conn.execute("SELECT COUNT(1) FROM responses").fetchone()
+                entries = int(row[0]) if row else 0
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.writes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_DEFAULT_CACHE: Optional[LLMResponseCache] = None
+_DEFAULT_CACHE_CONFIGURED = False
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def default_response_cache_path() -> Path:
+    raw = os.getenv("LLM_RESPONSE_CACHE_PATH")
+    if raw:
+        return Path(raw).expanduser()
+    return Path.home() / ".cache" / "fairytales_research" / "llm_responses.sqlite"
+
+
+def configure_llm_response_cache(
+    mode: Optional[str],
+    path: Optional[Path] = None,
+) -> Optional[LLMResponseCache]:
+    """Set the process-wide response cache used by `llm_router` (overrides the env).
+
+    Args:
+        mode: `off`, `on`, or `replay`.
+        path: SQLite file (default: `LLM_RESPONSE_CACHE_PATH` or the user cache dir).
+
+    Returns:
+        The active cache, or None when `mode` is `off`.
+    """
+
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_CONFIGURED
+
+    m = normalize_cache_mode(mode)
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is not None:
+            _DEFAULT_CACHE.close()
+        _DEFAULT_CACHE = None
+        if m != "off":
+            _DEFAULT_CACHE = LLMResponseCache(Path(path) if path else default_response_cache_path(), mode=m)
+        _DEFAULT_CACHE_CONFIGURED = True
+        return _DEFAULT_CACHE
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or None when disabled (the default)."""
+
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_CONFIGURED
+
+    if _DEFAULT_CACHE_CONFIGURED:
+        return _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if not _DEFAULT_CACHE_CONFIGURED:
+            m = normalize_cache_mode(os.getenv("LLM_RESPONSE_CACHE"))
+            if m != "off":
+                _DEFAULT_CACHE = LLMResponseCache(default_response_cache_path(), mode=m)
+            _DEFAULT_CACHE_CONFIGURED = True
+        return _DEFAULT_CACHE
+
+
+def llm_response_cache_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the process-wide response cache, or None when it is disabled."""
+
+    cache = get_llm_response_cache()
+    return cache.stats() if cache is not None else None
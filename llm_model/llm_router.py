@@ -11,11 +11,13 @@ without changing prompt-building logic.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Literal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
 
 from .gemini_client import GeminiConfig, GeminiError
 from .huggingface_client import HuggingFaceConfig, HuggingFaceError
+from .llm_response_cache import LLMResponseCache, get_llm_response_cache, response_cache_key
 from .ollama_client import OllamaConfig, OllamaError
 from .unsloth_client import UnslothConfig, UnslothError
 
@@ -27,6 +29,10 @@ class LLMRouterError(RuntimeError):
     pass
 
 
+class LLMReplayMissError(LLMRouterError):
+    """No recorded response for a request while the response cache is in replay mode."""
+
+
 def _normalize_provider(provider: str) -> LLMProvider:
     p = (provider or "").strip().lower()
     # Allow a few aliases to make switching ergonomic.
@@ -54,16 +60,306 @@ class LLMConfig:
     unsloth: UnslothConfig = UnslothConfig()
 
 
+# Provider settings that do not change the generated text (connection, runtime, secrets).
+_NON_GENERATION_FIELDS = ("api_key", "base_url", "keep_alive", "num_thread", "enable_cpu_offload", "use_vllm")
+
+
+def _cache_identity(
+    config: LLMConfig,
+    response_format_json: bool,
+) -> Tuple[LLMProvider, str, Dict[str, Any]]:
+    """Return (provider, model, generation options) identifying responses for the cache key."""
+
+    provider = _normalize_provider(config.provider)
+    if provider == "ollama":
+        settings, model = config.ollama, config.ollama.model
+    elif provider == "gemini":
+        settings = config.gemini
+        model = config.gemini.model_thinking if config.thinking and config.gemini.model_thinking else config.gemini.model
+    elif provider == "huggingface":
+        settings, model = config.huggingface, config.huggingface.model
+    else:
+        settings, model = config.unsloth, config.unsloth.model_path
+
+    options = {k: v for k, v in asdict(settings).items() if k not in _NON_GENERATION_FIELDS}
+    options["thinking"] = bool(config.thinking)
+    options["response_format_json"] = bool(response_format_json)
+    return provider, model, options
+
+
+def _cached_lookup(
+    cache: LLMResponseCache,
+    config: LLMConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool,
+) -> Tuple[str, LLMProvider, str, Optional[str]]:
+    """Return (key, provider, model, cached response or None).
+
+    Raises:
+        LLMReplayMissError: on a miss in replay mode.
+    """
+
+    provider, model, options = _cache_identity(config, response_format_json)
+    key = response_cache_key(provider=provider, model=model, options=options, messages=messages)
+    cached = cache.get(key)
+    if cached is None and cache.replay_only:
+        raise LLMReplayMissError(f"No recorded {provider} response for this request (model={model!r}, replay mode)")
+    return key, provider, model, cached
+
+
 def chat(
     *,
     config: LLMConfig,
     messages: List[Dict[str, str]],
     response_format_json: bool = True,
     timeout_s: float = 300.0,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> str:
-    """Chat with the configured provider and return assistant text."""
+    """Chat with the configured provider and return assistant text.
 
+    If `on_token` is given, the response is streamed (see `chat_stream`) and
+    `on_token` is called with each text delta before the full text is returned.
+
+    When the LLM response cache is enabled (see `llm_response_cache`), repeated
+    requests are answered from it; a cached response is passed to `on_token`
+    as a single delta.
+    """
+
+    cache = get_llm_response_cache()
+    if cache is None:
+        return _chat(
+            config=config,
+            messages=messages,
+            response_format_json=response_format_json,
+            timeout_s=timeout_s,
+            on_token=on_token,
+        )
+
+    key, provider, model, cached = _cached_lookup(cache, config, messages, response_format_json)
+    if cached is not None:
+        if on_token is not None:
+            on_token(cached)
+        return cached
+
+    text = _chat(
+        config=config,
+        messages=messages,
+        response_format_json=response_format_json,
+        timeout_s=timeout_s,
+        on_token=on_token,
+    )
+    if text:
+        cache.put(key, provider=provider, model=model, response=text)
+    return text
+
+
+def chat_stream(
+    *,
+    config: LLMConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+) -> Iterator[str]:
+    """Stream assistant text deltas from the configured provider.
+
+    Ollama and Gemini stream natively. The local Hugging Face / Unsloth
+    providers generate in-process and yield the whole response as one chunk.
+    With the LLM response cache enabled, a cached response is yielded as one
+    chunk and a fully streamed response is stored.
+
+    Raises:
+        LLMRouterError: on provider failure (possibly after some deltas were yielded).
+    """
+
+    cache = get_llm_response_cache()
+    if cache is None:
+        yield from _chat_stream(
+            config=config,
+            messages=messages,
+            response_format_json=response_format_json,
+            timeout_s=timeout_s,
+        )
+        return
+
+    key, provider, model, cached = _cached_lookup(cache, config, messages, response_format_json)
+    if cached is not None:
+        yield cached
+        return
+
+    parts: List[str] = []
+    for delta in _chat_stream(
+        config=config,
+        messages=messages,
+        response_format_json=response_format_json,
+        timeout_s=timeout_s,
+    ):
+        parts.append(delta)
+        yield delta
+    text = "".join(parts)
+    if provider == "gemini":
+        text = text.strip()
+    if text:
+        cache.put(key, provider=provider, model=model, response=text)
+
+
+@dataclass(frozen=True)
+class ChatResult:
+    """Outcome of one conversation in `chat_many`: the text, or the error it failed with."""
+
+    text: Optional[str] = None
+    error: Optional[LLMRouterError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def chat_many(
+    *,
+    config: LLMConfig,
+    messages_list: Sequence[List[Dict[str, str]]],
+    max_concurrency: int = 4,
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+) -> List[ChatResult]:
+    """Run many independent conversations and return their results in input order.
+
+    - Ollama / Gemini: requests are sent from up to `max_concurrency` threads.
+    - Hugging Face (incl. vLLM) / Unsloth: conversations are generated in batches
+      of `max_concurrency` (one padded `generate()` call per batch).
+
+    A failing conversation (or batch) does not affect the others; its error is
+    returned in its `ChatResult`. The LLM response cache is consulted per item.
+    """
+
+    n = len(messages_list)
+    results: List[Optional[ChatResult]] = [None] * n
     provider = _normalize_provider(config.provider)
+    width = max(1, int(max_concurrency))
+
+    cache = get_llm_response_cache()
+    keys: Dict[int, str] = {}
+    pending: List[int] = []
+    for i, messages in enumerate(messages_list):
+        if cache is None:
+            pending.append(i)
+            continue
+        try:
+            keys[i], _, _, cached = _cached_lookup(cache, config, messages, response_format_json)
+        except LLMReplayMissError as exc:
+            results[i] = ChatResult(error=exc)
+            continue
+        if cached is not None:
+            results[i] = ChatResult(text=cached)
+        else:
+            pending.append(i)
+
+    def finish(i: int, text: str) -> None:
+        results[i] = ChatResult(text=text)
+        if cache is not None and text:
+            _, model, _ = _cache_identity(config, response_format_json)
+            cache.put(keys[i], provider=provider, model=model, response=text)
+
+    if provider in ("huggingface", "unsloth"):
+        for start in range(0, len(pending), width):
+            chunk = pending[start : start + width]
+            try:
+                texts = _chat_batch(
+                    config=config,
+                    messages_list=[messages_list[i] for i in chunk],
+                    response_format_json=response_format_json,
+                )
+            except Exception as exc:
+                error = exc if isinstance(exc, LLMRouterError) else LLMRouterError(str(exc))
+                for i in chunk:
+                    results[i] = ChatResult(error=error)
+                continue
+            for i, text in zip(chunk, texts):
+                finish(i, text)
+    elif pending:
+
+        def one(i: int) -> None:
+            try:
+                text = _chat(
+                    config=config,
+                    messages=messages_list[i],
+                    response_format_json=response_format_json,
+                    timeout_s=timeout_s,
+                    on_token=None,
+                )
+            except LLMRouterError as exc:
+                results[i] = ChatResult(error=exc)
+            except Exception as exc:
+                results[i] = ChatResult(error=LLMRouterError(str(exc)))
+            else:
+                finish(i, text)
+
+        with ThreadPoolExecutor(max_workers=min(width, len(pending)), thread_name_prefix="chat-many") as pool:
+            list(pool.map(one, pending))
+
+    return [r if r is not None else ChatResult(error=LLMRouterError("No result")) for r in results]
+
+
+def _chat_batch(
+    *,
+    config: LLMConfig,
+    messages_list: List[List[Dict[str, str]]],
+    response_format_json: bool,
+) -> List[str]:
+    provider = _normalize_provider(config.provider)
+
+    if provider == "huggingface":
+        from .huggingface_client import chat_batch as huggingface_chat_batch
+
+        try:
+            return huggingface_chat_batch(
+                config=config.huggingface,
+                messages_list=messages_list,
+                response_format_json=response_format_json,
+            )
+        except HuggingFaceError as exc:
+            raise LLMRouterError(str(exc)) from exc
+
+    # provider == "unsloth"
+    from .unsloth_client import chat_batch as unsloth_chat_batch
+
+    try:
+        return unsloth_chat_batch(
+            config=config.unsloth,
+            messages_list=messages_list,
+            response_format_json=response_format_json,
+        )
+    except UnslothError as exc:
+        raise LLMRouterError(str(exc)) from exc
+
+
+def _chat(
+    *,
+    config: LLMConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool,
+    timeout_s: float,
+    on_token: Optional[Callable[[str], None]],
+) -> str:
+    provider = _normalize_provider(config.provider)
+
+    if on_token is not None:
+        parts: List[str] = []
+        for delta in _chat_stream(
+            config=config,
+            messages=messages,
+            response_format_json=response_format_json,
+            timeout_s=timeout_s,
+        ):
+            parts.append(delta)
+            on_token(delta)
+        text = "".join(parts)
+        if provider == "gemini":
+            # Match gemini_client.chat, which strips and rejects empty output.
+            text = text.strip()
+            if not text:
+                raise LLMRouterError("Gemini returned empty text")
+        return text
 
     if provider == "ollama":
         from .ollama_client import chat as ollama_chat
@@ -117,3 +413,50 @@ def chat(
         )
     except UnslothError as exc:
         raise LLMRouterError(str(exc)) from exc
+
+
+def _chat_stream(
+    *,
+    config: LLMConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool,
+    timeout_s: float,
+) -> Iterator[str]:
+    provider = _normalize_provider(config.provider)
+
+    if provider == "ollama":
+        from .ollama_client import chat_stream as ollama_chat_stream
+
+        try:
+            yield from ollama_chat_stream(
+                config=config.ollama,
+                messages=messages,
+                response_format_json=response_format_json,
+                timeout_s=timeout_s,
+            )
+        except OllamaError as exc:
+            raise LLMRouterError(str(exc)) from exc
+        return
+
+    if provider == "gemini":
+        from .gemini_client import chat_stream as gemini_chat_stream
+
+        try:
+            yield from gemini_chat_stream(
+                config=config.gemini,
+                messages=messages,
+                response_format_json=response_format_json,
+                timeout_s=timeout_s,
+                thinking=bool(config.thinking),
+            )
+        except GeminiError as exc:
+            raise LLMRouterError(str(exc)) from exc
+        return
+
+    yield _chat(
+        config=config,
+        messages=messages,
+        response_format_json=response_format_json,
+        timeout_s=timeout_s,
+        on_token=None,
+    )
@@ -0,0 +1,242 @@
+"""Dynamic batching of chat requests for the in-process Transformers clients.
+
+The Hugging Face and Unsloth clients run `model.generate()` in the calling
+thread, one conversation at a time. Under concurrent traffic (backend
+threadpool, `max_workers` > 1 in full detection) most of the accelerator sits
+idle. With batching enabled, each loaded model gets a `DynamicBatcher`:
+
+- callers `submit()` a request and get a `concurrent.futures.Future`
+- a worker thread takes the first pending request, waits at most
+  `max_wait_ms` for more, and hands up to `max_batch_size` requests to the
+  model as one padded batch
+- results (or the batch's exception) are set on the individual futures
+
+`DynamicBatcher` itself knows nothing about models; the clients pass a
+`run_batch(items) -> results` callable.
+
+Configuration (environment):
+- `LLM_BATCH_MAX_SIZE`: requests per batch (default: 1, i.e. batching off).
+- `LLM_BATCH_MAX_WAIT_MS`: how long the first request of a batch may wait for
+  others (default: 10).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Deque, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Latency samples kept per batcher for the percentile metrics.
+_SAMPLES = 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class DynamicBatcher(Generic[T, R]):
+    """Request queue that runs pending items in batches on one worker thread."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], Sequence[R]],
+        *,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher",
+    ):
+        """Initialize the batcher and start its worker thread.
+
+        Args:
+            run_batch: Processes a list of items and returns one result per item, in order.
+            max_batch_size: Largest batch handed to `run_batch`.
+            max_wait_ms: Longest time the oldest pending item waits for the batch to fill.
+            name: Used for the worker thread and in `batching_stats()`.
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[T, Future, float]] = deque()
+        self._closed = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._wait_ms: Deque[float] = deque(maxlen=_SAMPLES)
+        self._batch_ms: Deque[float] = deque(maxlen=_SAMPLES)
+
+        self._worker = threading.Thread(target=self._loop, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queue `item`; the returned future resolves to its result."""
+
+        future: "Future[R]" = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            self._queue.append((item, future, time.perf_counter()))
+            self.submitted += 1
+            self._cond.notify()
+        return future
+
+    def _next_batch(self) -> List[Tuple[T, Future, float]]:
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+            deadline = self._queue[0][2] + self.max_wait_s
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            # Drop requests whose caller already gave up.
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                results = list(self.run_batch([item for item, _, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} items")
+            except BaseException as exc:
+                results, error = [], exc
+            else:
+                error = None
+            end = time.perf_counter()
+
+            with self._cond:
+                self.batches += 1
+                self.largest_batch = max(self.largest_batch, len(batch))
+                self._batch_ms.append((end - start) * 1000.0)
+                for _, _, queued_at in batch:
+                    self._wait_ms.append((start - queued_at) * 1000.0)
+                if error is None:
+                    self.completed += len(batch)
+                else:
+                    self.failed += len(batch)
+
+            for i, (_, future, _) in enumerate(batch):
+                if error is None:
+                    future.set_result(results[i])
+                else:
+                    future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and latency percentiles (ms)."""
+
+        with self._cond:
+            waits = list(self._wait_ms)
+            batch_ms = list(self._batch_ms)
+            done = self.completed + self.failed
+            return {
+                "queue_depth": len(self._queue),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "mean_batch_size": done / self.batches if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "queue_wait_ms_p50": _percentile(waits, 0.5),
+                "queue_wait_ms_p95": _percentile(waits, 0.95),
+                "batch_ms_p50": _percentile(batch_ms, 0.5),
+                "batch_ms_p95": _percentile(batch_ms, 0.95),
+            }
+
+    def close(self, *, wait: bool = True) -> None:
+        """Stop accepting requests; pending ones are still processed."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait and self._worker is not threading.current_thread():
+            self._worker.join()
+
+
+_BATCHERS: Dict[str, DynamicBatcher] = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def batching_enabled() -> bool:
+    return _env_int("LLM_BATCH_MAX_SIZE", 1) > 1
+
+
+def get_batcher(key: str, run_batch: Callable[[List[Any]], Sequence[Any]]) -> DynamicBatcher:
+    """Return the batcher for `key` (one per loaded model + generation settings), creating it once.
+
+    `run_batch` is only used when the batcher is created.
+    """
+
+    with _BATCHERS_LOCK:
+        batcher = _BATCHERS.get(key)
+        if batcher is None:
+            batcher = DynamicBatcher(
+                run_batch,
+                max_batch_size=_env_int("LLM_BATCH_MAX_SIZE", 1),
+                max_wait_ms=_env_float("LLM_BATCH_MAX_WAIT_MS", 10.0),
+                name=key,
+            )
+            _BATCHERS[key] = batcher
+        return batcher
+
+
+def batching_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every batcher, keyed by model."""
+
+    with _BATCHERS_LOCK:
+        batchers = dict(_BATCHERS)
+    return {key: b.stats() for key, b in batchers.items()}
+
+
+def wait_for(future: "Future[R]", timeout_s: Optional[float]) -> R:
+    """`future.result(timeout)`, cancelling the request if it has not started by the timeout.
+
+    Raises:
+        concurrent.futures.TimeoutError: if no result arrived within `timeout_s`.
+    """
+
+    try:
+        return future.result(timeout=timeout_s)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
@@ -11,7 +11,7 @@ to match the exported JSON format.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 from .json_utils import loads_strict_json
 from .narrative_prompts import SYSTEM_PROMPT_NARRATIVE, build_narrative_user_prompt
@@ -41,6 +41,7 @@ def annotate_narrative_event(
     mode: Literal["supplement", "modify", "recreate"] = "recreate",
     additional_prompt: Optional[str] = None,
     config: NarrativeAnnotatorConfig = NarrativeAnnotatorConfig(),
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     """Annotate a single narrative event within a story.
 
@@ -55,6 +56,8 @@ def annotate_narrative_event(
         mode: Annotation mode ("supplement", "modify", or "recreate").
         additional_prompt: Optional additional instructions from the user.
         config: Narrative annotator configuration.
+        on_token: Optional callback receiving raw model output deltas as they stream
+                  (used by the SSE endpoints). The return value is unchanged.
 
     Returns a dict representing the narrative event.
 
@@ -87,7 +90,7 @@ def annotate_narrative_event(
     ]
 
     try:
-        raw = chat(config=config.llm, messages=messages, response_format_json=True)
+        raw = chat(config=config.llm, messages=messages, response_format_json=True, on_token=on_token)
     except LLMRouterError as exc:
         raise NarrativeAnnotationError(str(exc)) from exc
 
@@ -25,6 +25,7 @@ import uuid
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
 
+from .embedding_cache import get_default_embedding_cache
 from .json_utils import loads_strict_json
 from .llm_router import LLMConfig, LLMRouterError, chat
 from .ollama_client import OllamaError, embed
@@ -289,6 +290,7 @@ def auto_segment_to_empty_narratives(
                 model=config.embedding_model,
                 inputs=[c.get("text") or "" for c in chunks],
                 timeout_s=600.0,
+                cache=get_default_embedding_cache(),
             )
         except OllamaError as exc:
             raise NarrativeSegmentationError(str(exc)) from exc
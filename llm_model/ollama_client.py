@@ -3,15 +3,37 @@
 Docs (Ollama): https://github.com/ollama/ollama/blob/main/docs/api.md
 
 We use /api/chat because it's better suited for structured prompting.
+
+HTTP connections are pooled and kept alive: the blocking functions (`chat`,
+`embed`, ...) share one `requests.Session`, and the asyncio variants (`achat`,
+`aembed`) share one `httpx.AsyncClient` per event loop whose in-flight requests
+are capped by a semaphore.
+
+Chat requests carry `keep_alive` so the model (and the KV cache of the last
+prompts) stays loaded between calls; Ollama then only evaluates the part of a
+prompt after the longest prefix it has cached. `usage_stats()` sums the
+`prompt_eval_count` Ollama reports, i.e. the prompt tokens actually evaluated.
+
+Configuration (environment):
+- `OLLAMA_POOL_CONNECTIONS`: max pooled connections per host (default: 16).
+- `OLLAMA_MAX_CONCURRENCY`: max concurrent async requests (default: 8).
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
 
 import requests
 
+if TYPE_CHECKING:
+    from .embedding_cache import EmbeddingCache
+
 
 @dataclass(frozen=True)
 class OllamaConfig:
@@ -33,11 +55,70 @@ class OllamaConfig:
     # Set to False to disable thinking mode, True to enable, None to use model default
     think: Optional[bool] = None
 
+    # How long Ollama keeps the model loaded after a request (e.g. "30m", "-1" = forever,
+    # None = server default of 5m). Keeping it loaded preserves the cached prompt prefix.
+    keep_alive: Optional[str] = "30m"
+
 
 class OllamaError(RuntimeError):
     pass
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+_USAGE: Dict[str, int] = {"requests": 0, "prompt_eval_count": 0, "eval_count": 0, "prompt_eval_duration_ns": 0}
+_USAGE_LOCK = threading.Lock()
+
+
+def _record_usage(data: Dict[str, Any]) -> None:
+    """Add the token counters of a final /api/chat response to the usage totals."""
+
+    with _USAGE_LOCK:
+        _USAGE["requests"] += 1
+        _USAGE["prompt_eval_count"] += int(data.get("prompt_eval_count") or 0)
+        _USAGE["eval_count"] += int(data.get("eval_count") or 0)
+        _USAGE["prompt_eval_duration_ns"] += int(data.get("prompt_eval_duration") or 0)
+
+
+def usage_stats() -> Dict[str, int]:
+    """Return process-wide chat token counters (prompt tokens evaluated, tokens generated)."""
+
+    with _USAGE_LOCK:
+        return dict(_USAGE)
+
+
+def reset_usage_stats() -> None:
+    with _USAGE_LOCK:
+        for key in _USAGE:
+            _USAGE[key] = 0
+
+
+def _http_session() -> requests.Session:
+    """Return the process-wide keep-alive session used by the blocking calls."""
+
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            from requests.adapters import HTTPAdapter
+
+            pool = _env_int("OLLAMA_POOL_CONNECTIONS", 16)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
 def list_local_models(
     *,
     base_url: str,
@@ -53,7 +134,7 @@ def list_local_models(
 
     url = f"{base_url.rstrip('/')}/api/tags"
     try:
-        resp = requests.get(url, timeout=timeout_s)
+        resp = _http_session().get(url, timeout=timeout_s)
     except requests.RequestException as exc:
         raise OllamaError(f"Failed to reach Ollama at {url}: {exc}") from exc
 
@@ -87,11 +168,15 @@ def embed(
     inputs: Sequence[str],
     instruction: str | None = None,
     timeout_s: float = 600.0,
+    cache: Optional["EmbeddingCache"] = None,
 ) -> List[List[float]]:
     """Generate embeddings for one or more input strings.
 
     This function prefers Ollama's batch endpoint when available.
 
+    When `cache` is given, inputs already present in the cache are not sent to
+    Ollama; only the misses (deduplicated) are embedded and then stored.
+
     Endpoints (varies by Ollama version):
     - POST /api/embed  (batch): {model, input: [..]} -> {embeddings: [[..], ...]}
     - POST /api/embeddings (single): {model, prompt} -> {embedding: [..]}
@@ -103,6 +188,7 @@ def embed(
         instruction: Optional instruction to prepend to each input text for instruction-based
                     embeddings. If provided, each input will be formatted as "{instruction} {text}".
         timeout_s: HTTP timeout.
+        cache: Optional EmbeddingCache (see `llm_model.embedding_cache`).
 
     Returns:
         List of embedding vectors aligned with inputs.
@@ -111,10 +197,97 @@ def embed(
     if not inputs:
         return []
 
+    if cache is None:
+        return _embed_uncached(
+            base_url=base_url,
+            model=model,
+            inputs=inputs,
+            instruction=instruction,
+            timeout_s=timeout_s,
+        )
+
+    texts, out, missing = _cache_lookup(cache, model=model, inputs=inputs, instruction=instruction)
+    if missing:
+        vectors = _embed_uncached(
+            base_url=base_url,
+            model=model,
+            inputs=missing,
+            instruction=instruction,
+            timeout_s=timeout_s,
+        )
+        out = _cache_fill(
+            cache,
+            model=model,
+            texts=texts,
+            out=out,
+            missing=missing,
+            vectors=vectors,
+            instruction=instruction,
+        )
+
+    return out  # type: ignore[return-value]
+
+
+def _cache_lookup(
+    cache: "EmbeddingCache",
+    *,
+    model: str,
+    inputs: Sequence[str],
+    instruction: str | None,
+):
+    """Return (texts, cached vectors or None, distinct missing texts)."""
+
+    texts = list(inputs)
+    out = cache.get_many(model=model, texts=texts, instruction=instruction)
+
+    # Embed each distinct missing text once.
+    missing: List[str] = []
+    seen = set()
+    for text, vec in zip(texts, out):
+        if vec is None and text not in seen:
+            seen.add(text)
+            missing.append(text)
+    return texts, out, missing
+
+
+def _cache_fill(
+    cache: "EmbeddingCache",
+    *,
+    model: str,
+    texts: List[str],
+    out: List[Optional[List[float]]],
+    missing: List[str],
+    vectors: List[List[float]],
+    instruction: str | None,
+) -> List[List[float]]:
+    if len(vectors) != len(missing):
+        raise OllamaError(
+            f"Ollama returned {len(vectors)} embeddings for {len(missing)} inputs"
+        )
+    cache.put_many(model=model, texts=missing, vectors=vectors, instruction=instruction)
+    fresh = dict(zip(missing, vectors))
+    return [vec if vec is not None else fresh[text] for text, vec in zip(texts, out)]
+
+
+def _apply_instruction(inputs: Sequence[str], instruction: str | None) -> List[str]:
+    if not instruction:
+        return list(inputs)
+    return [f"{instruction} {text}" if text.strip() else text for text in inputs]
+
+
+def _embed_uncached(
+    *,
+    base_url: str,
+    model: str,
+    inputs: Sequence[str],
+    instruction: str | None,
+    timeout_s: float,
+) -> List[List[float]]:
+    """Call Ollama's embedding endpoints (no caching)."""
+
     # Apply instruction if provided
-    processed_inputs = list(inputs)
-    if instruction:
-        processed_inputs = [f"{instruction} {text}" if text.strip() else text for text in inputs]
+    processed_inputs = _apply_instruction(inputs, instruction)
+    session = _http_session()
 
     base = base_url.rstrip("/")
 
@@ -125,7 +298,7 @@ def embed(
         "input": processed_inputs,
     }
     try:
-        resp = requests.post(url_batch, json=payload_batch, timeout=timeout_s)
+        resp = session.post(url_batch, json=payload_batch, timeout=timeout_s)
         if resp.status_code == 200:
             data = resp.json()
             embeddings = data.get("embeddings")
@@ -149,7 +322,7 @@ def embed(
             "prompt": text,
         }
         try:
-            resp = requests.post(url_single, json=payload_single, timeout=timeout_s)
+            resp = session.post(url_single, json=payload_single, timeout=timeout_s)
         except requests.RequestException as exc:
             raise OllamaError(f"Failed to reach Ollama at {url_single}: {exc}") from exc
 
@@ -196,7 +369,85 @@ def chat(
     """
 
     url = f"{config.base_url.rstrip('/')}/api/chat"
+    payload = _chat_payload(config=config, messages=messages, response_format_json=response_format_json)
+
+    try:
+        resp = _http_session().post(url, json=payload, timeout=timeout_s)
+    except requests.RequestException as exc:
+        raise OllamaError(f"Failed to reach Ollama at {url}: {exc}") from exc
+
+    if resp.status_code != 200:
+        raise OllamaError(
+            f"Ollama /api/chat failed: HTTP {resp.status_code}: {resp.text[:500]}"
+        )
+
+    try:
+        data = resp.json()
+    except ValueError as exc:
+        raise OllamaError(f"Ollama returned non-JSON response: {resp.text[:500]}") from exc
+
+    return _chat_content(data)
+
+
+def chat_stream(
+    *,
+    config: OllamaConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+) -> Iterator[str]:
+    """Stream a chat response, yielding content deltas as Ollama generates them.
+
+    Same request as `chat()` but with `"stream": true`; Ollama answers with one
+    JSON object per line. `"".join(chat_stream(...))` equals `chat(...)`.
+
+    Raises:
+        OllamaError: on non-200 response, an error line, or invalid payload.
+    """
+
+    url = f"{config.base_url.rstrip('/')}/api/chat"
+    payload = _chat_payload(
+        config=config, messages=messages, response_format_json=response_format_json, stream=True
+    )
 
+    try:
+        resp = _http_session().post(url, json=payload, timeout=timeout_s, stream=True)
+    except requests.RequestException as exc:
+        raise OllamaError(f"Failed to reach Ollama at {url}: {exc}") from exc
+
+    with resp:
+        if resp.status_code != 200:
+            raise OllamaError(
+                f"Ollama /api/chat failed: HTTP {resp.status_code}: {resp.text[:500]}"
+            )
+        try:
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as exc:
+                    raise OllamaError(f"Ollama returned non-JSON stream line: {line[:500]!r}") from exc
+                if data.get("error"):
+                    raise OllamaError(f"Ollama /api/chat stream failed: {data['error']}")
+                message = data.get("message")
+                content = message.get("content") if isinstance(message, dict) else None
+                if isinstance(content, str) and content:
+                    yield content
+                if data.get("done"):
+                    _record_usage(data)
+                    break
+        except requests.RequestException as exc:
+            raise OllamaError(f"Ollama stream from {url} was interrupted: {exc}") from exc
+
+
+def _chat_payload(
+    *,
+    config: OllamaConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool,
+    stream: bool = False,
+) -> Dict[str, Any]:
     options: Dict[str, Any] = {
         "temperature": config.temperature,
         "top_p": config.top_p,
@@ -221,29 +472,21 @@ def chat(
     payload: Dict[str, Any] = {
         "model": config.model,
         "messages": messages,
-        "stream": False,
+        "stream": stream,
         "options": options,
     }
+    if config.keep_alive is not None:
+        payload["keep_alive"] = config.keep_alive
 
     # Ollama recently supports a structured response hint. If not supported,
     # it is ignored by older versions.
     if response_format_json:
         payload["format"] = "json"
+    return payload
 
-    try:
-        resp = requests.post(url, json=payload, timeout=timeout_s)
-    except requests.RequestException as exc:
-        raise OllamaError(f"Failed to reach Ollama at {url}: {exc}") from exc
 
-    if resp.status_code != 200:
-        raise OllamaError(
-            f"Ollama /api/chat failed: HTTP {resp.status_code}: {resp.text[:500]}"
-        )
-
-    try:
-        data = resp.json()
-    except ValueError as exc:
-        raise OllamaError(f"Ollama returned non-JSON response: {resp.text[:500]}") from exc
+def _chat_content(data: Dict[str, Any]) -> str:
+    _record_usage(data)
 
     # Expected shape: { message: { role: ..., content: ... }, ... }
     message = data.get("message")
@@ -260,3 +503,223 @@ def chat(
     # Content can be empty string in some cases (model refused to answer, etc.)
     # Return as-is - caller should handle empty responses
     return content
+
+
+# -------------------------
+# asyncio client
+# -------------------------
+
+
+class AsyncOllamaClient:
+    """asyncio Ollama client on one keep-alive `httpx.AsyncClient`.
+
+    At most `max_concurrency` requests are in flight at once; further calls wait
+    on a semaphore instead of opening more connections. An instance is bound to
+    the event loop it is first used on (use `get_async_client()` for a shared one).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        max_connections: Optional[int] = None,
+    ):
+        try:
+            import httpx  # type: ignore
+        except ImportError as exc:  # pragma: no cover
+            raise OllamaError("The async Ollama client requires httpx (pip install httpx)") from exc
+
+        self.max_concurrency = max_concurrency or _env_int("OLLAMA_MAX_CONCURRENCY", 8)
+        self.max_connections = max_connections or _env_int("OLLAMA_POOL_CONNECTIONS", 16)
+
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=None,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _post(self, url: str, payload: Dict[str, Any], timeout_s: float):
+        async with self._semaphore:
+            try:
+                return await self._client.post(url, json=payload, timeout=timeout_s)
+            except self._httpx.HTTPError as exc:
+                raise OllamaError(f"Failed to reach Ollama at {url}: {exc}") from exc
+
+    async def chat(
+        self,
+        *,
+        config: OllamaConfig,
+        messages: List[Dict[str, str]],
+        response_format_json: bool = True,
+        timeout_s: float = 300.0,
+    ) -> str:
+        """Async counterpart of `chat()`."""
+
+        url = f"{config.base_url.rstrip('/')}/api/chat"
+        payload = _chat_payload(config=config, messages=messages, response_format_json=response_format_json)
+        resp = await self._post(url, payload, timeout_s)
+
+        if resp.status_code != 200:
+            raise OllamaError(
+                f"Ollama /api/chat failed: HTTP {resp.status_code}: {resp.text[:500]}"
+            )
+        try:
+            data = resp.json()
+        except ValueError as exc:
+            raise OllamaError(f"Ollama returned non-JSON response: {resp.text[:500]}") from exc
+        return _chat_content(data)
+
+    async def embed(
+        self,
+        *,
+        base_url: str,
+        model: str,
+        inputs: Sequence[str],
+        instruction: str | None = None,
+        timeout_s: float = 600.0,
+        cache: Optional["EmbeddingCache"] = None,
+    ) -> List[List[float]]:
+        """Async counterpart of `embed()` (same endpoints, fallback and caching)."""
+
+        if not inputs:
+            return []
+        if cache is None:
+            return await self._embed_uncached(
+                base_url=base_url, model=model, inputs=inputs, instruction=instruction, timeout_s=timeout_s
+            )
+
+        # The cache takes a lock and commits to SQLite, so keep it off the event loop.
+        texts, out, missing = await asyncio.to_thread(
+            _cache_lookup, cache, model=model, inputs=inputs, instruction=instruction
+        )
+        if missing:
+            vectors = await self._embed_uncached(
+                base_url=base_url, model=model, inputs=missing, instruction=instruction, timeout_s=timeout_s
+            )
+            out = await asyncio.to_thread(
+                _cache_fill,
+                cache,
+                model=model,
+                texts=texts,
+                out=out,
+                missing=missing,
+                vectors=vectors,
+                instruction=instruction,
+            )
+        return out  # type: ignore[return-value]
+
+    async def _embed_uncached(
+        self,
+        *,
+        base_url: str,
+        model: str,
+        inputs: Sequence[str],
+        instruction: str | None,
+        timeout_s: float,
+    ) -> List[List[float]]:
+        processed_inputs = _apply_instruction(inputs, instruction)
+        base = base_url.rstrip("/")
+
+        # 1) Prefer batch endpoint
+        url_batch = f"{base}/api/embed"
+        try:
+            resp = await self._post(url_batch, {"model": model, "input": processed_inputs}, timeout_s)
+            if resp.status_code == 200:
+                embeddings = resp.json().get("embeddings")
+                if isinstance(embeddings, list) and all(isinstance(v, list) for v in embeddings):
+                    return embeddings  # type: ignore[return-value]
+        except OllamaError:
+            # Fall back to single endpoint below.
+            pass
+        except ValueError as exc:
+            raise OllamaError(
+                f"Ollama returned non-JSON response on {url_batch}: {resp.text[:500]}"  # type: ignore[name-defined]
+            ) from exc
+
+        # 2) Fallback: single embedding endpoint, requests issued concurrently
+        url_single = f"{base}/api/embeddings"
+
+        async def one(text: str) -> List[float]:
+            r = await self._post(url_single, {"model": model, "prompt": text}, timeout_s)
+            if r.status_code != 200:
+                raise OllamaError(f"Ollama /api/embeddings failed: HTTP {r.status_code}: {r.text[:500]}")
+            try:
+                data = r.json()
+            except ValueError as exc:
+                raise OllamaError(f"Ollama returned non-JSON response on {url_single}: {r.text[:500]}") from exc
+            emb = data.get("embedding")
+            if not isinstance(emb, list):
+                raise OllamaError(f"Unexpected embeddings response shape: {data}")
+            return emb
+
+        return list(await asyncio.gather(*(one(text) for text in processed_inputs)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# One client per event loop (httpx clients and semaphores are loop-bound).
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOllamaClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> AsyncOllamaClient:
+    """Return the shared async client for the running event loop."""
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = AsyncOllamaClient()
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client of the running event loop (e.g. on app shutdown)."""
+
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def achat(
+    *,
+    config: OllamaConfig,
+    messages: List[Dict[str, str]],
+    response_format_json: bool = True,
+    timeout_s: float = 300.0,
+) -> str:
+    """Async `chat()` on the shared pooled client."""
+
+    return await get_async_client().chat(
+        config=config,
+        messages=messages,
+        response_format_json=response_format_json,
+        timeout_s=timeout_s,
+    )
+
+
+async def aembed(
+    *,
+    base_url: str,
+    model: str,
+    inputs: Sequence[str],
+    instruction: str | None = None,
+    timeout_s: float = 600.0,
+    cache: Optional["EmbeddingCache"] = None,
+) -> List[List[float]]:
+    """Async `embed()` on the shared pooled client."""
+
+    return await get_async_client().embed(
+        base_url=base_url,
+        model=model,
+        inputs=inputs,
+        instruction=instruction,
+        timeout_s=timeout_s,
+        cache=cache,
+    )
@@ -0,0 +1,205 @@
+"""Prompt-prefix KV cache for the in-process Transformers clients.
+
+The full detection chains send, per step, prompts that share a long prefix
+(instructions, taxonomy guide, story summary) and differ only in the span-specific
+suffix. Ollama reuses the KV state of a cached prefix on its own; for the
+Hugging Face and Unsloth clients this module does the same:
+
+- after a generation, the KV cache of the prompt tokens is stored together with
+  the prompt token ids (a few entries per model, LRU)
+- before the next generation, the entry sharing the longest token prefix with the
+  new prompt is copied, cropped to that prefix and passed to `generate()` as
+  `past_key_values`, so only the remaining suffix is run through the model
+
+Only caches that support `crop()` (Transformers `DynamicCache`) are reused; with
+anything else, `generate_with_prefix_cache` behaves like a plain `generate()`.
+
+Configuration (environment):
+- `LLM_PREFIX_CACHE_ENTRIES`: cached prompts per model (default: 0, i.e. off).
+  Every entry holds a full prompt's KV cache in device memory and each hit
+  deep-copies one, so keep this small (2-4 covers one step type per chain).
+- `LLM_PREFIX_CACHE_MIN_TOKENS`: shortest prefix worth reusing (default: 32).
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+def common_prefix_length(a: Sequence[int], b: Sequence[int]) -> int:
+    """Number of leading tokens shared by `a` and `b`."""
+
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+
+class PrefixKVCache:
+    """LRU of (prompt token ids, KV cache) pairs for one model.
+
+    Safe to share between threads; stored caches are never handed out directly,
+    only cropped copies.
+    """
+
+    def __init__(self, *, max_entries: int = 4, min_prefix_tokens: int = 32):
+        self.max_entries = max(0, int(max_entries))
+        self.min_prefix_tokens = max(1, int(min_prefix_tokens))
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, ...], Any]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.prompt_tokens = 0
+        self.reused_tokens = 0
+
+    def lookup(self, input_ids: Sequence[int]) -> Tuple[int, Optional[Any]]:
+        """Return (n_tokens, kv_cache) for the longest cached prefix of `input_ids`.
+
+        The returned cache is a private copy cropped to `n_tokens`, which is always
+        shorter than the prompt so that at least one token is left to evaluate.
+        Returns (0, None) on a miss.
+        """
+
+        ids = tuple(int(t) for t in input_ids)
+        best_key: Optional[Tuple[int, ...]] = None
+        best_len = 0
+        with self._lock:
+            self.prompt_tokens += len(ids)
+            for key in self._entries:
+                n = common_prefix_length(key, ids)
+                if n > best_len:
+                    best_key, best_len = key, n
+            best_len = min(best_len, len(ids) - 1)
+            if best_key is None or best_len < self.min_prefix_tokens:
+                self.misses += 1
+                return 0, None
+            self._entries.move_to_end(best_key)
+            stored = self._entries[best_key]
+            self.hits += 1
+            self.reused_tokens += best_len
+
+        # Copy outside the lock: stored caches are never mutated after `store()`,
+        # and the copy of a long prompt's KV state is not cheap.
+        cache = copy.deepcopy(stored)
+        cache.crop(best_len)
+        return best_len, cache
+
+    def store(self, input_ids: Sequence[int], past_key_values: Any) -> None:
+        """Remember the KV cache of a prompt.
+
+        `past_key_values` may also cover generated tokens (as returned by
+        `generate()`); it is cropped to the prompt in place, so callers must not
+        use it afterwards.
+        """
+
+        if self.max_entries <= 0 or past_key_values is None or not hasattr(past_key_values, "crop"):
+            return
+        ids = tuple(int(t) for t in input_ids)
+        if len(ids) < self.min_prefix_tokens:
+            return
+        past_key_values.crop(len(ids))
+        with self._lock:
+            self._entries[ids] = past_key_values
+            self._entries.move_to_end(ids)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "prompt_tokens": self.prompt_tokens,
+                "reused_tokens": self.reused_tokens,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHES: Dict[str, PrefixKVCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_prefix_cache(model_key: str) -> Optional[PrefixKVCache]:
+    """Return the prefix cache for a loaded model, or None unless enabled via env."""
+
+    max_entries = _env_int("LLM_PREFIX_CACHE_ENTRIES", 0)
+    if max_entries <= 0:
+        return None
+    with _CACHES_LOCK:
+        cache = _CACHES.get(model_key)
+        if cache is None:
+            cache = PrefixKVCache(
+                max_entries=max_entries,
+                min_prefix_tokens=_env_int("LLM_PREFIX_CACHE_MIN_TOKENS", 32),
+            )
+            _CACHES[model_key] = cache
+        return cache
+
+
+def prefix_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Stats of every model's prefix cache, keyed by model."""
+
+    with _CACHES_LOCK:
+        caches = dict(_CACHES)
+    return {key: cache.stats() for key, cache in caches.items()}
+
+
+def generate_with_prefix_cache(
+    model: Any,
+    inputs: Dict[str, Any],
+    cache: Optional[PrefixKVCache],
+    **generation_kwargs: Any,
+) -> Any:
+    """`model.generate(**inputs, **generation_kwargs)` reusing a cached prompt prefix.
+
+    Args:
+        model: A Transformers causal LM.
+        inputs: Tokenizer output for a single prompt (`input_ids`, `attention_mask`).
+        cache: The model's prefix cache (None = plain generate).
+
+    Returns:
+        The generated token tensor, shaped (1, prompt + new tokens) like `generate()`.
+    """
+
+    if cache is None:
+        return model.generate(**inputs, **generation_kwargs)
+
+    input_ids: List[int] = inputs["input_ids"][0].tolist()
+    _, past = cache.lookup(input_ids)
+
+    kwargs = dict(generation_kwargs)
+    kwargs["return_dict_in_generate"] = True
+    if past is not None:
+        kwargs["past_key_values"] = past
+    try:
+        outputs = model.generate(**inputs, **kwargs)
+    except Exception as exc:
+        if past is None:
+            raise
+        # Model/generation path without prefix support: stop caching and retry from scratch.
+        print(f"[INFO] Prompt-prefix KV reuse failed ({exc}); disabling it for this model.", flush=True)
+        cache.clear()
+        cache.max_entries = 0
+        kwargs.pop("past_key_values", None)
+        outputs = model.generate(**inputs, **kwargs)
+
+    cache.store(input_ids, getattr(outputs, "past_key_values", None))
+    return outputs.sequences
@@ -7,10 +7,10 @@ and extract relevant information based on the classification.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from ..json_utils import loads_strict_json
-from ..llm_router import LLMConfig, LLMRouterError, chat
+from ..llm_router import LLMConfig, LLMRouterError, chat, chat_many
 from .stac_prompts import (
     SYSTEM_PROMPT_STAC_ANALYSIS,
     build_stac_analysis_prompt,
@@ -66,6 +66,34 @@ def analyze_stac(
         STACAnalysisError: on model/JSON failure.
     """
 
+    messages = _build_stac_messages(
+        sentence=sentence,
+        story_context=story_context,
+        use_context=use_context,
+        previous_sentence=previous_sentence,
+        next_sentence=next_sentence,
+        use_neighboring_sentences=use_neighboring_sentences,
+    )
+
+    try:
+        raw = chat(config=config.llm, messages=messages, response_format_json=True)
+    except LLMRouterError as exc:
+        raise STACAnalysisError(str(exc)) from exc
+
+    return _parse_stac_response(raw)
+
+
+def _build_stac_messages(
+    *,
+    sentence: str,
+    story_context: Optional[str],
+    use_context: bool,
+    previous_sentence: Optional[str],
+    next_sentence: Optional[str],
+    use_neighboring_sentences: bool,
+) -> List[Dict[str, str]]:
+    """Validate the inputs of one sentence and build its chat messages."""
+
     if not isinstance(sentence, str) or not sentence.strip():
         raise STACAnalysisError("`sentence` must be a non-empty string")
 
@@ -108,20 +136,16 @@ def analyze_stac(
             ),
         },
     ]
+    return messages
 
-    try:
-        raw = chat(config=config.llm, messages=messages, response_format_json=True)
-    except LLMRouterError as exc:
-        raise STACAnalysisError(str(exc)) from exc
 
+def _parse_stac_response(raw: str) -> Dict[str, Any]:
     data = loads_strict_json(raw)
     if not isinstance(data, dict):
         raise STACAnalysisError("Model output JSON must be an object")
 
     # Normalize output to ensure it matches the expected schema
-    result = _normalize_stac_data(data)
-
-    return result
+    return _normalize_stac_data(data)
 
 
 def _normalize_stac_data(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -194,11 +218,12 @@ def analyze_stac_batch(
     use_context: bool = True,
     use_neighboring_sentences: bool = False,
     config: STACAnalyzerConfig = STACAnalyzerConfig(),
+    max_concurrency: int = 4,
 ) -> List[Dict[str, Any]]:
     """Analyze multiple sentences in batch using STAC classification.
     
-    This function is optimized for batch processing and can leverage
-    vLLM's batch inference capabilities for faster processing.
+    Sentences are sent through `llm_router.chat_many`: concurrent requests for
+    Ollama/Gemini, batched generation for Hugging Face (incl. vLLM) and Unsloth.
     
     Args:
         sentences: List of sentences to analyze (should be consecutive sentences from a story).
@@ -206,9 +231,11 @@ def analyze_stac_batch(
         use_context: Whether to use story context in the analysis.
         use_neighboring_sentences: Whether to use neighboring sentences as auxiliary information.
         config: STAC analyzer configuration.
+        max_concurrency: Requests in flight (or batch size for local models).
     
     Returns:
-        List of analysis results, one for each sentence in the same order.
+        List of analysis results, one for each sentence in the same order. A sentence
+        that fails gets a "situation" result whose explanation starts with "Error:".
     """
 
     if not isinstance(sentences, list) or not sentences:
@@ -221,89 +248,8 @@ def analyze_stac_batch(
     else:
         story_context = None
 
-    # Check if using vLLM (better for batch processing)
-    use_vllm = False
-    if hasattr(config.llm, 'huggingface') and hasattr(config.llm.huggingface, 'use_vllm'):
-        use_vllm = config.llm.huggingface.use_vllm
-
-    # For vLLM, we can do true batch inference
-    if use_vllm:
-        return _analyze_stac_batch_vllm(
-            sentences=sentences,
-            story_context=story_context,
-            use_context=use_context,
-            use_neighboring_sentences=use_neighboring_sentences,
-            config=config,
-        )
-
-    # For transformers, process in parallel (concurrent requests)
-    # Note: This is not true batching but can still be faster than sequential
-    return _analyze_stac_batch_transformers(
-        sentences=sentences,
-        story_context=story_context,
-        use_context=use_context,
-        use_neighboring_sentences=use_neighboring_sentences,
-        config=config,
-    )
-
-
-def _analyze_stac_batch_vllm(
-    *,
-    sentences: List[str],
-    story_context: Optional[str],
-    use_context: bool,
-    use_neighboring_sentences: bool,
-    config: STACAnalyzerConfig,
-) -> List[Dict[str, Any]]:
-    """Batch processing using vLLM (true batch inference)."""
-    try:
-        from vllm import LLM, SamplingParams
-        from transformers import AutoTokenizer
-    except ImportError:
-        # Fallback to transformers batch processing
-        return _analyze_stac_batch_transformers(
-            sentences=sentences,
-            story_context=story_context,
-            use_context=use_context,
-            use_neighboring_sentences=use_neighboring_sentences,
-            config=config,
-        )
-
-    # Get vLLM model from cache (reuse existing model)
-    from ..huggingface_client import _chat_with_vllm
-
-    if not hasattr(_chat_with_vllm, "_vllm_cache"):
-        # Fallback if vLLM not initialized
-        return _analyze_stac_batch_transformers(
-            sentences=sentences,
-            story_context=story_context,
-            use_context=use_context,
-            use_neighboring_sentences=use_neighboring_sentences,
-            config=config,
-        )
-
-    cache_key = f"vllm::{config.llm.huggingface.model}"
-    if cache_key not in _chat_with_vllm._vllm_cache:
-        # Fallback if model not loaded
-        return _analyze_stac_batch_transformers(
-            sentences=sentences,
-            story_context=story_context,
-            use_context=use_context,
-            use_neighboring_sentences=use_neighboring_sentences,
-            config=config,
-        )
-
-    llm = _chat_with_vllm._vllm_cache[cache_key]
-
-    # Prepare tokenizer for prompt formatting
-    try:
-        tokenizer = AutoTokenizer.from_pretrained(
-            config.llm.huggingface.model, trust_remote_code=True)
-    except Exception:
-        tokenizer = None
-
-    # Prepare all prompts in batch
-    prompts = []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(sentences)
+    requests: List[Tuple[int, List[Dict[str, str]]]] = []
     for idx, sentence in enumerate(sentences):
         previous_sentence = None
         next_sentence = None
@@ -314,127 +260,44 @@ def _analyze_stac_batch_vllm(
             if idx < len(sentences) - 1:
                 next_sentence = sentences[idx + 1]
 
-        # Format prompt
-        system_prompt = SYSTEM_PROMPT_STAC_ANALYSIS
-        if True:  # response_format_json
-            if "JSON" not in system_prompt.upper():
-                system_prompt += "\n\nYou must respond with valid JSON only (no markdown, no commentary)."
-
-        chat_messages = [
-            {"role": "user", "content": build_stac_analysis_prompt(
+        try:
+            messages = _build_stac_messages(
                 sentence=sentence,
                 story_context=story_context,
                 use_context=use_context,
                 previous_sentence=previous_sentence,
                 next_sentence=next_sentence,
                 use_neighboring_sentences=use_neighboring_sentences,
-            )}
-        ]
-
-        # Format using tokenizer if available
-        if tokenizer and hasattr(tokenizer, "apply_chat_template"):
-            try:
-                prompt = tokenizer.apply_chat_template(
-                    chat_messages,
-                    tokenize=False,
-                    add_generation_prompt=True,
-                )
-                if system_prompt:
-                    prompt = f"<|im_start|>system\n{system_prompt}<|im_end|>\n{prompt}"
-            except Exception:
-                prompt = f"System: {system_prompt}\n\nUser: {chat_messages[0]['content']}\nAssistant: "
-        else:
-            prompt = f"System: {system_prompt}\n\nUser: {chat_messages[0]['content']}\nAssistant: "
-
-        prompts.append(prompt)
-
-    # Generate with vLLM in batch (true batch processing)
-    sampling_params = SamplingParams(
-        temperature=config.llm.huggingface.temperature,
-        top_p=config.llm.huggingface.top_p,
-        max_tokens=config.llm.huggingface.max_new_tokens,
+            )
+        except STACAnalysisError as e:
+            results[idx] = _error_result(e)
+            continue
+        requests.append((idx, messages))
+
+    responses = chat_many(
+        config=config.llm,
+        messages_list=[messages for _, messages in requests],
+        max_concurrency=max_concurrency,
+        response_format_json=True,
     )
+    for (idx, _), response in zip(requests, responses):
+        try:
+            if not response.ok:
+                raise STACAnalysisError(str(response.error))
+            results[idx] = _parse_stac_response(response.text or "")
+        except Exception as e:
+            results[idx] = _error_result(e)
 
-    try:
-        # True batch inference: process all prompts at once
-        outputs = llm.generate(prompts, sampling_params)
-
-        # Parse results
-        results = []
-        for output in outputs:
-            try:
-                raw = output.outputs[0].text.strip()
-                data = loads_strict_json(raw)
-                if not isinstance(data, dict):
-                    raise STACAnalysisError(
-                        "Model output JSON must be an object")
-                result = _normalize_stac_data(data)
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "stac_category": "situation",
-                    "location": "",
-                    "task_roles": [],
-                    "doers": [],
-                    "receivers": [],
-                    "changed_state": "",
-                    "explanation": f"Error: {str(e)}",
-                })
-
-        return results
-    except Exception as e:
-        # Fallback to transformers batch processing
-        return _analyze_stac_batch_transformers(
-            sentences=sentences,
-            story_context=story_context,
-            use_context=use_context,
-            use_neighboring_sentences=use_neighboring_sentences,
-            config=config,
-        )
-
-
-def _analyze_stac_batch_transformers(
-    *,
-    sentences: List[str],
-    story_context: Optional[str],
-    use_context: bool,
-    use_neighboring_sentences: bool,
-    config: STACAnalyzerConfig,
-) -> List[Dict[str, Any]]:
-    """Batch processing using transformers (sequential but optimized)."""
-    # For transformers, just call analyze_stac for each sentence
-    # The model will be cached, so this is still efficient
-    results = []
-    for idx, sentence in enumerate(sentences):
-        previous_sentence = None
-        next_sentence = None
+    return [r if r is not None else _error_result(STACAnalysisError("No result")) for r in results]
 
-        if use_neighboring_sentences:
-            if idx > 0:
-                previous_sentence = sentences[idx - 1]
-            if idx < len(sentences) - 1:
-                next_sentence = sentences[idx + 1]
 
-        try:
-            result = analyze_stac(
-                sentence=sentence,
-                story_context=story_context,
-                use_context=use_context,
-                previous_sentence=previous_sentence,
-                next_sentence=next_sentence,
-                use_neighboring_sentences=use_neighboring_sentences,
-                config=config,
-            )
-            results.append(result)
-        except Exception as e:
-            results.append({
-                "stac_category": "situation",
-                "location": "",
-                "task_roles": [],
-                "doers": [],
-                "receivers": [],
-                "changed_state": "",
-                "explanation": f"Error: {str(e)}",
-            })
-
-    return results
+def _error_result(error: Exception) -> Dict[str, Any]:
+    return {
+        "stac_category": "situation",
+        "location": "",
+        "task_roles": [],
+        "doers": [],
+        "receivers": [],
+        "changed_state": "",
+        "explanation": f"Error: {str(error)}",
+    }
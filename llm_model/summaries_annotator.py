@@ -16,7 +16,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .json_utils import loads_strict_json
-from .llm_router import LLMConfig, LLMRouterError, chat
+from .llm_router import LLMConfig, LLMRouterError, chat, chat_many
 
 
 @dataclass(frozen=True)
@@ -26,6 +26,9 @@ class SummariesAnnotatorConfig:
     # Keep requests small-ish to reduce context overflows.
     max_paragraphs_per_batch: int = 20
 
+    # Paragraph batches sent to the LLM concurrently (see llm_router.chat_many).
+    max_concurrency: int = 4
+
 
 class SummariesAnnotationError(RuntimeError):
     pass
@@ -181,20 +184,29 @@ def annotate_summaries(
     per_paragraph_out: Dict[str, str] = {}
 
     max_batch = max(1, int(config.max_paragraphs_per_batch or 20))
+    messages_list = []
     for start in range(0, len(paragraphs), max_batch):
         batch = [(i, paragraphs[i]) for i in range(start, min(len(paragraphs), start + max_batch))]
+        messages_list.append(
+            [
+                {"role": "system", "content": _system_prompt()},
+                {"role": "user", "content": _user_prompt_paragraph_batch(paragraphs=batch, language=lang)},
+            ]
+        )
 
-        messages = [
-            {"role": "system", "content": _system_prompt()},
-            {"role": "user", "content": _user_prompt_paragraph_batch(paragraphs=batch, language=lang)},
-        ]
+    responses = chat_many(
+        config=config.llm,
+        messages_list=messages_list,
+        max_concurrency=config.max_concurrency,
+        response_format_json=True,
+        timeout_s=600.0,
+    )
 
-        try:
-            raw = chat(config=config.llm, messages=messages, response_format_json=True, timeout_s=600.0)
-        except LLMRouterError as exc:
-            raise SummariesAnnotationError(str(exc)) from exc
+    for response in responses:
+        if not response.ok:
+            raise SummariesAnnotationError(str(response.error)) from response.error
 
-        data = loads_strict_json(raw)
+        data = loads_strict_json(response.text or "")
         if not isinstance(data, dict):
             raise SummariesAnnotationError("Model output JSON must be an object")
 
@@ -0,0 +1,95 @@
+"""Unit tests for the two-level embedding cache."""
+
+import pytest
+
+from llm_model import ollama_client
+from llm_model.embedding_cache import EmbeddingCache, embedding_cache_key
+
+
+def test_key_scheme():
+    key = embedding_cache_key(model="m", text="wolf")
+
+    assert key == embedding_cache_key(model="m", text="wolf", instruction=None)
+    assert key == embedding_cache_key(model="m", text="wolf", instruction="")
+    assert key != embedding_cache_key(model="other", text="wolf")
+    assert key != embedding_cache_key(model="m", text="wolf", instruction="Represent the motif:")
+    assert key != embedding_cache_key(model="m", text="fox")
+    # Fields are separated, so shifting text between them changes the key.
+    assert embedding_cache_key(model="ab", text="c") != embedding_cache_key(model="a", text="bc")
+
+
+def test_get_many_aligns_hits_and_misses():
+    cache = EmbeddingCache(None)
+    cache.put_many(model="m", texts=["a", "b"], vectors=[[1.0, 2.0], [3.0, 4.0]])
+
+    assert cache.get_many(model="m", texts=["b", "x", "a", "b"]) == [[3.0, 4.0], None, [1.0, 2.0], [3.0, 4.0]]
+    assert cache.get(model="other", text="a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["memory_hits"]) == (3, 2, 3)
+
+
+def test_returned_vectors_are_copies():
+    cache = EmbeddingCache(None)
+    vector = [1.0, 2.0]
+    cache.put(model="m", text="a", vector=vector)
+    vector[0] = 99.0
+
+    first = cache.get(model="m", text="a")
+    first[1] = -1.0
+
+    assert cache.get(model="m", text="a") == [1.0, 2.0]
+
+
+def test_memory_layer_evicts_least_recently_used():
+    cache = EmbeddingCache(None, max_memory_items=2)
+    cache.put(model="m", text="a", vector=[1.0])
+    cache.put(model="m", text="b", vector=[2.0])
+    cache.get(model="m", text="a")
+    cache.put(model="m", text="c", vector=[3.0])
+
+    assert cache.get(model="m", text="b") is None
+    assert cache.get(model="m", text="a") == [1.0]
+    assert cache.stats()["memory_items"] == 2
+
+
+def test_sqlite_layer_persists_across_instances(tmp_path):
+    path = tmp_path / "embeddings.sqlite"
+    writer = EmbeddingCache(path)
+    writer.put_many(model="m", texts=["a", "b"], vectors=[[0.5, 0.25], [1.5, -2.0]], instruction="q:")
+    writer.close()
+
+    reader = EmbeddingCache(path, max_memory_items=0)
+    assert reader.get_many(model="m", texts=["a", "b"], instruction="q:") == [[0.5, 0.25], [1.5, -2.0]]
+    assert reader.get(model="m", text="a") is None
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["disk_items"], stats["memory_items"]) == (2, 2, 0)
+
+    # A disk hit is remembered in memory.
+    cached = EmbeddingCache(path)
+    cached.get(model="m", text="a", instruction="q:")
+    cached.get(model="m", text="a", instruction="q:")
+    assert (cached.stats()["disk_hits"], cached.stats()["memory_hits"]) == (1, 1)
+
+
+def test_put_many_rejects_misaligned_input():
+    with pytest.raises(ValueError):
+        EmbeddingCache(None).put_many(model="m", texts=["a"], vectors=[])
+
+
+def test_embed_only_sends_distinct_misses(monkeypatch):
+    requests = []
+
+    def fake_embed_uncached(*, inputs, **kwargs):
+        requests.append(list(inputs))
+        return [[float(len(text))] for text in inputs]
+
+    monkeypatch.setattr(ollama_client, "_embed_uncached", fake_embed_uncached)
+    cache = EmbeddingCache(None)
+    cache.put(model="m", text="cached", vector=[0.0])
+
+    out = ollama_client.embed(base_url="http://ollama", model="m", inputs=["cached", "ab", "abc", "ab"], cache=cache)
+
+    assert out == [[0.0], [2.0], [3.0], [2.0]]
+    assert requests == [["ab", "abc"]]
+    assert ollama_client.embed(base_url="http://ollama", model="m", inputs=["abc", "ab"], cache=cache) == [[3.0], [2.0]]
+    assert len(requests) == 1
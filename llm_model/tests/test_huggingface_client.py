@@ -0,0 +1,88 @@
+"""Unit tests for batched Hugging Face generation (fake model and tokenizer, no torch)."""
+
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from llm_model import huggingface_client
+from llm_model.huggingface_client import HuggingFaceConfig
+
+
+class FakeBatch(dict):
+    def __init__(self, rows):
+        super().__init__(input_ids=rows)
+        self.input_ids = SimpleNamespace(shape=(len(rows), len(rows[0])))
+
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Character-level tokenizer without a pad token, like Llama / Mistral / Gemma."""
+
+    eos_token = "$"
+
+    def __init__(self):
+        self.pad_token = None
+        self.padding_side = "right"
+        self.calls = []
+
+    @property
+    def pad_token_id(self):
+        return None if self.pad_token is None else ord(self.pad_token)
+
+    @property
+    def eos_token_id(self):
+        return ord(self.eos_token)
+
+    def __call__(self, prompts, return_tensors=None, padding=False):
+        if padding and self.pad_token is None:
+            raise ValueError("Asking to pad but the tokenizer does not have a padding token.")
+        self.calls.append(self.padding_side)
+        width = max(len(p) for p in prompts)
+        pad = [self.pad_token] * width
+        rows = [
+            [ord(c) for c in (pad[: width - len(p)] + list(p) if self.padding_side == "left" else list(p) + pad[len(p) :])]
+            for p in prompts
+        ]
+        return FakeBatch(rows)
+
+    def decode(self, ids, skip_special_tokens=False):
+        return "".join(chr(i) for i in ids)
+
+
+class FakeModel:
+    def __init__(self):
+        self.kwargs = None
+
+    def generate(self, input_ids, **kwargs):
+        self.kwargs = kwargs
+        return [row + [ord(c) for c in " ok"] for row in input_ids]
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    model, tokenizer = FakeModel(), FakeTokenizer()
+    monkeypatch.setattr(huggingface_client, "_load_model_and_tokenizer", lambda **kwargs: (model, tokenizer))
+    monkeypatch.setattr(huggingface_client, "torch", SimpleNamespace(no_grad=contextlib.nullcontext))
+    return model, tokenizer
+
+
+def test_generate_batch_pads_with_eos_when_tokenizer_has_no_pad_token(fakes):
+    model, tokenizer = fakes
+
+    texts = huggingface_client._generate_batch(HuggingFaceConfig(device="cpu"), ["short", "a longer prompt"])
+
+    assert texts == ["ok", "ok"]
+    assert tokenizer.pad_token == tokenizer.eos_token
+    assert model.kwargs["pad_token_id"] == tokenizer.eos_token_id
+
+
+def test_generate_batch_restores_padding_side(fakes):
+    _, tokenizer = fakes
+
+    huggingface_client._generate_batch(HuggingFaceConfig(device="cpu"), ["one", "three"])
+
+    assert tokenizer.calls == ["left"]
+    assert tokenizer.padding_side == "right"
@@ -0,0 +1,154 @@
+"""Unit tests for the on-disk LLM response cache."""
+
+import pytest
+
+from llm_model import llm_response_cache, llm_router
+from llm_model.llm_response_cache import (
+    LLMResponseCache,
+    configure_llm_response_cache,
+    get_llm_response_cache,
+    llm_response_cache_stats,
+    normalize_cache_mode,
+    response_cache_key,
+)
+from llm_model.llm_router import LLMConfig, LLMReplayMissError, chat
+
+MESSAGES = [
+    {"role": "system", "content": "You are a folklorist."},
+    {"role": "user", "content": "Summarize the tale."},
+]
+
+
+@pytest.fixture
+def process_cache(monkeypatch):
+    """Start from an unconfigured process-wide cache and close it afterwards."""
+    monkeypatch.setattr(llm_response_cache, "_DEFAULT_CACHE", None)
+    monkeypatch.setattr(llm_response_cache, "_DEFAULT_CACHE_CONFIGURED", False)
+    monkeypatch.delenv("LLM_RESPONSE_CACHE", raising=False)
+    yield
+    configure_llm_response_cache("off")
+
+
+@pytest.fixture
+def fake_chat(monkeypatch):
+    """Replace the provider call with one that records its requests."""
+    calls = []
+
+    def fake(*, messages, **kwargs):
+        calls.append(messages)
+        return f"response {len(calls)}"
+
+    monkeypatch.setattr(llm_router, "_chat", fake)
+    return calls
+
+
+class TestResponseCacheKey:
+    """Tests for response_cache_key."""
+
+    def test_key_is_stable(self):
+        key = response_cache_key(provider="ollama", model="qwen3:8b", options={"a": 1, "b": 2}, messages=MESSAGES)
+
+        assert key == response_cache_key(provider="ollama", model="qwen3:8b", options={"b": 2, "a": 1}, messages=MESSAGES)
+        # Extra message fields do not change the request.
+        extra = [dict(m, name="x") for m in MESSAGES]
+        assert key == response_cache_key(provider="ollama", model="qwen3:8b", options={"a": 1, "b": 2}, messages=extra)
+
+    def test_key_changes_with_request(self):
+        base = dict(provider="ollama", model="qwen3:8b", options={"temperature": 0.2}, messages=MESSAGES)
+        key = response_cache_key(**base)
+
+        assert key != response_cache_key(**dict(base, provider="gemini"))
+        assert key != response_cache_key(**dict(base, model="qwen3:14b"))
+        assert key != response_cache_key(**dict(base, options={"temperature": 0.7}))
+        assert key != response_cache_key(**dict(base, messages=MESSAGES[:1]))
+
+    def test_router_key_ignores_connection_settings(self):
+        from llm_model.ollama_client import OllamaConfig
+
+        local = llm_router._cache_identity(LLMConfig(ollama=OllamaConfig(base_url="http://a:11434")), True)
+        remote = llm_router._cache_identity(LLMConfig(ollama=OllamaConfig(base_url="http://b:11434")), True)
+        assert local == remote
+        assert local != llm_router._cache_identity(LLMConfig(), False)
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache."""
+
+    def test_modes(self):
+        assert normalize_cache_mode(None) == "off"
+        assert normalize_cache_mode("ON") == "on"
+        assert normalize_cache_mode("read-only") == "replay"
+        with pytest.raises(ValueError):
+            normalize_cache_mode("sometimes")
+
+    def test_off_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            LLMResponseCache(tmp_path / "cache.sqlite", mode="off")
+
+    def test_get_put_and_stats(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite", mode="on")
+
+        assert cache.get("k") is None
+        cache.put("k", provider="ollama", model="m", response="hello")
+        assert cache.get("k") == "hello"
+
+        stats = cache.stats()
+        assert stats == {"mode": "on", "hits": 1, "misses": 1, "writes": 1, "hit_rate": 0.5, "entries": 1}
+
+        cache.reset_stats()
+        assert cache.stats()["hits"] == 0
+        cache.close()
+
+    def test_replay_reads_recorded_responses_only(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        recorder = LLMResponseCache(path, mode="on")
+        recorder.put("k", provider="ollama", model="m", response="hello")
+        recorder.close()
+
+        replay = LLMResponseCache(path, mode="replay")
+        assert replay.get("k") == "hello"
+        replay.put("other", provider="ollama", model="m", response="ignored")
+        assert replay.get("other") is None
+        assert replay.stats()["writes"] == 0
+        replay.close()
+
+
+class TestRouterCaching:
+    """Tests for the response cache as used by llm_router.chat."""
+
+    def test_off_calls_llm_every_time(self, process_cache, fake_chat):
+        assert get_llm_response_cache() is None
+
+        assert chat(config=LLMConfig(), messages=MESSAGES) == "response 1"
+        assert chat(config=LLMConfig(), messages=MESSAGES) == "response 2"
+        assert llm_response_cache_stats() is None
+
+    def test_on_reuses_responses(self, process_cache, fake_chat, tmp_path):
+        configure_llm_response_cache("on", tmp_path / "cache.sqlite")
+
+        assert chat(config=LLMConfig(), messages=MESSAGES) == "response 1"
+        assert chat(config=LLMConfig(), messages=MESSAGES) == "response 1"
+        assert chat(config=LLMConfig(), messages=MESSAGES, response_format_json=False) == "response 2"
+
+        assert len(fake_chat) == 2
+        stats = llm_response_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["writes"], stats["entries"]) == (1, 2, 2, 2)
+
+    def test_replay_hit_and_miss(self, process_cache, fake_chat, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        configure_llm_response_cache("on", path)
+        chat(config=LLMConfig(), messages=MESSAGES)
+
+        configure_llm_response_cache("replay", path)
+        assert chat(config=LLMConfig(), messages=MESSAGES) == "response 1"
+        with pytest.raises(LLMReplayMissError):
+            chat(config=LLMConfig(), messages=MESSAGES[:1])
+        assert len(fake_chat) == 1
+
+    def test_mode_from_environment(self, process_cache, monkeypatch, tmp_path):
+        monkeypatch.setenv("LLM_RESPONSE_CACHE", "replay")
+        monkeypatch.setenv("LLM_RESPONSE_CACHE_PATH", str(tmp_path / "env.sqlite"))
+
+        cache = get_llm_response_cache()
+        assert cache is not None and cache.replay_only
+        assert cache.path == tmp_path / "env.sqlite"
@@ -0,0 +1,133 @@
+"""Unit tests for llm_router.chat_many (provider calls are replaced by fakes)."""
+
+import threading
+import time
+
+import pytest
+
+from llm_model import llm_response_cache, llm_router
+from llm_model.llm_response_cache import configure_llm_response_cache
+from llm_model.llm_router import ChatResult, LLMConfig, LLMReplayMissError, LLMRouterError, chat, chat_many
+
+
+def conversation(i):
+    return [{"role": "user", "content": f"question {i}"}]
+
+
+def index_of(messages):
+    return int(messages[-1]["content"].split()[-1])
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr(llm_response_cache, "_DEFAULT_CACHE", None)
+    monkeypatch.setattr(llm_response_cache, "_DEFAULT_CACHE_CONFIGURED", True)
+    yield
+    configure_llm_response_cache("off")
+
+
+@pytest.fixture
+def remote_calls(monkeypatch):
+    """Fake `_chat`: later items answer first; item 2 fails."""
+    calls = []
+
+    def fake_chat(*, messages, **kwargs):
+        i = index_of(messages)
+        calls.append(i)
+        time.sleep(0.01 * (5 - i))
+        if i == 2:
+            raise LLMRouterError("rate limited")
+        return f"answer {i}"
+
+    monkeypatch.setattr(llm_router, "_chat", fake_chat)
+    return calls
+
+
+@pytest.fixture
+def local_batches(monkeypatch):
+    """Fake `_chat_batch`: records batches; a batch containing item 3 fails."""
+    batches = []
+
+    def fake_chat_batch(*, messages_list, **kwargs):
+        batch = [index_of(m) for m in messages_list]
+        batches.append(batch)
+        if 3 in batch:
+            raise RuntimeError("CUDA out of memory")
+        return [f"answer {i}" for i in batch]
+
+    monkeypatch.setattr(llm_router, "_chat_batch", fake_chat_batch)
+    return batches
+
+
+def test_results_keep_input_order(remote_calls):
+    results = chat_many(config=LLMConfig(), messages_list=[conversation(i) for i in range(5)], max_concurrency=5)
+
+    assert [r.text for r in results] == ["answer 0", "answer 1", None, "answer 3", "answer 4"]
+    assert sorted(remote_calls) == [0, 1, 2, 3, 4]
+
+
+def test_item_error_does_not_cancel_others(remote_calls):
+    results = chat_many(config=LLMConfig(provider="gemini"), messages_list=[conversation(i) for i in range(5)])
+
+    assert [r.ok for r in results] == [True, True, False, True, True]
+    assert isinstance(results[2].error, LLMRouterError)
+    assert "rate limited" in str(results[2].error)
+
+
+def test_local_batch_error_fails_only_its_batch(local_batches):
+    results = chat_many(
+        config=LLMConfig(provider="huggingface"),
+        messages_list=[conversation(i) for i in range(6)],
+        max_concurrency=2,
+    )
+
+    assert local_batches == [[0, 1], [2, 3], [4, 5]]
+    assert [r.text for r in results] == ["answer 0", "answer 1", None, None, "answer 4", "answer 5"]
+    assert all(isinstance(r.error, LLMRouterError) for r in results[2:4])
+    assert "CUDA out of memory" in str(results[2].error)
+
+
+def test_cached_items_skip_the_llm(local_batches, tmp_path):
+    configure_llm_response_cache("on", tmp_path / "cache.sqlite")
+    config = LLMConfig(provider="unsloth")
+    chat_many(config=config, messages_list=[conversation(0), conversation(1)], max_concurrency=2)
+
+    results = chat_many(config=config, messages_list=[conversation(i) for i in range(3)], max_concurrency=2)
+
+    assert local_batches == [[0, 1], [2]]
+    assert [r.text for r in results] == ["answer 0", "answer 1", "answer 2"]
+
+
+def test_replay_miss_is_an_item_error(remote_calls, tmp_path):
+    path = tmp_path / "cache.sqlite"
+    configure_llm_response_cache("on", path)
+    chat(config=LLMConfig(), messages=conversation(0))
+    configure_llm_response_cache("replay", path)
+    remote_calls.clear()
+
+    results = chat_many(config=LLMConfig(), messages_list=[conversation(0), conversation(1)])
+
+    assert results[0] == ChatResult(text="answer 0")
+    assert isinstance(results[1].error, LLMReplayMissError)
+    assert remote_calls == []
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_chat(*, messages, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return "ok"
+
+    monkeypatch.setattr(llm_router, "_chat", fake_chat)
+    results = chat_many(config=LLMConfig(), messages_list=[conversation(i) for i in range(8)], max_concurrency=3)
+
+    assert all(r.ok for r in results)
+    assert peak <= 3
@@ -0,0 +1,128 @@
+"""Unit tests for DynamicBatcher (fake run_batch, no model needed)."""
+
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from llm_model.local_batching import DynamicBatcher, wait_for
+
+
+class Recorder:
+    """run_batch that doubles its items, records each batch and can be held back."""
+
+    def __init__(self, *, hold: bool = False, error: Exception = None):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+        self.error = error
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return [item * 2 for item in items]
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(run_batch, **kwargs):
+        batcher = DynamicBatcher(run_batch, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def test_results_follow_items(make_batcher):
+    recorder = Recorder()
+    batcher = make_batcher(recorder, max_batch_size=4, max_wait_ms=20)
+
+    futures = [batcher.submit(i) for i in range(10)]
+
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(10)]
+    assert [item for batch in recorder.batches for item in batch] == list(range(10))
+
+
+def test_batches_are_capped(make_batcher):
+    recorder = Recorder(hold=True)
+    batcher = make_batcher(recorder, max_batch_size=3, max_wait_ms=50)
+
+    first = batcher.submit(0)
+    assert recorder.started.wait(5)
+    futures = [batcher.submit(i) for i in range(1, 8)]
+    recorder.release.set()
+
+    assert [f.result(timeout=5) for f in [first] + futures] == [i * 2 for i in range(8)]
+    assert [len(batch) for batch in recorder.batches] == [1, 3, 3, 1]
+    assert batcher.stats()["largest_batch"] == 3
+
+
+def test_partial_batch_is_flushed_after_max_wait(make_batcher):
+    recorder = Recorder()
+    batcher = make_batcher(recorder, max_batch_size=8, max_wait_ms=50)
+
+    start = time.perf_counter()
+    assert batcher.submit(21).result(timeout=5) == 42
+    assert time.perf_counter() - start >= 0.045
+    assert recorder.batches == [[21]]
+
+
+def test_batch_error_reaches_every_future(make_batcher):
+    recorder = Recorder(hold=True, error=ValueError("out of memory"))
+    batcher = make_batcher(recorder, max_batch_size=4, max_wait_ms=50)
+
+    first = batcher.submit(0)
+    assert recorder.started.wait(5)
+    futures = [batcher.submit(i) for i in range(1, 4)]
+    recorder.release.set()
+
+    for future in [first] + futures:
+        with pytest.raises(ValueError, match="out of memory"):
+            future.result(timeout=5)
+    assert batcher.stats()["failed"] == 4
+
+
+def test_wait_for_cancels_queued_request(make_batcher):
+    recorder = Recorder(hold=True)
+    batcher = make_batcher(recorder, max_batch_size=1, max_wait_ms=0)
+
+    running = batcher.submit(1)
+    assert recorder.started.wait(5)
+    queued = batcher.submit(2)
+
+    with pytest.raises(FutureTimeoutError):
+        wait_for(queued, 0.05)
+    assert queued.cancelled()
+
+    recorder.release.set()
+    assert wait_for(running, 5) == 2
+    batcher.close()
+    assert recorder.batches == [[1]]
+
+
+def test_close_drains_pending_requests(make_batcher):
+    recorder = Recorder(hold=True)
+    batcher = make_batcher(recorder, max_batch_size=2, max_wait_ms=0)
+
+    first = batcher.submit(0)
+    assert recorder.started.wait(5)
+    pending = [batcher.submit(i) for i in range(1, 5)]
+
+    batcher.close(wait=False)
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(5)
+    recorder.release.set()
+    batcher.close()
+
+    assert [f.result(timeout=0) for f in [first] + pending] == [0, 2, 4, 6, 8]
+    assert batcher.stats()["completed"] == 5
@@ -0,0 +1,150 @@
+"""Unit tests for the asyncio Ollama client (httpx.MockTransport, no server)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from llm_model import ollama_client
+from llm_model.embedding_cache import EmbeddingCache
+from llm_model.ollama_client import AsyncOllamaClient, OllamaConfig, OllamaError
+
+BASE_URL = "http://ollama.test"
+
+
+def make_client(handler, **kwargs):
+    client = AsyncOllamaClient(**kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def run(coro_fn):
+    async def main():
+        return await coro_fn()
+
+    return asyncio.run(main())
+
+
+def test_chat_returns_message_content():
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": '{"ok": true}'}})
+
+    async def go():
+        client = make_client(handler)
+        try:
+            return await client.chat(config=OllamaConfig(base_url=BASE_URL), messages=[{"role": "user", "content": "hi"}])
+        finally:
+            await client.aclose()
+
+    assert run(go) == '{"ok": true}'
+    path, payload = seen[0]
+    assert path == "/api/chat"
+    assert payload["messages"] == [{"role": "user", "content": "hi"}]
+    assert payload["stream"] is False
+
+
+def test_chat_http_error():
+    async def go():
+        client = make_client(lambda request: httpx.Response(500, text="model not found"))
+        try:
+            await client.chat(config=OllamaConfig(base_url=BASE_URL), messages=[])
+        finally:
+            await client.aclose()
+
+    with pytest.raises(OllamaError, match="HTTP 500"):
+        run(go)
+
+
+def test_semaphore_caps_requests_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"message": {"content": "x"}})
+
+    async def go():
+        client = make_client(handler, max_concurrency=2)
+        try:
+            config = OllamaConfig(base_url=BASE_URL)
+            return await asyncio.gather(*(client.chat(config=config, messages=[]) for _ in range(6)))
+        finally:
+            await client.aclose()
+
+    assert run(go) == ["x"] * 6
+    assert peak == 2
+
+
+def test_embed_falls_back_to_single_endpoint():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        payload = json.loads(request.content)
+        if request.url.path == "/api/embed":
+            return httpx.Response(404, text="not found")
+        return httpx.Response(200, json={"embedding": [float(len(payload["prompt"]))]})
+
+    async def go():
+        client = make_client(handler)
+        try:
+            return await client.embed(base_url=BASE_URL, model="m", inputs=["a", "bbb"], instruction="q:")
+        finally:
+            await client.aclose()
+
+    assert run(go) == [[4.0], [6.0]]  # "q: a", "q: bbb"
+    assert paths[0] == "/api/embed"
+    assert sorted(paths[1:]) == ["/api/embeddings", "/api/embeddings"]
+
+
+def test_embed_uses_cache_for_hits_and_fills_misses():
+    batches = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["input"]
+        batches.append(inputs)
+        return httpx.Response(200, json={"embeddings": [[float(len(t))] for t in inputs]})
+
+    cache = EmbeddingCache(None)
+    cache.put(model="m", text="cached", vector=[9.0])
+
+    async def go():
+        client = make_client(handler)
+        try:
+            first = await client.embed(base_url=BASE_URL, model="m", inputs=["cached", "ab", "ab"], cache=cache)
+            second = await client.embed(base_url=BASE_URL, model="m", inputs=["ab"], cache=cache)
+            return first, second
+        finally:
+            await client.aclose()
+
+    first, second = run(go)
+    assert first == [[9.0], [2.0], [2.0]]
+    assert second == [[2.0]]
+    assert batches == [["ab"]]
+
+
+def test_module_helpers_share_one_client_per_loop(monkeypatch):
+    def handler(request):
+        if request.url.path == "/api/chat":
+            return httpx.Response(200, json={"message": {"content": "hello"}})
+        return httpx.Response(200, json={"embeddings": [[1.0, 2.0]]})
+
+    async def go():
+        client = make_client(handler)
+        ollama_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = client
+        assert ollama_client.get_async_client() is client
+        text = await ollama_client.achat(config=OllamaConfig(base_url=BASE_URL), messages=[])
+        vectors = await ollama_client.aembed(base_url=BASE_URL, model="m", inputs=["x"])
+        await ollama_client.aclose_async_client()
+        assert asyncio.get_running_loop() not in ollama_client._ASYNC_CLIENTS
+        return text, vectors
+
+    assert run(go) == ("hello", [[1.0, 2.0]])
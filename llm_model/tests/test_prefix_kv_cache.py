@@ -0,0 +1,169 @@
+"""Unit tests for the prompt-prefix KV cache (fake KV cache and model, no torch)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from llm_model import prefix_kv_cache
+from llm_model.prefix_kv_cache import PrefixKVCache, generate_with_prefix_cache, get_prefix_cache
+
+
+class FakeKV:
+    """Stands in for a Transformers DynamicCache: one entry per cached token."""
+
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+
+    def crop(self, n):
+        del self.tokens[n:]
+
+
+class FakeIds(list):
+    def tolist(self):
+        return list(self)
+
+
+class FakeModel:
+    """Generates three tokens and returns the KV state of prompt + output."""
+
+    def __init__(self, *, reject_past=False):
+        self.reject_past = reject_past
+        self.calls = []
+
+    def generate(self, input_ids, past_key_values=None, return_dict_in_generate=False, **kwargs):
+        self.calls.append(None if past_key_values is None else list(past_key_values.tokens))
+        if past_key_values is not None and self.reject_past:
+            raise TypeError("past_key_values not supported")
+        prompt = list(input_ids[0])
+        if past_key_values is not None:
+            assert past_key_values.tokens == prompt[: len(past_key_values.tokens)]
+        sequence = prompt + [-1, -2, -3]
+        if not return_dict_in_generate:
+            return [sequence]
+        return SimpleNamespace(sequences=[sequence], past_key_values=FakeKV(sequence))
+
+
+def _inputs(ids):
+    return {"input_ids": [FakeIds(ids)]}
+
+
+PREFIX = list(range(100, 140))
+
+
+def test_lookup_returns_cropped_copy_of_longest_prefix():
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=8)
+    cache.store(PREFIX + [1, 2, 3], FakeKV(PREFIX + [1, 2, 3]))
+    cache.store(PREFIX[:10] + [7], FakeKV(PREFIX[:10] + [7]))
+
+    n, kv = cache.lookup(PREFIX + [1, 9, 9])
+
+    assert n == len(PREFIX) + 1
+    assert kv.tokens == PREFIX + [1]
+    # The stored entry is untouched by the caller's crop.
+    n_again, kv_again = cache.lookup(PREFIX + [1, 2, 3, 4])
+    assert n_again == len(PREFIX) + 3
+    assert kv_again.tokens == PREFIX + [1, 2, 3]
+    assert cache.stats()["hits"] == 2
+
+
+def test_lookup_leaves_at_least_one_token_to_evaluate():
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=8)
+    cache.store(PREFIX, FakeKV(PREFIX))
+
+    n, kv = cache.lookup(PREFIX)
+
+    assert n == len(PREFIX) - 1
+    assert kv.tokens == PREFIX[:-1]
+
+
+def test_min_prefix_tokens():
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=16)
+    cache.store(PREFIX[:10], FakeKV(PREFIX[:10]))
+    assert cache.stats()["entries"] == 0
+
+    cache.store(PREFIX, FakeKV(PREFIX))
+    assert cache.lookup(PREFIX[:15] + [0, 0, 0]) == (0, None)
+    assert cache.lookup([0] + PREFIX) == (0, None)
+    assert cache.lookup(PREFIX[:16] + [0])[0] == 16
+    assert cache.stats()["misses"] == 2
+
+
+def test_store_crops_generated_tokens_and_evicts_lru():
+    cache = PrefixKVCache(max_entries=2, min_prefix_tokens=4)
+    kv = FakeKV(PREFIX + [-1, -2])
+    cache.store(PREFIX, kv)
+    assert kv.tokens == PREFIX
+
+    cache.store([1, 2, 3, 4, 5], FakeKV([1, 2, 3, 4, 5]))
+    cache.lookup(PREFIX + [0])  # PREFIX becomes most recently used
+    cache.store([6, 7, 8, 9, 10], FakeKV([6, 7, 8, 9, 10]))
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup([1, 2, 3, 4, 5, 0]) == (0, None)
+    assert cache.lookup(PREFIX + [0])[0] == len(PREFIX)
+
+
+def test_store_ignores_caches_without_crop():
+    cache = PrefixKVCache(max_entries=2, min_prefix_tokens=4)
+    cache.store(PREFIX, ((1, 2), (3, 4)))
+    cache.store(PREFIX, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_get_prefix_cache_is_opt_in(monkeypatch):
+    monkeypatch.setattr(prefix_kv_cache, "_CACHES", {})
+    monkeypatch.delenv("LLM_PREFIX_CACHE_ENTRIES", raising=False)
+    assert get_prefix_cache("model") is None
+
+    monkeypatch.setenv("LLM_PREFIX_CACHE_ENTRIES", "3")
+    monkeypatch.setenv("LLM_PREFIX_CACHE_MIN_TOKENS", "12")
+    cache = get_prefix_cache("model")
+    assert cache is not None and cache is get_prefix_cache("model")
+    assert (cache.max_entries, cache.min_prefix_tokens) == (3, 12)
+
+
+def test_generate_reuses_prompt_prefix():
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=8)
+    model = FakeModel()
+
+    first = generate_with_prefix_cache(model, _inputs(PREFIX + [1, 2]), cache, max_new_tokens=3)
+    second = generate_with_prefix_cache(model, _inputs(PREFIX + [5, 6]), cache, max_new_tokens=3)
+
+    assert first == [PREFIX + [1, 2, -1, -2, -3]]
+    assert second == [PREFIX + [5, 6, -1, -2, -3]]
+    assert model.calls == [None, PREFIX]
+    assert cache.stats()["reused_tokens"] == len(PREFIX)
+
+
+def test_generate_without_cache_is_plain_generate():
+    model = FakeModel()
+    assert generate_with_prefix_cache(model, _inputs(PREFIX), None) == [PREFIX + [-1, -2, -3]]
+    assert model.calls == [None]
+
+
+def test_generate_disables_reuse_when_model_rejects_past(capsys):
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=8)
+    model = FakeModel(reject_past=True)
+    generate_with_prefix_cache(model, _inputs(PREFIX + [1]), cache)
+
+    out = generate_with_prefix_cache(model, _inputs(PREFIX + [2]), cache)
+
+    assert out == [PREFIX + [2, -1, -2, -3]]
+    assert model.calls == [None, PREFIX, None]
+    assert cache.max_entries == 0
+    assert cache.stats()["entries"] == 0
+    assert "disabling it" in capsys.readouterr().out
+
+    generate_with_prefix_cache(model, _inputs(PREFIX + [3]), cache)
+    assert model.calls[-1] is None
+
+
+def test_generate_error_without_past_propagates():
+    class Broken:
+        def generate(self, **kwargs):
+            raise RuntimeError("out of memory")
+
+    cache = PrefixKVCache(max_entries=4, min_prefix_tokens=8)
+    with pytest.raises(RuntimeError, match="out of memory"):
+        generate_with_prefix_cache(Broken(), _inputs(PREFIX), cache)
+    assert cache.max_entries == 4
@@ -0,0 +1,153 @@
+"""Unit tests for streamed chat responses (fake HTTP responses, no server)."""
+
+import io
+import json
+
+import pytest
+import requests
+
+from llm_model import gemini_client, ollama_client
+from llm_model.gemini_client import GeminiConfig, GeminiError
+from llm_model.llm_router import LLMConfig, LLMRouterError, chat
+from llm_model.ollama_client import OllamaConfig, OllamaError
+
+MESSAGES = [{"role": "user", "content": "讲一个故事"}]
+GEMINI = GeminiConfig(api_key="key", model="gemini-test")
+
+
+def fake_response(body, content_type, status=200):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers["Content-Type"] = content_type
+    resp.raw = io.BytesIO(body.encode("utf-8"))
+    return resp
+
+
+def ndjson(*objects):
+    return "".join(json.dumps(o, ensure_ascii=False) + "\n" for o in objects)
+
+
+def sse(*objects):
+    return "".join(f"data: {json.dumps(o, ensure_ascii=False)}\r\n\r\n" for o in objects)
+
+
+def gemini_chunk(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+@pytest.fixture
+def ollama_body(monkeypatch):
+    """Serve the given NDJSON body for every Ollama request."""
+    served = {}
+
+    class Session:
+        def post(self, url, json=None, timeout=None, stream=False):
+            served["payload"] = json
+            return fake_response(served["body"], "application/x-ndjson", served.get("status", 200))
+
+    monkeypatch.setattr(ollama_client, "_http_session", lambda: Session())
+    return served
+
+
+@pytest.fixture
+def gemini_body(monkeypatch):
+    """Serve the given SSE body (bare `text/event-stream`, no charset) for every Gemini request."""
+    served = {}
+
+    def post(url, params=None, json=None, timeout=None, stream=False):
+        served["params"] = params
+        return fake_response(served["body"], "text/event-stream", served.get("status", 200))
+
+    monkeypatch.setattr(gemini_client.requests, "post", post)
+    return served
+
+
+class TestOllamaStream:
+    """Tests for the Ollama NDJSON parser."""
+
+    def test_yields_deltas_until_done(self, ollama_body):
+        ollama_body["body"] = ndjson(
+            {"message": {"role": "assistant", "content": "狼"}, "done": False},
+            {"message": {"role": "assistant", "content": ""}, "done": False},
+            {"message": {"role": "assistant", "content": "来了"}, "done": False},
+            {"message": {"role": "assistant", "content": ""}, "done": True, "eval_count": 3},
+            {"message": {"role": "assistant", "content": "ignored"}},
+        ) + "\n"
+
+        deltas = list(ollama_client.chat_stream(config=OllamaConfig(), messages=MESSAGES))
+
+        assert deltas == ["狼", "来了"]
+        assert ollama_body["payload"]["stream"] is True
+
+    def test_error_line(self, ollama_body):
+        ollama_body["body"] = ndjson({"message": {"content": "a"}}, {"error": "model crashed"})
+
+        stream = ollama_client.chat_stream(config=OllamaConfig(), messages=MESSAGES)
+        assert next(stream) == "a"
+        with pytest.raises(OllamaError, match="model crashed"):
+            next(stream)
+
+    def test_invalid_line_and_http_error(self, ollama_body):
+        ollama_body["body"] = "not json\n"
+        with pytest.raises(OllamaError, match="non-JSON"):
+            list(ollama_client.chat_stream(config=OllamaConfig(), messages=MESSAGES))
+
+        ollama_body.update(body="model not found", status=404)
+        with pytest.raises(OllamaError, match="HTTP 404"):
+            list(ollama_client.chat_stream(config=OllamaConfig(), messages=MESSAGES))
+
+
+class TestGeminiStream:
+    """Tests for the Gemini SSE parser."""
+
+    def test_decodes_utf8_without_charset(self, gemini_body):
+        gemini_body["body"] = (
+            ": keep-alive\r\n\r\n"
+            + sse(gemini_chunk("狼"), gemini_chunk("来了"))
+            + sse({"candidates": [{"finishReason": "STOP"}], "usageMetadata": {}})
+        )
+
+        deltas = list(gemini_client.chat_stream(config=GEMINI, messages=MESSAGES))
+
+        assert deltas == ["狼", "来了"]
+        assert gemini_body["params"]["alt"] == "sse"
+
+    def test_error_event(self, gemini_body):
+        gemini_body["body"] = sse(gemini_chunk("a"), {"error": {"code": 429, "message": "quota"}})
+
+        with pytest.raises(GeminiError, match="quota"):
+            list(gemini_client.chat_stream(config=GEMINI, messages=MESSAGES))
+
+    def test_http_error(self, gemini_body):
+        gemini_body.update(body='{"error": "bad key"}', status=400)
+
+        with pytest.raises(GeminiError, match="HTTP 400"):
+            list(gemini_client.chat_stream(config=GEMINI, messages=MESSAGES))
+
+
+class TestRouterOnToken:
+    """Tests for llm_router.chat(on_token=...)."""
+
+    def test_ollama_tokens_and_result(self, ollama_body):
+        ollama_body["body"] = ndjson({"message": {"content": '{"a": '}}, {"message": {"content": "1}"}, "done": True})
+        tokens = []
+
+        text = chat(config=LLMConfig(provider="ollama"), messages=MESSAGES, on_token=tokens.append)
+
+        assert tokens == ['{"a": ', "1}"]
+        assert text == '{"a": 1}'
+
+    def test_gemini_result_is_stripped(self, gemini_body):
+        gemini_body["body"] = sse(gemini_chunk("  狼来了"), gemini_chunk("\n"))
+        tokens = []
+
+        text = chat(config=LLMConfig(provider="gemini", gemini=GEMINI), messages=MESSAGES, on_token=tokens.append)
+
+        assert tokens == ["  狼来了", "\n"]
+        assert text == "狼来了"
+
+    def test_empty_gemini_stream_is_an_error(self, gemini_body):
+        gemini_body["body"] = sse({"candidates": [{"finishReason": "SAFETY"}]})
+
+        with pytest.raises(LLMRouterError, match="empty"):
+            chat(config=LLMConfig(provider="gemini", gemini=GEMINI), messages=MESSAGES, on_token=lambda t: None)
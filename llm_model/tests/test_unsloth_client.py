@@ -0,0 +1,111 @@
+"""Unit tests for Unsloth prompt tokenization (fake model and tokenizer, no unsloth/torch)."""
+
+import pytest
+
+from llm_model import unsloth_client
+from llm_model.unsloth_client import UnslothConfig, UnslothError
+
+
+class FakeIds(list):
+    @property
+    def shape(self):
+        return (len(self), len(self[0]))
+
+
+class FakeBatch(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Character-level tokenizer that truncates on the right when asked to, like HF tokenizers."""
+
+    eos_token = "$"
+
+    def __init__(self):
+        self.pad_token = None
+        self.padding_side = "right"
+        self.kwargs = []
+
+    @property
+    def pad_token_id(self):
+        return None if self.pad_token is None else ord(self.pad_token)
+
+    def __call__(self, prompts, return_tensors=None, padding=False, truncation=False, max_length=None):
+        self.kwargs.append({"truncation": truncation, "max_length": max_length})
+        single = isinstance(prompts, str)
+        prompts = [prompts] if single else list(prompts)
+        if truncation and max_length:
+            prompts = [p[:max_length] for p in prompts]
+        width = max(len(p) for p in prompts)
+        pad = (self.pad_token or "") * width
+        rows = [
+            [ord(c) for c in (pad[: width - len(p)] + p if self.padding_side == "left" else p + pad[: width - len(p)])]
+            for p in prompts
+        ]
+        return FakeBatch(input_ids=FakeIds(rows))
+
+    def decode(self, ids, skip_special_tokens=False):
+        return "".join(chr(i) for i in ids)
+
+
+class FakeModel:
+    device = "cpu"
+
+    def __init__(self):
+        self.input_ids = None
+
+    def generate(self, input_ids, **kwargs):
+        self.input_ids = input_ids
+        return [row + [ord(c) for c in " ok"] for row in input_ids]
+
+
+def _prompt(segment: str) -> str:
+    # Stable prefix (instructions, taxonomy, summary) first, the span last.
+    return "instructions and taxonomy guide. " * 60 + "SEGMENT: " + segment
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    model, tokenizer = FakeModel(), FakeTokenizer()
+    monkeypatch.setattr(unsloth_client, "load_model", lambda config: (model, tokenizer))
+    monkeypatch.delenv("LLM_PREFIX_CACHE_ENTRIES", raising=False)
+    return model, tokenizer
+
+
+def test_long_prompt_keeps_trailing_segment(fakes):
+    model, tokenizer = fakes
+    prompt = _prompt("The dragon guarded the princess.")
+    assert len(prompt) > 1024
+
+    text = unsloth_client._generate_one(UnslothConfig(), model, tokenizer, prompt)
+
+    assert text == "ok"
+    assert not tokenizer.kwargs[0]["truncation"]
+    assert tokenizer.decode(model.input_ids[0]) == prompt
+    assert tokenizer.decode(model.input_ids[0]).endswith("The dragon guarded the princess.")
+
+
+def test_batch_keeps_trailing_segments(fakes):
+    model, tokenizer = fakes
+    prompts = [_prompt("The dragon guarded the princess."), _prompt("A fox.")]
+
+    texts = unsloth_client._generate_batch(UnslothConfig(), prompts)
+
+    assert texts == ["ok", "ok"]
+    decoded = [tokenizer.decode(row) for row in model.input_ids]
+    assert decoded[0] == prompts[0]
+    assert decoded[1].endswith(prompts[1])
+    assert tokenizer.padding_side == "right"
+
+
+def test_prompt_longer_than_context_fails_instead_of_truncating(fakes):
+    model, tokenizer = fakes
+    config = UnslothConfig(max_seq_length=1024, max_new_tokens=128)
+
+    with pytest.raises(UnslothError, match="max_seq_length=1024"):
+        unsloth_client._generate_one(config, model, tokenizer, _prompt("The dragon guarded the princess."))
+    with pytest.raises(UnslothError, match="max_seq_length=1024"):
+        unsloth_client._generate_batch(config, [_prompt("a"), _prompt("b")])
+
+    assert model.input_ids is None
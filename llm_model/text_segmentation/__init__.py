@@ -5,11 +5,12 @@ including Magnetic Clustering and GraphSegSM algorithms, as well as evaluation
 metrics for boundary segmentation.
 """
 
-from .similarity_matrix import SimilarityMatrixBuilder
+from .similarity_matrix import BandedSimilarityMatrix, SimilarityMatrixBuilder
 from .magnetic_clustering import MagneticClustering
 from .graph_segsm import GraphSegSM
 from .boundary_metric import BoundarySegmentationMetric
 from .segmenter import TextSegmenter
+from .session import SegmentationSession, SegmentationSessionCache, get_default_session_cache
 
 # Optional visualization imports (requires matplotlib/seaborn)
 try:
@@ -27,10 +28,14 @@ from .visualization_hooks import (
 
 __all__ = [
     "SimilarityMatrixBuilder",
+    "BandedSimilarityMatrix",
     "MagneticClustering",
     "GraphSegSM",
     "BoundarySegmentationMetric",
     "TextSegmenter",
+    "SegmentationSession",
+    "SegmentationSessionCache",
+    "get_default_session_cache",
     "SegmentationVisualizer",
     "visualize_segmentation_result",
     "VisualizableMagneticClustering",
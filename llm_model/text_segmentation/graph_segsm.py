@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import List, Set
+import time
+from typing import List, Literal, Optional, Set
 
 import networkx as nx
 import numpy as np
 
-from .similarity_matrix import SimilarityMatrixBuilder
+from .similarity_matrix import BandedSimilarityMatrix, SimilarityMatrix, SimilarityMatrixBuilder
 
 
 class GraphSegSM:
@@ -16,6 +17,15 @@ class GraphSegSM:
     This algorithm builds a semantic graph where nodes are sentences and
     edges connect similar sentences. Segmentation is performed by finding
     maximal cliques in the graph.
+    
+    Maximal-clique enumeration is exponential in the worst case (dense graphs
+    from repetitive text, low thresholds). `clique_mode` bounds it:
+    - "exact": all maximal cliques of the graph (original algorithm)
+    - "window": only connect sentences at most `clique_window` apart, so
+      every clique lies within a window of adjacent sentences
+    - "components": use connected components instead of cliques (linear time)
+    With `time_budget_s`, clique enumeration that runs over budget falls back
+    to connected components.
     """
 
     def __init__(
@@ -23,6 +33,9 @@ class GraphSegSM:
         similarity_builder: SimilarityMatrixBuilder,
         threshold: float = 0.7,
         min_seg_size: int = 3,
+        clique_mode: Literal["exact", "window", "components"] = "exact",
+        clique_window: int = 8,
+        time_budget_s: Optional[float] = None,
     ):
         """Initialize GraphSegSM.
         
@@ -32,10 +45,22 @@ class GraphSegSM:
                 Sentences with similarity > threshold are connected.
             min_seg_size: Minimum segment size. Segments smaller than this
                 will be merged with their most similar neighbor.
+            clique_mode: "exact", "window" or "components" (see class docstring).
+            clique_window: Largest sentence distance connected in "window" mode.
+            time_budget_s: Seconds allowed for clique enumeration before falling
+                back to connected components. None means no limit.
         """
+        if clique_mode not in ("exact", "window", "components"):
+            raise ValueError(f"Unknown clique_mode: {clique_mode}")
+        if clique_window < 1:
+            raise ValueError(f"clique_window must be >= 1, got {clique_window}")
         self.similarity_builder = similarity_builder
         self.threshold = threshold
         self.min_seg_size = min_seg_size
+        self.clique_mode = clique_mode
+        self.clique_window = clique_window
+        self.time_budget_s = time_budget_s
+        self.used_fallback = False
 
     def segment(
         self,
@@ -55,7 +80,25 @@ class GraphSegSM:
         
         # Build similarity matrix
         similarity_matrix = self.similarity_builder.build_similarity_matrix(sentences)
-        n = len(sentences)
+        
+        return self.segment_from_matrix(similarity_matrix, len(sentences))
+
+    def segment_from_matrix(
+        self,
+        similarity_matrix: SimilarityMatrix,
+        n: int,
+    ) -> List[int]:
+        """Segment using a precomputed similarity matrix.
+        
+        Args:
+            similarity_matrix: Similarity matrix of the n sentences (dense or banded).
+            n: Number of sentences.
+            
+        Returns:
+            List of boundary indices, as returned by `segment`.
+        """
+        if n <= 1:
+            return []
         
         # Build semantic graph
         graph = self._build_graph(similarity_matrix, n)
@@ -76,13 +119,13 @@ class GraphSegSM:
 
     def _build_graph(
         self,
-        similarity_matrix: np.ndarray,
+        similarity_matrix: SimilarityMatrix,
         n: int,
     ) -> nx.Graph:
         """Build semantic graph from similarity matrix.
         
         Args:
-            similarity_matrix: The similarity matrix.
+            similarity_matrix: The similarity matrix (dense or banded).
             n: Number of sentences.
             
         Returns:
@@ -92,26 +135,64 @@ class GraphSegSM:
         graph = nx.Graph()
         graph.add_nodes_from(range(n))
         
-        # Add edges for similar sentences
-        for i in range(n):
-            for j in range(i + 1, n):
-                if similarity_matrix[i, j] > self.threshold:
-                    graph.add_edge(i, j)
+        # Sentence pairs farther apart than this are never connected
+        max_distance = n - 1
+        if self.clique_mode == "window":
+            max_distance = min(max_distance, self.clique_window)
+        
+        if isinstance(similarity_matrix, BandedSimilarityMatrix):
+            # Only pairs within the band can be connected
+            max_distance = min(max_distance, similarity_matrix.bandwidth)
+        
+        if isinstance(similarity_matrix, BandedSimilarityMatrix) or max_distance < n - 1:
+            for d in range(1, max_distance + 1):
+                rows = np.flatnonzero(similarity_matrix.diagonal(d) > self.threshold)
+                graph.add_edges_from((int(i), int(i) + d) for i in rows)
+            return graph
+        
+        # Add edges for similar sentences (upper triangle, i < j)
+        rows, cols = np.nonzero(np.triu(np.asarray(similarity_matrix) > self.threshold, k=1))
+        graph.add_edges_from(zip(rows.tolist(), cols.tolist()))
         
         return graph
 
     def _find_maximal_cliques(self, graph: nx.Graph) -> List[Set[int]]:
         """Find all maximal cliques in the graph.
         
+        In "components" mode, or when enumeration exceeds `time_budget_s`,
+        connected components are returned instead.
+        
         Args:
             graph: The semantic graph.
             
         Returns:
             List of sets, where each set contains sentence indices in a clique.
         """
-        cliques = [set(clique) for clique in nx.find_cliques(graph)]
+        self.used_fallback = False
+        if self.clique_mode == "components":
+            return self._connected_components(graph)
+        
+        if self.time_budget_s is None:
+            return [set(clique) for clique in nx.find_cliques(graph)]
+        
+        deadline = time.perf_counter() + self.time_budget_s
+        cliques = []
+        for clique in nx.find_cliques(graph):
+            cliques.append(set(clique))
+            if time.perf_counter() > deadline:
+                print(
+                    f"[WARNING] Clique enumeration exceeded {self.time_budget_s:.2f}s "
+                    f"({len(cliques)} cliques so far); using connected components.",
+                    flush=True,
+                )
+                self.used_fallback = True
+                return self._connected_components(graph)
         return cliques
 
+    def _connected_components(self, graph: nx.Graph) -> List[Set[int]]:
+        """Connected components of the graph, a linear-time stand-in for cliques."""
+        return [set(component) for component in nx.connected_components(graph)]
+
     def _cliques_to_segments(
         self,
         cliques: List[Set[int]],
@@ -168,7 +249,7 @@ class GraphSegSM:
     def _merge_small_segments(
         self,
         segments: List[List[int]],
-        similarity_matrix: np.ndarray,
+        similarity_matrix: SimilarityMatrix,
         n: int,
     ) -> List[List[int]]:
         """Merge segments smaller than min_seg_size with their neighbors.
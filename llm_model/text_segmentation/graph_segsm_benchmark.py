@@ -0,0 +1,168 @@
+"""Benchmark: GraphSegSM graph construction and clique search over thresholds.
+
+Builds synthetic sentence embeddings for a long, repetitive story (segments
+draw their topic from a small pool, so distant segments look alike, as in
+fairy tales that repeat an episode three times), then for every threshold
+and clique mode reports edges, cliques, time per stage, whether the time
+budget was hit, and the boundary score against the true segmentation.
+
+Modes: `exact` (all maximal cliques, with `--time-budget`), `window`
+(cliques within `--clique-window` adjacent sentences) and `components`.
+The edge construction is also timed with the former Python double loop.
+
+Usage:
+  python -m llm_model.text_segmentation.graph_segsm_benchmark \\
+    --sentences 2000 --thresholds 0.3 0.5 0.7 0.9 --time-budget 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .boundary_metric import BoundarySegmentationMetric
+from .graph_segsm import GraphSegSM
+from .similarity_matrix import SimilarityMatrixBuilder
+
+
+def synthetic_story(
+    n_sentences: int,
+    *,
+    topics: int = 6,
+    dim: int = 64,
+    noise: float = 0.8,
+    min_len: int = 5,
+    max_len: int = 20,
+    seed: int = 0,
+) -> Tuple[np.ndarray, List[int]]:
+    """Return (embeddings, reference boundaries) for a synthetic repetitive story."""
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    embeddings = np.empty((n_sentences, dim))
+    boundaries: List[int] = []
+    start = 0
+    previous = -1
+    while start < n_sentences:
+        length = int(rng.integers(min_len, max_len + 1))
+        topic = int(rng.integers(topics))
+        while topics > 1 and topic == previous:
+            topic = int(rng.integers(topics))
+        end = min(start + length, n_sentences)
+        embeddings[start:end] = centers[topic] + noise * rng.normal(size=(end - start, dim))
+        if end < n_sentences:
+            boundaries.append(end - 1)
+        start, previous = end, topic
+    return embeddings, boundaries
+
+
+def _loop_graph(similarity_matrix: np.ndarray, threshold: float) -> nx.Graph:
+    """Graph built with the former per-pair Python loop."""
+
+    n = similarity_matrix.shape[0]
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            if similarity_matrix[i, j] > threshold:
+                graph.add_edge(i, j)
+    return graph
+
+
+def run_mode(
+    similarity_matrix: np.ndarray,
+    reference: Sequence[int],
+    *,
+    threshold: float,
+    mode: str,
+    clique_window: int,
+    time_budget_s: float,
+) -> Dict[str, object]:
+    """Run the GraphSegSM stages on a precomputed matrix and time each one."""
+
+    n = similarity_matrix.shape[0]
+    seg = GraphSegSM(
+        similarity_builder=SimilarityMatrixBuilder(embedding_func=None),
+        threshold=threshold,
+        clique_mode=mode,
+        clique_window=clique_window,
+        time_budget_s=time_budget_s,
+    )
+
+    t0 = time.perf_counter()
+    graph = seg._build_graph(similarity_matrix, n)
+    t1 = time.perf_counter()
+    cliques = seg._find_maximal_cliques(graph)
+    t2 = time.perf_counter()
+    segments = seg._cliques_to_segments(cliques, n)
+    segments = seg._merge_small_segments(segments, similarity_matrix, n)
+    boundaries = seg._segments_to_boundaries(segments, n)
+    t3 = time.perf_counter()
+
+    return {
+        "edges": graph.number_of_edges(),
+        "cliques": len(cliques),
+        "graph_s": t1 - t0,
+        "cliques_s": t2 - t1,
+        "total_s": t3 - t0,
+        "fallback": seg.used_fallback,
+        "boundaries": len(boundaries),
+        "score": BoundarySegmentationMetric().calculate(list(reference), boundaries),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.text_segmentation.graph_segsm_benchmark",
+        description="Time GraphSegSM edge construction and clique search over similarity thresholds.",
+    )
+    parser.add_argument("--sentences", type=int, default=2000, help="Number of sentences")
+    parser.add_argument("--topics", type=int, default=6, help="Topic pool size (smaller = more repetitive)")
+    parser.add_argument("--noise", type=float, default=0.8, help="Per-sentence noise around the topic")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.3, 0.5, 0.7, 0.9])
+    parser.add_argument("--modes", nargs="+", default=["exact", "window", "components"])
+    parser.add_argument("--clique-window", type=int, default=8, help="Sentence distance for window mode")
+    parser.add_argument("--time-budget", type=float, default=5.0, help="Clique enumeration budget (s)")
+    parser.add_argument("--skip-loop", action="store_true", help="Do not time the former edge loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    embeddings, reference = synthetic_story(
+        args.sentences, topics=args.topics, noise=args.noise, seed=args.seed
+    )
+    similarity_matrix = SimilarityMatrixBuilder(embedding_func=None).similarity_from_embeddings(embeddings)
+    print(f"[INFO] {args.sentences} sentences, {len(reference) + 1} reference segments, {args.topics} topics")
+
+    print(
+        f"{'threshold':>9} {'mode':<10} {'edges':>9} {'cliques':>8} {'graph_s':>8} "
+        f"{'loop_s':>8} {'cliques_s':>9} {'total_s':>8} {'fallback':>8} {'bounds':>6} {'score':>6}"
+    )
+    for threshold in args.thresholds:
+        loop_s = float("nan")
+        if not args.skip_loop:
+            start = time.perf_counter()
+            _loop_graph(similarity_matrix, threshold)
+            loop_s = time.perf_counter() - start
+        for mode in args.modes:
+            r = run_mode(
+                similarity_matrix,
+                reference,
+                threshold=threshold,
+                mode=mode,
+                clique_window=args.clique_window,
+                time_budget_s=args.time_budget,
+            )
+            print(
+                f"{threshold:>9.2f} {mode:<10} {r['edges']:>9} {r['cliques']:>8} {r['graph_s']:>8.3f} "
+                f"{loop_s if mode == 'exact' else float('nan'):>8.3f} {r['cliques_s']:>9.3f} "
+                f"{r['total_s']:>8.3f} {str(r['fallback']):>8} {r['boundaries']:>6} {r['score']:>6.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,7 +7,7 @@ from typing import List, Optional
 import numpy as np
 from scipy.ndimage import gaussian_filter1d
 
-from .similarity_matrix import SimilarityMatrixBuilder
+from .similarity_matrix import SimilarityMatrix, SimilarityMatrixBuilder
 
 
 class MagneticClustering:
@@ -65,7 +65,25 @@ class MagneticClustering:
         
         # Build similarity matrix
         similarity_matrix = self.similarity_builder.build_similarity_matrix(sentences)
-        n = len(sentences)
+        
+        return self.segment_from_matrix(similarity_matrix, len(sentences))
+
+    def segment_from_matrix(
+        self,
+        similarity_matrix: SimilarityMatrix,
+        n: int,
+    ) -> List[int]:
+        """Segment using a precomputed similarity matrix.
+        
+        Args:
+            similarity_matrix: Similarity matrix of the n sentences (dense or banded).
+            n: Number of sentences.
+            
+        Returns:
+            List of boundary indices, as returned by `segment`.
+        """
+        if n <= 1:
+            return []
         
         # Compute magnetic forces
         magnetic_forces = self._compute_magnetic_forces(similarity_matrix, n)
@@ -80,46 +98,52 @@ class MagneticClustering:
 
     def _compute_magnetic_forces(
         self,
-        similarity_matrix: np.ndarray,
+        similarity_matrix: SimilarityMatrix,
         n: int,
     ) -> np.ndarray:
         """Compute magnetic force b_i for each sentence gap.
         
         Args:
-            similarity_matrix: The similarity matrix.
+            similarity_matrix: The similarity matrix (dense or banded).
             n: Number of sentences.
             
         Returns:
             Array of magnetic forces, shape (n-1,).
         """
-        forces = []
-        
-        for i in range(n - 1):
-            # Compute right attraction (forward)
-            right_attraction = 0.0
-            for k in range(1, self.window_size + 1):
-                j = i + k
-                if j < n:
-                    sim = self.similarity_builder.get_approximate_similarity(
-                        similarity_matrix, i, j
-                    )
-                    right_attraction += self.weights[k - 1] * sim
-            
-            # Compute left attraction (backward)
-            left_attraction = 0.0
-            for k in range(1, self.window_size + 1):
-                j = i - k
-                if j >= 0:
-                    sim = self.similarity_builder.get_approximate_similarity(
-                        similarity_matrix, i, j
-                    )
-                    left_attraction += self.weights[k - 1] * sim
-            
-            # Magnetic force is the difference
-            force = right_attraction - left_attraction
-            forces.append(force)
+        if n <= 1:
+            return np.zeros(0)
+        
+        # For offset k, gap i is attracted right by S[i, i+k] (k-th superdiagonal)
+        # and left by S[i, i-k] (k-th subdiagonal). Accumulate per offset in the
+        # same order as the scalar definition so results match exactly.
+        right_attraction = np.zeros(n - 1)
+        left_attraction = np.zeros(n - 1)
+        for k in range(1, min(self.window_size, n - 1) + 1):
+            weight = self.weights[k - 1]
+            # S[i, i+k] for i = 0..n-1-k
+            right_attraction[: n - k] += weight * self._diagonal(similarity_matrix, k)
+            # S[i, i-k] for i = k..n-2
+            left_attraction[k:] += weight * self._diagonal(similarity_matrix, -k)[: n - 1 - k]
+        
+        # Magnetic force is the difference
+        return right_attraction - left_attraction
+
+    def _diagonal(self, similarity_matrix: SimilarityMatrix, offset: int) -> np.ndarray:
+        """Diagonal `offset` of the matrix with masked entries approximated.
         
-        return np.array(forces)
+        Vectorized equivalent of `SimilarityMatrixBuilder.get_approximate_similarity`
+        along one diagonal: with a local neighborhood, zero (masked) entries are
+        replaced by the mean of the non-zero entries of the same diagonal (or 0.0).
+        """
+        values = similarity_matrix.diagonal(offset).astype(float, copy=True)
+        if self.similarity_builder.local_neighborhood is None:
+            return values
+        
+        masked = values == 0.0
+        if masked.any():
+            observed = values[~masked]
+            values[masked] = np.mean(observed) if observed.size else 0.0
+        return values
 
     def _smooth_forces(self, forces: np.ndarray) -> np.ndarray:
         """Apply Gaussian smoothing to magnetic forces.
@@ -146,11 +170,9 @@ class MagneticClustering:
         Returns:
             List of boundary indices.
         """
-        boundaries = []
-        
-        for i in range(len(smoothed_forces) - 1):
-            # Boundary: b_i < 0 and b_{i+1} > 0
-            if smoothed_forces[i] < 0 and smoothed_forces[i + 1] > 0:
-                boundaries.append(i)
+        if len(smoothed_forces) < 2:
+            return []
         
-        return boundaries
+        # Boundary: b_i < 0 and b_{i+1} > 0
+        crossings = (smoothed_forces[:-1] < 0) & (smoothed_forces[1:] > 0)
+        return np.flatnonzero(crossings).tolist()
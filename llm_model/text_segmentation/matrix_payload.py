@@ -0,0 +1,135 @@
+"""Compact encodings of similarity matrices for the visualization API.
+
+`tolist()` of an n x n float64 matrix costs about 20 bytes per entry as JSON,
+so a 500-sentence story produced a multi-megabyte response. This module
+shrinks the payload in three independent ways:
+
+- downsampling: average s x s blocks so at most `max_size` rows remain
+- banding: keep only the diagonals 0..band as an (n, band + 1) array, the
+  layout of `BandedSimilarityMatrix` (``bands[i, d] = S[i, i + d]``)
+- binary: little-endian float16 (or float32), base64 in JSON or raw bytes
+
+`encode_similarity_matrix` returns the description used in JSON responses:
+``{"dtype", "layout", "shape", "n", "step", "data"}``; `n` is the number of
+sentences and `step` the downsampling factor (row r covers sentences
+r * step .. (r + 1) * step - 1).
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+from typing import Any, Dict, Literal, Optional, Tuple
+
+import numpy as np
+
+from .similarity_matrix import BandedSimilarityMatrix, SimilarityMatrix
+
+MatrixDtype = Literal["float16", "float32"]
+
+
+def downsample_matrix(matrix: np.ndarray, max_size: Optional[int]) -> Tuple[np.ndarray, int]:
+    """Block-average a square matrix to at most `max_size` rows.
+
+    Returns:
+        (matrix, step) where step is the number of sentences per row (1 if unchanged).
+    """
+    n = matrix.shape[0]
+    if not max_size or n <= max_size:
+        return matrix, 1
+
+    step = math.ceil(n / int(max_size))
+    rows = math.ceil(n / step)
+    padded = np.full((rows * step, rows * step), np.nan)
+    padded[:n, :n] = matrix
+    blocks = padded.reshape(rows, step, rows, step)
+    return np.nanmean(blocks, axis=(1, 3)), step
+
+
+def band_matrix(matrix: SimilarityMatrix, band: int) -> np.ndarray:
+    """Diagonals 0..band of a square matrix as an (n, band + 1) array."""
+
+    if isinstance(matrix, BandedSimilarityMatrix) and matrix.bandwidth >= band:
+        return matrix.bands[:, : band + 1].copy()
+
+    n = matrix.shape[0]
+    band = max(0, min(int(band), n - 1))
+    bands = np.zeros((n, band + 1))
+    for d in range(band + 1):
+        bands[: n - d, d] = matrix.diagonal(d)
+    return bands
+
+
+def prepare_similarity_matrix(
+    matrix: SimilarityMatrix,
+    *,
+    max_size: Optional[int] = None,
+    band: Optional[int] = None,
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Apply banding or downsampling to a similarity matrix.
+
+    Args:
+        matrix: Dense or banded similarity matrix of n sentences.
+        max_size: Downsample to at most this many rows (dense layout only).
+        band: Keep only the diagonals 0..band (banded layout). Takes precedence
+            over `max_size`; banded input matrices are always sent banded.
+
+    Returns:
+        (values, meta) where meta holds layout ("dense" or "banded"), n and step.
+    """
+    n = matrix.shape[0]
+    if band is not None:
+        values, step, layout = band_matrix(matrix, band), 1, "banded"
+    elif isinstance(matrix, BandedSimilarityMatrix):
+        values, step, layout = matrix.bands, 1, "banded"
+    else:
+        values, step = downsample_matrix(np.asarray(matrix, dtype=float), max_size)
+        layout = "dense"
+    return values, {"layout": layout, "n": int(n), "step": int(step)}
+
+
+def similarity_matrix_bytes(
+    matrix: SimilarityMatrix,
+    *,
+    dtype: MatrixDtype = "float16",
+    max_size: Optional[int] = None,
+    band: Optional[int] = None,
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Encode a similarity matrix as raw little-endian bytes.
+
+    Args:
+        matrix: Dense or banded similarity matrix of n sentences.
+        dtype: "float16" (half the size of float32, ~3 significant digits) or "float32".
+        max_size: See `prepare_similarity_matrix`.
+        band: See `prepare_similarity_matrix`.
+
+    Returns:
+        (data, meta) where meta holds dtype, layout, shape, n and step.
+    """
+    if dtype not in ("float16", "float32"):
+        raise ValueError(f"Unsupported matrix dtype: {dtype}")
+
+    values, meta = prepare_similarity_matrix(matrix, max_size=max_size, band=band)
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return array.tobytes(), {"dtype": dtype, "shape": list(array.shape), **meta}
+
+
+def encode_similarity_matrix(
+    matrix: SimilarityMatrix,
+    *,
+    dtype: MatrixDtype = "float16",
+    max_size: Optional[int] = None,
+    band: Optional[int] = None,
+) -> Dict[str, Any]:
+    """`similarity_matrix_bytes` with the data base64-encoded, for JSON responses."""
+
+    data, meta = similarity_matrix_bytes(matrix, dtype=dtype, max_size=max_size, band=band)
+    return {**meta, "data": base64.b64encode(data).decode("ascii")}
+
+
+def decode_similarity_matrix(payload: Dict[str, Any]) -> np.ndarray:
+    """Inverse of `encode_similarity_matrix` (returns the encoded array, float32)."""
+
+    raw = base64.b64decode(payload["data"])
+    array = np.frombuffer(raw, dtype=np.dtype(payload["dtype"]).newbyteorder("<"))
+    return array.reshape(payload["shape"]).astype(np.float32)
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Literal, Optional
 from .boundary_metric import BoundarySegmentationMetric
 from .graph_segsm import GraphSegSM
 from .magnetic_clustering import MagneticClustering
+from .session import SegmentationSessionCache
 from .similarity_matrix import SimilarityMatrixBuilder
 
 
@@ -42,6 +43,8 @@ class TextSegmenter:
         algorithm: Literal["magnetic", "graph"] = "magnetic",
         embedding_model: str = "nomic-embed-text",
         context_window: int = 2,
+        local_neighborhood: Optional[int] = None,
+        banded: bool = False,
         # Magnetic Clustering parameters
         window_size: int = 3,
         weights: Optional[List[float]] = None,
@@ -49,6 +52,10 @@ class TextSegmenter:
         # GraphSegSM parameters
         threshold: float = 0.7,
         min_seg_size: int = 3,
+        clique_mode: Literal["exact", "window", "components"] = "exact",
+        clique_window: int = 8,
+        time_budget_s: Optional[float] = None,
+        session_cache: Optional[SegmentationSessionCache] = None,
     ):
         """Initialize TextSegmenter.
         
@@ -59,20 +66,34 @@ class TextSegmenter:
             algorithm: Algorithm to use ("magnetic" or "graph").
             embedding_model: Name of the embedding model (for metadata).
             context_window: Number of consecutive sentences to use as context.
+            local_neighborhood: Only compare sentences within this distance.
+            banded: Store only the diagonals within `local_neighborhood`
+                instead of the full n x n similarity matrix (for long documents).
             window_size: Window size for Magnetic Clustering.
             weights: Weight parameters for Magnetic Clustering.
             filter_width: Gaussian filter width for Magnetic Clustering.
             threshold: Similarity threshold for GraphSegSM.
             min_seg_size: Minimum segment size for GraphSegSM.
+            clique_mode: Clique search of GraphSegSM ("exact", "window" or
+                "components").
+            clique_window: Largest sentence distance connected in "window" mode.
+            time_budget_s: Clique enumeration budget before GraphSegSM falls
+                back to connected components.
+            session_cache: If set, embeddings and the similarity matrix of
+                each document are cached there, so repeated calls with other
+                clustering parameters skip the embedding step.
         """
         self.embedding_func = embedding_func
         self.algorithm = algorithm
         self.embedding_model = embedding_model
+        self.session_cache = session_cache
         
         # Build similarity matrix builder
         self.similarity_builder = SimilarityMatrixBuilder(
             embedding_func=embedding_func,
             context_window=context_window,
+            local_neighborhood=local_neighborhood,
+            banded=banded,
         )
         
         # Initialize algorithm
@@ -88,6 +109,9 @@ class TextSegmenter:
                 similarity_builder=self.similarity_builder,
                 threshold=threshold,
                 min_seg_size=min_seg_size,
+                clique_mode=clique_mode,
+                clique_window=clique_window,
+                time_budget_s=time_budget_s,
             )
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
@@ -128,7 +152,15 @@ class TextSegmenter:
             )
         
         # Perform segmentation
-        boundaries = self.segmenter.segment(sentences)
+        if self.session_cache is not None:
+            session = self.session_cache.get_or_create(
+                sentences,
+                similarity_builder=self.similarity_builder,
+                embedding_model=self.embedding_model,
+            )
+            boundaries = self.segmenter.segment_from_matrix(session.similarity_matrix, len(sentences))
+        else:
+            boundaries = self.segmenter.segment(sentences)
         
         # Build segments
         segments = self._build_segments(sentences, boundaries)
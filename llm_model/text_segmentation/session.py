@@ -0,0 +1,164 @@
+"""Per-document segmentation sessions for cheap parameter sweeps.
+
+Changing `window_size`, `filter_width` or `threshold` does not change the
+sentences, their context-window embeddings or the similarity matrix, yet
+`TextSegmenter.segment` used to rebuild all three on every call. A
+`SegmentationSession` holds them for one document, and
+`SegmentationSessionCache` keeps the most recent sessions keyed by a hash of
+(sentences, embedding model, context window, neighborhood, banded), so a
+sweep only reruns the clustering step.
+
+The cache assumes `embedding_model` identifies the embedding function: two
+segmenters with the same model name and similarity settings share sessions.
+
+Configuration (environment):
+- `SEGMENTATION_SESSION_CACHE_ENTRIES`: sessions kept by the default cache
+  (default: 8, `0` disables it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .similarity_matrix import SimilarityMatrix, SimilarityMatrixBuilder
+
+
+def segmentation_session_key(
+    sentences: List[str],
+    *,
+    embedding_model: str,
+    similarity_builder: SimilarityMatrixBuilder,
+) -> str:
+    """Return the key of the session for these sentences and similarity settings."""
+
+    payload = {
+        "embedding_model": embedding_model,
+        "context_window": similarity_builder.context_window,
+        "local_neighborhood": similarity_builder.local_neighborhood,
+        "banded": similarity_builder.banded,
+        "sentences": list(sentences),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SegmentationSession:
+    """Sentences, embeddings and similarity matrix of one document."""
+
+    key: str
+    sentences: List[str]
+    embeddings: np.ndarray
+    similarity_matrix: SimilarityMatrix
+
+
+class SegmentationSessionCache:
+    """LRU of segmentation sessions.
+
+    The object is safe to share between threads (FastAPI serves requests in a
+    threadpool); all state is guarded by a single lock. Sessions are built
+    outside the lock, so two concurrent misses on the same document may both
+    embed it; the last one is kept.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of sessions kept (least recently used are dropped).
+        """
+        self.max_entries = max(1, int(max_entries))
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, SegmentationSession]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(
+        self,
+        sentences: List[str],
+        *,
+        similarity_builder: SimilarityMatrixBuilder,
+        embedding_model: str,
+    ) -> SegmentationSession:
+        """Return the cached session for the document, building it on a miss.
+
+        Args:
+            sentences: Sentences of the document.
+            similarity_builder: Builder used to embed the sentences on a miss.
+            embedding_model: Name of the model behind the builder's embedding function.
+        """
+        key = segmentation_session_key(
+            sentences,
+            embedding_model=embedding_model,
+            similarity_builder=similarity_builder,
+        )
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                self.hits += 1
+                return session
+            self.misses += 1
+
+        embeddings = similarity_builder.build_embeddings(sentences)
+        session = SegmentationSession(
+            key=key,
+            sentences=list(sentences),
+            embeddings=embeddings,
+            similarity_matrix=similarity_builder.similarity_from_embeddings(embeddings),
+        )
+
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached sessions."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._sessions),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+_DEFAULT_CACHE: Optional[SegmentationSessionCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_session_cache() -> Optional[SegmentationSessionCache]:
+    """Return the process-wide session cache, or None when disabled via env."""
+
+    global _DEFAULT_CACHE
+
+    try:
+        max_entries = int(os.getenv("SEGMENTATION_SESSION_CACHE_ENTRIES") or 8)
+    except ValueError:
+        max_entries = 8
+    if max_entries <= 0:
+        return None
+
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = SegmentationSessionCache(max_entries=max_entries)
+        return _DEFAULT_CACHE
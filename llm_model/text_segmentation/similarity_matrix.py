@@ -2,12 +2,99 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
 
+class BandedSimilarityMatrix:
+    """Symmetric similarity matrix that only stores diagonals near the main one.
+    
+    Linear segmentation only compares sentences that are close to each other,
+    so for long documents the full n x n matrix is mostly wasted memory.
+    This class keeps the diagonals 0..bandwidth in an array of shape
+    (n, bandwidth + 1), where ``bands[i, d] = S[i, i + d]`` (rows past the
+    end of a diagonal are zero). Entries outside the band read as 0.0, the
+    same value a masked dense matrix holds there.
+    
+    It supports the parts of the ndarray interface the segmentation
+    algorithms use: ``shape``, ``S[i, j]``, ``diagonal(offset)`` and
+    ``np.asarray(S)`` (dense copy, e.g. for plotting).
+    """
+
+    def __init__(self, bands: np.ndarray):
+        """Initialize from precomputed bands.
+        
+        Args:
+            bands: Array of shape (n, bandwidth + 1) with
+                ``bands[i, d] = S[i, i + d]``.
+        """
+        bands = np.asarray(bands, dtype=float)
+        if bands.ndim != 2 or bands.shape[1] < 1:
+            raise ValueError(f"bands must have shape (n, bandwidth + 1), got {bands.shape}")
+        self.bands = bands
+
+    @property
+    def n(self) -> int:
+        return self.bands.shape[0]
+
+    @property
+    def bandwidth(self) -> int:
+        return self.bands.shape[1] - 1
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.n, self.n)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bands.nbytes
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        n = self.n
+        if i < 0:
+            i += n
+        if j < 0:
+            j += n
+        if not (0 <= i < n and 0 <= j < n):
+            raise IndexError(f"index ({index[0]}, {index[1]}) is out of bounds for shape {self.shape}")
+        d = abs(i - j)
+        if d > self.bandwidth:
+            return 0.0
+        return self.bands[min(i, j), d]
+
+    def diagonal(self, offset: int = 0) -> np.ndarray:
+        """Return diagonal `offset` (``S[i, i + offset]``), like ``ndarray.diagonal``."""
+        d = abs(int(offset))
+        length = max(self.n - d, 0)
+        if d > self.bandwidth:
+            return np.zeros(length)
+        return self.bands[:length, d]
+
+    def to_dense(self) -> np.ndarray:
+        """Return the full (n, n) matrix with zeros outside the band."""
+        n = self.n
+        dense = np.zeros((n, n))
+        rows = np.arange(n)
+        for d in range(min(self.bandwidth, n - 1) + 1):
+            values = self.bands[: n - d, d]
+            dense[rows[: n - d], rows[d:]] = values
+            dense[rows[d:], rows[: n - d]] = values
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+
+SimilarityMatrix = Union[np.ndarray, BandedSimilarityMatrix]
+
+
 class SimilarityMatrixBuilder:
     """Builds cosine similarity matrix from sentence embeddings.
     
@@ -22,6 +109,7 @@ class SimilarityMatrixBuilder:
         embedding_func: callable,
         context_window: int = 2,
         local_neighborhood: Optional[int] = None,
+        banded: bool = False,
     ):
         """Initialize the similarity matrix builder.
         
@@ -33,10 +121,17 @@ class SimilarityMatrixBuilder:
                 when generating embeddings. Default is 2.
             local_neighborhood: If set, only compute similarity for pairs within
                 this distance from diagonal. If None, compute full matrix.
+            banded: If True, `build_similarity_matrix` returns a
+                `BandedSimilarityMatrix` holding only the diagonals within
+                `local_neighborhood` (O(n * local_neighborhood) memory instead
+                of O(n^2)). Requires `local_neighborhood`.
         """
+        if banded and local_neighborhood is None:
+            raise ValueError("banded similarity matrices require local_neighborhood")
         self.embedding_func = embedding_func
         self.context_window = context_window
         self.local_neighborhood = local_neighborhood
+        self.banded = banded
 
     def build_embeddings(
         self,
@@ -91,7 +186,7 @@ class SimilarityMatrixBuilder:
     def build_similarity_matrix(
         self,
         sentences: List[str],
-    ) -> np.ndarray:
+    ) -> SimilarityMatrix:
         """Build cosine similarity matrix from sentences.
         
         Args:
@@ -100,17 +195,36 @@ class SimilarityMatrixBuilder:
         Returns:
             Similarity matrix of shape (n_sentences, n_sentences) where
             S[i, j] is the cosine similarity between sentence i and j.
+            A `BandedSimilarityMatrix` if the builder is banded.
         """
         if not sentences:
             return np.array([])
         
         # Get embeddings
         embeddings = self.build_embeddings(sentences)
+        
+        return self.similarity_from_embeddings(embeddings)
+
+    def similarity_from_embeddings(
+        self,
+        embeddings: np.ndarray,
+    ) -> SimilarityMatrix:
+        """Build the similarity matrix from precomputed embeddings.
+        
+        Args:
+            embeddings: Array of shape (n_sentences, embedding_dim).
+            
+        Returns:
+            Same as `build_similarity_matrix`.
+        """
         n = len(embeddings)
         
         if n == 0:
             return np.array([])
         
+        if self.banded:
+            return self._banded_cosine_similarity(np.asarray(embeddings, dtype=float))
+        
         # Compute full similarity matrix
         similarity_matrix = cosine_similarity(embeddings)
         
@@ -121,9 +235,32 @@ class SimilarityMatrixBuilder:
         
         return similarity_matrix
 
+    def _banded_cosine_similarity(self, embeddings: np.ndarray) -> BandedSimilarityMatrix:
+        """Cosine similarity on the diagonals 0..local_neighborhood only.
+        
+        Args:
+            embeddings: Array of shape (n_sentences, embedding_dim).
+            
+        Returns:
+            BandedSimilarityMatrix with bandwidth min(local_neighborhood, n - 1).
+        """
+        n = len(embeddings)
+        bandwidth = min(int(self.local_neighborhood), n - 1)
+        
+        # Normalize rows like sklearn's cosine_similarity (zero vectors stay zero)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        normalized = embeddings / norms
+        
+        bands = np.zeros((n, bandwidth + 1))
+        for d in range(bandwidth + 1):
+            bands[: n - d, d] = np.einsum("ij,ij->i", normalized[: n - d], normalized[d:])
+        
+        return BandedSimilarityMatrix(bands)
+
     def get_approximate_similarity(
         self,
-        similarity_matrix: np.ndarray,
+        similarity_matrix: SimilarityMatrix,
         i: int,
         j: int,
     ) -> float:
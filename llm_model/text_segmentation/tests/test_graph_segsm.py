@@ -114,3 +114,114 @@ def test_find_maximal_cliques():
     assert isinstance(cliques, list)
     assert all(isinstance(c, set) for c in cliques)
     assert len(cliques) > 0  # Should find at least some cliques
+
+
+def test_graph_segsm_banded_matrix():
+    """A banded matrix yields the edges of the masked dense matrix."""
+    def embedding_func(texts):
+        rng = np.random.default_rng(1)
+        return rng.normal(size=(len(texts), 4)).tolist()
+
+    sentences = [f"s{i}" for i in range(15)]
+    results = {}
+    for banded in (False, True):
+        builder = SimilarityMatrixBuilder(
+            embedding_func=embedding_func,
+            local_neighborhood=2,
+            banded=banded,
+        )
+        graph_seg = GraphSegSM(similarity_builder=builder, threshold=0.1, min_seg_size=2)
+        matrix = builder.build_similarity_matrix(sentences)
+        graph = graph_seg._build_graph(matrix, len(sentences))
+        edges = {tuple(sorted(e)) for e in graph.edges()}
+        results[banded] = (edges, graph_seg.segment(sentences))
+
+    assert results[True] == results[False]
+    assert all(j - i <= 2 for i, j in results[True][0])
+
+
+def _random_similarity(n, seed=0):
+    rng = np.random.default_rng(seed)
+    emb = rng.normal(size=(n, 4))
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb @ emb.T
+
+
+def test_build_graph_matches_pairwise_threshold():
+    """Vectorized edge construction connects exactly the pairs above threshold."""
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    graph_seg = GraphSegSM(similarity_builder=builder, threshold=0.3)
+    n = 30
+    matrix = _random_similarity(n)
+
+    graph = graph_seg._build_graph(matrix, n)
+
+    expected = {(i, j) for i in range(n) for j in range(i + 1, n) if matrix[i, j] > 0.3}
+    assert {tuple(sorted(e)) for e in graph.edges()} == expected
+    assert graph.number_of_nodes() == n
+
+
+def test_window_mode_limits_edge_distance():
+    """Window mode only connects sentences within clique_window of each other."""
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    graph_seg = GraphSegSM(
+        similarity_builder=builder,
+        threshold=0.0,
+        clique_mode="window",
+        clique_window=3,
+    )
+    n = 30
+    matrix = _random_similarity(n, seed=1)
+
+    graph = graph_seg._build_graph(matrix, n)
+    cliques = graph_seg._find_maximal_cliques(graph)
+
+    expected = {(i, j) for i in range(n) for j in range(i + 1, min(i + 4, n)) if matrix[i, j] > 0.0}
+    assert {tuple(sorted(e)) for e in graph.edges()} == expected
+    assert all(max(c) - min(c) <= 3 for c in cliques)
+
+
+def test_components_mode():
+    """Components mode returns connected components instead of cliques."""
+    import networkx as nx
+
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    graph_seg = GraphSegSM(similarity_builder=builder, clique_mode="components")
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(6))
+    graph.add_edges_from([(0, 1), (1, 2), (4, 5)])
+
+    cliques = graph_seg._find_maximal_cliques(graph)
+
+    assert sorted(sorted(c) for c in cliques) == [[0, 1, 2], [3], [4, 5]]
+
+
+def test_time_budget_falls_back_to_components():
+    """Clique enumeration over budget falls back to connected components."""
+    import networkx as nx
+
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    graph_seg = GraphSegSM(similarity_builder=builder, time_budget_s=0.0)
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(5))
+    graph.add_edges_from([(0, 1), (1, 2), (3, 4)])
+
+    cliques = graph_seg._find_maximal_cliques(graph)
+
+    assert graph_seg.used_fallback
+    assert sorted(sorted(c) for c in cliques) == [[0, 1, 2], [3, 4]]
+
+    # A generous budget gives the exact cliques
+    graph_seg.time_budget_s = 60.0
+    cliques = graph_seg._find_maximal_cliques(graph)
+    assert not graph_seg.used_fallback
+    assert sorted(sorted(c) for c in cliques) == [[0, 1], [1, 2], [3, 4]]
+
+
+def test_invalid_clique_mode():
+    """Unknown clique modes are rejected."""
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    with pytest.raises(ValueError):
+        GraphSegSM(similarity_builder=builder, clique_mode="approximate")
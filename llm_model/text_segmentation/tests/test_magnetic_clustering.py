@@ -99,3 +99,103 @@ def test_magnetic_clustering_force_direction():
     # Boundaries should be valid indices
     for b in boundaries:
         assert 0 <= b < len(sentences) - 1
+
+
+def _reference_forces(clustering, similarity_matrix, n):
+    """Scalar definition of the magnetic force, one similarity lookup at a time."""
+    builder = clustering.similarity_builder
+    forces = []
+    for i in range(n - 1):
+        right_attraction = 0.0
+        left_attraction = 0.0
+        for k in range(1, clustering.window_size + 1):
+            if i + k < n:
+                sim = builder.get_approximate_similarity(similarity_matrix, i, i + k)
+                right_attraction += clustering.weights[k - 1] * sim
+            if i - k >= 0:
+                sim = builder.get_approximate_similarity(similarity_matrix, i, i - k)
+                left_attraction += clustering.weights[k - 1] * sim
+        forces.append(right_attraction - left_attraction)
+    return np.array(forces)
+
+
+def _random_similarity(n, seed):
+    rng = np.random.default_rng(seed)
+    emb = rng.normal(size=(n, 8))
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb @ emb.T
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 40])
+@pytest.mark.parametrize("window_size", [1, 3, 5])
+def test_vectorized_forces_match_reference(n, window_size):
+    """Vectorized forces are identical to the per-pair definition."""
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    clustering = MagneticClustering(similarity_builder=builder, window_size=window_size)
+    sim = _random_similarity(n, seed=n * 10 + window_size)
+
+    forces = clustering._compute_magnetic_forces(sim, n)
+
+    assert forces.shape == (max(n - 1, 0),)
+    np.testing.assert_array_equal(forces, _reference_forces(clustering, sim, n))
+
+
+@pytest.mark.parametrize("local_neighborhood", [1, 2, 4])
+def test_vectorized_forces_match_reference_with_local_neighborhood(local_neighborhood):
+    """Masked (zero) entries are approximated by their diagonal mean, as in get_approximate_similarity."""
+    builder = SimilarityMatrixBuilder(
+        embedding_func=dummy_embedding_func,
+        local_neighborhood=local_neighborhood,
+    )
+    weights = [0.9, 0.6, 0.4, 0.2, 0.1]
+    clustering = MagneticClustering(similarity_builder=builder, window_size=5, weights=weights)
+    n = 30
+    sim = _random_similarity(n, seed=local_neighborhood)
+    idx = np.arange(n)
+    sim[np.abs(idx[:, None] - idx[None, :]) > local_neighborhood] = 0.0
+    # A fully zero diagonal falls back to 0.0, a partially zero one to the mean.
+    sim[idx[:-2], idx[:-2] + 2] = 0.0
+    sim[5, 6] = sim[6, 5] = 0.0
+
+    forces = clustering._compute_magnetic_forces(sim, n)
+
+    np.testing.assert_array_equal(forces, _reference_forces(clustering, sim, n))
+
+
+def test_find_boundaries_sign_changes():
+    """Boundaries are the gaps where the smoothed force goes from negative to positive."""
+    builder = SimilarityMatrixBuilder(embedding_func=dummy_embedding_func)
+    clustering = MagneticClustering(similarity_builder=builder)
+
+    forces = np.array([0.5, -0.2, 0.3, 0.0, -0.1, 0.4, -0.3])
+
+    boundaries = clustering._find_boundaries(forces)
+
+    assert boundaries == [1, 4]
+    assert all(isinstance(b, int) for b in boundaries)
+    assert clustering._find_boundaries(np.array([-1.0])) == []
+
+
+@pytest.mark.parametrize("local_neighborhood", [2, 3, 6])
+def test_banded_matrix_gives_same_forces(local_neighborhood):
+    """Forces from a banded matrix equal those from the masked dense matrix."""
+    def embedding_func(texts):
+        rng = np.random.default_rng(0)
+        return rng.normal(size=(len(texts), 16)).tolist()
+
+    sentences = [f"s{i}" for i in range(25)]
+    forces = {}
+    boundaries = {}
+    for banded in (False, True):
+        builder = SimilarityMatrixBuilder(
+            embedding_func=embedding_func,
+            local_neighborhood=local_neighborhood,
+            banded=banded,
+        )
+        clustering = MagneticClustering(similarity_builder=builder, window_size=4)
+        matrix = builder.build_similarity_matrix(sentences)
+        forces[banded] = clustering._compute_magnetic_forces(matrix, len(sentences))
+        boundaries[banded] = clustering.segment(sentences)
+
+    np.testing.assert_allclose(forces[True], forces[False])
+    assert boundaries[True] == boundaries[False]
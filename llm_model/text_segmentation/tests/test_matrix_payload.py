@@ -0,0 +1,74 @@
+"""Tests for similarity matrix payload encoding."""
+
+import numpy as np
+import pytest
+
+from ..matrix_payload import (
+    band_matrix,
+    decode_similarity_matrix,
+    downsample_matrix,
+    encode_similarity_matrix,
+    similarity_matrix_bytes,
+)
+from ..similarity_matrix import SimilarityMatrixBuilder
+
+
+def random_similarity(n, seed=0):
+    rng = np.random.default_rng(seed)
+    emb = rng.normal(size=(n, 8))
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb @ emb.T
+
+
+def test_float16_round_trip():
+    """float16 keeps the matrix to about three decimals at a quarter of float64's size."""
+    matrix = random_similarity(50)
+
+    payload = encode_similarity_matrix(matrix)
+    decoded = decode_similarity_matrix(payload)
+
+    assert payload["dtype"] == "float16"
+    assert payload["layout"] == "dense"
+    assert payload["shape"] == [50, 50]
+    assert payload["n"] == 50 and payload["step"] == 1
+    assert np.allclose(decoded, matrix, atol=1e-3)
+
+    data, _ = similarity_matrix_bytes(matrix)
+    assert len(data) == 50 * 50 * 2
+
+
+def test_downsample_matrix_block_average():
+    """Blocks of step x step sentences are averaged, including a partial last block."""
+    matrix = random_similarity(10)
+
+    small, step = downsample_matrix(matrix, 4)
+
+    assert step == 3
+    assert small.shape == (4, 4)
+    assert small[0, 1] == pytest.approx(matrix[0:3, 3:6].mean())
+    assert small[3, 3] == pytest.approx(matrix[9, 9])
+    assert downsample_matrix(matrix, 10)[1] == 1
+
+
+def test_band_matrix_dense_and_banded_input():
+    """Banded payloads hold S[i, i + d] for d = 0..band, from dense or banded matrices."""
+    sentences = [f"s{i}" for i in range(9)]
+
+    def embedding_func(texts):
+        return np.random.default_rng(1).normal(size=(len(texts), 6)).tolist()
+
+    dense = SimilarityMatrixBuilder(embedding_func=embedding_func).build_similarity_matrix(sentences)
+    banded = SimilarityMatrixBuilder(
+        embedding_func=embedding_func, local_neighborhood=3, banded=True
+    ).build_similarity_matrix(sentences)
+
+    bands = band_matrix(dense, 2)
+    assert bands.shape == (9, 3)
+    assert bands[4, 2] == pytest.approx(dense[4, 6])
+    assert bands[8, 1] == 0.0
+    assert np.allclose(band_matrix(banded, 2), bands)
+
+    payload = encode_similarity_matrix(banded)
+    assert payload["layout"] == "banded"
+    assert payload["shape"] == [9, 4]
+    assert np.allclose(decode_similarity_matrix(payload), banded.bands, atol=1e-3)
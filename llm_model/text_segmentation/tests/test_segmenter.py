@@ -182,3 +182,61 @@ def test_build_segments():
         all_indices.update(range(start, end + 1))
     
     assert all_indices == set(range(len(sentences)))
+
+
+def test_session_cache_reuses_embeddings_across_parameters():
+    """A parameter sweep embeds each document once."""
+    from ..session import SegmentationSessionCache
+
+    calls = []
+
+    def counting_embedding_func(texts):
+        calls.append(list(texts))
+        rng = np.random.default_rng(len(texts))
+        return rng.normal(size=(len(texts), 8)).tolist()
+
+    cache = SegmentationSessionCache(max_entries=2)
+    sentences = [f"Sentence {i}" for i in range(12)]
+
+    results = []
+    for window_size, filter_width in [(2, 1.0), (3, 2.0), (4, 0.5)]:
+        segmenter = TextSegmenter(
+            embedding_func=counting_embedding_func,
+            algorithm="magnetic",
+            window_size=window_size,
+            filter_width=filter_width,
+            session_cache=cache,
+        )
+        results.append(segmenter.segment("", sentences=sentences))
+
+        uncached = TextSegmenter(
+            embedding_func=counting_embedding_func,
+            algorithm="magnetic",
+            window_size=window_size,
+            filter_width=filter_width,
+        )
+        assert results[-1].boundaries == uncached.segment("", sentences=sentences).boundaries
+
+    cached_calls = len(calls) - 3  # one per uncached run
+    assert cached_calls == 1
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_session_cache_key_covers_similarity_settings():
+    """Different documents or context windows get their own sessions, LRU-bounded."""
+    from ..session import SegmentationSessionCache
+
+    cache = SegmentationSessionCache(max_entries=2)
+    for context_window, sentences in [(2, ["A", "B", "C"]), (1, ["A", "B", "C"]), (2, ["A", "B", "D"])]:
+        TextSegmenter(
+            embedding_func=dummy_embedding_func,
+            algorithm="graph",
+            context_window=context_window,
+            session_cache=cache,
+        ).segment("", sentences=sentences)
+
+    stats = cache.stats()
+    assert stats["misses"] == 3
+    assert stats["hits"] == 0
+    assert stats["entries"] == 2
@@ -3,7 +3,7 @@
 import numpy as np
 import pytest
 
-from ..similarity_matrix import SimilarityMatrixBuilder
+from ..similarity_matrix import BandedSimilarityMatrix, SimilarityMatrixBuilder
 
 
 def dummy_embedding_func(texts):
@@ -101,3 +101,54 @@ def test_single_sentence():
     
     assert matrix.shape == (1, 1)
     assert matrix[0, 0] == 1.0
+
+
+def random_embedding_func(texts):
+    """Random (but reproducible) dense embeddings."""
+    rng = np.random.default_rng(len(texts))
+    return rng.normal(size=(len(texts), 16)).tolist()
+
+
+@pytest.mark.parametrize("local_neighborhood", [1, 3, 50])
+def test_banded_matches_masked_dense(local_neighborhood):
+    """Banded matrix holds the same values as the masked dense matrix."""
+    sentences = [f"s{i}" for i in range(12)]
+    dense = SimilarityMatrixBuilder(
+        embedding_func=random_embedding_func,
+        local_neighborhood=local_neighborhood,
+    ).build_similarity_matrix(sentences)
+    banded = SimilarityMatrixBuilder(
+        embedding_func=random_embedding_func,
+        local_neighborhood=local_neighborhood,
+        banded=True,
+    ).build_similarity_matrix(sentences)
+
+    assert isinstance(banded, BandedSimilarityMatrix)
+    assert banded.shape == (12, 12)
+    assert banded.bands.shape == (12, min(local_neighborhood, 11) + 1)
+    assert np.allclose(banded.to_dense(), dense)
+    assert np.allclose(np.asarray(banded), dense)
+    for offset in (-13, -4, -1, 0, 2, 5, 11):
+        assert np.allclose(banded.diagonal(offset), dense.diagonal(offset))
+    assert banded[3, 2] == pytest.approx(dense[3, 2])
+    assert banded[0, 11] == pytest.approx(dense[0, 11])
+
+
+def test_banded_approximate_similarity():
+    """get_approximate_similarity works on banded matrices."""
+    builder = SimilarityMatrixBuilder(
+        embedding_func=random_embedding_func,
+        local_neighborhood=1,
+        banded=True,
+    )
+    matrix = builder.build_similarity_matrix(["A", "B", "C", "D", "E"])
+
+    assert builder.get_approximate_similarity(matrix, 1, 2) == pytest.approx(matrix[1, 2])
+    # Outside the band: mean of the (all masked) diagonal falls back to 0.0
+    assert builder.get_approximate_similarity(matrix, 0, 3) == 0.0
+
+
+def test_banded_requires_local_neighborhood():
+    """Banded storage needs a neighborhood to bound the band."""
+    with pytest.raises(ValueError):
+        SimilarityMatrixBuilder(embedding_func=dummy_embedding_func, banded=True)
@@ -0,0 +1,143 @@
+"""Tests for the segmentation grid-search tuner."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ..similarity_matrix import SimilarityMatrixBuilder
+from ..tuner import (
+    SegmentationParams,
+    build_grid,
+    embed_stories,
+    evaluate_grid,
+    load_annotated_story,
+    rank_results,
+    write_results,
+)
+
+
+def topic_embedding_func(texts):
+    """Embeddings that follow the topic word at the start of each text."""
+    topics = {"Wolf": 0, "Fox": 1, "Bear": 2}
+    rng = np.random.default_rng(0)
+    embeddings = []
+    for text in texts:
+        vec = 0.1 * rng.normal(size=8)
+        vec[topics.get(text.split()[0], 3)] += 1.0
+        embeddings.append(vec.tolist())
+    return embeddings
+
+
+def write_story(path, language, topics, sentences_per_topic=4):
+    text = ""
+    spans = []
+    for topic in topics:
+        start = len(text)
+        for i in range(sentences_per_topic):
+            text += f"{topic} sentence {i}."
+        spans.append({"start": start, "end": len(text), "text": text[start:]})
+    data = {
+        "source_info": {"language": language, "text_content": text},
+        "narrative_events": [{"text_span": span} for span in spans],
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def stories(tmp_path):
+    write_story(tmp_path / "a.json", "en", ["Wolf", "Fox", "Bear"])
+    write_story(tmp_path / "b.json", "zh", ["Fox", "Bear"])
+    loaded = [load_annotated_story(tmp_path / name) for name in ("a.json", "b.json")]
+    embed_stories(loaded, SimilarityMatrixBuilder(embedding_func=topic_embedding_func, context_window=1))
+    return loaded
+
+
+def test_load_annotated_story(stories):
+    """Sentences and reference boundaries come from the event spans."""
+    story = stories[0]
+    assert story.doc_id == "a"
+    assert story.language == "en"
+    assert len(story.sentences) == 12
+    assert story.reference_boundaries == [3, 7]
+    assert story.similarity_matrix.shape == (12, 12)
+
+
+def test_load_annotated_story_without_spans(tmp_path):
+    """Stories without text spans are skipped."""
+    path = tmp_path / "empty.json"
+    path.write_text(json.dumps({"source_info": {"text_content": "A. B."}, "narrative_events": []}))
+    assert load_annotated_story(path) is None
+
+
+def test_build_grid():
+    """Each algorithm gets the product of its own parameters."""
+    grid = build_grid(
+        algorithms=["magnetic", "graph"],
+        window_sizes=[2, 3],
+        filter_widths=[1.0, 2.0, 3.0],
+        thresholds=[0.5],
+        min_seg_sizes=[2, 3],
+    )
+    assert len(grid) == 2 * 3 + 1 * 2
+    assert SegmentationParams("magnetic", window_size=3, filter_width=2.0) in grid
+    assert SegmentationParams("graph", threshold=0.5, min_seg_size=3) in grid
+
+
+def test_evaluate_grid_parallel_matches_serial(stories):
+    """Worker processes give the same scores as in-process evaluation."""
+    grid = build_grid(
+        algorithms=["magnetic", "graph"],
+        window_sizes=[2, 3],
+        filter_widths=[0.5, 1.0],
+        thresholds=[0.5, 0.9],
+        min_seg_sizes=[2, 3],
+    )
+    serial = evaluate_grid(stories, grid, workers=1)
+    parallel = evaluate_grid(stories, grid, workers=2)
+
+    assert [e["params"] for e in parallel] == grid
+    assert parallel == serial
+
+
+def test_rank_results(stories, tmp_path):
+    """Rows are ranked by mean score within each language, 'all' first."""
+    grid = build_grid(
+        algorithms=["graph"],
+        window_sizes=[],
+        filter_widths=[],
+        thresholds=[0.5, 0.99],
+        min_seg_sizes=[2],
+    )
+    rows = rank_results(evaluate_grid(stories, grid))
+
+    assert [r["language"] for r in rows] == ["all", "all", "en", "en", "zh", "zh"]
+    assert [r["rank"] for r in rows] == [1, 2, 1, 2, 1, 2]
+    all_rows = rows[:2]
+    assert all_rows[0]["mean_score"] >= all_rows[1]["mean_score"]
+    assert all_rows[0]["threshold"] == 0.5
+    assert all_rows[0]["stories"] == 2
+
+    output = tmp_path / "grid.csv"
+    write_results(rows, output)
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("language,rank,algorithm")
+    assert len(lines) == 7
+
+
+def test_load_annotated_story_guesses_missing_language(tmp_path):
+    """Annotations without source_info.language get it from the script."""
+    path = tmp_path / "zh.json"
+    text = "从前有一座山。山里有一座庙。"
+    path.write_text(
+        json.dumps(
+            {
+                "source_info": {"language": "", "text_content": text},
+                "narrative_events": [{"text_span": {"start": 0, "end": 7}}, {"text_span": {"start": 7, "end": 14}}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    story = load_annotated_story(path)
+    assert story.language == "zh"
+    assert story.reference_boundaries == [0]
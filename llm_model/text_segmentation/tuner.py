@@ -0,0 +1,390 @@
+"""Grid search of segmentation parameters against annotated stories.
+
+Each annotated story (JSON v3 with `source_info.text_content` and
+`narrative_events[].text_span`) is split into sentences like
+`TextSpanEvaluator` does, the reference boundaries are the sentences holding
+the last character of each event span, and the story is embedded once. Every
+parameter combination then only reruns the clustering on the precomputed
+similarity matrices, spread over worker processes, and is scored with
+`BoundarySegmentationMetric`. Results are ranked per language and over all
+stories.
+
+Usage:
+  python -m llm_model.text_segmentation.tuner \\
+    --annotations "datasets/*/json_v3/*.json" --embedding-model nomic-embed-text \\
+    --window-sizes 2 3 4 5 --filter-widths 0.5 1 2 3 \\
+    --thresholds 0.5 0.6 0.7 0.8 --min-seg-sizes 2 3 5 \\
+    --workers 8 --output segmentation_grid.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .boundary_metric import BoundarySegmentationMetric
+from .graph_segsm import GraphSegSM
+from .magnetic_clustering import MagneticClustering
+from .similarity_matrix import SimilarityMatrix, SimilarityMatrixBuilder
+
+
+@dataclass
+class TuningStory:
+    """One annotated story with its precomputed similarity matrix."""
+
+    doc_id: str
+    language: str
+    sentences: List[str]
+    reference_boundaries: List[int]
+    similarity_matrix: Optional[SimilarityMatrix] = None
+
+
+@dataclass(frozen=True)
+class SegmentationParams:
+    """One point of the grid. Fields that do not apply to the algorithm are None."""
+
+    algorithm: str
+    window_size: Optional[int] = None
+    filter_width: Optional[float] = None
+    threshold: Optional[float] = None
+    min_seg_size: Optional[int] = None
+
+
+def _guess_language(text: str) -> str:
+    """Language code from the script when the annotation does not record one."""
+
+    if re.search(r"[\u3040-\u30ff]", text):
+        return "ja"
+    if re.search(r"[\u3400-\u9fff]", text):
+        return "zh"
+    return "en"
+
+
+def load_annotated_story(json_path: Path) -> Optional[TuningStory]:
+    """Read sentences and reference boundaries from a JSON v3 annotation.
+
+    Returns None when the file has no text or no complete text spans.
+    """
+    from llm_model.evaluation.utils import (
+        char_position_to_sentence_index,
+        extract_text_spans,
+        text_to_sentence_indices,
+    )
+
+    data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+    source = data.get("source_info") or {}
+    text = source.get("text_content") or ""
+    spans = extract_text_spans(data)
+    if not text.strip() or not spans:
+        return None
+
+    sentence_indices = text_to_sentence_indices(text)
+    sentences = [text[start:end].strip() or text[start:end] for start, end in sentence_indices]
+    if len(sentences) < 2:
+        return None
+
+    # A span ends after the sentence holding its last character
+    ends = {char_position_to_sentence_index(max(int(span["end"]) - 1, 0), sentence_indices) for span in spans}
+    reference = sorted(i for i in ends if 0 <= i < len(sentences) - 1)
+
+    return TuningStory(
+        doc_id=Path(json_path).stem,
+        language=str(source.get("language") or _guess_language(text)),
+        sentences=sentences,
+        reference_boundaries=reference,
+    )
+
+
+def embed_stories(stories: Sequence[TuningStory], similarity_builder: SimilarityMatrixBuilder) -> None:
+    """Compute the similarity matrix of every story (the only embedding step)."""
+
+    for i, story in enumerate(stories, start=1):
+        start = time.perf_counter()
+        story.similarity_matrix = similarity_builder.build_similarity_matrix(story.sentences)
+        print(
+            f"[INFO] Embedded {story.doc_id} ({len(story.sentences)} sentences) "
+            f"[{i}/{len(stories)}] in {time.perf_counter() - start:.1f}s",
+            flush=True,
+        )
+
+
+def build_grid(
+    *,
+    algorithms: Sequence[str],
+    window_sizes: Sequence[int],
+    filter_widths: Sequence[float],
+    thresholds: Sequence[float],
+    min_seg_sizes: Sequence[int],
+) -> List[SegmentationParams]:
+    """Cartesian product of the parameters that apply to each algorithm."""
+
+    grid: List[SegmentationParams] = []
+    if "magnetic" in algorithms:
+        grid.extend(
+            SegmentationParams("magnetic", window_size=int(w), filter_width=float(f))
+            for w, f in itertools.product(window_sizes, filter_widths)
+        )
+    if "graph" in algorithms:
+        grid.extend(
+            SegmentationParams("graph", threshold=float(t), min_seg_size=int(m))
+            for t, m in itertools.product(thresholds, min_seg_sizes)
+        )
+    return grid
+
+
+def segment_with_params(
+    params: SegmentationParams,
+    similarity_matrix: SimilarityMatrix,
+    n: int,
+    *,
+    graph_options: Optional[Dict[str, Any]] = None,
+) -> List[int]:
+    """Boundaries for one story and one parameter set, from its similarity matrix."""
+
+    builder = SimilarityMatrixBuilder(embedding_func=None)
+    if params.algorithm == "magnetic":
+        segmenter = MagneticClustering(
+            similarity_builder=builder,
+            window_size=params.window_size,
+            filter_width=params.filter_width,
+        )
+    elif params.algorithm == "graph":
+        segmenter = GraphSegSM(
+            similarity_builder=builder,
+            threshold=params.threshold,
+            min_seg_size=params.min_seg_size,
+            **(graph_options or {}),
+        )
+    else:
+        raise ValueError(f"Unknown algorithm: {params.algorithm}")
+    return segmenter.segment_from_matrix(similarity_matrix, n)
+
+
+# Worker-process state, set once per process by `_init_worker`.
+_WORKER_STORIES: List[TuningStory] = []
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def _init_worker(stories: List[TuningStory], options: Dict[str, Any]) -> None:
+    global _WORKER_STORIES, _WORKER_OPTIONS
+    _WORKER_STORIES = stories
+    _WORKER_OPTIONS = options
+
+
+def _evaluate_params(params: SegmentationParams) -> Dict[str, Any]:
+    """Score one parameter set on every story (runs in a worker process)."""
+
+    metric = BoundarySegmentationMetric(tolerance=_WORKER_OPTIONS.get("tolerance", 2))
+    per_story = []
+    for story in _WORKER_STORIES:
+        hypothesis = segment_with_params(
+            params,
+            story.similarity_matrix,
+            len(story.sentences),
+            graph_options=_WORKER_OPTIONS.get("graph_options"),
+        )
+        per_story.append(
+            {
+                "doc_id": story.doc_id,
+                "language": story.language,
+                "score": metric.calculate(story.reference_boundaries, hypothesis),
+                "predicted": len(hypothesis),
+                "reference": len(story.reference_boundaries),
+            }
+        )
+    return {"params": params, "stories": per_story}
+
+
+def evaluate_grid(
+    stories: List[TuningStory],
+    grid: Sequence[SegmentationParams],
+    *,
+    workers: int = 1,
+    tolerance: int = 2,
+    graph_options: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Evaluate every parameter set on every story.
+
+    Args:
+        stories: Stories with similarity matrices (see `embed_stories`).
+        grid: Parameter sets to evaluate.
+        workers: Worker processes; 1 evaluates in this process.
+        tolerance: `BoundarySegmentationMetric` tolerance.
+        graph_options: Extra GraphSegSM arguments (clique_mode, time_budget_s, ...).
+
+    Returns:
+        One entry per parameter set, in grid order, with per-story scores.
+    """
+    options = {"tolerance": tolerance, "graph_options": graph_options or {}}
+    if workers <= 1 or len(grid) <= 1:
+        _init_worker(stories, options)
+        return [_evaluate_params(params) for params in grid]
+
+    chunksize = max(1, len(grid) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stories, options)) as pool:
+        return list(pool.map(_evaluate_params, grid, chunksize=chunksize))
+
+
+def rank_results(evaluations: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate scores per language (and over all stories) and rank by mean score."""
+
+    rows: List[Dict[str, Any]] = []
+    for evaluation in evaluations:
+        params: SegmentationParams = evaluation["params"]
+        by_language: Dict[str, List[Dict[str, Any]]] = {"all": list(evaluation["stories"])}
+        for story in evaluation["stories"]:
+            by_language.setdefault(story["language"], []).append(story)
+        for language, stories in by_language.items():
+            scores = np.array([s["score"] for s in stories], dtype=float)
+            rows.append(
+                {
+                    "language": language,
+                    **asdict(params),
+                    "mean_score": float(scores.mean()) if len(scores) else 0.0,
+                    "std_score": float(scores.std()) if len(scores) else 0.0,
+                    "stories": len(stories),
+                    "mean_predicted": float(np.mean([s["predicted"] for s in stories])) if stories else 0.0,
+                    "mean_reference": float(np.mean([s["reference"] for s in stories])) if stories else 0.0,
+                }
+            )
+
+    rows.sort(key=lambda r: (r["language"] != "all", r["language"], -r["mean_score"]))
+    rank = 0
+    language = None
+    for row in rows:
+        rank = rank + 1 if row["language"] == language else 1
+        language = row["language"]
+        row["rank"] = rank
+    return rows
+
+
+def write_results(rows: Sequence[Dict[str, Any]], path: Path) -> None:
+    """Write the ranked table as CSV."""
+
+    fields = [
+        "language", "rank", "algorithm", "window_size", "filter_width", "threshold", "min_seg_size",
+        "mean_score", "std_score", "stories", "mean_predicted", "mean_reference",
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ("" if row.get(k) is None else row.get(k)) for k in fields})
+
+
+def _format_params(row: Dict[str, Any]) -> str:
+    if row["algorithm"] == "magnetic":
+        return f"window_size={row['window_size']} filter_width={row['filter_width']}"
+    return f"threshold={row['threshold']} min_seg_size={row['min_seg_size']}"
+
+
+def print_top(rows: Sequence[Dict[str, Any]], top: int) -> None:
+    language = None
+    for row in rows:
+        if row["rank"] > top:
+            continue
+        if row["language"] != language:
+            language = row["language"]
+            print(f"\n{language} ({row['stories']} stories)")
+            print(f"{'rank':>4} {'algorithm':<9} {'parameters':<36} {'score':>6} {'std':>6} {'pred':>6} {'ref':>6}")
+        print(
+            f"{row['rank']:>4} {row['algorithm']:<9} {_format_params(row):<36} {row['mean_score']:>6.3f} "
+            f"{row['std_score']:>6.3f} {row['mean_predicted']:>6.1f} {row['mean_reference']:>6.1f}"
+        )
+
+
+def _ollama_embedding_func(base_url: str, model: str) -> Callable[[List[str]], List[List[float]]]:
+    from llm_model.embedding_cache import get_default_embedding_cache
+    from llm_model.ollama_client import embed
+
+    def embedding_func(texts: List[str]) -> List[List[float]]:
+        return embed(base_url=base_url, model=model, inputs=texts, cache=get_default_embedding_cache())
+
+    return embedding_func
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.text_segmentation.tuner",
+        description="Grid-search segmentation parameters against annotated stories.",
+    )
+    parser.add_argument(
+        "--annotations",
+        nargs="+",
+        default=["datasets/*/json_v3/*.json"],
+        help="JSON v3 annotation files or glob patterns",
+    )
+    parser.add_argument("--languages", nargs="*", default=None, help="Only stories in these languages (e.g. zh en)")
+    parser.add_argument("--embedding-model", default=os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"))
+    parser.add_argument("--base-url", default=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"))
+    parser.add_argument("--context-window", type=int, default=2, help="Sentences per embedding window")
+    parser.add_argument("--algorithms", nargs="+", choices=["magnetic", "graph"], default=["magnetic", "graph"])
+    parser.add_argument("--window-sizes", type=int, nargs="+", default=[2, 3, 4, 5])
+    parser.add_argument("--filter-widths", type=float, nargs="+", default=[0.5, 1.0, 2.0, 3.0])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8])
+    parser.add_argument("--min-seg-sizes", type=int, nargs="+", default=[2, 3, 5])
+    parser.add_argument("--clique-mode", choices=["exact", "window", "components"], default="exact")
+    parser.add_argument("--time-budget", type=float, default=5.0, help="GraphSegSM clique budget per story (s)")
+    parser.add_argument("--tolerance", type=int, default=2, help="BoundarySegmentationMetric tolerance")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--top", type=int, default=5, help="Rows printed per language")
+    parser.add_argument("--output", type=Path, default=Path("segmentation_grid.csv"), help="Ranked results (CSV)")
+    args = parser.parse_args(argv)
+
+    paths = sorted({p for pattern in args.annotations for p in glob.glob(pattern)})
+    stories = [s for s in (load_annotated_story(Path(p)) for p in paths) if s is not None]
+    if args.languages:
+        stories = [s for s in stories if s.language in set(args.languages)]
+    if not stories:
+        print("[ERROR] No annotated stories with text spans found.")
+        return 1
+    print(f"[INFO] {len(stories)} annotated stories from {len(paths)} files")
+
+    builder = SimilarityMatrixBuilder(
+        embedding_func=_ollama_embedding_func(args.base_url, args.embedding_model),
+        context_window=args.context_window,
+    )
+    embed_stories(stories, builder)
+
+    grid = build_grid(
+        algorithms=args.algorithms,
+        window_sizes=args.window_sizes,
+        filter_widths=args.filter_widths,
+        thresholds=args.thresholds,
+        min_seg_sizes=args.min_seg_sizes,
+    )
+    start = time.perf_counter()
+    evaluations = evaluate_grid(
+        stories,
+        grid,
+        workers=args.workers,
+        tolerance=args.tolerance,
+        graph_options={"clique_mode": args.clique_mode, "time_budget_s": args.time_budget},
+    )
+    print(
+        f"[INFO] Evaluated {len(grid)} parameter sets x {len(stories)} stories "
+        f"in {time.perf_counter() - start:.1f}s with {args.workers} workers"
+    )
+
+    rows = rank_results(evaluations)
+    write_results(rows, args.output)
+    print_top(rows, args.top)
+    print(f"\n[INFO] Ranked results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,7 +12,7 @@ import numpy as np
 
 from .graph_segsm import GraphSegSM
 from .magnetic_clustering import MagneticClustering
-from .similarity_matrix import SimilarityMatrixBuilder
+from .similarity_matrix import SimilarityMatrix, SimilarityMatrixBuilder
 
 
 class VisualizableMagneticClustering(MagneticClustering):
@@ -27,25 +27,23 @@ class VisualizableMagneticClustering(MagneticClustering):
         super().__init__(*args, **kwargs)
         self._visualization_data: Dict[str, Any] = {}
 
-    def segment(
+    def segment_from_matrix(
         self,
-        sentences: List[str],
+        similarity_matrix: SimilarityMatrix,
+        n: int,
     ) -> List[int]:
-        """Segment text and collect visualization data.
+        """Segment a precomputed similarity matrix and collect visualization data.
         
         Args:
-            sentences: List of sentence strings.
+            similarity_matrix: Similarity matrix of the n sentences.
+            n: Number of sentences.
             
         Returns:
             List of boundary indices.
         """
-        if len(sentences) <= 1:
+        if n <= 1:
             return []
 
-        # Build similarity matrix
-        similarity_matrix = self.similarity_builder.build_similarity_matrix(sentences)
-        n = len(sentences)
-
         # Store similarity matrix
         self._visualization_data["similarity_matrix"] = similarity_matrix
 
@@ -88,25 +86,23 @@ class VisualizableGraphSegSM(GraphSegSM):
         super().__init__(*args, **kwargs)
         self._visualization_data: Dict[str, Any] = {}
 
-    def segment(
+    def segment_from_matrix(
         self,
-        sentences: List[str],
+        similarity_matrix: SimilarityMatrix,
+        n: int,
     ) -> List[int]:
-        """Segment text and collect visualization data.
+        """Segment a precomputed similarity matrix and collect visualization data.
         
         Args:
-            sentences: List of sentence strings.
+            similarity_matrix: Similarity matrix of the n sentences.
+            n: Number of sentences.
             
         Returns:
             List of boundary indices.
         """
-        if len(sentences) <= 1:
+        if n <= 1:
             return []
 
-        # Build similarity matrix
-        similarity_matrix = self.similarity_builder.build_similarity_matrix(sentences)
-        n = len(sentences)
-
         # Store similarity matrix
         self._visualization_data["similarity_matrix"] = similarity_matrix
 
@@ -180,6 +176,8 @@ class VisualizableTextSegmenter:
         self.similarity_builder = SimilarityMatrixBuilder(
             embedding_func=embedding_func,
             context_window=context_window,
+            local_neighborhood=kwargs.get("local_neighborhood"),
+            banded=kwargs.get("banded", False),
         )
 
         # Initialize algorithm with visualization wrapper
@@ -195,16 +193,22 @@ class VisualizableTextSegmenter:
                 similarity_builder=self.similarity_builder,
                 threshold=kwargs.get("threshold", 0.7),
                 min_seg_size=kwargs.get("min_seg_size", 3),
+                clique_mode=kwargs.get("clique_mode", "exact"),
+                clique_window=kwargs.get("clique_window", 8),
+                time_budget_s=kwargs.get("time_budget_s"),
             )
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
 
-        # Create base segmenter for text processing
+        # Create base segmenter for text processing; it runs the visualizable
+        # algorithm so one segmentation both returns the result and collects data
         self.base_segmenter = TextSegmenter(
             embedding_func=embedding_func,
             algorithm=algorithm,
             **kwargs,
         )
+        self.base_segmenter.similarity_builder = self.similarity_builder
+        self.base_segmenter.segmenter = self.segmenter
 
     def segment(
         self,
@@ -224,24 +228,15 @@ class VisualizableTextSegmenter:
         Returns:
             SegmentationResult with visualization data stored in segmenter.
         """
-        # Use base segmenter for text processing
-        result = self.base_segmenter.segment(
+        # The base segmenter runs the visualizable algorithm, which stores
+        # its intermediate data while segmenting
+        return self.base_segmenter.segment(
             text=text,
             document_id=document_id,
             sentences=sentences,
             reference_boundaries=reference_boundaries,
         )
 
-        # But use visualizable segmenter to get intermediate data
-        if sentences is None:
-            sentences = self.base_segmenter._split_sentences(text)
-
-        # Re-segment with visualizable segmenter to collect data
-        # (This is a small overhead but keeps things non-intrusive)
-        _ = self.segmenter.segment(sentences)
-
-        return result
-
     def get_visualization_data(self) -> Dict[str, Any]:
         """Get collected visualization data.
         
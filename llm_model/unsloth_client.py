@@ -6,7 +6,10 @@ This module provides chat interface for unsloth fine-tuned models.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+from .local_batching import FutureTimeoutError, batching_enabled, get_batcher, wait_for
+from .prefix_kv_cache import generate_with_prefix_cache, get_prefix_cache
 
 
 class UnslothError(RuntimeError):
@@ -24,6 +27,7 @@ class UnslothConfig:
     top_p: float = 0.8
     top_k: int = 20
     max_new_tokens: int = 512
+    max_seq_length: int = 4096  # Context window (prompt + new tokens)
     enable_cpu_offload: bool = False
 
 
@@ -56,7 +60,7 @@ def load_model(config: UnslothConfig):
         # Load model
         model, tokenizer = FastLanguageModel.from_pretrained(
             model_name=config.model_path,
-            max_seq_length=1024,
+            max_seq_length=config.max_seq_length,
             dtype=None,
             load_in_4bit=True,
         )
@@ -88,7 +92,7 @@ def chat(
         config: Unsloth configuration
         messages: List of message dicts with 'role' and 'content' keys
         response_format_json: If True, expect JSON output (not enforced by model)
-        timeout_s: Timeout in seconds (not used for local inference)
+        timeout_s: Timeout in seconds (only enforced while waiting for a batched generation)
 
     Returns:
         Generated text response
@@ -108,39 +112,143 @@ def chat(
             enable_thinking=False  # Disable thinking mode for Qwen3
         )
 
-        # Tokenize
-        inputs = tokenizer(
-            formatted_input,
-            return_tensors="pt",
-            truncation=True,
-            max_length=1024,
-        ).to(model.device)
+        if batching_enabled():
+            # Concurrent callers share padded generate() calls (see local_batching)
+            batcher = get_batcher(
+                f"unsloth::{config.model_path}::{config.temperature}::{config.top_p}::{config.top_k}::{config.max_new_tokens}",
+                lambda prompts: _generate_batch(config, prompts),
+            )
+            try:
+                return wait_for(batcher.submit(formatted_input), timeout_s)
+            except FutureTimeoutError:
+                raise UnslothError(f"Generation did not finish within {timeout_s}s (batch queue)")
 
-        # Generate (model is already in inference mode from FastLanguageModel.for_inference)
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=config.max_new_tokens,
-            temperature=config.temperature,
-            top_p=config.top_p,
-            top_k=config.top_k,
-            do_sample=True,
-        )
+        return _generate_one(config, model, tokenizer, formatted_input)
 
-        # Decode output
-        generated_text = tokenizer.decode(
-            outputs[0][inputs["input_ids"].shape[1]:],
-            skip_special_tokens=True
-        ).strip()
+    except UnslothError:
+        raise
+    except Exception as e:
+        raise UnslothError(f"Unsloth chat failed: {e}") from e
 
-        # Remove thinking tags if present
-        if "<think>" in generated_text and "</think>" in generated_text:
-            think_end = generated_text.rfind("</think>")
-            if think_end != -1:
-                generated_text = generated_text[think_end + len("</think>"):].strip()
 
-        return generated_text
+def chat_batch(
+    *,
+    config: UnslothConfig,
+    messages_list: Sequence[List[Dict[str, str]]],
+    response_format_json: bool = True,
+) -> List[str]:
+    """Generate responses for several conversations in one left-padded `generate()` call.
+
+    Returns:
+        Generated text responses, in the order of `messages_list`.
 
+    Raises:
+        UnslothError: If generation fails
+    """
+    if not messages_list:
+        return []
+    try:
+        _, tokenizer = load_model(config)
+        prompts = [
+            tokenizer.apply_chat_template(
+                messages,
+                tokenize=False,
+                add_generation_prompt=True,
+                enable_thinking=False  # Disable thinking mode for Qwen3
+            )
+            for messages in messages_list
+        ]
+        return _generate_batch(config, prompts)
     except UnslothError:
         raise
     except Exception as e:
-        raise UnslothError(f"Unsloth chat failed: {e}") from e
+        raise UnslothError(f"Unsloth batch chat failed: {e}") from e
+
+
+def _generate_one(config: UnslothConfig, model, tokenizer, formatted_input: str) -> str:
+    """Generate the response for a single formatted prompt."""
+
+    # Tokenize (no truncation: the story segment sits at the end of the prompt)
+    inputs = tokenizer(
+        formatted_input,
+        return_tensors="pt",
+    ).to(model.device)
+    _check_prompt_length(config, inputs["input_ids"].shape[1])
+
+    # Generate (model is already in inference mode from FastLanguageModel.for_inference),
+    # reusing the KV state of a previously seen prompt prefix (see prefix_kv_cache)
+    outputs = generate_with_prefix_cache(
+        model,
+        inputs,
+        get_prefix_cache(config.model_path),
+        **_generation_kwargs(config),
+    )
+
+    # Decode output
+    generated_text = tokenizer.decode(
+        outputs[0][inputs["input_ids"].shape[1]:],
+        skip_special_tokens=True
+    ).strip()
+
+    return _strip_thinking(generated_text)
+
+
+def _generation_kwargs(config: UnslothConfig) -> Dict[str, object]:
+    return {
+        "max_new_tokens": config.max_new_tokens,
+        "temperature": config.temperature,
+        "top_p": config.top_p,
+        "top_k": config.top_k,
+        "do_sample": True,
+    }
+
+
+def _check_prompt_length(config: UnslothConfig, n_prompt_tokens: int) -> None:
+    """Fail instead of truncating prompts that do not fit the context window."""
+
+    if n_prompt_tokens + config.max_new_tokens > config.max_seq_length:
+        raise UnslothError(
+            f"Prompt has {n_prompt_tokens} tokens; with max_new_tokens={config.max_new_tokens} "
+            f"it exceeds max_seq_length={config.max_seq_length}"
+        )
+
+
+def _strip_thinking(generated_text: str) -> str:
+    # Remove thinking tags if present
+    if "<think>" in generated_text and "</think>" in generated_text:
+        think_end = generated_text.rfind("</think>")
+        if think_end != -1:
+            generated_text = generated_text[think_end + len("</think>"):].strip()
+    return generated_text
+
+
+def _generate_batch(config: UnslothConfig, prompts: List[str]) -> List[str]:
+    """Generate responses for several formatted prompts in one left-padded `generate()` call."""
+
+    model, tokenizer = load_model(config)
+    if len(prompts) == 1:
+        return [_generate_one(config, model, tokenizer, prompts[0])]
+
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    # Decoder-only models continue from the last position, so pad on the left.
+    # The tokenizer is cached and shared, so restore its padding side afterwards.
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"
+    try:
+        inputs = tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+        ).to(model.device)
+    finally:
+        tokenizer.padding_side = padding_side
+    _check_prompt_length(config, inputs["input_ids"].shape[1])
+
+    outputs = model.generate(**inputs, pad_token_id=tokenizer.pad_token_id, **_generation_kwargs(config))
+
+    prompt_width = inputs["input_ids"].shape[1]
+    return [
+        _strip_thinking(tokenizer.decode(row[prompt_width:], skip_special_tokens=True).strip())
+        for row in outputs
+    ]
@@ -0,0 +1,455 @@
+"""Recall/latency benchmark: exact NumPy search vs HNSW on real stories.
+
+Embeds the chunks of every story matched by `--stories` once (through the shared
+embedding cache), then for each collection times
+
+- `exact`: matrix product over the memory-mapped vectors (ground truth)
+- `hnsw`: `HNSWIndex.knn_batch` at each `--ef-search` value
+- `quantized`: scan of the quantized vectors + exact re-rank, at each
+  `--rerank-factor` (only for stores built with `--quantization`)
+- `hierarchical`: motif branch centroids, then exact search within the best
+  `--branches` branches (also reports the fraction of motif rows scanned)
+
+and reports recall@k against the exact (flat) top-k per chunk. A second table compares
+the storage of each collection: file size, load time and resident memory of the
+HNSW index versus the quantized codes (the float `.npy` matrix is memory-mapped).
+
+`--sample-queries N` uses N stored vectors of the other collection as queries
+instead of embedding stories, so the benchmark runs without Ollama.
+
+Usage:
+  python -m llm_model.vector_database.benchmark \\
+    --stories "datasets/*/texts/*" --top-k 10 --ef-search 16 64 256 --rerank-factor 1 4 \\
+    --branches 4 8 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import statistics
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from llm_model.ollama_client import embed as ollama_embed
+
+from .db import COLLECTIONS, FairyVectorDB, _embedding_cache, _hnsw_config_from_meta
+from .hnsw_index import HNSWIndex
+from .paths import VectorDBPaths
+from .sqlite_store import connect, count_collection
+from .text_chunking import ChunkingConfig, chunk_text
+from .vector_store import load_collection_vectors, load_quantized_vectors
+
+_STORY_SUFFIXES = (".md", ".txt")
+
+
+def _story_files(patterns: Sequence[str]) -> List[Path]:
+    files = set()
+    for pattern in patterns:
+        for name in glob.glob(pattern, recursive=True):
+            path = Path(name)
+            if path.is_file() and path.suffix.lower() in _STORY_SUFFIXES:
+                files.add(path)
+    return sorted(files)
+
+
+def _embed_stories(
+    files: Sequence[Path],
+    *,
+    base_url: str,
+    model: str,
+    chunking: ChunkingConfig,
+) -> List[np.ndarray]:
+    cache = _embedding_cache(True)
+    matrices: List[np.ndarray] = []
+    for path in files:
+        chunks = chunk_text(path.read_text(encoding="utf-8"), config=chunking)
+        if not chunks:
+            continue
+        vecs = ollama_embed(base_url=base_url, model=model, inputs=chunks, timeout_s=600.0, cache=cache)
+        matrices.append(np.asarray(vecs, dtype=np.float32))
+    return matrices
+
+
+def _sample_queries(db: FairyVectorDB, n: int, *, seed: int = 0) -> Dict[str, List[np.ndarray]]:
+    """Per collection, one query matrix of `n` stored vectors of the other collection."""
+
+    rng = np.random.default_rng(seed)
+    queries: Dict[str, List[np.ndarray]] = {}
+    for collection, other in (("atu", "motif"), ("motif", "atu")):
+        source = db.get_collection_vectors(other)
+        rows = np.sort(rng.choice(len(source), size=min(int(n), len(source)), replace=False))
+        queries[collection] = [np.asarray(source.vectors[rows], dtype=np.float32)]
+    return queries
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux only)."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _rss_delta_mb(before: Optional[int]) -> Optional[float]:
+    after = _rss_bytes()
+    if before is None or after is None:
+        return None
+    return (after - before) / 1e6
+
+
+def measure_footprint(paths: VectorDBPaths) -> List[Dict[str, Any]]:
+    """Load each collection's HNSW index and quantized codes in isolation.
+
+    Reports the file size, load time and RSS growth of each storage. RSS numbers
+    are only indicative (the allocator may reuse memory freed by earlier loads).
+    """
+
+    meta = json.loads(paths.meta_path.read_text(encoding="utf-8"))
+    dim = int(meta["dim"])
+    hnsw_cfg = _hnsw_config_from_meta(meta)
+    normalized = bool(meta.get("vectors", {}).get("normalized", True))
+    conn = connect(paths.sqlite_path)
+    counts = {c: count_collection(conn, c) for c in COLLECTIONS}
+    conn.close()
+
+    layout = {
+        "atu": (paths.atu_index_path, paths.atu_vectors_path, paths.atu_vector_ids_path,
+                paths.atu_quantized_path, paths.atu_quantized_scales_path),
+        "motif": (paths.motif_index_path, paths.motif_vectors_path, paths.motif_vector_ids_path,
+                  paths.motif_quantized_path, paths.motif_quantized_scales_path),
+    }
+    rows: List[Dict[str, Any]] = []
+    for collection, (index_path, vectors_path, ids_path, codes_path, scales_path) in layout.items():
+        before = _rss_bytes()
+        t0 = time.perf_counter()
+        idx = HNSWIndex(dim=dim, config=hnsw_cfg)
+        idx.load(index_path, max_elements=max(1, counts[collection]))
+        load_s = time.perf_counter() - t0
+        rows.append(
+            {
+                "collection": collection,
+                "storage": "hnsw",
+                "file_mb": index_path.stat().st_size / 1e6,
+                "load_s": load_s,
+                "rss_mb": _rss_delta_mb(before),
+            }
+        )
+        del idx
+
+        originals = load_collection_vectors(vectors_path, ids_path, normalized=normalized)
+        if originals is None:
+            continue
+        rows.append(
+            {
+                "collection": collection,
+                "storage": f"npy {originals.vectors.dtype} (mmap)",
+                "file_mb": vectors_path.stat().st_size / 1e6,
+                "load_s": None,
+                "rss_mb": None,
+            }
+        )
+        before = _rss_bytes()
+        t0 = time.perf_counter()
+        quantized = load_quantized_vectors(codes_path, scales_path, originals=originals)
+        load_s = time.perf_counter() - t0
+        if quantized is not None:
+            rows.append(
+                {
+                    "collection": collection,
+                    "storage": f"quantized {quantized.quantization}",
+                    "file_mb": quantized.nbytes / 1e6,
+                    "load_s": load_s,
+                    "rss_mb": _rss_delta_mb(before),
+                }
+            )
+        del quantized, originals
+    return rows
+
+
+def _timed(fn: Callable[[], Tuple[np.ndarray, np.ndarray]], repeat: int) -> Tuple[Tuple[np.ndarray, np.ndarray], float]:
+    """Run `fn` `repeat` times; return the last result and the median latency in ms."""
+
+    times: List[float] = []
+    result = fn()
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return result, statistics.median(times)
+
+
+def _recall(approx: np.ndarray, exact: np.ndarray) -> float:
+    """Mean per-query |approx ∩ exact| / |exact| over the top-k label sets."""
+
+    if exact.size == 0:
+        return 1.0
+    hits = [len(set(a.tolist()) & set(e.tolist())) / max(1, len(e)) for a, e in zip(approx, exact)]
+    return float(np.mean(hits))
+
+
+def run_benchmark(
+    *,
+    db: FairyVectorDB,
+    queries: Sequence[np.ndarray] | Dict[str, Sequence[np.ndarray]],
+    top_k: int,
+    ef_values: Sequence[int],
+    repeat: int,
+    search_threads: int = -1,
+    rerank_factors: Sequence[int] = (),
+    branch_counts: Sequence[int] = (),
+) -> List[Dict[str, Any]]:
+    """Benchmark every collection.
+
+    `queries` holds one (n_chunks, dim) matrix per story, or such a list per collection.
+    """
+
+    rows: List[Dict[str, Any]] = []
+    for collection in COLLECTIONS:
+        collection_queries = queries[collection] if isinstance(queries, dict) else queries
+        vectors = db.get_collection_vectors(collection)
+        idx = db._get_index(collection)
+        k = min(int(top_k), len(vectors))
+
+        exact_ms: List[float] = []
+        exact_labels: List[np.ndarray] = []
+        for q in collection_queries:
+            (labels, _), ms = _timed(lambda q=q: vectors.search(queries=q, k=k), repeat)
+            exact_labels.append(labels)
+            exact_ms.append(ms)
+        rows.append(
+            {
+                "collection": collection,
+                "docs": len(vectors),
+                "method": "exact",
+                "ef_search": None,
+                "rerank_factor": None,
+                "branches": None,
+                "rows_scanned": 1.0,
+                "recall_at_k": 1.0,
+                "median_ms_per_story": statistics.median(exact_ms) if exact_ms else 0.0,
+            }
+        )
+
+        for ef in ef_values:
+            idx.set_ef_search(max(int(ef), k))
+            hnsw_ms: List[float] = []
+            recalls: List[float] = []
+            for q, truth in zip(collection_queries, exact_labels):
+                (labels, _), ms = _timed(
+                    lambda q=q: idx.knn_batch(vectors=q, k=k, num_threads=search_threads), repeat
+                )
+                hnsw_ms.append(ms)
+                recalls.append(_recall(labels, truth))
+            rows.append(
+                {
+                    "collection": collection,
+                    "docs": len(vectors),
+                    "method": "hnsw",
+                    "ef_search": int(ef),
+                    "rerank_factor": None,
+                    "branches": None,
+                    "rows_scanned": None,
+                    "recall_at_k": float(np.mean(recalls)) if recalls else 1.0,
+                    "median_ms_per_story": statistics.median(hnsw_ms) if hnsw_ms else 0.0,
+                }
+            )
+        idx.set_ef_search(idx.config.ef_search)
+
+        branches = db._branches.get(collection)
+        for n_branches in branch_counts if branches is not None else ():
+            b_ms: List[float] = []
+            recalls = []
+            scanned = []
+            for q, truth in zip(collection_queries, exact_labels):
+                (labels, _), ms = _timed(
+                    lambda q=q: branches.search(queries=q, k=k, n_branches=n_branches), repeat
+                )
+                b_ms.append(ms)
+                recalls.append(_recall(labels, truth))
+                top = branches.top_branches(np.asarray(q, dtype=np.float32), n_branches)
+                sizes = np.diff(branches.starts)[top].sum(axis=1)
+                scanned.append(float(sizes.mean()) / max(1, len(vectors)))
+            rows.append(
+                {
+                    "collection": collection,
+                    "docs": len(vectors),
+                    "method": "hierarchical",
+                    "ef_search": None,
+                    "rerank_factor": None,
+                    "branches": int(n_branches),
+                    "rows_scanned": float(np.mean(scanned)) if scanned else 0.0,
+                    "recall_at_k": float(np.mean(recalls)) if recalls else 1.0,
+                    "median_ms_per_story": statistics.median(b_ms) if b_ms else 0.0,
+                }
+            )
+
+        quantized = db._quantized.get(collection)
+        if quantized is None:
+            continue
+        for factor in rerank_factors:
+            q_ms: List[float] = []
+            recalls = []
+            for q, truth in zip(collection_queries, exact_labels):
+                (labels, _), ms = _timed(
+                    lambda q=q: quantized.search(queries=q, k=k, rerank_factor=factor), repeat
+                )
+                q_ms.append(ms)
+                recalls.append(_recall(labels, truth))
+            rows.append(
+                {
+                    "collection": collection,
+                    "docs": len(vectors),
+                    "method": quantized.quantization,
+                    "ef_search": None,
+                    "rerank_factor": int(factor),
+                    "branches": None,
+                    "rows_scanned": 1.0,
+                    "recall_at_k": float(np.mean(recalls)) if recalls else 1.0,
+                    "median_ms_per_story": statistics.median(q_ms) if q_ms else 0.0,
+                }
+            )
+    return rows
+
+
+def _print_table(rows: Sequence[Dict[str, Any]], *, top_k: int) -> None:
+    print(
+        f"{'collection':<10} {'docs':>7} {'method':<12} {'param':>11} {f'recall@{top_k}':>10} "
+        f"{'scanned':>8} {'ms/story':>9}"
+    )
+    for r in rows:
+        param = "-"
+        if r["ef_search"] is not None:
+            param = f"ef={r['ef_search']}"
+        elif r["rerank_factor"] is not None:
+            param = f"rerank={r['rerank_factor']}"
+        elif r["branches"] is not None:
+            param = f"branches={r['branches']}"
+        scanned = "-" if r["rows_scanned"] is None else f"{r['rows_scanned']:.3f}"
+        print(
+            f"{r['collection']:<10} {r['docs']:>7} {r['method']:<12} {param:>11} "
+            f"{r['recall_at_k']:>10.4f} {scanned:>8} {r['median_ms_per_story']:>9.3f}"
+        )
+
+
+def _print_footprint(rows: Sequence[Dict[str, Any]]) -> None:
+    def fmt(value: Optional[float], spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'collection':<10} {'storage':<22} {'size_mb':>9} {'load_s':>8} {'rss_mb':>8}")
+    for r in rows:
+        print(
+            f"{r['collection']:<10} {r['storage']:<22} {r['file_mb']:>9.1f} "
+            f"{fmt(r['load_s'], '.3f'):>8} {fmt(r['rss_mb'], '.1f'):>8}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_model.vector_database.benchmark",
+        description="Compare exact (NumPy) and HNSW search recall/latency on dataset stories.",
+    )
+    parser.add_argument(
+        "--store-dir",
+        default=str(Path(__file__).resolve().parent / "store"),
+        help="Directory containing the built vector DB artifacts",
+    )
+    parser.add_argument(
+        "--stories",
+        nargs="+",
+        default=["datasets/*/texts/*"],
+        help="Glob pattern(s) for story files (.md/.txt)",
+    )
+    parser.add_argument("--ollama-base-url", default="http://localhost:11434", help="Ollama base URL")
+    parser.add_argument("--embedding-model", default=None, help="Embedding model (default: the one in meta.json)")
+    parser.add_argument("--top-k", type=int, default=10, help="Neighbors per chunk")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 256], help="HNSW ef values to test")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per story (median is reported)")
+    parser.add_argument("--search-threads", type=int, default=-1, help="hnswlib query threads")
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="Quantized search re-rank factors to test (stores built with --quantization)",
+    )
+    parser.add_argument(
+        "--branches",
+        type=int,
+        nargs="+",
+        default=[4, 8, 16],
+        help="Hierarchical search: motif branches searched per query",
+    )
+    parser.add_argument(
+        "--sample-queries",
+        type=int,
+        default=0,
+        help="Use N stored vectors of the other collection as queries instead of stories (no Ollama)",
+    )
+    parser.add_argument("--max-chars", type=int, default=1200, help="Chunk size")
+    parser.add_argument("--overlap", type=int, default=120, help="Chunk overlap")
+    parser.add_argument("--json-out", default=None, help="Optional path to write the results as JSON")
+    args = parser.parse_args(argv)
+
+    paths = VectorDBPaths(root_dir=Path(args.store_dir))
+    footprint = measure_footprint(paths)
+
+    db = FairyVectorDB(paths=paths)
+    db.load()
+    model = args.embedding_model or db._meta.get("embedding_model") or "qwen3-embedding:4b"
+
+    queries: Sequence[np.ndarray] | Dict[str, List[np.ndarray]]
+    if args.sample_queries > 0:
+        queries = _sample_queries(db, int(args.sample_queries))
+        n_stories, n_chunks = 1, int(args.sample_queries)
+        print(f"[vector-db] {n_chunks} sampled stored vectors as queries")
+    else:
+        files = _story_files(args.stories)
+        if not files:
+            raise SystemExit(f"No story files matched: {args.stories}")
+
+        print(f"[vector-db] Embedding {len(files)} stories with {model}...")
+        queries = _embed_stories(
+            files,
+            base_url=args.ollama_base_url,
+            model=model,
+            chunking=ChunkingConfig(max_chars=int(args.max_chars), overlap=int(args.overlap)),
+        )
+        n_stories, n_chunks = len(queries), sum(q.shape[0] for q in queries)
+        print(f"[vector-db] {n_stories} stories, {n_chunks} chunks")
+
+    rows = run_benchmark(
+        db=db,
+        queries=queries,
+        top_k=int(args.top_k),
+        ef_values=[int(x) for x in args.ef_search],
+        repeat=int(args.repeat),
+        search_threads=int(args.search_threads),
+        rerank_factors=[int(x) for x in args.rerank_factor],
+        branch_counts=[int(x) for x in args.branches],
+    )
+    _print_table(rows, top_k=int(args.top_k))
+    print()
+    _print_footprint(footprint)
+
+    if args.json_out:
+        payload = {
+            "stories": n_stories,
+            "chunks": n_chunks,
+            "top_k": int(args.top_k),
+            "results": rows,
+            "footprint": footprint,
+        }
+        Path(args.json_out).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -55,6 +55,28 @@ def main(argv: list[str] | None = None) -> int:
         default=512,
         help="Embedding batch size sent to Ollama",
     )
+    p_build.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Always re-embed documents instead of reusing cached vectors",
+    )
+    p_build.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed rows that are new or changed since the last build",
+    )
+    p_build.add_argument(
+        "--vector-dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="dtype of the memory-mapped <collection>_vectors.npy files",
+    )
+    p_build.add_argument(
+        "--quantization",
+        choices=["float16", "int8"],
+        default=None,
+        help="Also write quantized vectors for --search-mode quantized",
+    )
 
     p_detect = sub.add_parser("detect", help="Detect likely ATU types and motifs in a story")
     p_detect.add_argument(
@@ -89,6 +111,46 @@ def main(argv: list[str] | None = None) -> int:
     )
     p_detect.add_argument("--max-chars", type=int, default=1200, help="Chunk size")
     p_detect.add_argument("--overlap", type=int, default=120, help="Chunk overlap")
+    p_detect.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Always re-embed story chunks instead of reusing cached vectors",
+    )
+    p_detect.add_argument(
+        "--search-mode",
+        choices=["auto", "exact", "hnsw", "quantized", "hierarchical"],
+        default="auto",
+        help=(
+            "exact = NumPy brute force, hnsw = approximate, quantized = scan of the quantized "
+            "vectors + exact re-rank, hierarchical = motif chapter/division centroids first, "
+            "auto = exact for small collections"
+        ),
+    )
+    p_detect.add_argument(
+        "--exact-max-docs",
+        type=int,
+        default=20000,
+        help="In auto mode, collections up to this size are searched exactly",
+    )
+    p_detect.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=4,
+        help="Quantized search re-ranks top-k * factor candidates with the float vectors",
+    )
+    p_detect.add_argument(
+        "--hierarchy-branches",
+        type=int,
+        default=8,
+        help="Hierarchical search: motif branches (chapter > division) searched per chunk",
+    )
+    p_detect.add_argument(
+        "--skip-hnsw",
+        nargs="*",
+        choices=["atu", "motif"],
+        default=[],
+        help="Do not load the HNSW index of these collections",
+    )
 
     args = parser.parse_args(argv)
 
@@ -100,6 +162,10 @@ def main(argv: list[str] | None = None) -> int:
                 ollama_base_url=args.ollama_base_url,
                 embedding_model=args.embedding_model,
                 embed_batch_size=int(args.embed_batch_size),
+                use_embedding_cache=not args.no_embedding_cache,
+                incremental=bool(args.incremental),
+                vector_dtype=args.vector_dtype,
+                quantization=args.quantization,
             ),
         )
         print(f"Built vector DB at: {args.store_dir}")
@@ -108,7 +174,7 @@ def main(argv: list[str] | None = None) -> int:
     if args.cmd == "detect":
         text = _read_text(args.text_file, args.text)
         db = FairyVectorDB(paths=VectorDBPaths(root_dir=Path(args.store_dir)))
-        db.load()
+        db.load(skip_hnsw=args.skip_hnsw)
         result = db.detect(
             text=text,
             config=QueryConfig(
@@ -121,6 +187,11 @@ def main(argv: list[str] | None = None) -> int:
                     max_chars=int(args.max_chars),
                     overlap=int(args.overlap),
                 ),
+                use_embedding_cache=not args.no_embedding_cache,
+                search_mode=args.search_mode,
+                exact_max_docs=int(args.exact_max_docs),
+                rerank_factor=int(args.rerank_factor),
+                hierarchy_branches=int(args.hierarchy_branches),
             ),
         )
         print(json.dumps(result, ensure_ascii=False, indent=2))
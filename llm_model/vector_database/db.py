@@ -1,22 +1,85 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from llm_model.embedding_cache import EmbeddingCache, get_default_embedding_cache
+from llm_model.ollama_client import aembed as ollama_aembed
 from llm_model.ollama_client import embed as ollama_embed
 
 from .csv_sources import SourcePaths, iter_atu_records, iter_motif_records
+from .doc_cache import DocCache
 from .hnsw_index import HNSWConfig, HNSWIndex
 from .paths import VectorDBPaths, default_paths
-from .sqlite_store import DocRecord, connect, count_collection, ensure_schema, fetch_by_ids, upsert_documents
+from .result_cache import DetectResultCache, detect_cache_key
+from .sqlite_store import (
+    DocRecord,
+    connect,
+    content_hash,
+    count_collection,
+    ensure_schema,
+    fetch_collection_state,
+    mark_deleted,
+    upsert_documents,
+)
 from .text_chunking import ChunkingConfig, chunk_text
+from .vector_store import (
+    QUANTIZATIONS,
+    BranchIndex,
+    CollectionVectors,
+    QuantizedVectors,
+    VectorStoreWriter,
+    load_branch_index,
+    load_collection_vectors,
+    load_quantized_vectors,
+    remove_quantized_vectors,
+    write_branch_index,
+    write_quantized_vectors,
+)
+
+
+def _max_similarity_per_doc(
+    labels: np.ndarray,
+    distances: np.ndarray,
+    min_similarity: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Collapse (n_chunks, k) kNN results to the best similarity per doc id.
+
+    Returns (doc_ids, similarities), with doc ids ascending.
+    """
+
+    flat_labels = labels.reshape(-1)
+    sims = 1.0 - distances.reshape(-1).astype(np.float64)
+    keep = sims >= min_similarity
+    flat_labels = flat_labels[keep]
+    sims = sims[keep]
+    if flat_labels.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    doc_ids, inverse = np.unique(flat_labels, return_inverse=True)
+    best = np.full(doc_ids.shape[0], -np.inf)
+    np.maximum.at(best, inverse, sims)
+    return doc_ids.astype(np.int64), best
+
 
+def _motif_branch_key(metadata: Dict[str, Any]) -> str:
+    """Branch of a motif in the Thompson hierarchy: chapter > first division.
 
-def _cosine_distance_to_similarity(distance: float) -> float:
-    # For hnswlib cosine space, distance is (1 - cosine_similarity).
-    return 1.0 - float(distance)
+    Falls back to the letter prefix of the code (the chapter) when the CSV has
+    no chapter/division columns.
+    """
+
+    chapter = str(metadata.get("chapter") or "").strip()
+    division = str(metadata.get("division1") or "").strip()
+    if not chapter:
+        code = str(metadata.get("code") or "").strip()
+        chapter = code[:1].upper()
+    return f"{chapter} | {division}" if division else chapter
 
 
 @dataclass(frozen=True)
@@ -27,6 +90,20 @@ class BuildConfig:
     # Batching controls
     embed_batch_size: int = 32
 
+    # Reuse vectors from the shared embedding cache (see llm_model.embedding_cache)
+    use_embedding_cache: bool = True
+
+    # Only embed rows whose content changed since the last build (falls back to a
+    # full build when the store is missing or was built with another model/HNSW setup)
+    incremental: bool = False
+
+    # dtype of the memory-mapped `<collection>_vectors.npy` files ("float32" or "float16")
+    vector_dtype: str = "float32"
+
+    # Also write a quantized copy of the vectors ("float16", "int8" or None) for
+    # `search_mode="quantized"`; needs the cosine space
+    quantization: Optional[str] = None
+
     # HNSW controls
     hnsw: HNSWConfig = HNSWConfig()
 
@@ -43,40 +120,222 @@ class QueryConfig:
     atu_min_similarity: float = 0.45
     motif_min_similarity: float = 0.35
 
+    # hnswlib query threads for multi-chunk searches (-1 = all cores)
+    search_threads: int = -1
+
+    # "hnsw" (approximate), "exact" (NumPy matrix product over the stored vectors),
+    # "quantized" (scan of the quantized vectors, exact re-rank of the best
+    # top_k * rerank_factor candidates) or "auto": exact for collections with at most
+    # `exact_max_docs` live rows, HNSW for larger ones (typically exact ATU + HNSW
+    # motifs; quantized/exact when the HNSW index was not loaded).
+    # "hierarchical" ranks the motif chapter/division centroids and searches exactly
+    # within the `hierarchy_branches` best branches per chunk (other collections: auto).
+    search_mode: str = "auto"
+    exact_max_docs: int = 20000
+    rerank_factor: int = 4
+    hierarchy_branches: int = 8
+
+    # Reuse vectors from the shared embedding cache (see llm_model.embedding_cache)
+    use_embedding_cache: bool = True
+
+
+def _embedding_cache(enabled: bool) -> Optional[EmbeddingCache]:
+    return get_default_embedding_cache() if enabled else None
+
+
+def _hnsw_config_from_meta(meta: Dict[str, Any]) -> HNSWConfig:
+    hnsw = meta.get("hnsw", {})
+    return HNSWConfig(
+        space=str(hnsw.get("space", "cosine")),
+        ef_construction=int(hnsw.get("ef_construction", 200)),
+        m=int(hnsw.get("m", 32)),
+        ef_search=int(hnsw.get("ef_search", 64)),
+    )
+
+
+@dataclass(frozen=True)
+class CollectionDiff:
+    """Difference between CSV records and the SQLite rows of one collection."""
+
+    new: List[DocRecord]
+    changed: List[DocRecord]
+    removed_ids: List[int]
+    unchanged: int
+
+
+def _diff_collection(conn, collection: str, records: Sequence[DocRecord]) -> CollectionDiff:
+    state = fetch_collection_state(conn, collection)
+
+    new: List[DocRecord] = []
+    changed: List[DocRecord] = []
+    unchanged = 0
+    seen = set()
+    for rec in records:
+        seen.add(rec.doc_key)
+        existing = state.get(rec.doc_key)
+        if existing is None:
+            new.append(rec)
+            continue
+        _, stored_hash, deleted = existing
+        if deleted or stored_hash != content_hash(rec):
+            changed.append(rec)
+        else:
+            unchanged += 1
+
+    removed_ids = [
+        doc_id for key, (doc_id, _, deleted) in state.items() if key not in seen and not deleted
+    ]
+    return CollectionDiff(new=new, changed=changed, removed_ids=removed_ids, unchanged=unchanged)
+
+
+def _embed_into_index(
+    *,
+    idx: HNSWIndex,
+    items: Sequence[Tuple[int, str]],
+    config: BuildConfig,
+    desc: str,
+    expected_dim: Optional[int] = None,
+    store: Optional[VectorStoreWriter] = None,
+) -> None:
+    """Embed `(label, text)` pairs in batches and add them to `idx` (and `store`)."""
+
+    try:
+        from tqdm import tqdm  # type: ignore
+    except Exception:  # pragma: no cover
+        tqdm = None  # type: ignore
+
+    cache = _embedding_cache(config.use_embedding_cache)
+    batch_size = max(1, int(config.embed_batch_size))
+
+    pbar = None
+    if tqdm is not None and items:
+        pbar = tqdm(total=len(items), desc=desc)
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        vecs = ollama_embed(
+            base_url=config.ollama_base_url,
+            model=config.embedding_model,
+            inputs=[text for _, text in batch],
+            timeout_s=600.0,
+            cache=cache,
+        )
+        if expected_dim is not None and vecs and len(vecs[0]) != expected_dim:
+            raise ValueError(
+                f"Embedding dim {len(vecs[0])} does not match the stored index dim {expected_dim}; "
+                "run a full build instead"
+            )
+        ids = [doc_id for doc_id, _ in batch]
+        idx.add(vectors=vecs, ids=ids)
+        if store is not None:
+            store.put(ids, vecs)
+        if pbar is not None:
+            pbar.update(len(batch))
+
+    if pbar is not None:
+        pbar.close()
+
+
+def _copy_vectors_from(
+    *,
+    store: VectorStoreWriter,
+    ids: Sequence[int],
+    previous: Optional[CollectionVectors],
+    idx: HNSWIndex,
+    batch_size: int = 4096,
+) -> None:
+    """Carry unchanged vectors over into a rewritten store.
+
+    Rows come from the previous `.npy` file when it has them, otherwise from the
+    HNSW index itself (stores built before the `.npy` files existed).
+    """
+
+    ids_arr = np.asarray(list(ids), dtype=np.int64)
+    if previous is not None and previous.dim == store.dim and bool((previous.rows_for(ids_arr) >= 0).all()):
+        source = previous.take
+    else:
+        source = lambda part: idx.get_vectors(part.tolist())  # noqa: E731
+
+    for start in range(0, ids_arr.shape[0], batch_size):
+        part = ids_arr[start : start + batch_size]
+        store.put(part, source(part))
+
 
 class VectorDBNotBuiltError(RuntimeError):
     pass
 
 
+SEARCH_MODES = ("auto", "exact", "hnsw", "quantized", "hierarchical")
+COLLECTIONS = ("atu", "motif")
+
+
 class FairyVectorDB:
     """Local vector database for ATU types and Motif-Index (TMI).
 
     Storage:
       - SQLite stores document text + metadata
       - Two HNSW indices store vectors for collections: 'atu' and 'motif'
+      - Memory-mapped `.npy` matrices keep the same vectors (rows aligned with
+        SQLite ids) for exact re-ranking and analytics
+      - Optional quantized copies (float16/int8) for a compact in-memory scan
+      - Motif branch centroids (chapter > division) for coarse-to-fine search
+      - Decoded records and display labels are cached in memory by SQLite id
+      - Optionally, whole `detect()` results are cached (`result_cache`)
 
     Embeddings are always generated by Ollama using the configured embedding model.
     """
 
-    def __init__(self, *, paths: Optional[VectorDBPaths] = None):
+    def __init__(
+        self,
+        *,
+        paths: Optional[VectorDBPaths] = None,
+        result_cache: Optional[DetectResultCache] = None,
+    ):
+        """Create an unloaded database.
+
+        Args:
+            paths: Store layout (default: `store/` next to this package).
+            result_cache: Cache of whole `detect()`/`adetect()` results; cleared
+                whenever this object loads or rebuilds the store. None disables it.
+        """
         import threading
 
         self.paths = paths or default_paths()
+        self.result_cache = result_cache
         self._conn = None
         self._conn_lock = threading.Lock()
         self._meta: Dict[str, Any] = {}
         self._atu_index: Optional[HNSWIndex] = None
         self._motif_index: Optional[HNSWIndex] = None
+        self._vectors: Dict[str, Optional[CollectionVectors]] = {}
+        self._quantized: Dict[str, Optional[QuantizedVectors]] = {}
+        self._branches: Dict[str, Optional[BranchIndex]] = {}
+        self._hnsw_skipped: Tuple[str, ...] = ()
+        self._docs: Optional[DocCache] = None
 
     # -------------------------
     # Build
     # -------------------------
 
     def build_from_csvs(self, *, sources: SourcePaths, config: BuildConfig) -> None:
-        """Build (or rebuild) the vector database from the two CSV sources."""
+        """Build (or rebuild) the vector database from the two CSV sources.
+
+        With `config.incremental=True` and a compatible existing store, only rows
+        whose content changed are re-embedded (see `_update_from_csvs`).
+        """
+
+        if config.quantization is not None and config.quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization {config.quantization!r}; expected one of {QUANTIZATIONS}")
 
         self.paths.root_dir.mkdir(parents=True, exist_ok=True)
 
+        if config.incremental:
+            reason = self._incremental_blocker(config)
+            if reason is None:
+                self._update_from_csvs(sources=sources, config=config)
+                return
+            print(f"[vector-db] Incremental build not possible ({reason}); doing a full build")
+
         print("[vector-db] Loading CSV sources...")
 
         # (Re)create sqlite content
@@ -92,6 +351,11 @@ class FairyVectorDB:
 
         upsert_documents(conn, atu_records)
         upsert_documents(conn, motif_records)
+
+        # Rows that disappeared from the CSVs must not be indexed again.
+        for collection, records in (("atu", atu_records), ("motif", motif_records)):
+            diff = _diff_collection(conn, collection, records)
+            mark_deleted(conn, diff.removed_ids)
         conn.commit()
 
         print("[vector-db] Wrote documents to SQLite")
@@ -106,6 +370,7 @@ class FairyVectorDB:
             model=config.embedding_model,
             inputs=[sample_text],
             timeout_s=600.0,
+            cache=_embedding_cache(config.use_embedding_cache),
         )[0]
         dim = len(sample_vec)
         if dim <= 0:
@@ -113,8 +378,8 @@ class FairyVectorDB:
 
         # Build indices by iterating SQLite rows for stable integer IDs.
         # Note: we rely on SQLite autoincrement IDs for correspondence with HNSW labels.
-        atu_count = count_collection(conn, "atu")
-        motif_count = count_collection(conn, "motif")
+        atu_count = count_collection(conn, "atu", include_deleted=False)
+        motif_count = count_collection(conn, "motif", include_deleted=False)
         total = atu_count + motif_count
 
         print(f"[vector-db] SQLite counts: atu={atu_count} motif={motif_count} total={total}")
@@ -131,6 +396,11 @@ class FairyVectorDB:
                 "m": config.hnsw.m,
                 "ef_search": config.hnsw.ef_search,
             },
+            "vectors": {
+                "dtype": config.vector_dtype,
+                "normalized": config.hnsw.space == "cosine",
+                "quantization": config.quantization if config.hnsw.space == "cosine" else None,
+            },
         }
 
         # Build ATU index
@@ -139,6 +409,8 @@ class FairyVectorDB:
             conn=conn,
             collection="atu",
             index_path=self.paths.atu_index_path,
+            vectors_path=self.paths.atu_vectors_path,
+            vector_ids_path=self.paths.atu_vector_ids_path,
             dim=dim,
             config=config,
             max_elements=atu_count,
@@ -150,6 +422,8 @@ class FairyVectorDB:
             conn=conn,
             collection="motif",
             index_path=self.paths.motif_index_path,
+            vectors_path=self.paths.motif_vectors_path,
+            vector_ids_path=self.paths.motif_vector_ids_path,
             dim=dim,
             config=config,
             max_elements=motif_count,
@@ -160,6 +434,7 @@ class FairyVectorDB:
         print("[vector-db] Wrote meta.json")
         print(f"[vector-db] Build complete: {self.paths.root_dir}")
         conn.close()
+        self._invalidate_caches()
 
     def _build_index_for_collection(
         self,
@@ -167,59 +442,245 @@ class FairyVectorDB:
         conn,
         collection: str,
         index_path: Path,
+        vectors_path: Path,
+        vector_ids_path: Path,
         dim: int,
         config: BuildConfig,
         max_elements: int,
     ) -> None:
         from .sqlite_store import iter_collection
 
-        try:
-            from tqdm import tqdm  # type: ignore
-        except Exception:  # pragma: no cover
-            tqdm = None  # type: ignore
-
         idx = HNSWIndex(dim=dim, config=config.hnsw)
         idx.init(max_elements=max(1, max_elements))
 
-        batch_texts: List[str] = []
-        batch_ids: List[int] = []
+        items = [(doc_id, rec.text) for doc_id, rec in iter_collection(conn, collection)]
+        store = VectorStoreWriter(
+            vectors_path=vectors_path,
+            ids_path=vector_ids_path,
+            ids=[doc_id for doc_id, _ in items],
+            dim=dim,
+            dtype=config.vector_dtype,
+            normalize=config.hnsw.space == "cosine",
+        )
+        try:
+            _embed_into_index(
+                idx=idx,
+                items=items,
+                config=config,
+                desc=f"Embedding+Indexing {collection}",
+                store=store,
+            )
+        except BaseException:
+            store.abort()
+            raise
 
-        pbar = None
-        if tqdm is not None:
-            pbar = tqdm(total=max_elements, desc=f"Embedding+Indexing {collection}")
+        idx.save(index_path)
+        store.close()
+        self._write_quantized(collection, quantization=config.quantization, normalized=store.normalize)
+        if collection == "motif":
+            self._write_motif_branches(conn, normalized=store.normalize)
 
-        def flush() -> None:
-            if not batch_texts:
-                return
-            vecs = ollama_embed(
-                base_url=config.ollama_base_url,
-                model=config.embedding_model,
-                inputs=batch_texts,
-                timeout_s=600.0,
-            )
-            idx.add(vectors=vecs, ids=batch_ids)
-            if pbar is not None:
-                pbar.update(len(batch_texts))
-            batch_texts.clear()
-            batch_ids.clear()
-
-        for doc_id, rec in iter_collection(conn, collection):
-            batch_ids.append(doc_id)
-            batch_texts.append(rec.text)
-            if len(batch_texts) >= config.embed_batch_size:
-                flush()
-        flush()
+    def _invalidate_caches(self) -> None:
+        """Forget cached documents and results after the store changed."""
 
-        if pbar is not None:
-            pbar.close()
+        if self._docs is not None:
+            self._docs.clear()
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
-        idx.save(index_path)
+    def _quantized_paths(self, collection: str) -> Tuple[Path, Path]:
+        if collection == "atu":
+            return self.paths.atu_quantized_path, self.paths.atu_quantized_scales_path
+        return self.paths.motif_quantized_path, self.paths.motif_quantized_scales_path
+
+    def _write_quantized(self, collection: str, *, quantization: Optional[str], normalized: bool) -> None:
+        """Rewrite (or remove) the quantized copy of a collection's stored vectors."""
+
+        codes_path, scales_path = self._quantized_paths(collection)
+        if quantization and not normalized:
+            print(f"[vector-db] Skipping quantized {collection} vectors: they need the cosine space")
+            quantization = None
+        if not quantization:
+            remove_quantized_vectors(codes_path=codes_path, scales_path=scales_path)
+            return
+
+        if collection == "atu":
+            vectors_path, ids_path = self.paths.atu_vectors_path, self.paths.atu_vector_ids_path
+        else:
+            vectors_path, ids_path = self.paths.motif_vectors_path, self.paths.motif_vector_ids_path
+        source = load_collection_vectors(vectors_path, ids_path, normalized=normalized)
+        if source is None:
+            return
+        write_quantized_vectors(source, codes_path=codes_path, scales_path=scales_path, quantization=quantization)
+        print(f"[vector-db] Wrote {quantization} {collection} vectors ({codes_path.name})")
+        del source
+
+    def _write_motif_branches(self, conn, *, normalized: bool) -> None:
+        """Recompute the motif branch centroids from the stored vectors."""
+
+        from .sqlite_store import iter_collection
+
+        source = load_collection_vectors(
+            self.paths.motif_vectors_path, self.paths.motif_vector_ids_path, normalized=normalized
+        )
+        if source is None or not normalized:
+            return
+        keys = {doc_id: _motif_branch_key(rec.metadata) for doc_id, rec in iter_collection(conn, "motif")}
+        row_branches = [keys.get(int(doc_id), "") for doc_id in source.ids.tolist()]
+        write_branch_index(source, row_branches=row_branches, path=self.paths.motif_branches_path)
+        print(f"[vector-db] Wrote {len(set(row_branches))} motif branch centroids")
+        del source
+
+    def _incremental_blocker(self, config: BuildConfig) -> Optional[str]:
+        """Return why an incremental update is impossible, or None if it is possible."""
+
+        if not self.paths.meta_path.exists():
+            return "no existing meta.json"
+        for path in (self.paths.sqlite_path, self.paths.atu_index_path, self.paths.motif_index_path):
+            if not path.exists():
+                return f"missing {path.name}"
+
+        meta = json.loads(self.paths.meta_path.read_text(encoding="utf-8"))
+        if meta.get("embedding_model") != config.embedding_model:
+            return f"embedding model changed ({meta.get('embedding_model')} -> {config.embedding_model})"
+
+        stored = meta.get("hnsw", {})
+        for key in ("space", "ef_construction", "m"):
+            if stored.get(key) != getattr(config.hnsw, key):
+                return f"HNSW parameter '{key}' changed"
+        return None
+
+    def _update_from_csvs(self, *, sources: SourcePaths, config: BuildConfig) -> None:
+        """Apply CSV changes to an existing store, embedding only new/changed rows."""
+
+        meta = json.loads(self.paths.meta_path.read_text(encoding="utf-8"))
+        dim = int(meta.get("dim") or 0)
+        hnsw_cfg = _hnsw_config_from_meta(meta)
+
+        print("[vector-db] Incremental build: loading CSV sources...")
+
+        conn = connect(self.paths.sqlite_path)
+        ensure_schema(conn)
+
+        normalize = hnsw_cfg.space == "cosine"
+        quantization_current = meta.get("vectors", {}).get("quantization") == (
+            config.quantization if normalize else None
+        )
+        plan = (
+            (
+                "atu",
+                list(iter_atu_records(sources.atu_csv)),
+                self.paths.atu_index_path,
+                self.paths.atu_vectors_path,
+                self.paths.atu_vector_ids_path,
+            ),
+            (
+                "motif",
+                list(iter_motif_records(sources.motif_csv)),
+                self.paths.motif_index_path,
+                self.paths.motif_vectors_path,
+                self.paths.motif_vector_ids_path,
+            ),
+        )
+
+        for collection, records, index_path, vectors_path, vector_ids_path in plan:
+            diff = _diff_collection(conn, collection, records)
+            print(
+                f"[vector-db] {collection}: new={len(diff.new)} changed={len(diff.changed)} "
+                f"removed={len(diff.removed_ids)} unchanged={diff.unchanged}"
+            )
+            previous = load_collection_vectors(vectors_path, vector_ids_path, normalized=normalize)
+            vectors_current = previous is not None and previous.vectors.dtype == np.dtype(config.vector_dtype)
+            if not diff.new and not diff.changed and not diff.removed_ids and vectors_current:
+                if not quantization_current:
+                    self._write_quantized(collection, quantization=config.quantization, normalized=normalize)
+                if collection == "motif" and not self.paths.motif_branches_path.exists():
+                    self._write_motif_branches(conn, normalized=normalize)
+                continue
+
+            upsert_documents(conn, diff.new + diff.changed)
+            mark_deleted(conn, diff.removed_ids)
+            conn.commit()
+
+            # New rows received fresh SQLite ids; changed rows kept theirs.
+            state = fetch_collection_state(conn, collection)
+            items = [(state[r.doc_key][0], r.text) for r in diff.new + diff.changed]
+
+            idx = HNSWIndex(dim=dim, config=hnsw_cfg)
+            idx.load(index_path, max_elements=max(1, count_collection(conn, collection)))
+            idx.resize(max_elements=idx.get_current_count() + len(items))
+
+            # The vector files are rewritten for the live ids: unchanged rows are
+            # copied over, new/changed rows come from the embedding batches below.
+            live_ids = sorted(doc_id for doc_id, _, deleted in state.values() if not deleted)
+            embedded_ids = {doc_id for doc_id, _ in items}
+            store = VectorStoreWriter(
+                vectors_path=vectors_path,
+                ids_path=vector_ids_path,
+                ids=live_ids,
+                dim=dim,
+                dtype=config.vector_dtype,
+                normalize=normalize,
+            )
+            try:
+                _copy_vectors_from(
+                    store=store,
+                    ids=[doc_id for doc_id in live_ids if doc_id not in embedded_ids],
+                    previous=previous,
+                    idx=idx,
+                )
+                # hnswlib replaces the vector of an existing label (and un-deletes it).
+                _embed_into_index(
+                    idx=idx,
+                    items=items,
+                    config=config,
+                    desc=f"Embedding+Indexing {collection} (changed)",
+                    expected_dim=dim,
+                    store=store,
+                )
+            except BaseException:
+                store.abort()
+                raise
+            idx.mark_deleted(diff.removed_ids)
+            idx.save(index_path)
+            del previous
+            store.close()
+            self._write_quantized(collection, quantization=config.quantization, normalized=normalize)
+            if collection == "motif":
+                self._write_motif_branches(conn, normalized=normalize)
+
+        atu_count = count_collection(conn, "atu", include_deleted=False)
+        motif_count = count_collection(conn, "motif", include_deleted=False)
+        meta["ollama_base_url"] = config.ollama_base_url
+        meta["vectors"] = {
+            "dtype": config.vector_dtype,
+            "normalized": normalize,
+            "quantization": config.quantization if normalize else None,
+        }
+        meta["counts"] = {"atu": atu_count, "motif": motif_count, "total": atu_count + motif_count}
+        self.paths.meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        conn.close()
+        self._invalidate_caches()
+        print(f"[vector-db] Incremental build complete: {self.paths.root_dir}")
 
     # -------------------------
     # Load
     # -------------------------
 
-    def load(self) -> None:
+    def load(self, *, skip_hnsw: Sequence[str] = (), preload_docs: bool = True) -> None:
+        """Open SQLite, the HNSW indices and the stored (and quantized) vectors.
+
+        Args:
+            skip_hnsw: Collections whose HNSW index is not loaded, e.g. ("motif",)
+                when motifs are searched with `search_mode="quantized"`. This saves
+                the load time and memory of the index file (vectors + graph).
+            preload_docs: Decode all documents and labels into memory now; otherwise
+                they are cached on first access.
+        """
+        unknown = sorted(set(skip_hnsw) - set(COLLECTIONS))
+        if unknown:
+            raise ValueError(f"Unknown collection(s) in skip_hnsw: {unknown}")
+
         if not self.paths.meta_path.exists():
             raise VectorDBNotBuiltError(
                 f"Vector DB metadata not found at {self.paths.meta_path}. Build it first."
@@ -233,26 +694,94 @@ class FairyVectorDB:
         conn = connect(self.paths.sqlite_path)
         ensure_schema(conn)
         self._conn = conn
+        self._docs = DocCache(conn, lock=self._conn_lock)
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        if preload_docs:
+            self._docs.preload(COLLECTIONS)
 
         # Initialize + load indices.
         # We set max_elements using current DB counts (safe upper bound for load).
         atu_count = count_collection(conn, "atu")
         motif_count = count_collection(conn, "motif")
 
-        hnsw_cfg = HNSWConfig(
-            space=str(self._meta.get("hnsw", {}).get("space", "cosine")),
-            ef_construction=int(self._meta.get("hnsw", {}).get("ef_construction", 200)),
-            m=int(self._meta.get("hnsw", {}).get("m", 32)),
-            ef_search=int(self._meta.get("hnsw", {}).get("ef_search", 64)),
-        )
+        hnsw_cfg = _hnsw_config_from_meta(self._meta)
+
+        self._hnsw_skipped = tuple(c for c in COLLECTIONS if c in skip_hnsw)
+        self._atu_index = None
+        self._motif_index = None
+        if "atu" not in self._hnsw_skipped:
+            atu = HNSWIndex(dim=dim, config=hnsw_cfg)
+            atu.load(self.paths.atu_index_path, max_elements=max(1, atu_count))
+            self._atu_index = atu
+        if "motif" not in self._hnsw_skipped:
+            motif = HNSWIndex(dim=dim, config=hnsw_cfg)
+            motif.load(self.paths.motif_index_path, max_elements=max(1, motif_count))
+            self._motif_index = motif
+
+        # Raw vectors are optional: stores built before they existed only have HNSW files.
+        normalized = bool(self._meta.get("vectors", {}).get("normalized", hnsw_cfg.space == "cosine"))
+        self._vectors = {
+            "atu": load_collection_vectors(
+                self.paths.atu_vectors_path, self.paths.atu_vector_ids_path, normalized=normalized
+            ),
+            "motif": load_collection_vectors(
+                self.paths.motif_vectors_path, self.paths.motif_vector_ids_path, normalized=normalized
+            ),
+        }
+
+        self._quantized = {}
+        if self._meta.get("vectors", {}).get("quantization"):
+            for collection, originals in self._vectors.items():
+                if originals is None:
+                    continue
+                codes_path, scales_path = self._quantized_paths(collection)
+                self._quantized[collection] = load_quantized_vectors(
+                    codes_path, scales_path, originals=originals
+                )
+
+        motif_vectors = self._vectors.get("motif")
+        self._branches = {
+            "motif": load_branch_index(self.paths.motif_branches_path, originals=motif_vectors)
+            if motif_vectors is not None
+            else None
+        }
+
+    # -------------------------
+    # Vectors
+    # -------------------------
 
-        atu = HNSWIndex(dim=dim, config=hnsw_cfg)
-        atu.load(self.paths.atu_index_path, max_elements=max(1, atu_count))
-        motif = HNSWIndex(dim=dim, config=hnsw_cfg)
-        motif.load(self.paths.motif_index_path, max_elements=max(1, motif_count))
+    def get_collection_vectors(self, collection: str) -> CollectionVectors:
+        """Return the memory-mapped vectors of a collection (rows aligned with SQLite ids)."""
 
-        self._atu_index = atu
-        self._motif_index = motif
+        self._require_loaded()
+        if collection not in ("atu", "motif"):
+            raise ValueError(f"Unknown collection: {collection}")
+        vectors = self._vectors.get(collection)
+        if vectors is None:
+            raise VectorDBNotBuiltError(
+                f"No stored vectors for '{collection}'. Rebuild (a `--incremental` build is enough) to create them."
+            )
+        return vectors
+
+    def get_vectors(self, collection: str, ids: Sequence[int]) -> np.ndarray:
+        """Return float32 vectors for SQLite ids as an (len(ids), dim) matrix."""
+
+        return self.get_collection_vectors(collection).take(ids)
+
+    def get_quantized_vectors(self, collection: str) -> QuantizedVectors:
+        """Return the in-memory quantized vectors of a collection."""
+
+        self._require_loaded()
+        if collection not in COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection}")
+        quantized = self._quantized.get(collection)
+        if quantized is None:
+            raise VectorDBNotBuiltError(
+                f"No quantized vectors for '{collection}'. Rebuild with `--quantization int8` "
+                "(a `--incremental` build is enough)."
+            )
+        return quantized
 
     # -------------------------
     # Query
@@ -263,11 +792,16 @@ class FairyVectorDB:
 
         self._require_loaded()
 
+        key, cached = self._cached_result(text, config)
+        if cached is not None:
+            return cached
+
         chunks = chunk_text(text, config=config.chunking)
         if not chunks:
             return {"atu": [], "motifs": [], "chunks": 0}
 
         # Embed chunks in batches
+        cache = _embedding_cache(config.use_embedding_cache)
         chunk_vectors: List[List[float]] = []
         batch: List[str] = []
         for c in chunks:
@@ -279,6 +813,7 @@ class FairyVectorDB:
                         model=config.embedding_model,
                         inputs=batch,
                         timeout_s=600.0,
+                        cache=cache,
                     )
                 )
                 batch.clear()
@@ -289,20 +824,100 @@ class FairyVectorDB:
                     model=config.embedding_model,
                     inputs=batch,
                     timeout_s=600.0,
+                    cache=cache,
                 )
             )
 
+        return self._search_and_store(key, chunks, chunk_vectors, config)
+
+    async def adetect(self, *, text: str, config: QueryConfig) -> Dict[str, Any]:
+        """Async `detect()`: chunks are embedded with the pooled async Ollama client.
+
+        The search (an exact scan of up to `exact_max_docs` rows in "auto" mode),
+        the document lookups and the result cache run in a worker thread, so they
+        do not block the event loop.
+        """
+
+        self._require_loaded()
+
+        key, cached = await asyncio.to_thread(self._cached_result, text, config)
+        if cached is not None:
+            return cached
+
+        chunks = chunk_text(text, config=config.chunking)
+        if not chunks:
+            return {"atu": [], "motifs": [], "chunks": 0}
+
+        cache = _embedding_cache(config.use_embedding_cache)
+        chunk_vectors: List[List[float]] = []
+        for start in range(0, len(chunks), 16):
+            chunk_vectors.extend(
+                await ollama_aembed(
+                    base_url=config.ollama_base_url,
+                    model=config.embedding_model,
+                    inputs=chunks[start : start + 16],
+                    timeout_s=600.0,
+                    cache=cache,
+                )
+            )
+
+        return await asyncio.to_thread(self._search_and_store, key, chunks, chunk_vectors, config)
+
+    def _search_and_store(
+        self,
+        key: Optional[str],
+        chunks: Sequence[str],
+        chunk_vectors: Sequence[Sequence[float]],
+        config: QueryConfig,
+    ) -> Dict[str, Any]:
+        result = self._detect_from_vectors(chunks=chunks, chunk_vectors=chunk_vectors, config=config)
+        return self._store_result(key, result)
+
+    def _cached_result(self, text: str, config: QueryConfig) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (cache key, cached result or None); the key is None without a cache."""
+
+        if self.result_cache is None:
+            return None, None
+        key = detect_cache_key(text, config, store=str(self.paths.root_dir))
+        cached = self.result_cache.get(key)
+        return key, (dict(cached, cached=True) if cached is not None else None)
+
+    def _store_result(self, key: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        if key is not None and self.result_cache is not None:
+            self.result_cache.put(key, result)
+        return dict(result, cached=False)
+
+    def _detect_from_vectors(
+        self,
+        *,
+        chunks: Sequence[str],
+        chunk_vectors: Sequence[Sequence[float]],
+        config: QueryConfig,
+    ) -> Dict[str, Any]:
+        chunk_matrix = np.asarray(chunk_vectors, dtype=np.float32)
+
+        atu_method = self.search_method("atu", config)
+        motif_method = self.search_method("motif", config)
+
         atu_scores = self._search_collection(
-            vectors=chunk_vectors,
+            vectors=chunk_matrix,
             collection="atu",
             top_k=config.top_k,
             min_similarity=config.atu_min_similarity,
+            num_threads=config.search_threads,
+            method=atu_method,
+            rerank_factor=config.rerank_factor,
+            hierarchy_branches=config.hierarchy_branches,
         )
         motif_scores = self._search_collection(
-            vectors=chunk_vectors,
+            vectors=chunk_matrix,
             collection="motif",
             top_k=config.top_k,
             min_similarity=config.motif_min_similarity,
+            num_threads=config.search_threads,
+            method=motif_method,
+            rerank_factor=config.rerank_factor,
+            hierarchy_branches=config.hierarchy_branches,
         )
 
         return {
@@ -310,43 +925,92 @@ class FairyVectorDB:
             "motifs": motif_scores,
             "chunks": len(chunks),
             "embedding_model": config.embedding_model,
+            "search": {"atu": atu_method, "motif": motif_method},
         }
 
+    def search_method(self, collection: str, config: QueryConfig) -> str:
+        """Resolve `config.search_mode` to "exact", "hnsw", "quantized" or "hierarchical"."""
+
+        mode = str(config.search_mode or "auto").lower()
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search_mode {config.search_mode!r}; expected one of {SEARCH_MODES}")
+        if mode == "hnsw":
+            return "hnsw"
+
+        self._require_loaded()
+        vectors = self._vectors.get(collection)
+        exact_ok = vectors is not None and vectors.normalized
+        if mode == "exact":
+            if not exact_ok:
+                raise VectorDBNotBuiltError(
+                    f"Exact search needs normalized stored vectors for '{collection}'. "
+                    "Rebuild (a `--incremental` build is enough) with the cosine space."
+                )
+            return "exact"
+        if mode == "quantized":
+            self.get_quantized_vectors(collection)
+            return "quantized"
+        if mode == "hierarchical" and self._branches.get(collection) is not None:
+            return "hierarchical"
+
+        # auto: brute force is both exact and cheap for small collections.
+        if exact_ok and len(vectors) <= int(config.exact_max_docs):
+            return "exact"
+        if collection in self._hnsw_skipped:
+            if self._quantized.get(collection) is not None:
+                return "quantized"
+            if exact_ok:
+                return "exact"
+        return "hnsw"
+
     def _search_collection(
         self,
         *,
-        vectors: Sequence[Sequence[float]],
+        vectors: np.ndarray | Sequence[Sequence[float]],
         collection: str,
         top_k: int,
         min_similarity: float,
+        num_threads: int = -1,
+        method: str = "hnsw",
+        rerank_factor: int = 4,
+        hierarchy_branches: int = 8,
     ) -> List[Dict[str, Any]]:
-        idx = self._get_index(collection)
+        self._require_loaded()
         assert self._conn is not None
 
-        best: Dict[int, float] = {}
-        for vec in vectors:
-            ids, distances = idx.knn(vector=vec, k=top_k)
-            for doc_id, dist in zip(ids, distances):
-                sim = _cosine_distance_to_similarity(dist)
-                if sim < min_similarity:
-                    continue
-                prev = best.get(int(doc_id))
-                if prev is None or sim > prev:
-                    best[int(doc_id)] = sim
+        # One query for all chunk vectors, then max-per-doc.
+        if method == "exact":
+            labels, distances = self.get_collection_vectors(collection).search(queries=vectors, k=top_k)
+        elif method == "hierarchical":
+            branches = self._branches.get(collection)
+            if branches is None:
+                raise VectorDBNotBuiltError(
+                    f"No branch index for '{collection}'. Rebuild (a `--incremental` build is enough)."
+                )
+            labels, distances = branches.search(queries=vectors, k=top_k, n_branches=hierarchy_branches)
+        elif method == "quantized":
+            labels, distances = self.get_quantized_vectors(collection).search(
+                queries=vectors, k=top_k, rerank_factor=rerank_factor
+            )
+        else:
+            idx = self._get_index(collection)
+            labels, distances = idx.knn_batch(vectors=vectors, k=top_k, num_threads=num_threads)
+        doc_ids, sims = _max_similarity_per_doc(labels, distances, min_similarity)
 
-        # Fetch doc records and sort
-        id_list = sorted(best.keys())
-        with self._conn_lock:
-            docs = fetch_by_ids(self._conn, id_list)
+        # Doc records and labels come from the in-memory cache
+        assert self._docs is not None
+        docs = self._docs.get_many(doc_ids.tolist())
 
         scored: List[Dict[str, Any]] = []
-        for doc_id, sim in best.items():
-            rec = docs.get(int(doc_id))
-            if not rec:
+        for doc_id, sim in zip(doc_ids.tolist(), sims.tolist()):
+            entry = docs.get(int(doc_id))
+            if not entry:
                 continue
+            rec, label = entry
             scored.append(
                 {
                     "doc_key": rec.doc_key,
+                    "label": label,
                     "similarity": float(sim),
                     "metadata": rec.metadata,
                     "text": rec.text,
@@ -358,6 +1022,10 @@ class FairyVectorDB:
 
     def _get_index(self, collection: str) -> HNSWIndex:
         self._require_loaded()
+        if collection in self._hnsw_skipped:
+            raise VectorDBNotBuiltError(
+                f"HNSW index for '{collection}' was not loaded (skip_hnsw); use exact or quantized search"
+            )
         if collection == "atu":
             if self._atu_index is None:
                 raise VectorDBNotBuiltError("ATU index not loaded")
@@ -369,7 +1037,10 @@ class FairyVectorDB:
         raise ValueError(f"Unknown collection: {collection}")
 
     def _require_loaded(self) -> None:
-        if self._conn is None or self._atu_index is None or self._motif_index is None:
+        indices = {"atu": self._atu_index, "motif": self._motif_index}
+        if self._conn is None or any(
+            idx is None and collection not in self._hnsw_skipped for collection, idx in indices.items()
+        ):
             raise VectorDBNotBuiltError("Vector DB not loaded. Call load() first.")
 
 
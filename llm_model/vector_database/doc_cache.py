@@ -0,0 +1,98 @@
+"""In-memory document records and labels, indexed by SQLite id.
+
+Query results used to go through `fetch_by_ids` (one SQL query plus a
+`json.loads` of `metadata_json` per hit) on every search. `DocCache` keeps the
+decoded `DocRecord`s and their formatted labels in lists indexed by SQLite id,
+filled up front by `preload()` or lazily on first access. SQLite ids are
+autoincrement integers, so the lists stay dense.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .labels import format_label
+from .sqlite_store import DocRecord, fetch_by_ids
+
+
+class DocCache:
+    """Decoded documents and labels of the vector DB, by SQLite id.
+
+    The SQLite connection is shared with the rest of `FairyVectorDB`, so every
+    access to it goes through `lock`. Lookups of cached ids do not take the lock.
+    """
+
+    def __init__(self, conn, *, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+        self._records: List[Optional[DocRecord]] = []
+        self._labels: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return sum(1 for rec in self._records if rec is not None)
+
+    def preload(self, collections: Sequence[str] = ("atu", "motif")) -> int:
+        """Load every live document of `collections`; returns the number loaded."""
+
+        placeholders = ",".join(["?"] * len(collections))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, collection, doc_key, text, metadata_json FROM documents "
+                f"WHERE deleted=0 AND collection IN ({placeholders})",
+                list(collections),
+            ).fetchall()
+            for doc_id, collection, doc_key, text, metadata_json in rows:
+                self._store(
+                    int(doc_id),
+                    DocRecord(
+                        collection=str(collection),
+                        doc_key=str(doc_key),
+                        text=str(text),
+                        metadata=json.loads(metadata_json),
+                    ),
+                )
+        return len(rows)
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, Tuple[DocRecord, str]]:
+        """Return {id: (record, label)}; ids not cached yet are fetched from SQLite.
+
+        Unknown ids are omitted. The records are shared: do not mutate them.
+        """
+
+        records, labels = self._records, self._labels
+        out: Dict[int, Tuple[DocRecord, str]] = {}
+        missing: List[int] = []
+        for doc_id in ids:
+            doc_id = int(doc_id)
+            rec = records[doc_id] if 0 <= doc_id < len(records) else None
+            if rec is None:
+                missing.append(doc_id)
+            else:
+                out[doc_id] = (rec, labels[doc_id])  # type: ignore[assignment]
+
+        if missing:
+            with self._lock:
+                fetched = fetch_by_ids(self._conn, missing)
+                for doc_id, rec in fetched.items():
+                    self._store(doc_id, rec)
+                    out[doc_id] = (rec, self._labels[doc_id])  # type: ignore[assignment]
+        return out
+
+    def clear(self) -> None:
+        """Drop all cached documents (after a rebuild changed the SQLite rows)."""
+
+        with self._lock:
+            self._records = []
+            self._labels = []
+
+    def _store(self, doc_id: int, rec: DocRecord) -> None:
+        # Called with the lock held. The label is set before the record, so a reader
+        # that finds a record also finds its label.
+        if doc_id >= len(self._records):
+            grow = doc_id + 1 - len(self._records)
+            self._records.extend([None] * grow)
+            self._labels.extend([None] * grow)
+        self._labels[doc_id] = format_label(rec.collection, rec.metadata)
+        self._records[doc_id] = rec
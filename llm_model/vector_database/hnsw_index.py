@@ -35,12 +35,12 @@ class HNSWIndex:
         self._index.set_ef(int(self.config.ef_search))
         self._initialized = True
 
-    def add(self, *, vectors: Sequence[Sequence[float]], ids: Sequence[int]) -> None:
+    def add(self, *, vectors: np.ndarray | Sequence[Sequence[float]], ids: Sequence[int]) -> None:
         if not self._initialized:
             raise RuntimeError("Index not initialized")
         if len(vectors) != len(ids):
             raise ValueError("vectors and ids length mismatch")
-        if not vectors:
+        if len(vectors) == 0:
             return
 
         arr = np.asarray(vectors, dtype=np.float32)
@@ -53,6 +53,42 @@ class HNSWIndex:
         labels, distances = self._index.knn_query(vec, k=int(k))
         return labels[0].tolist(), distances[0].tolist()
 
+    def knn_batch(
+        self,
+        *,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        k: int,
+        num_threads: int = -1,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Query many vectors at once.
+
+        Args:
+            vectors: (n, dim) float32 matrix (other inputs are converted once).
+            k: Neighbors per query vector.
+            num_threads: hnswlib query threads (-1 = all cores).
+
+        Returns:
+            (labels, distances), both of shape (n, k).
+        """
+        if not self._initialized:
+            raise RuntimeError("Index not initialized")
+        arr = np.ascontiguousarray(vectors, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[0] == 0:
+            return np.empty((0, int(k)), dtype=np.int64), np.empty((0, int(k)), dtype=np.float32)
+        labels, distances = self._index.knn_query(arr, k=int(k), num_threads=int(num_threads))
+        return labels.astype(np.int64, copy=False), distances
+
+    def get_vectors(self, ids: Sequence[int]) -> np.ndarray:
+        """Return stored vectors for labels (normalized by hnswlib in cosine space)."""
+        if not self._initialized:
+            raise RuntimeError("Index not initialized")
+        if len(ids) == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        items = self._index.get_items([int(i) for i in ids], return_type="numpy")
+        return np.asarray(items, dtype=np.float32)
+
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         self._index.save_index(str(path))
@@ -63,5 +99,26 @@ class HNSWIndex:
         self._index.load_index(str(path))
         self._index.set_ef(int(self.config.ef_search))
 
+    def set_ef_search(self, ef: int) -> None:
+        """Change the query-time beam width (higher = better recall, slower)."""
+        self._index.set_ef(int(ef))
+
     def get_current_count(self) -> int:
         return int(self._index.get_current_count())
+
+    def get_max_elements(self) -> int:
+        return int(self._index.get_max_elements())
+
+    def resize(self, *, max_elements: int) -> None:
+        """Grow capacity so that `max_elements` labels fit (never shrinks)."""
+        if int(max_elements) > self.get_max_elements():
+            self._index.resize_index(int(max_elements))
+
+    def mark_deleted(self, ids: Iterable[int]) -> None:
+        """Exclude labels from future queries (hnswlib keeps them in the graph)."""
+        for label in ids:
+            try:
+                self._index.mark_deleted(int(label))
+            except RuntimeError:
+                # Unknown or already-deleted label: nothing to exclude.
+                continue
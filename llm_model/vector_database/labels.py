@@ -0,0 +1,47 @@
+"""Human-readable labels for ATU and motif documents (shown by the frontend)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+def format_atu_label(meta: Dict[str, Any]) -> str:
+    num = (meta.get("atu_number") or "").strip()
+    title = (meta.get("title") or "").strip()
+    l1 = (meta.get("level_1_category") or "").strip()
+    l2 = (meta.get("level_2_category") or "").strip()
+    l3 = (meta.get("level_3_category") or "").strip()
+    rng = (meta.get("category_range") or "").strip()
+
+    parts = [p for p in [l1, l2, l3] if p]
+    path = " > ".join(parts)
+    if rng:
+        path = f"{path} ({rng})" if path else f"({rng})"
+
+    core = f"ATU {num}: {title}" if title else f"ATU {num}"
+    return f"{core} ({path})" if path else core
+
+
+def format_motif_label(meta: Dict[str, Any]) -> str:
+    code = (meta.get("code") or "").strip()
+    motif = (meta.get("motif") or "").strip()
+    chapter = (meta.get("chapter") or "").strip()
+    d1 = (meta.get("division1") or "").strip()
+    d2 = (meta.get("division2") or "").strip()
+    d3 = (meta.get("division3") or "").strip()
+
+    path_parts = [p for p in [chapter, d1, d2, d3] if p]
+    path = " > ".join(path_parts)
+
+    core = f"Motif {code}: {motif}" if motif else f"Motif {code}"
+    return f"{core} ({path})" if path else core
+
+
+def format_label(collection: str, meta: Dict[str, Any]) -> str:
+    """Label of a document of `collection` ("atu" or "motif")."""
+
+    if collection == "atu":
+        return format_atu_label(meta)
+    if collection == "motif":
+        return format_motif_label(meta)
+    raise ValueError(f"Unknown collection: {collection}")
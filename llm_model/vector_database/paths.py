@@ -22,6 +22,42 @@ class VectorDBPaths:
     def motif_index_path(self) -> Path:
         return self.root_dir / "motif_hnsw.bin"
 
+    @property
+    def atu_vectors_path(self) -> Path:
+        return self.root_dir / "atu_vectors.npy"
+
+    @property
+    def atu_vector_ids_path(self) -> Path:
+        return self.root_dir / "atu_vector_ids.npy"
+
+    @property
+    def motif_vectors_path(self) -> Path:
+        return self.root_dir / "motif_vectors.npy"
+
+    @property
+    def motif_vector_ids_path(self) -> Path:
+        return self.root_dir / "motif_vector_ids.npy"
+
+    @property
+    def atu_quantized_path(self) -> Path:
+        return self.root_dir / "atu_vectors_q.npy"
+
+    @property
+    def atu_quantized_scales_path(self) -> Path:
+        return self.root_dir / "atu_vectors_q_scales.npy"
+
+    @property
+    def motif_quantized_path(self) -> Path:
+        return self.root_dir / "motif_vectors_q.npy"
+
+    @property
+    def motif_quantized_scales_path(self) -> Path:
+        return self.root_dir / "motif_vectors_q_scales.npy"
+
+    @property
+    def motif_branches_path(self) -> Path:
+        return self.root_dir / "motif_branches.npz"
+
     @property
     def meta_path(self) -> Path:
         return self.root_dir / "meta.json"
@@ -0,0 +1,144 @@
+"""Whole-result cache for `FairyVectorDB.detect()` / `adetect()`.
+
+Annotators press "detect" on the same story many times while editing other
+fields; each press re-embedded every chunk and searched both collections.
+`DetectResultCache` keeps recent results keyed by a hash of
+
+- the story text, normalized as `chunk_text` does (so equal keys mean equal chunks)
+- embedding model, top_k, both similarity thresholds, chunking config
+- search settings (mode, exact_max_docs, rerank_factor, hierarchy_branches)
+- the store directory
+
+Entries expire after `ttl_s` and the least recently used are dropped beyond
+`max_entries`. `FairyVectorDB` clears its cache whenever it (re)loads or
+rebuilds the store.
+
+Configuration (environment, read by `get_default_detect_result_cache`):
+- `VECTOR_DB_RESULT_CACHE_ENTRIES`: results kept (default: 256, `0` disables).
+- `VECTOR_DB_RESULT_CACHE_TTL_S`: seconds a result stays valid (default: 600).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Tuple
+
+
+def _normalize_text(text: str) -> str:
+    # Same normalization as `chunk_text`.
+    return (text or "").strip().replace("\r\n", "\n")
+
+
+def detect_cache_key(text: str, config: Any, *, store: str) -> str:
+    """Return the cache key of a detection of `text` with a `QueryConfig`."""
+
+    payload = {
+        "store": store,
+        "text_sha256": hashlib.sha256(_normalize_text(text).encode("utf-8")).hexdigest(),
+        "embedding_model": config.embedding_model,
+        "top_k": int(config.top_k),
+        "atu_min_similarity": float(config.atu_min_similarity),
+        "motif_min_similarity": float(config.motif_min_similarity),
+        "chunking": asdict(config.chunking),
+        "search_mode": str(config.search_mode),
+        "exact_max_docs": int(config.exact_max_docs),
+        "rerank_factor": int(config.rerank_factor),
+        "hierarchy_branches": int(config.hierarchy_branches),
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DetectResultCache:
+    """LRU of detection results with a time-to-live.
+
+    Safe to share between threads; all state is guarded by a single lock.
+    Cached results are shared objects: callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_s: float = 600.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of results kept (least recently used are dropped).
+            ttl_s: Seconds after which a result is recomputed.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `key`, or None if missing or expired."""
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl_s:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached results."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_DEFAULT_CACHE: Optional[DetectResultCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_detect_result_cache() -> Optional[DetectResultCache]:
+    """Return the process-wide result cache, or None when disabled via env."""
+
+    global _DEFAULT_CACHE
+
+    try:
+        max_entries = int(os.getenv("VECTOR_DB_RESULT_CACHE_ENTRIES") or 256)
+    except ValueError:
+        max_entries = 256
+    if max_entries <= 0:
+        return None
+    try:
+        ttl_s = float(os.getenv("VECTOR_DB_RESULT_CACHE_TTL_S") or 600.0)
+    except ValueError:
+        ttl_s = 600.0
+
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = DetectResultCache(max_entries=max_entries, ttl_s=ttl_s)
+        return _DEFAULT_CACHE
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
 from dataclasses import dataclass
@@ -15,6 +16,16 @@ class DocRecord:
     metadata: Dict[str, Any]
 
 
+def content_hash(record: DocRecord) -> str:
+    """Stable hash of a document's text + metadata (used for incremental builds)."""
+
+    h = hashlib.sha256()
+    h.update(record.text.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(json.dumps(record.metadata, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
 def connect(db_path: Path) -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     # FastAPI may serve requests in a threadpool; the vector DB object is shared.
@@ -35,6 +46,8 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
           doc_key TEXT NOT NULL,
           text TEXT NOT NULL,
           metadata_json TEXT NOT NULL,
+          content_hash TEXT,
+          deleted INTEGER NOT NULL DEFAULT 0,
           UNIQUE(collection, doc_key)
         );
         """
@@ -46,6 +59,13 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
         """
     )
 
+    # Stores built before incremental rebuilds existed lack these columns.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+    if "content_hash" not in columns:
+        conn.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+    if "deleted" not in columns:
+        conn.execute("ALTER TABLE documents ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0")
+
 
 def upsert_documents(
     conn: sqlite3.Connection, records: Iterable[DocRecord]
@@ -56,21 +76,58 @@ def upsert_documents(
             r.doc_key,
             r.text,
             json.dumps(r.metadata, ensure_ascii=False),
+            content_hash(r),
         )
         for r in records
     ]
     conn.executemany(
         """
-        INSERT INTO documents(collection, doc_key, text, metadata_json)
-        VALUES(?, ?, ?, ?)
+        INSERT INTO documents(collection, doc_key, text, metadata_json, content_hash, deleted)
+        VALUES(?, ?, ?, ?, ?, 0)
         ON CONFLICT(collection, doc_key) DO UPDATE SET
           text=excluded.text,
-          metadata_json=excluded.metadata_json;
+          metadata_json=excluded.metadata_json,
+          content_hash=excluded.content_hash,
+          deleted=0;
         """,
         rows,
     )
 
 
+def mark_deleted(conn: sqlite3.Connection, ids: Iterable[int]) -> None:
+    conn.executemany(
+        "UPDATE documents SET deleted=1 WHERE id=?",
+        [(int(i),) for i in ids],
+    )
+
+
+def fetch_collection_state(
+    conn: sqlite3.Connection, collection: str
+) -> Dict[str, Tuple[int, str, bool]]:
+    """Return {doc_key: (id, content_hash, deleted)} for one collection.
+
+    Rows written before the `content_hash` column existed are hashed on the fly.
+    """
+
+    cur = conn.execute(
+        "SELECT id, doc_key, text, metadata_json, content_hash, deleted FROM documents WHERE collection=?",
+        (collection,),
+    )
+    out: Dict[str, Tuple[int, str, bool]] = {}
+    for doc_id, doc_key, text, metadata_json, stored_hash, deleted in cur:
+        if not stored_hash:
+            stored_hash = content_hash(
+                DocRecord(
+                    collection=collection,
+                    doc_key=str(doc_key),
+                    text=str(text),
+                    metadata=json.loads(metadata_json),
+                )
+            )
+        out[str(doc_key)] = (int(doc_id), str(stored_hash), bool(deleted))
+    return out
+
+
 def fetch_by_ids(
     conn: sqlite3.Connection, ids: Iterable[int]
 ) -> Dict[int, DocRecord]:
@@ -97,10 +154,12 @@ def fetch_by_ids(
 
 
 def iter_collection(
-    conn: sqlite3.Connection, collection: str
+    conn: sqlite3.Connection, collection: str, *, include_deleted: bool = False
 ) -> Iterable[Tuple[int, DocRecord]]:
+    deleted_clause = "" if include_deleted else " AND deleted=0"
     cur = conn.execute(
-        "SELECT id, collection, doc_key, text, metadata_json FROM documents WHERE collection=? ORDER BY id",
+        "SELECT id, collection, doc_key, text, metadata_json FROM documents "
+        f"WHERE collection=?{deleted_clause} ORDER BY id",
         (collection,),
     )
     for row in cur:
@@ -113,8 +172,13 @@ def iter_collection(
         )
 
 
-def count_collection(conn: sqlite3.Connection, collection: str) -> int:
-    cur = conn.execute("SELECT COUNT(1) FROM documents WHERE collection=?", (collection,))
+def count_collection(
+    conn: sqlite3.Connection, collection: str, *, include_deleted: bool = True
+) -> int:
+    deleted_clause = "" if include_deleted else " AND deleted=0"
+    cur = conn.execute(
+        f"SELECT COUNT(1) FROM documents WHERE collection=?{deleted_clause}", (collection,)
+    )
     value = cur.fetchone()
     return int(value[0]) if value else 0
 
@@ -0,0 +1,182 @@
+"""Tests for the in-memory document cache and the result labels."""
+
+import csv
+import threading
+
+import pytest
+
+from .. import db as db_module
+from ..csv_sources import SourcePaths
+from ..db import BuildConfig, FairyVectorDB
+from ..doc_cache import DocCache
+from ..labels import format_atu_label, format_label, format_motif_label
+from ..paths import VectorDBPaths
+from ..sqlite_store import connect
+
+
+class CountingConnection:
+    """SQLite connection that counts the statements it runs."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = 0
+
+    def execute(self, *args):
+        self.statements += 1
+        return self.conn.execute(*args)
+
+
+def write_csv(path, rows):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        db_module, "ollama_embed", lambda *, inputs, **kwargs: [[1.0, float(len(text)), 0.5] for text in inputs]
+    )
+    sources = SourcePaths(atu_csv=tmp_path / "atu.csv", motif_csv=tmp_path / "motif.csv")
+    write_csv(
+        sources.atu_csv,
+        [
+            {
+                "atu_number": "300",
+                "title": "The Dragon-Slayer",
+                "level_1_category": "Tales of Magic",
+                "level_2_category": "Supernatural Adversaries",
+                "level_3_category": "",
+                "category_range": "300-399",
+            },
+            {"atu_number": "510", "title": "Cinderella", "level_1_category": "", "level_2_category": "", "level_3_category": "", "category_range": ""},
+        ],
+    )
+    write_csv(
+        sources.motif_csv,
+        [
+            {"code": "B11", "MOTIF": "Dragon", "chapter": "B", "division1": "B0-B99. Mythical animals"},
+            {"code": "F361", "MOTIF": "Fairy's revenge", "chapter": "F", "division1": ""},
+        ],
+    )
+    paths = VectorDBPaths(root_dir=tmp_path / "store")
+    FairyVectorDB(paths=paths).build_from_csvs(sources=sources, config=BuildConfig(use_embedding_cache=False))
+    conn = connect(paths.sqlite_path)
+    yield CountingConnection(conn)
+    conn.close()
+
+
+def doc_ids(conn):
+    rows = conn.conn.execute("SELECT doc_key, id FROM documents").fetchall()
+    return {key: int(doc_id) for key, doc_id in rows}
+
+
+class TestDocCache:
+    """Tests for DocCache."""
+
+    def test_preload_serves_lookups_from_memory(self, conn):
+        ids = doc_ids(conn)
+        cache = DocCache(conn, lock=threading.Lock())
+
+        assert cache.preload() == 4
+        assert len(cache) == 4
+        conn.statements = 0
+        docs = cache.get_many(ids.values())
+
+        assert conn.statements == 0
+        assert {rec.doc_key for rec, _ in docs.values()} == set(ids)
+        rec, label = docs[ids["atu:300"]]
+        assert rec.metadata["title"] == "The Dragon-Slayer"
+        assert label == "ATU 300: The Dragon-Slayer (Tales of Magic > Supernatural Adversaries (300-399))"
+        assert docs[ids["motif:B11"]][1] == "Motif B11: Dragon (B > B0-B99. Mythical animals)"
+
+    def test_preload_selected_collections(self, conn):
+        cache = DocCache(conn, lock=threading.Lock())
+
+        assert cache.preload(("atu",)) == 2
+        assert len(cache) == 2
+
+    def test_lazy_fill_fetches_each_id_once(self, conn):
+        ids = doc_ids(conn)
+        cache = DocCache(conn, lock=threading.Lock())
+        wanted = [ids["atu:510"], ids["motif:F361"]]
+
+        first = cache.get_many(wanted)
+        assert conn.statements == 1
+        assert len(cache) == 2
+        second = cache.get_many(wanted)
+
+        assert conn.statements == 1
+        assert second == first
+        assert first[ids["atu:510"]][1] == "ATU 510: Cinderella"
+        assert first[ids["motif:F361"]][1] == "Motif F361: Fairy's revenge (F)"
+
+    def test_unknown_ids_are_omitted(self, conn):
+        ids = doc_ids(conn)
+        cache = DocCache(conn, lock=threading.Lock())
+        cache.preload()
+
+        docs = cache.get_many([ids["atu:300"], 999, -1])
+
+        assert list(docs) == [ids["atu:300"]]
+
+    def test_clear(self, conn):
+        ids = doc_ids(conn)
+        cache = DocCache(conn, lock=threading.Lock())
+        cache.preload()
+
+        cache.clear()
+        assert len(cache) == 0
+        conn.statements = 0
+        assert ids["atu:300"] in cache.get_many([ids["atu:300"]])
+        assert conn.statements == 1
+
+
+class TestLabels:
+    """The labels keep the format of the former backend/main.py formatters."""
+
+    @pytest.mark.parametrize(
+        "meta, expected",
+        [
+            (
+                {
+                    "atu_number": "300",
+                    "title": "The Dragon-Slayer",
+                    "level_1_category": "Tales of Magic",
+                    "level_2_category": "Supernatural Adversaries",
+                    "level_3_category": "",
+                    "category_range": "300-399",
+                },
+                "ATU 300: The Dragon-Slayer (Tales of Magic > Supernatural Adversaries (300-399))",
+            ),
+            (
+                {"atu_number": " 510A ", "title": " Cinderella ", "level_1_category": "Tales of Magic"},
+                "ATU 510A: Cinderella (Tales of Magic)",
+            ),
+            ({"atu_number": "1", "category_range": "1-69"}, "ATU 1 ((1-69))"),
+            ({"atu_number": "2", "title": None}, "ATU 2"),
+        ],
+    )
+    def test_atu_label(self, meta, expected):
+        assert format_atu_label(meta) == expected
+        assert format_label("atu", meta) == expected
+
+    @pytest.mark.parametrize(
+        "meta, expected",
+        [
+            (
+                {"code": "B11", "motif": "Dragon", "chapter": "B", "division1": "B0-B99", "division2": "", "division3": "B11.2"},
+                "Motif B11: Dragon (B > B0-B99 > B11.2)",
+            ),
+            ({"code": "F361", "motif": "Fairy's revenge"}, "Motif F361: Fairy's revenge"),
+            ({"code": "D0", "chapter": "D"}, "Motif D0 (D)"),
+        ],
+    )
+    def test_motif_label(self, meta, expected):
+        assert format_motif_label(meta) == expected
+        assert format_label("motif", meta) == expected
+
+    def test_unknown_collection(self):
+        with pytest.raises(ValueError):
+            format_label("tale", {})
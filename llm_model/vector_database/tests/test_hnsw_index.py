@@ -0,0 +1,64 @@
+"""Tests for batched HNSW queries and the per-document collapse."""
+
+import numpy as np
+
+from ..db import _max_similarity_per_doc
+from ..hnsw_index import HNSWConfig, HNSWIndex
+
+
+def make_index(n=200, dim=12, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    index = HNSWIndex(dim=dim, config=HNSWConfig(ef_construction=100, m=16, ef_search=100))
+    index.init(max_elements=n)
+    index.add(vectors=vectors, ids=list(range(100, 100 + n)))
+    return index, rng
+
+
+def test_knn_batch_matches_single_queries():
+    index, rng = make_index()
+    queries = rng.normal(size=(7, 12)).astype(np.float32)
+
+    labels, distances = index.knn_batch(vectors=queries, k=5, num_threads=2)
+
+    assert labels.shape == distances.shape == (7, 5)
+    for row, query in enumerate(queries):
+        single_labels, single_distances = index.knn(vector=query, k=5)
+        assert labels[row].tolist() == single_labels
+        np.testing.assert_allclose(distances[row], single_distances, rtol=1e-6)
+
+
+def test_knn_batch_of_nothing():
+    index, _ = make_index(n=10)
+    labels, distances = index.knn_batch(vectors=np.empty((0, 12), dtype=np.float32), k=3)
+    assert labels.shape == distances.shape == (0, 3)
+
+
+def test_max_similarity_per_doc_matches_per_vector_loop():
+    index, rng = make_index()
+    queries = rng.normal(size=(9, 12)).astype(np.float32)
+    min_similarity = 0.2
+
+    # Reference: the per-chunk loop the batched path replaced.
+    expected = {}
+    for query in queries:
+        for label, distance in zip(*index.knn(vector=query, k=10)):
+            sim = 1.0 - distance
+            if sim >= min_similarity:
+                expected[label] = max(sim, expected.get(label, -np.inf))
+
+    doc_ids, sims = _max_similarity_per_doc(*index.knn_batch(vectors=queries, k=10), min_similarity)
+
+    assert doc_ids.tolist() == sorted(expected)
+    np.testing.assert_allclose(sims, [expected[d] for d in sorted(expected)], rtol=1e-6)
+
+
+def test_max_similarity_per_doc_filters_threshold():
+    labels = np.array([[3, 1], [1, 2]])
+    distances = np.array([[0.1, 0.5], [0.2, 0.9]], dtype=np.float32)
+
+    doc_ids, sims = _max_similarity_per_doc(labels, distances, 0.4)
+
+    assert doc_ids.tolist() == [1, 3]
+    np.testing.assert_allclose(sims, [0.8, 0.9], rtol=1e-6)
+    assert _max_similarity_per_doc(labels, distances, 0.95)[0].size == 0
@@ -0,0 +1,141 @@
+"""Tests for incremental vector DB rebuilds (stub embeddings, no Ollama)."""
+
+import csv
+import hashlib
+
+import numpy as np
+import pytest
+
+from .. import db as db_module
+from ..csv_sources import SourcePaths
+from ..db import BuildConfig, FairyVectorDB
+from ..hnsw_index import HNSWConfig
+from ..paths import VectorDBPaths
+from ..sqlite_store import connect, fetch_collection_state
+
+DIM = 16
+
+ATU_FIELDS = ["atu_number", "title", "description", "level_1_category", "level_2_category",
+              "level_3_category", "category_range", "detail_url"]
+MOTIF_FIELDS = ["code", "MOTIF", "chapter", "division1", "division2", "division3"]
+
+
+def stub_vector(text):
+    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+    return np.random.default_rng(seed).normal(size=DIM).tolist()
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    """Record every text sent to the embedding model."""
+    calls = []
+
+    def fake_embed(*, inputs, **kwargs):
+        calls.extend(inputs)
+        return [stub_vector(text) for text in inputs]
+
+    monkeypatch.setattr(db_module, "ollama_embed", fake_embed)
+    return calls
+
+
+def write_csv(path, fields, rows):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({name: row.get(name, "") for name in fields})
+
+
+def motif(code, text):
+    return {"code": code, "MOTIF": text, "chapter": code[0]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    sources = SourcePaths(atu_csv=tmp_path / "atu.csv", motif_csv=tmp_path / "motif.csv")
+    write_csv(sources.atu_csv, ATU_FIELDS, [{"atu_number": str(n), "title": f"Tale {n}"} for n in (300, 510)])
+    write_csv(sources.motif_csv, MOTIF_FIELDS, [motif(f"A{i}", f"motif {i}") for i in range(6)])
+    return sources, VectorDBPaths(root_dir=tmp_path / "store")
+
+
+def build(paths, sources, *, incremental):
+    config = BuildConfig(
+        use_embedding_cache=False,
+        incremental=incremental,
+        hnsw=HNSWConfig(ef_construction=50, m=8, ef_search=50),
+    )
+    FairyVectorDB(paths=paths).build_from_csvs(sources=sources, config=config)
+
+
+def motif_ids(paths):
+    conn = connect(paths.sqlite_path)
+    try:
+        return {key: (doc_id, deleted) for key, (doc_id, _, deleted) in fetch_collection_state(conn, "motif").items()}
+    finally:
+        conn.close()
+
+
+def loaded(paths):
+    db = FairyVectorDB(paths=paths)
+    db.load()
+    return db
+
+
+def test_incremental_build_embeds_only_changed_rows(store, embedded):
+    sources, paths = store
+    build(paths, sources, incremental=False)
+    before = motif_ids(paths)
+    deleted_text = next(text for text in embedded if "motif 5" in text)
+
+    # A1 changes, A5 disappears, A9 is new.
+    rows = [motif(f"A{i}", f"motif {i}") for i in range(5)]
+    rows[1] = motif("A1", "motif 1, retold")
+    rows.append(motif("A9", "motif 9"))
+    write_csv(sources.motif_csv, MOTIF_FIELDS, rows)
+
+    embedded.clear()
+    build(paths, sources, incremental=True)
+
+    assert len(embedded) == 2
+    assert any("motif 1, retold" in text for text in embedded)
+    assert any("motif 9" in text for text in embedded)
+
+    after = motif_ids(paths)
+    assert after["motif:A1"][0] == before["motif:A1"][0]  # re-embedded under the same id
+    assert after["motif:A5"] == (before["motif:A5"][0], True)
+
+    db = loaded(paths)
+    idx = db._get_index("motif")
+    changed_text = next(text for text in embedded if "motif 1, retold" in text)
+    labels, _ = idx.knn_batch(vectors=[stub_vector(changed_text)], k=1)
+    assert labels[0, 0] == before["motif:A1"][0]
+
+    # The deleted row is never returned, even when querying with its own vector.
+    labels, _ = idx.knn_batch(vectors=[stub_vector(deleted_text)], k=6)
+    assert before["motif:A5"][0] not in labels[0].tolist()
+
+    # Stored vectors follow the live ids, with the changed row updated.
+    vectors = db.get_collection_vectors("motif")
+    assert before["motif:A5"][0] not in vectors.ids.tolist()
+    expected = np.asarray(stub_vector(changed_text))
+    np.testing.assert_allclose(
+        db.get_vectors("motif", [before["motif:A1"][0]])[0],
+        expected / np.linalg.norm(expected),
+        rtol=1e-5,
+    )
+
+
+def test_incremental_build_without_changes_is_a_noop(store, embedded):
+    sources, paths = store
+    build(paths, sources, incremental=False)
+    before = motif_ids(paths)
+    index_bytes = paths.motif_index_path.read_bytes()
+    vectors_mtime = paths.motif_vectors_path.stat().st_mtime_ns
+
+    embedded.clear()
+    build(paths, sources, incremental=True)
+
+    assert embedded == []
+    assert motif_ids(paths) == before
+    assert paths.motif_index_path.read_bytes() == index_bytes
+    assert paths.motif_vectors_path.stat().st_mtime_ns == vectors_mtime
@@ -0,0 +1,184 @@
+"""Tests for the detect() result cache."""
+
+import csv
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from .. import db as db_module
+from .. import result_cache
+from ..csv_sources import SourcePaths
+from ..db import BuildConfig, FairyVectorDB, QueryConfig
+from ..paths import VectorDBPaths
+from ..result_cache import DetectResultCache, detect_cache_key
+from ..text_chunking import ChunkingConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+class TestDetectResultCache:
+    """Tests for DetectResultCache."""
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = DetectResultCache(max_entries=4, ttl_s=60.0)
+        cache.put("story", {"atu": []})
+
+        clock.now += 59.0
+        assert cache.get("story") == {"atu": []}
+        clock.now += 2.0
+        assert cache.get("story") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_is_evicted(self, clock):
+        cache = DetectResultCache(max_entries=2, ttl_s=60.0)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        assert cache.get("a") == {"n": 1}  # "b" is now the least recently used
+
+        cache.put("c", {"n": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"n": 1}
+        assert cache.get("c") == {"n": 3}
+        assert cache.stats() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "entries": 2}
+
+    def test_clear(self, clock):
+        cache = DetectResultCache()
+        cache.put("a", {"n": 1})
+        cache.clear()
+        assert cache.get("a") is None
+
+
+class TestDetectCacheKey:
+    """Tests for detect_cache_key."""
+
+    def test_same_request_same_key(self):
+        key = detect_cache_key("Once upon a time.\r\nThe end.", QueryConfig(), store="/db")
+
+        assert key == detect_cache_key("  Once upon a time.\nThe end.\n", QueryConfig(), store="/db")
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"top_k": 5},
+            {"atu_min_similarity": 0.5},
+            {"motif_min_similarity": 0.5},
+            {"chunking": ChunkingConfig(max_chars=600)},
+            {"chunking": ChunkingConfig(overlap=0)},
+            {"embedding_model": "nomic-embed-text"},
+            {"search_mode": "exact"},
+        ],
+    )
+    def test_key_changes_with_query_settings(self, changes):
+        config = QueryConfig()
+
+        assert detect_cache_key("story", config, store="/db") != detect_cache_key(
+            "story", replace(config, **changes), store="/db"
+        )
+
+    def test_key_changes_with_text_and_store(self):
+        key = detect_cache_key("story", QueryConfig(), store="/db")
+
+        assert key != detect_cache_key("another story", QueryConfig(), store="/db")
+        assert key != detect_cache_key("story", QueryConfig(), store="/other-db")
+
+
+def write_csv(path, rows):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    calls = []
+
+    def fake_embed(*, inputs, **kwargs):
+        calls.extend(inputs)
+        return [[1.0, float(len(text) % 7), float(sum(map(ord, text)) % 11)] for text in inputs]
+
+    monkeypatch.setattr(db_module, "ollama_embed", fake_embed)
+    return calls
+
+
+@pytest.fixture
+def built(tmp_path, embedded):
+    sources = SourcePaths(atu_csv=tmp_path / "atu.csv", motif_csv=tmp_path / "motif.csv")
+    write_csv(sources.atu_csv, [{"atu_number": "300", "title": "The Dragon-Slayer"}, {"atu_number": "510", "title": "Cinderella"}])
+    write_csv(sources.motif_csv, [{"code": "B11", "MOTIF": "Dragon", "chapter": "B"}, {"code": "F361", "MOTIF": "Fairy's revenge", "chapter": "F"}])
+    paths = VectorDBPaths(root_dir=tmp_path / "store")
+    config = BuildConfig(use_embedding_cache=False)
+    FairyVectorDB(paths=paths).build_from_csvs(sources=sources, config=config)
+    return sources, paths, config
+
+
+def test_detect_results_are_cached_until_reload_or_rebuild(built, embedded):
+    sources, paths, build_config = built
+    db = FairyVectorDB(paths=paths, result_cache=DetectResultCache())
+    db.load()
+    query = QueryConfig(use_embedding_cache=False, atu_min_similarity=-1.0, motif_min_similarity=-1.0)
+
+    embedded.clear()
+    first = db.detect(text="A hero slays a dragon.", config=query)
+    second = db.detect(text="A hero slays a dragon.", config=query)
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["atu"] == first["atu"] and second["motifs"] == first["motifs"]
+    assert len(embedded) == 1
+
+    # Another top_k is another request.
+    assert db.detect(text="A hero slays a dragon.", config=replace(query, top_k=1))["cached"] is False
+
+    db.load()
+    assert db.result_cache.stats()["entries"] == 0
+    assert db.detect(text="A hero slays a dragon.", config=query)["cached"] is False
+
+    db.build_from_csvs(sources=sources, config=build_config)
+    assert db.result_cache.stats()["entries"] == 0
+
+
+def test_adetect_searches_off_the_event_loop(built, monkeypatch):
+    import asyncio
+    import threading
+
+    _, paths, _ = built
+
+    async def fake_aembed(*, inputs, **kwargs):
+        return db_module.ollama_embed(inputs=inputs)
+
+    monkeypatch.setattr(db_module, "ollama_aembed", fake_aembed)
+    db = FairyVectorDB(paths=paths, result_cache=DetectResultCache())
+    db.load()
+    search_threads = []
+    detect_from_vectors = db._detect_from_vectors
+
+    def recording(**kwargs):
+        search_threads.append(threading.current_thread())
+        return detect_from_vectors(**kwargs)
+
+    monkeypatch.setattr(db, "_detect_from_vectors", recording)
+    query = QueryConfig(use_embedding_cache=False, atu_min_similarity=-1.0, motif_min_similarity=-1.0)
+
+    async def run():
+        return await db.adetect(text="A hero slays a dragon.", config=query), threading.current_thread()
+
+    first, loop_thread = asyncio.run(run())
+    second, _ = asyncio.run(run())
+
+    assert search_threads and search_threads[0] is not loop_thread
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert first["atu"] == db.detect(text="A hero slays a dragon.", config=query)["atu"]
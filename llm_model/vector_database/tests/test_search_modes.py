@@ -0,0 +1,100 @@
+"""Tests for resolving `QueryConfig.search_mode` and the results of each mode."""
+
+import csv
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from .. import db as db_module
+from ..csv_sources import SourcePaths
+from ..db import BuildConfig, FairyVectorDB, QueryConfig, VectorDBNotBuiltError
+from ..paths import VectorDBPaths
+
+DIM = 8
+
+
+def write_csv(path, rows):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def stub_embed(*, inputs, **kwargs):
+    out = []
+    for text in inputs:
+        seed = sum(ord(c) * (i + 1) for i, c in enumerate(text))
+        out.append(np.random.default_rng(seed).normal(size=DIM).tolist())
+    return out
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_module, "ollama_embed", stub_embed)
+    sources = SourcePaths(atu_csv=tmp_path / "atu.csv", motif_csv=tmp_path / "motif.csv")
+    write_csv(sources.atu_csv, [{"atu_number": str(n), "title": f"Tale {n}"} for n in range(300, 330)])
+    write_csv(
+        sources.motif_csv,
+        [{"code": f"{c}{i}", "MOTIF": f"motif {c}{i}", "chapter": c} for c in "ABF" for i in range(20)],
+    )
+    paths = VectorDBPaths(root_dir=tmp_path / "store")
+    FairyVectorDB(paths=paths).build_from_csvs(sources=sources, config=BuildConfig(use_embedding_cache=False))
+    return paths
+
+
+def loaded(paths, **kwargs):
+    db = FairyVectorDB(paths=paths)
+    db.load(**kwargs)
+    return db
+
+
+def test_auto_uses_exact_search_for_small_collections(paths):
+    db = loaded(paths)
+
+    assert db.search_method("atu", QueryConfig()) == "exact"
+    assert db.search_method("motif", QueryConfig()) == "exact"
+    assert db.search_method("motif", QueryConfig(exact_max_docs=59)) == "hnsw"
+    assert db.search_method("atu", QueryConfig(exact_max_docs=59)) == "exact"
+
+
+def test_explicit_modes(paths):
+    db = loaded(paths)
+
+    assert db.search_method("motif", QueryConfig(search_mode="hnsw")) == "hnsw"
+    assert db.search_method("motif", QueryConfig(search_mode="EXACT", exact_max_docs=0)) == "exact"
+    with pytest.raises(ValueError):
+        db.search_method("motif", QueryConfig(search_mode="fastest"))
+
+
+def test_auto_falls_back_to_exact_without_hnsw(paths):
+    db = loaded(paths, skip_hnsw=("motif",))
+
+    assert db.search_method("motif", QueryConfig(exact_max_docs=0)) == "exact"
+
+
+def test_exact_mode_needs_stored_vectors(paths):
+    paths.motif_vectors_path.unlink()
+    db = loaded(paths)
+
+    with pytest.raises(VectorDBNotBuiltError):
+        db.search_method("motif", QueryConfig(search_mode="exact"))
+    assert db.search_method("motif", QueryConfig()) == "hnsw"
+
+
+def test_exact_and_hnsw_agree(paths):
+    db = loaded(paths)
+    chunks = ["chunk one", "chunk two"]
+    config = QueryConfig(top_k=5, atu_min_similarity=-1.0, motif_min_similarity=-1.0)
+
+    vectors = stub_embed(inputs=chunks)
+    exact = db._detect_from_vectors(chunks=chunks, chunk_vectors=vectors, config=replace(config, search_mode="exact"))
+    hnsw = db._detect_from_vectors(chunks=chunks, chunk_vectors=vectors, config=replace(config, search_mode="hnsw"))
+
+    assert exact["search"] == {"atu": "exact", "motif": "exact"}
+    assert hnsw["search"] == {"atu": "hnsw", "motif": "hnsw"}
+    for collection in ("atu", "motifs"):
+        assert [m["doc_key"] for m in exact[collection]] == [m["doc_key"] for m in hnsw[collection]]
+        np.testing.assert_allclose(
+            [m["similarity"] for m in exact[collection]], [m["similarity"] for m in hnsw[collection]], atol=1e-5
+        )
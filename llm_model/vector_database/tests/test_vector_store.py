@@ -0,0 +1,368 @@
+"""Tests for the stored document vectors (`vector_store.py`)."""
+
+import numpy as np
+import pytest
+
+from ..db import _max_similarity_per_doc
+from ..vector_store import (
+    CollectionVectors,
+    VectorStoreWriter,
+    load_branch_index,
+    load_collection_vectors,
+    load_quantized_vectors,
+    quantize_rows,
+    write_branch_index,
+    write_quantized_vectors,
+)
+
+
+def store_paths(tmp_path):
+    return tmp_path / "motif_vectors.npy", tmp_path / "motif_vector_ids.npy"
+
+
+def write_store(tmp_path, ids, vectors, **kwargs):
+    vectors_path, ids_path = store_paths(tmp_path)
+    writer = VectorStoreWriter(vectors_path=vectors_path, ids_path=ids_path, ids=ids, dim=vectors.shape[1], **kwargs)
+    writer.put(ids, vectors)
+    writer.close()
+    return load_collection_vectors(vectors_path, ids_path)
+
+
+def unit_rows(arr):
+    return arr / np.linalg.norm(arr, axis=1, keepdims=True)
+
+
+class TestVectorStoreWriter:
+    """Tests for VectorStoreWriter and load_collection_vectors."""
+
+    def test_round_trip_in_any_put_order(self, tmp_path):
+        vectors_path, ids_path = store_paths(tmp_path)
+        rng = np.random.default_rng(0)
+        ids = [7, 3, 12, 5]
+        vectors = rng.normal(size=(4, 6)).astype(np.float32)
+
+        writer = VectorStoreWriter(vectors_path=vectors_path, ids_path=ids_path, ids=ids, dim=6)
+        writer.put(ids[2:], vectors[2:])
+        writer.put(ids[:2], vectors[:2])
+        writer.close()
+        store = load_collection_vectors(vectors_path, ids_path)
+
+        assert store.ids.tolist() == [3, 5, 7, 12]
+        assert isinstance(store.vectors, np.memmap)
+        np.testing.assert_allclose(store.take(ids), unit_rows(vectors), rtol=1e-6)
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_unnormalized_float16(self, tmp_path):
+        vectors = np.array([[3.0, 4.0], [1.0, -2.0]], dtype=np.float32)
+        store = write_store(tmp_path, [1, 2], vectors, dtype="float16", normalize=False)
+
+        assert store.vectors.dtype == np.float16
+        np.testing.assert_allclose(store.take([2, 1]), vectors[::-1])
+
+    def test_previous_store_is_replaced_only_on_close(self, tmp_path):
+        old = write_store(tmp_path, [1, 2], np.eye(2, dtype=np.float32))
+        vectors_path, ids_path = store_paths(tmp_path)
+
+        writer = VectorStoreWriter(vectors_path=vectors_path, ids_path=ids_path, ids=[1, 2, 3], dim=2)
+        writer.put([1, 2, 3], np.ones((3, 2), dtype=np.float32))
+        assert load_collection_vectors(vectors_path, ids_path).ids.tolist() == old.ids.tolist()
+
+        writer.close()
+        assert load_collection_vectors(vectors_path, ids_path).ids.tolist() == [1, 2, 3]
+
+    def test_unfilled_rows_abort_and_keep_previous_store(self, tmp_path):
+        write_store(tmp_path, [1, 2], np.eye(2, dtype=np.float32))
+        vectors_path, ids_path = store_paths(tmp_path)
+
+        writer = VectorStoreWriter(vectors_path=vectors_path, ids_path=ids_path, ids=[1, 2, 3], dim=2)
+        writer.put([1, 3], np.ones((2, 2), dtype=np.float32))
+        assert writer.missing_ids().tolist() == [2]
+        with pytest.raises(ValueError, match="never written"):
+            writer.close()
+
+        assert load_collection_vectors(vectors_path, ids_path).ids.tolist() == [1, 2]
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_put_validates_ids_and_shape(self, tmp_path):
+        vectors_path, ids_path = store_paths(tmp_path)
+        writer = VectorStoreWriter(vectors_path=vectors_path, ids_path=ids_path, ids=[1, 2], dim=2)
+
+        with pytest.raises(KeyError):
+            writer.put([5], np.ones((1, 2), dtype=np.float32))
+        with pytest.raises(ValueError):
+            writer.put([1], np.ones((1, 3), dtype=np.float32))
+        writer.abort()
+
+    def test_missing_files(self, tmp_path):
+        assert load_collection_vectors(*store_paths(tmp_path)) is None
+
+
+class TestCollectionVectors:
+    """Tests for CollectionVectors lookups."""
+
+    def test_rows_for_and_take(self):
+        store = CollectionVectors(
+            ids=np.array([2, 4, 9], dtype=np.int64),
+            vectors=np.arange(6, dtype=np.float32).reshape(3, 2),
+            normalized=False,
+        )
+
+        assert store.rows_for([9, 2, 3, 10, 0]).tolist() == [2, 0, -1, -1, -1]
+        np.testing.assert_array_equal(store.take([4, 2]), [[2.0, 3.0], [0.0, 1.0]])
+        with pytest.raises(KeyError):
+            store.take([4, 5])
+
+    def test_empty_collection(self):
+        store = CollectionVectors(
+            ids=np.empty(0, dtype=np.int64), vectors=np.empty((0, 2), dtype=np.float32), normalized=True
+        )
+
+        assert store.rows_for([1]).tolist() == [-1]
+        ids, distances = store.search(queries=[[1.0, 0.0]], k=3)
+        assert ids.shape == distances.shape == (1, 0)
+
+
+def brute_force(vectors, ids, queries, k):
+    sims = unit_rows(queries) @ unit_rows(vectors).T
+    order = np.argsort(-sims, axis=1, kind="stable")[:, :k]
+    return ids[order], 1.0 - np.take_along_axis(sims, order, axis=1)
+
+
+@pytest.fixture
+def random_store(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(103, 16)).astype(np.float32)
+    ids = np.arange(10, 113, dtype=np.int64)
+    store = write_store(tmp_path, ids, vectors)
+    queries = rng.normal(size=(5, 16)).astype(np.float32)
+    return store, vectors, ids, queries
+
+
+class TestExactSearch:
+    """Tests for CollectionVectors.search."""
+
+    @pytest.mark.parametrize("block_rows", [7, 50, 103, 65536])
+    def test_matches_brute_force(self, random_store, block_rows):
+        store, vectors, ids, queries = random_store
+        expected_ids, expected_distances = brute_force(vectors, ids, queries, 10)
+
+        got_ids, got_distances = store.search(queries=queries, k=10, block_rows=block_rows)
+
+        np.testing.assert_array_equal(got_ids, expected_ids)
+        np.testing.assert_allclose(got_distances, expected_distances, atol=1e-5)
+
+    def test_k_larger_than_collection(self, random_store):
+        store, _, ids, queries = random_store
+
+        got_ids, got_distances = store.search(queries=queries[0], k=500, block_rows=30)
+
+        assert got_ids.shape == got_distances.shape == (1, 103)
+        assert sorted(got_ids[0].tolist()) == ids.tolist()
+        assert np.all(np.diff(got_distances[0]) >= 0)
+
+    def test_needs_normalized_vectors(self, tmp_path):
+        store = write_store(tmp_path, [1], np.ones((1, 2), dtype=np.float32), normalize=False)
+        with pytest.raises(ValueError):
+            CollectionVectors(ids=store.ids, vectors=store.vectors, normalized=False).search(queries=[[1.0, 0.0]], k=1)
+
+
+def quantized_store(tmp_path, store, quantization, **kwargs):
+    codes_path, scales_path = tmp_path / "motif_codes.npy", tmp_path / "motif_scales.npy"
+    write_quantized_vectors(
+        store, codes_path=codes_path, scales_path=scales_path, quantization=quantization, **kwargs
+    )
+    return load_quantized_vectors(codes_path, scales_path, originals=store)
+
+
+class TestQuantizeRows:
+    """Tests for quantize_rows and the quantized files."""
+
+    def test_int8_codes_and_scales(self):
+        arr = np.array([[0.5, -1.0, 0.25], [0.0, 0.0, 0.0], [2.0, 1.0, -0.5]], dtype=np.float32)
+
+        codes, scales = quantize_rows(arr, "int8")
+
+        assert codes.dtype == np.int8 and scales.dtype == np.float32
+        np.testing.assert_allclose(scales, [1.0 / 127, 1.0, 2.0 / 127], rtol=1e-6)
+        assert codes[1].tolist() == [0, 0, 0]
+        assert np.abs(codes).max(axis=1).tolist() == [127, 0, 127]
+        np.testing.assert_allclose(codes * scales[:, None], arr, atol=scales.max() / 2 + 1e-7)
+
+    def test_float16_is_a_cast(self):
+        arr = np.array([[0.1, -0.2]], dtype=np.float32)
+
+        codes, scales = quantize_rows(arr, "float16")
+
+        assert scales is None
+        np.testing.assert_array_equal(codes, arr.astype(np.float16))
+
+    def test_unknown_quantization(self):
+        with pytest.raises(ValueError):
+            quantize_rows(np.ones((1, 2)), "int4")
+
+    @pytest.mark.parametrize("quantization", ["int8", "float16"])
+    def test_write_in_blocks_matches_whole_matrix(self, tmp_path, random_store, quantization):
+        store = random_store[0]
+        expected_codes, expected_scales = quantize_rows(np.asarray(store.vectors), quantization)
+
+        quantized = quantized_store(tmp_path, store, quantization, block_rows=10)
+
+        assert quantized.quantization == quantization
+        np.testing.assert_array_equal(quantized.codes, expected_codes)
+        if expected_scales is None:
+            assert quantized.scales is None
+        else:
+            np.testing.assert_array_equal(quantized.scales, expected_scales)
+        assert quantized.nbytes == expected_codes.nbytes + (0 if expected_scales is None else expected_scales.nbytes)
+
+    def test_stale_or_incomplete_files_are_ignored(self, tmp_path, random_store):
+        store = random_store[0]
+        codes_path, scales_path = tmp_path / "motif_codes.npy", tmp_path / "motif_scales.npy"
+        assert load_quantized_vectors(codes_path, scales_path, originals=store) is None
+
+        quantized_store(tmp_path, store, "int8")
+        smaller = CollectionVectors(ids=store.ids[:10], vectors=store.vectors[:10], normalized=True)
+        assert load_quantized_vectors(codes_path, scales_path, originals=smaller) is None
+
+        scales_path.unlink()
+        assert load_quantized_vectors(codes_path, scales_path, originals=store) is None
+
+
+class TestQuantizedSearch:
+    """Tests for QuantizedVectors.search against exact search."""
+
+    @pytest.mark.parametrize("quantization", ["int8", "float16"])
+    @pytest.mark.parametrize("block_rows", [7, 50, 103, 8192])
+    def test_matches_exact_search(self, tmp_path, random_store, quantization, block_rows):
+        store, _, _, queries = random_store
+        quantized = quantized_store(tmp_path, store, quantization)
+        expected_ids, expected_distances = store.search(queries=queries, k=10)
+
+        got_ids, got_distances = quantized.search(queries=queries, k=10, block_rows=block_rows)
+
+        np.testing.assert_array_equal(got_ids, expected_ids)
+        # Re-ranked with the float originals, so distances are exact, not quantized.
+        np.testing.assert_allclose(got_distances, expected_distances, atol=1e-6)
+
+    @pytest.mark.parametrize("quantization", ["int8", "float16"])
+    def test_rerank_uses_exact_distances(self, tmp_path, random_store, quantization):
+        store, vectors, ids, queries = random_store
+        quantized = quantized_store(tmp_path, store, quantization)
+        exact = 1.0 - unit_rows(queries) @ unit_rows(vectors).T
+
+        got_ids, got_distances = quantized.search(queries=queries, k=5, rerank_factor=1, block_rows=7)
+
+        assert got_ids.shape == (5, 5)
+        rows = np.searchsorted(ids, got_ids)
+        np.testing.assert_allclose(got_distances, np.take_along_axis(exact, rows, axis=1), atol=1e-5)
+        assert np.all(np.diff(got_distances, axis=1) >= 0)
+
+    def test_k_larger_than_collection(self, tmp_path, random_store):
+        store, _, ids, queries = random_store
+        quantized = quantized_store(tmp_path, store, "int8")
+
+        got_ids, got_distances = quantized.search(queries=queries[0], k=500, block_rows=30)
+
+        assert got_ids.shape == got_distances.shape == (1, 103)
+        assert sorted(got_ids[0].tolist()) == ids.tolist()
+
+    def test_all_zero_row(self, tmp_path):
+        vectors = np.array([[1.0, 0.0], [0.0, 0.0], [0.6, 0.8]], dtype=np.float32)
+        store = CollectionVectors(ids=np.array([1, 2, 3], dtype=np.int64), vectors=vectors, normalized=True)
+        quantized = quantized_store(tmp_path, store, "int8")
+
+        assert quantized.scales[1] == 1.0
+        got_ids, got_distances = quantized.search(queries=[[1.0, 0.0]], k=3, block_rows=2)
+
+        assert got_ids.tolist() == [[1, 3, 2]]
+        np.testing.assert_allclose(got_distances, [[0.0, 0.4, 1.0]], atol=1e-6)
+
+
+@pytest.fixture
+def branch_store(tmp_path):
+    """Four clusters of rows; branches "a"-"c" interleaved, "d" contiguous at the end."""
+
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(4, 16)) * 4
+    keys = ["a", "b", "c"] * 20 + ["d"] * 3
+    vectors = np.stack([centers["abcd".index(key)] + rng.normal(size=16) for key in keys]).astype(np.float32)
+    ids = np.arange(100, 100 + len(keys), dtype=np.int64)
+    store = write_store(tmp_path, ids, vectors)
+    write_branch_index(store, row_branches=keys, path=tmp_path / "motif_branches.npz", block_rows=7)
+    index = load_branch_index(tmp_path / "motif_branches.npz", originals=store)
+    queries = (centers + rng.normal(size=(4, 16))).astype(np.float32)
+    return index, store, np.array(keys), queries
+
+
+class TestBranchIndex:
+    """Tests for BranchIndex and the branch index file."""
+
+    def test_round_trip(self, branch_store):
+        index, store, keys, _ = branch_store
+
+        assert index.names.tolist() == ["a", "b", "c", "d"]
+        assert index.names[index.row_branch].tolist() == keys.tolist()
+        assert index.starts.tolist() == [0, 20, 40, 60, 63]
+        for b, name in enumerate(index.names):
+            rows = index.order[index.starts[b] : index.starts[b + 1]]
+            assert set(rows.tolist()) == set(np.flatnonzero(keys == name).tolist())
+            centroid = np.asarray(store.vectors[rows], dtype=np.float64).mean(axis=0)
+            np.testing.assert_allclose(index.centroids[b], centroid / np.linalg.norm(centroid), atol=1e-6)
+
+    def test_write_checks_row_count(self, branch_store, tmp_path):
+        _, store, _, _ = branch_store
+        with pytest.raises(ValueError):
+            write_branch_index(store, row_branches=["a"], path=tmp_path / "bad.npz")
+
+    def test_missing_or_stale_file(self, branch_store, tmp_path):
+        _, store, _, _ = branch_store
+        assert load_branch_index(tmp_path / "missing.npz", originals=store) is None
+
+        smaller = CollectionVectors(ids=store.ids[:10], vectors=store.vectors[:10], normalized=True)
+        assert load_branch_index(tmp_path / "motif_branches.npz", originals=smaller) is None
+
+    def test_all_branches_match_exact_search(self, branch_store):
+        index, store, _, queries = branch_store
+        expected_ids, expected_distances = store.search(queries=queries, k=8)
+
+        got_ids, got_distances = index.search(queries=queries, k=8, n_branches=len(index))
+
+        np.testing.assert_array_equal(got_ids, expected_ids)
+        np.testing.assert_allclose(got_distances, expected_distances, atol=1e-6)
+
+    @pytest.mark.parametrize("n_branches", [1, 2])
+    def test_matches_exact_search_within_chosen_branches(self, branch_store, n_branches):
+        index, store, _, queries = branch_store
+        q = unit_rows(queries)
+
+        got_ids, got_distances = index.search(queries=queries, k=3, n_branches=n_branches)
+
+        chosen = index.top_branches(q, n_branches)
+        for i in range(q.shape[0]):
+            rows = np.flatnonzero(np.isin(index.row_branch, chosen[i]))
+            sub = CollectionVectors(ids=store.ids[rows], vectors=store.vectors[rows], normalized=True)
+            expected_ids, expected_distances = sub.search(queries=q[i], k=3)
+            np.testing.assert_array_equal(got_ids[i], expected_ids[0])
+            np.testing.assert_allclose(got_distances[i], expected_distances[0], atol=1e-6)
+
+    def test_coarse_search_finds_the_query_cluster(self, branch_store):
+        index, store, keys, queries = branch_store
+
+        got_ids, _ = index.search(queries=queries, k=3, n_branches=1)
+
+        rows = store.rows_for(got_ids.reshape(-1)).reshape(got_ids.shape)
+        assert keys[rows].tolist() == [[key] * 3 for key in "abcd"]
+
+    def test_short_branches_are_padded_and_filtered(self, branch_store):
+        index, store, _, queries = branch_store
+
+        # Branch "d" holds 3 rows, so k=5 leaves two padding columns.
+        labels, distances = index.search(queries=queries[3], k=5, n_branches=1)
+
+        assert labels[0, 3:].tolist() == [-1, -1]
+        assert np.isinf(distances[0, 3:]).all()
+        assert np.all(np.diff(distances[0, :3]) >= 0)
+
+        doc_ids, sims = _max_similarity_per_doc(labels, distances, -1.0)
+        assert sorted(doc_ids.tolist()) == sorted(labels[0, :3].tolist())
+        assert np.isfinite(sims).all()
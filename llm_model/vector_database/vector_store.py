@@ -0,0 +1,566 @@
+"""Memory-mapped document vectors stored next to the HNSW indices.
+
+hnswlib keeps vectors inside its own binary format, which makes them awkward to
+reuse for exact re-ranking, analytics or export. During a build we therefore also
+write each collection's vectors to a plain `.npy` matrix:
+
+- `<collection>_vectors.npy`: (n, dim) float32 or float16 rows
+- `<collection>_vector_ids.npy`: (n,) int64 SQLite ids, ascending; row i holds the
+  vector of document `ids[i]` (the same id used as the HNSW label)
+
+At load time the matrix is opened with `np.load(mmap_mode="r")`, so reading vectors
+does not copy the file into memory or into Python lists. For the cosine space the
+rows are L2-normalized, so a dot product is the cosine similarity.
+
+Optionally a quantized copy is written next to it (`QUANTIZATIONS`):
+
+- `<collection>_vectors_q.npy`: (n, dim) float16 or int8 codes, same row order
+- `<collection>_vectors_q_scales.npy`: (n,) float32 per-row scales (int8 only;
+  row i is approximately `codes[i] * scales[i]`)
+
+The codes are small enough to keep resident; `QuantizedVectors.search` scans them
+for candidates and re-ranks those with the float rows of the memory-mapped matrix,
+so only `k * rerank_factor` original rows per query are read from disk.
+
+For hierarchical collections (motifs: chapter > division) a branch index is kept in
+`<collection>_branches.npz`: the branch of every row and one normalized centroid per
+branch. `BranchIndex.search` first ranks the centroids, then searches only the rows
+of the best branches.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+SUPPORTED_DTYPES = ("float32", "float16")
+QUANTIZATIONS = ("float16", "int8")
+
+
+def _normalize_rows(arr: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+@dataclass(frozen=True)
+class CollectionVectors:
+    """Read-only view over one collection's vectors."""
+
+    ids: np.ndarray  # (n,) int64, ascending SQLite ids
+    vectors: np.ndarray  # (n, dim) memory-mapped matrix
+    normalized: bool
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    def rows_for(self, ids: Sequence[int] | np.ndarray) -> np.ndarray:
+        """Map SQLite ids to row numbers (-1 for ids without a stored vector)."""
+
+        wanted = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if len(self) == 0:
+            return np.full(wanted.shape[0], -1, dtype=np.int64)
+        pos = np.searchsorted(self.ids, wanted)
+        pos = np.minimum(pos, len(self) - 1)
+        return np.where(self.ids[pos] == wanted, pos, -1).astype(np.int64)
+
+    def take(self, ids: Sequence[int] | np.ndarray) -> np.ndarray:
+        """Return the float32 vectors for `ids` as an (len(ids), dim) matrix.
+
+        Only the requested rows are read from the mapped file.
+        """
+
+        rows = self.rows_for(ids)
+        if rows.size and int(rows.min()) < 0:
+            missing = np.asarray(ids, dtype=np.int64).reshape(-1)[rows < 0]
+            raise KeyError(f"No stored vector for ids: {missing[:10].tolist()}")
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    def search(
+        self,
+        *,
+        queries: np.ndarray | Sequence[Sequence[float]],
+        k: int,
+        block_rows: int = 65536,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact cosine kNN by matrix product over the stored (normalized) rows.
+
+        The matrix is scanned in blocks of `block_rows`, keeping a running top-k,
+        so memory stays bounded for large collections.
+
+        Returns:
+            (ids, distances) shaped (n_queries, k) like `HNSWIndex.knn_batch`,
+            with distance = 1 - cosine similarity. Fewer than k columns are
+            returned when the collection is smaller than k.
+        """
+
+        if not self.normalized:
+            raise ValueError("Exact search needs L2-normalized vectors (cosine space)")
+
+        q = np.ascontiguousarray(queries, dtype=np.float32)
+        if q.ndim == 1:
+            q = q.reshape(1, -1)
+        k = min(int(k), len(self))
+        if q.shape[0] == 0 or k <= 0:
+            return np.empty((q.shape[0], 0), dtype=np.int64), np.empty((q.shape[0], 0), dtype=np.float32)
+        q = _normalize_rows(q)
+
+        best_sims = np.full((q.shape[0], 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((q.shape[0], 0), dtype=np.int64)
+        for start in range(0, len(self), max(1, int(block_rows))):
+            block = np.asarray(self.vectors[start : start + block_rows], dtype=np.float32)
+            sims = q @ block.T  # (n_queries, block)
+            rows = np.arange(start, start + block.shape[0], dtype=np.int64)
+
+            sims = np.concatenate([best_sims, sims], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(rows, (q.shape[0], rows.shape[0]))], axis=1)
+            if sims.shape[1] > k:
+                top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+                sims = np.take_along_axis(sims, top, axis=1)
+                rows = np.take_along_axis(rows, top, axis=1)
+            best_sims, best_rows = sims, rows
+
+        best_sims, best_rows = _sort_desc(best_sims, best_rows)
+        return self.ids[best_rows], (1.0 - best_sims).astype(np.float32)
+
+
+def _sort_desc(sims: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(-sims, axis=1, kind="stable")
+    return np.take_along_axis(sims, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+def quantize_rows(arr: np.ndarray, quantization: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Quantize float rows to (codes, scales).
+
+    `float16` is a plain cast (scales is None). `int8` is symmetric per-row scalar
+    quantization: scale = max|x| / 127, codes = round(x / scale).
+    """
+
+    arr = np.asarray(arr, dtype=np.float32)
+    if quantization == "float16":
+        return arr.astype(np.float16), None
+    if quantization == "int8":
+        scales = np.abs(arr).max(axis=1) / 127.0 if arr.shape[0] else np.empty(0, dtype=np.float32)
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(arr / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    raise ValueError(f"Unsupported quantization {quantization!r}; expected one of {QUANTIZATIONS}")
+
+
+@dataclass(frozen=True)
+class QuantizedVectors:
+    """Quantized copy of a collection's vectors with exact re-ranking.
+
+    `codes` rows are aligned with `originals` (same ids, same order).
+    """
+
+    codes: np.ndarray  # (n, dim) float16 or int8, resident in memory
+    scales: Optional[np.ndarray]  # (n,) float32 for int8 codes, else None
+    originals: CollectionVectors
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def quantization(self) -> str:
+        return "int8" if self.codes.dtype == np.int8 else "float16"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the resident codes (and scales)."""
+
+        return int(self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def search(
+        self,
+        *,
+        queries: np.ndarray | Sequence[Sequence[float]],
+        k: int,
+        rerank_factor: int = 4,
+        block_rows: int = 8192,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-(k * rerank_factor) over the codes, then exact re-rank.
+
+        Codes are widened to float32 one block of `block_rows` at a time, which
+        bounds the temporary memory of the scan.
+
+        Returns:
+            (ids, distances) shaped (n_queries, k) like `CollectionVectors.search`;
+            distances come from the float originals (1 - cosine similarity).
+        """
+
+        if not self.originals.normalized:
+            raise ValueError("Quantized search needs L2-normalized vectors (cosine space)")
+
+        q = np.ascontiguousarray(queries, dtype=np.float32)
+        if q.ndim == 1:
+            q = q.reshape(1, -1)
+        k = min(int(k), len(self))
+        if q.shape[0] == 0 or k <= 0:
+            return np.empty((q.shape[0], 0), dtype=np.int64), np.empty((q.shape[0], 0), dtype=np.float32)
+        q = _normalize_rows(q)
+        n_candidates = min(len(self), k * max(1, int(rerank_factor)))
+
+        # Stage 1: candidate rows from the codes (running top-n_candidates per block).
+        best_sims = np.full((q.shape[0], 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((q.shape[0], 0), dtype=np.int64)
+        for start in range(0, len(self), max(1, int(block_rows))):
+            block = np.asarray(self.codes[start : start + block_rows], dtype=np.float32)
+            sims = q @ block.T
+            if self.scales is not None:
+                sims *= self.scales[start : start + block.shape[0]]
+            rows = np.arange(start, start + block.shape[0], dtype=np.int64)
+
+            sims = np.concatenate([best_sims, sims], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(rows, (q.shape[0], rows.shape[0]))], axis=1)
+            if sims.shape[1] > n_candidates:
+                top = np.argpartition(-sims, n_candidates - 1, axis=1)[:, :n_candidates]
+                sims = np.take_along_axis(sims, top, axis=1)
+                rows = np.take_along_axis(rows, top, axis=1)
+            best_sims, best_rows = sims, rows
+
+        # Stage 2: exact similarities from the memory-mapped float rows.
+        unique_rows, inverse = np.unique(best_rows, return_inverse=True)
+        exact = np.asarray(self.originals.vectors[unique_rows], dtype=np.float32)
+        cand = exact[inverse.reshape(best_rows.shape)]  # (n_queries, n_candidates, dim)
+        sims = np.einsum("qcd,qd->qc", cand, q)
+
+        if sims.shape[1] > k:
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            sims = np.take_along_axis(sims, top, axis=1)
+            best_rows = np.take_along_axis(best_rows, top, axis=1)
+        sims, best_rows = _sort_desc(sims, best_rows)
+        return self.originals.ids[best_rows], (1.0 - sims).astype(np.float32)
+
+
+class VectorStoreWriter:
+    """Write one collection's vectors into a preallocated `.npy` matrix.
+
+    The ids are fixed up front; `put()` may then be called in any order (e.g. per
+    embedding batch). Data goes to temporary files that replace the previous
+    store on `close()`, so readers never see a half-written matrix.
+    """
+
+    def __init__(
+        self,
+        *,
+        vectors_path: Path,
+        ids_path: Path,
+        ids: Sequence[int] | np.ndarray,
+        dim: int,
+        dtype: str = "float32",
+        normalize: bool = True,
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype {dtype!r}; expected one of {SUPPORTED_DTYPES}")
+
+        self.vectors_path = Path(vectors_path)
+        self.ids_path = Path(ids_path)
+        self.normalize = bool(normalize)
+        self.dim = int(dim)
+
+        self._ids = np.unique(np.asarray(ids, dtype=np.int64))
+        self._filled = np.zeros(self._ids.shape[0], dtype=bool)
+
+        self.vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_vectors = self.vectors_path.with_name(self.vectors_path.name + ".tmp")
+        self._tmp_ids = self.ids_path.with_name(self.ids_path.name + ".tmp")
+        self._data = np.lib.format.open_memmap(
+            str(self._tmp_vectors),
+            mode="w+",
+            dtype=np.dtype(dtype),
+            shape=(self._ids.shape[0], self.dim),
+        )
+
+    def put(self, ids: Sequence[int] | np.ndarray, vectors: np.ndarray | Sequence[Sequence[float]]) -> None:
+        """Store vectors for the given ids (ids must be part of the writer's id set)."""
+
+        wanted = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if wanted.size == 0:
+            return
+        arr = np.asarray(vectors, dtype=np.float32)
+        if arr.shape != (wanted.shape[0], self.dim):
+            raise ValueError(f"Expected vectors of shape {(wanted.shape[0], self.dim)}, got {arr.shape}")
+
+        rows = np.searchsorted(self._ids, wanted)
+        rows = np.minimum(rows, max(0, self._ids.shape[0] - 1))
+        if self._ids.shape[0] == 0 or not np.array_equal(self._ids[rows], wanted):
+            raise KeyError("put() received ids outside of the writer's id set")
+
+        if self.normalize:
+            arr = _normalize_rows(arr)
+        self._data[rows] = arr
+        self._filled[rows] = True
+
+    def missing_ids(self) -> np.ndarray:
+        return self._ids[~self._filled]
+
+    def close(self) -> None:
+        """Flush and atomically replace the previous store."""
+
+        if not bool(self._filled.all()):
+            missing = self.missing_ids()
+            self.abort()
+            raise ValueError(f"{missing.shape[0]} vectors were never written (e.g. ids {missing[:10].tolist()})")
+
+        self._data.flush()
+        del self._data
+        with open(self._tmp_ids, "wb") as f:
+            np.save(f, self._ids)
+        os.replace(self._tmp_ids, self.ids_path)
+        os.replace(self._tmp_vectors, self.vectors_path)
+
+    def abort(self) -> None:
+        """Drop the temporary files without touching the previous store."""
+
+        if hasattr(self, "_data"):
+            del self._data
+        for path in (self._tmp_vectors, self._tmp_ids):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+@dataclass(frozen=True)
+class BranchIndex:
+    """Rows of a collection grouped into branches, with one centroid per branch.
+
+    Rows of branch b are `order[starts[b] : starts[b + 1]]`.
+    """
+
+    names: np.ndarray  # (b,) branch keys
+    centroids: np.ndarray  # (b, dim) float32, L2-normalized
+    row_branch: np.ndarray  # (n,) int64 branch of every row
+    order: np.ndarray  # (n,) int64 rows sorted by branch
+    starts: np.ndarray  # (b + 1,) int64 offsets into `order`
+    originals: CollectionVectors
+
+    def __len__(self) -> int:
+        return int(self.names.shape[0])
+
+    def top_branches(self, queries: np.ndarray, n_branches: int) -> np.ndarray:
+        """(n_queries, n_branches) branch numbers with the most similar centroids."""
+
+        sims = queries @ self.centroids.T
+        n_branches = min(max(1, int(n_branches)), len(self))
+        return np.argpartition(-sims, n_branches - 1, axis=1)[:, :n_branches]
+
+    def search(
+        self,
+        *,
+        queries: np.ndarray | Sequence[Sequence[float]],
+        k: int,
+        n_branches: int = 8,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact kNN restricted to the rows of each query's `n_branches` best branches.
+
+        Each selected branch is read once and multiplied with the queries that chose
+        it, keeping a running top-k per query. When a query's branches hold fewer
+        than k rows the remaining columns have id -1 and distance inf.
+
+        Returns:
+            (ids, distances) shaped (n_queries, k) like `CollectionVectors.search`.
+        """
+
+        if not self.originals.normalized:
+            raise ValueError("Branch search needs L2-normalized vectors (cosine space)")
+
+        q = np.ascontiguousarray(queries, dtype=np.float32)
+        if q.ndim == 1:
+            q = q.reshape(1, -1)
+        k = min(int(k), len(self.originals))
+        if q.shape[0] == 0 or k <= 0 or len(self) == 0:
+            return np.empty((q.shape[0], 0), dtype=np.int64), np.empty((q.shape[0], 0), dtype=np.float32)
+        q = _normalize_rows(q)
+
+        top = self.top_branches(q, n_branches)
+        best_sims = np.full((q.shape[0], k), -np.inf, dtype=np.float32)
+        best_rows = np.full((q.shape[0], k), -1, dtype=np.int64)
+        for branch in np.unique(top).tolist():
+            members = np.flatnonzero((top == branch).any(axis=1))
+            rows = self.order[self.starts[branch] : self.starts[branch + 1]]
+            if rows.shape[0] and int(rows[-1]) - int(rows[0]) + 1 == rows.shape[0]:
+                block = self.originals.vectors[int(rows[0]) : int(rows[-1]) + 1]  # contiguous slice
+            else:
+                block = self.originals.vectors[rows]
+            sims = q[members] @ np.asarray(block, dtype=np.float32).T
+
+            sims = np.concatenate([best_sims[members], sims], axis=1)
+            cand = np.concatenate(
+                [best_rows[members], np.broadcast_to(rows, (members.shape[0], rows.shape[0]))], axis=1
+            )
+            part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            best_sims[members] = np.take_along_axis(sims, part, axis=1)
+            best_rows[members] = np.take_along_axis(cand, part, axis=1)
+
+        best_sims, best_rows = _sort_desc(best_sims, best_rows)
+        ids = np.where(best_rows >= 0, self.originals.ids[np.maximum(best_rows, 0)], -1)
+        return ids, (1.0 - best_sims).astype(np.float32)
+
+
+def write_branch_index(
+    source: CollectionVectors,
+    *,
+    row_branches: Sequence[str],
+    path: Path,
+    block_rows: int = 65536,
+) -> None:
+    """Compute branch centroids of a stored collection and atomically write them.
+
+    Args:
+        source: The collection's stored (normalized) vectors.
+        row_branches: Branch key of every row of `source`, in row order.
+        path: Target `.npz` file.
+    """
+
+    if len(row_branches) != len(source):
+        raise ValueError(f"Expected {len(source)} branch keys, got {len(row_branches)}")
+
+    names, row_branch = np.unique(np.asarray(row_branches, dtype=str), return_inverse=True)
+    sums = np.zeros((names.shape[0], source.dim), dtype=np.float64)
+    for start in range(0, len(source), max(1, int(block_rows))):
+        block = np.asarray(source.vectors[start : start + block_rows], dtype=np.float64)
+        np.add.at(sums, row_branch[start : start + block.shape[0]], block)
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez(
+        tmp,
+        names=names,
+        centroids=_normalize_rows(sums).astype(np.float32),
+        row_branch=row_branch.astype(np.int32),
+    )
+    os.replace(tmp, path)
+
+
+def load_branch_index(path: Path, *, originals: CollectionVectors) -> Optional[BranchIndex]:
+    """Load a collection's branch index, or return None if absent/stale."""
+
+    if not Path(path).exists():
+        return None
+
+    with np.load(str(path)) as data:
+        names = data["names"]
+        centroids = data["centroids"].astype(np.float32, copy=False)
+        row_branch = data["row_branch"].astype(np.int64)
+    if row_branch.shape[0] != len(originals) or centroids.shape != (names.shape[0], originals.dim):
+        print(f"[vector-db] Ignoring {Path(path).name}: shape does not match the stored vectors")
+        return None
+
+    order = np.argsort(row_branch, kind="stable")
+    starts = np.searchsorted(row_branch[order], np.arange(names.shape[0] + 1))
+    return BranchIndex(
+        names=names,
+        centroids=centroids,
+        row_branch=row_branch,
+        order=order,
+        starts=starts,
+        originals=originals,
+    )
+
+
+def write_quantized_vectors(
+    source: CollectionVectors,
+    *,
+    codes_path: Path,
+    scales_path: Path,
+    quantization: str,
+    block_rows: int = 65536,
+) -> None:
+    """Quantize a stored collection block by block and atomically write the files."""
+
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unsupported quantization {quantization!r}; expected one of {QUANTIZATIONS}")
+
+    codes_path = Path(codes_path)
+    scales_path = Path(scales_path)
+    tmp_codes = codes_path.with_name(codes_path.name + ".tmp")
+    tmp_scales = scales_path.with_name(scales_path.name + ".tmp")
+
+    n = len(source)
+    codes = np.lib.format.open_memmap(
+        str(tmp_codes),
+        mode="w+",
+        dtype=np.int8 if quantization == "int8" else np.float16,
+        shape=(n, source.dim),
+    )
+    scales = np.empty(n, dtype=np.float32)
+    for start in range(0, n, max(1, int(block_rows))):
+        part_codes, part_scales = quantize_rows(source.vectors[start : start + block_rows], quantization)
+        codes[start : start + part_codes.shape[0]] = part_codes
+        if part_scales is not None:
+            scales[start : start + part_scales.shape[0]] = part_scales
+    codes.flush()
+    del codes
+
+    if quantization == "int8":
+        with open(tmp_scales, "wb") as f:
+            np.save(f, scales)
+        os.replace(tmp_scales, scales_path)
+    else:
+        remove_quantized_vectors(scales_path=scales_path)
+    os.replace(tmp_codes, codes_path)
+
+
+def remove_quantized_vectors(*, codes_path: Optional[Path] = None, scales_path: Optional[Path] = None) -> None:
+    """Delete quantized files (e.g. after a build without quantization)."""
+
+    for path in (codes_path, scales_path):
+        if path is None:
+            continue
+        try:
+            Path(path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def load_quantized_vectors(
+    codes_path: Path,
+    scales_path: Path,
+    *,
+    originals: CollectionVectors,
+) -> Optional[QuantizedVectors]:
+    """Load a collection's quantized codes into memory, or return None if absent/stale."""
+
+    if not Path(codes_path).exists():
+        return None
+
+    codes = np.load(str(codes_path))
+    scales = None
+    if codes.dtype == np.int8:
+        if not Path(scales_path).exists():
+            print(f"[vector-db] Ignoring {Path(codes_path).name}: {Path(scales_path).name} is missing")
+            return None
+        scales = np.load(str(scales_path)).astype(np.float32, copy=False)
+    if codes.shape != originals.vectors.shape or (scales is not None and scales.shape[0] != codes.shape[0]):
+        print(f"[vector-db] Ignoring {Path(codes_path).name}: shape does not match the stored vectors")
+        return None
+    return QuantizedVectors(codes=codes, scales=scales, originals=originals)
+
+
+def load_collection_vectors(
+    vectors_path: Path,
+    ids_path: Path,
+    *,
+    normalized: bool = True,
+) -> Optional[CollectionVectors]:
+    """Memory-map a collection's vectors, or return None if the store has none."""
+
+    if not Path(vectors_path).exists() or not Path(ids_path).exists():
+        return None
+
+    vectors = np.load(str(vectors_path), mmap_mode="r")
+    ids = np.load(str(ids_path)).astype(np.int64, copy=False)
+    if vectors.ndim != 2 or vectors.shape[0] != ids.shape[0]:
+        print(f"[vector-db] Ignoring {Path(vectors_path).name}: shape does not match {Path(ids_path).name}")
+        return None
+    return CollectionVectors(ids=ids, vectors=vectors, normalized=normalized)
@@ -27,12 +27,19 @@ Usage:
         --num-predict 512 \
         --num-ctx 4096 \
         --disable-thinking
+
+    # Iterate on evaluation without re-running inference: record once, then replay
+    conda run -n nlp python scripts/run_full_pipeline_and_evaluate.py \
+        --story-file story.txt --ground-truth ground_truth.json --llm-cache on
+    conda run -n nlp python scripts/run_full_pipeline_and_evaluate.py \
+        --story-file story.txt --ground-truth ground_truth.json --llm-cache replay
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List
@@ -41,11 +48,13 @@ from typing import Any, Dict, List
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from llm_model.env import load_repo_dotenv
 from llm_model.evaluation import CompositeEvaluator
 from llm_model.evaluation.utils import load_ground_truth
 from llm_model.full_detection import process_story
 from llm_model.gemini_client import GeminiConfig
 from llm_model.huggingface_client import HuggingFaceConfig
+from llm_model.llm_response_cache import configure_llm_response_cache, llm_response_cache_stats
 from llm_model.llm_router import LLMConfig
 from llm_model.ollama_client import OllamaConfig
 
@@ -203,6 +212,13 @@ def run_pipeline_and_evaluate(
             print(f"Average time per span: {avg_time:.1f}s")
             print(f"Total processing time: {total_time:.1f}s")
     
+    cache_stats = llm_response_cache_stats()
+    if cache_stats is not None:
+        print(
+            f"LLM response cache ({cache_stats['mode']}): {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.1%} hit rate)"
+        )
+    
     # Build prediction JSON in v3 format
     prediction = {
         "version": "3.0",
@@ -263,6 +279,8 @@ def run_pipeline_and_evaluate(
 
 
 def main() -> int:
+    load_repo_dotenv()
+
     parser = argparse.ArgumentParser(
         description="Run full detection pipeline and evaluate against ground truth.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -342,6 +360,20 @@ def main() -> int:
         help="Include instrument recognition",
     )
     
+    # LLM response cache
+    parser.add_argument(
+        "--llm-cache",
+        choices=["off", "on", "replay"],
+        default=os.getenv("LLM_RESPONSE_CACHE") or "off",
+        help="LLM response cache: on = reuse/store responses, replay = cached responses only (default: LLM_RESPONSE_CACHE or off)",
+    )
+    parser.add_argument(
+        "--llm-cache-path",
+        type=Path,
+        default=None,
+        help="SQLite file for the LLM response cache (default: ~/.cache/fairytales_research/llm_responses.sqlite)",
+    )
+    
     # Output options
     parser.add_argument(
         "--no-save-prediction",
@@ -369,8 +401,6 @@ def main() -> int:
     output_dir = args.output_dir or Path.cwd()
     
     # Setup LLM config
-    import os
-    
     # Warn if num_predict is too low for JSON responses
     if args.num_predict is not None and args.num_predict > 0 and args.num_predict < 256:
         print(f"Warning: --num-predict={args.num_predict} may be too low for JSON responses.", flush=True)
@@ -403,6 +433,8 @@ def main() -> int:
         ),
     )
     
+    configure_llm_response_cache(args.llm_cache, args.llm_cache_path)
+    
     try:
         run_pipeline_and_evaluate(
             story_file=args.story_file,
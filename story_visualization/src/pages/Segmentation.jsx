@@ -5,8 +5,11 @@ import MagneticSignalChart from '../components/MagneticSignalChart'
 import GraphSegSMChart from '../components/GraphSegSMChart'
 import SegmentationComparison from '../components/SegmentationComparison'
 import { extractGroundTruthFromAnnotation, buildSegmentsFromBoundaries } from '../utils/textSpanUtils'
+import { decodeSimilarityMatrix } from '../utils/matrixPayload'
 
 const BACKEND_URL = import.meta.env.VITE_BACKEND_URL || 'http://localhost:8000'
+// Larger similarity matrices are block-averaged by the backend before sending
+const MATRIX_MAX_SIZE = 300
 
 export default function Segmentation({ story }) {
   const [text, setText] = useState('')
@@ -160,6 +163,9 @@ export default function Segmentation({ story }) {
           threshold: threshold,
           min_seg_size: minSegSize,
           reference_boundaries: referenceBoundaries.length > 0 ? referenceBoundaries : null,
+          // Half-precision matrix, block-averaged to at most MATRIX_MAX_SIZE rows
+          matrix_format: 'float16_base64',
+          matrix_max_size: MATRIX_MAX_SIZE,
         }),
       })
 
@@ -169,6 +175,12 @@ export default function Segmentation({ story }) {
       }
 
       const data = await response.json()
+      const encoded = data.visualization && data.visualization.similarity_matrix_encoded
+      if (encoded) {
+        const { matrix, step } = decodeSimilarityMatrix(encoded)
+        data.visualization.similarity_matrix = matrix
+        data.visualization.similarity_matrix_step = step
+      }
       setResult(data)
     } catch (err) {
       setError(err.message || 'Failed to segment text')
@@ -178,6 +190,14 @@ export default function Segmentation({ story }) {
     }
   }
 
+  // Sentences per heatmap cell when the backend downsampled the matrix
+  const matrixStep = (result && result.visualization && result.visualization.similarity_matrix_step) || 1
+  const scaleToMatrix = (boundaries) => (
+    matrixStep > 1
+      ? [...new Set(boundaries.map((b) => Math.floor(b / matrixStep)))]
+      : boundaries
+  )
+
   const getSegmentColor = (index) => {
     const colors = [
       '#e3f2fd', '#f3e5f5', '#e8f5e9', '#fff3e0',
@@ -706,9 +726,11 @@ export default function Segmentation({ story }) {
                     <h4>Similarity Matrix</h4>
                     <SimilarityMatrixHeatmap
                       similarityMatrix={result.visualization.similarity_matrix}
-                      groundTruthBoundaries={referenceBoundaries}
-                      contextWindow={contextWindow}
-                      title="Cosine Similarity Matrix"
+                      groundTruthBoundaries={scaleToMatrix(referenceBoundaries)}
+                      contextWindow={matrixStep > 1 ? Math.ceil(contextWindow / matrixStep) : contextWindow}
+                      title={matrixStep > 1
+                        ? `Cosine Similarity Matrix (${matrixStep} sentences per cell)`
+                        : 'Cosine Similarity Matrix'}
                     />
                   </div>
                 )}
@@ -0,0 +1,76 @@
+/**
+ * Tests for matrixPayload.js
+ */
+
+import { describe, it, expect } from 'vitest'
+import { halfToFloat, decodeMatrixBytes, toSquareMatrix, decodeSimilarityMatrix } from '../matrixPayload'
+
+// float16 bit patterns: 1.0 = 0x3c00, 0.5 = 0x3800, -2.0 = 0xc000, 0.25 = 0x3400
+function float16Payload(values, meta) {
+  const bytes = new Uint8Array(values.length * 2)
+  values.forEach((v, i) => {
+    bytes[2 * i] = v & 0xff
+    bytes[2 * i + 1] = v >> 8
+  })
+  const data = btoa(String.fromCharCode(...bytes))
+  return { dtype: 'float16', step: 1, ...meta, data }
+}
+
+describe('halfToFloat', () => {
+  it('should decode normal, negative and zero values', () => {
+    expect(halfToFloat(0x3c00)).toBe(1)
+    expect(halfToFloat(0x3800)).toBe(0.5)
+    expect(halfToFloat(0xc000)).toBe(-2)
+    expect(halfToFloat(0x0000)).toBe(0)
+  })
+})
+
+describe('decodeMatrixBytes', () => {
+  it('should decode little-endian float32', () => {
+    const buffer = new ArrayBuffer(8)
+    const view = new DataView(buffer)
+    view.setFloat32(0, 0.75, true)
+    view.setFloat32(4, -1.5, true)
+
+    expect(decodeMatrixBytes(buffer, 'float32')).toEqual([0.75, -1.5])
+  })
+
+  it('should reject unknown dtypes', () => {
+    expect(() => decodeMatrixBytes(new ArrayBuffer(4), 'int8')).toThrow()
+  })
+})
+
+describe('decodeSimilarityMatrix', () => {
+  it('should decode a dense float16 payload', () => {
+    const payload = float16Payload([0x3c00, 0x3800, 0x3800, 0x3c00], {
+      layout: 'dense', shape: [2, 2], n: 4, step: 2,
+    })
+
+    const { matrix, n, step } = decodeSimilarityMatrix(payload)
+
+    expect(matrix).toEqual([[1, 0.5], [0.5, 1]])
+    expect(n).toBe(4)
+    expect(step).toBe(2)
+  })
+
+  it('should expand a banded payload to a symmetric matrix', () => {
+    // rows hold S[i][i], S[i][i + 1]; the last row's second entry is padding
+    const payload = float16Payload([0x3c00, 0x3800, 0x3c00, 0x3400, 0x3c00, 0x0000], {
+      layout: 'banded', shape: [3, 2], n: 3,
+    })
+
+    const { matrix } = decodeSimilarityMatrix(payload)
+
+    expect(matrix).toEqual([
+      [1, 0.5, 0],
+      [0.5, 1, 0.25],
+      [0, 0.25, 1],
+    ])
+  })
+})
+
+describe('toSquareMatrix', () => {
+  it('should split dense values into rows', () => {
+    expect(toSquareMatrix([1, 2, 3, 4], { layout: 'dense', shape: [2, 2] })).toEqual([[1, 2], [3, 4]])
+  })
+})
@@ -0,0 +1,93 @@
+/**
+ * Decoding of the compact similarity matrix payloads returned by
+ * /api/text/segment (`matrix_format: 'float16_base64'`) and
+ * /api/text/segment/matrix (raw bytes).
+ *
+ * Payload: { dtype, layout, shape, n, step, data }
+ * - dtype: 'float16' | 'float32' (little-endian)
+ * - layout: 'dense' (rows x cols) or 'banded' (n x (band + 1), row i holds S[i][i + d])
+ * - step: sentences per row after downsampling (1 = not downsampled)
+ */
+
+/**
+ * Convert one IEEE 754 half-precision value to a JS number.
+ * @param {number} h - 16-bit integer
+ * @returns {number}
+ */
+export function halfToFloat(h) {
+  const sign = h & 0x8000 ? -1 : 1
+  const exponent = (h >> 10) & 0x1f
+  const fraction = h & 0x03ff
+  if (exponent === 0) return sign * Math.pow(2, -14) * (fraction / 1024)
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity
+  return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024)
+}
+
+/**
+ * Decode little-endian float16/float32 bytes to a flat array of numbers.
+ * @param {ArrayBuffer} buffer
+ * @param {string} dtype - 'float16' or 'float32'
+ * @returns {Array<number>}
+ */
+export function decodeMatrixBytes(buffer, dtype) {
+  const view = new DataView(buffer)
+  const values = []
+  if (dtype === 'float16') {
+    for (let offset = 0; offset + 2 <= buffer.byteLength; offset += 2) {
+      values.push(halfToFloat(view.getUint16(offset, true)))
+    }
+  } else if (dtype === 'float32') {
+    for (let offset = 0; offset + 4 <= buffer.byteLength; offset += 4) {
+      values.push(view.getFloat32(offset, true))
+    }
+  } else {
+    throw new Error(`Unsupported matrix dtype: ${dtype}`)
+  }
+  return values
+}
+
+function base64ToArrayBuffer(data) {
+  const binary = atob(data)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i)
+  }
+  return bytes.buffer
+}
+
+/**
+ * Turn decoded values into a square 2D array for the heatmap.
+ * Banded payloads are expanded symmetrically with zeros outside the band.
+ * @param {Array<number>} values - Flat row-major values
+ * @param {{layout: string, shape: Array<number>}} meta
+ * @returns {Array<Array<number>>}
+ */
+export function toSquareMatrix(values, { layout, shape }) {
+  const [rows, cols] = shape
+  if (layout === 'banded') {
+    const matrix = Array.from({ length: rows }, () => new Array(rows).fill(0))
+    for (let i = 0; i < rows; i++) {
+      for (let d = 0; d < cols && i + d < rows; d++) {
+        const value = values[i * cols + d]
+        matrix[i][i + d] = value
+        matrix[i + d][i] = value
+      }
+    }
+    return matrix
+  }
+  return Array.from({ length: rows }, (_, i) => values.slice(i * cols, (i + 1) * cols))
+}
+
+/**
+ * Decode a `similarity_matrix_encoded` JSON payload.
+ * @param {Object} payload - { dtype, layout, shape, n, step, data (base64) }
+ * @returns {{matrix: Array<Array<number>>, n: number, step: number}}
+ */
+export function decodeSimilarityMatrix(payload) {
+  const values = decodeMatrixBytes(base64ToArrayBuffer(payload.data), payload.dtype)
+  return {
+    matrix: toSquareMatrix(values, payload),
+    n: payload.n,
+    step: payload.step || 1,
+  }
+}